@@ -0,0 +1,54 @@
+"""Add classification_cache table.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Persistent tier of the classification memoization cache. Rows are keyed by
+a hash of (kind, normalized text, vendor, tenant, ruleset version) so a GL
+account or payment pattern change makes old rows unreachable.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "classification_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("ruleset_version", sa.String(64), nullable=False),
+        sa.Column("result", sa.JSON, nullable=True),
+        sa.Column("claude_calls", sa.Integer, default=0),
+        sa.Column("hit_count", sa.Integer, default=0),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_classification_cache_kind_tenant",
+        "classification_cache",
+        ["kind", "tenant_id"],
+    )
+    op.create_index(
+        "ix_classification_cache_created_at",
+        "classification_cache",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_classification_cache_created_at", table_name="classification_cache"
+    )
+    op.drop_index(
+        "ix_classification_cache_kind_tenant", table_name="classification_cache"
+    )
+    op.drop_table("classification_cache")
@@ -0,0 +1,44 @@
+"""Add vendor_stats table.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+Per-vendor rollup buckets (month, GL account, payment status) maintained by
+the document pipeline so /vendors/{id}/stats reads a handful of rows.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vendor_stats",
+        sa.Column("vendor_id", sa.String(36), primary_key=True),
+        sa.Column("dimension", sa.String(20), primary_key=True),
+        sa.Column("bucket", sa.String(50), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("label", sa.String(200), nullable=True),
+        sa.Column("document_count", sa.Integer, default=0),
+        sa.Column("total_amount", sa.Float, default=0.0),
+        sa.Column("last_document_at", sa.DateTime, nullable=True),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_vendor_stats_tenant",
+        "vendor_stats",
+        ["tenant_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vendor_stats_tenant", table_name="vendor_stats")
+    op.drop_table("vendor_stats")
@@ -0,0 +1,47 @@
+"""Add claude_response_cache table.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Raw Claude text/vision responses keyed by a hash of (kind, model, prompt
+template version, content hash), shared by all workers. A prompt or model
+change makes old rows unreachable; the TTL purge removes them.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "claude_response_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("prompt_version", sa.String(64), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("response_text", sa.Text, nullable=False),
+        sa.Column("latency_seconds", sa.Float, default=0.0),
+        sa.Column("hit_count", sa.Integer, default=0),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_claude_response_cache_created_at",
+        "claude_response_cache",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_claude_response_cache_created_at", table_name="claude_response_cache"
+    )
+    op.drop_table("claude_response_cache")
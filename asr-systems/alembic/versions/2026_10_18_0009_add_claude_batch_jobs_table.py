@@ -0,0 +1,53 @@
+"""Add claude_batch_jobs table.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+Progress of batch-mode reprocessing jobs (submitted Message Batches,
+planning and reprocessing offsets, result counts) so they survive restarts.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "claude_batch_jobs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("document_ids", sa.JSON),
+        sa.Column("batches", sa.JSON),
+        sa.Column("planned", sa.Integer, default=0),
+        sa.Column("reprocessed", sa.Integer, default=0),
+        sa.Column("failed", sa.Integer, default=0),
+        sa.Column("results", sa.JSON),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_claude_batch_jobs_tenant_id",
+        "claude_batch_jobs",
+        ["tenant_id"],
+    )
+    op.create_index(
+        "ix_claude_batch_jobs_status",
+        "claude_batch_jobs",
+        ["status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claude_batch_jobs_status", table_name="claude_batch_jobs")
+    op.drop_index("ix_claude_batch_jobs_tenant_id", table_name="claude_batch_jobs")
+    op.drop_table("claude_batch_jobs")
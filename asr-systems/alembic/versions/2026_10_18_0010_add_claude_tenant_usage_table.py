@@ -0,0 +1,39 @@
+"""Add claude_tenant_usage table.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+Per-tenant, per-day Claude calls, tokens, estimated spend and latency,
+incremented by every worker; daily budgets are checked against it.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "claude_tenant_usage",
+        sa.Column("tenant_id", sa.String(255), primary_key=True),
+        sa.Column("usage_date", sa.String(10), primary_key=True),
+        sa.Column("calls", sa.Integer, default=0),
+        sa.Column("batch_calls", sa.Integer, default=0),
+        sa.Column("input_tokens", sa.Integer, default=0),
+        sa.Column("output_tokens", sa.Integer, default=0),
+        sa.Column("cost_usd", sa.Float, default=0.0),
+        sa.Column("latency_seconds", sa.Float, default=0.0),
+        sa.Column("downgrades", sa.Integer, default=0),
+        sa.Column("updated_at", sa.DateTime),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("claude_tenant_usage")
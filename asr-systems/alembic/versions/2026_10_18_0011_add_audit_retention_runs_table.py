@@ -0,0 +1,41 @@
+"""Add audit_retention_runs table.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+Progress of chunked audit trail retention purges, so an interrupted purge
+resumes with its original cutoff.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_retention_runs",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("status", sa.String(20), index=True),
+        sa.Column("cutoff", sa.DateTime),
+        sa.Column("deleted", sa.Integer, default=0),
+        sa.Column("batches", sa.Integer, default=0),
+        sa.Column("watermark", sa.DateTime, nullable=True),
+        sa.Column("partitions_dropped", sa.JSON),
+        sa.Column("elapsed_seconds", sa.Float, default=0.0),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_retention_runs")
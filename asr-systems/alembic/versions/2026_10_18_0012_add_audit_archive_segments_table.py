@@ -0,0 +1,46 @@
+"""Add audit_archive_segments table.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+
+Manifest of audit trail events archived to compressed files in the storage
+backend, per tenant and month.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_archive_segments",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), index=True),
+        sa.Column("month", sa.String(7)),
+        sa.Column("storage_key", sa.String(1024)),
+        sa.Column("compression", sa.String(10)),
+        sa.Column("row_count", sa.Integer, default=0),
+        sa.Column("size_bytes", sa.Integer, default=0),
+        sa.Column("min_timestamp", sa.DateTime),
+        sa.Column("max_timestamp", sa.DateTime),
+        sa.Column("document_filter", sa.Text),
+        sa.Column("created_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_audit_archive_tenant_max_ts",
+        "audit_archive_segments",
+        ["tenant_id", "max_timestamp"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_archive_tenant_max_ts", table_name="audit_archive_segments")
+    op.drop_table("audit_archive_segments")
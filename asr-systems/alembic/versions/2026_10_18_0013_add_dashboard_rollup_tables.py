@@ -0,0 +1,63 @@
+"""Add dashboard_rollups and dashboard_recent_documents tables.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+
+Per-tenant daily dashboard rollups and the recent documents list, maintained
+by the document pipeline so /metrics/* endpoints read a handful of rows.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_rollups",
+        sa.Column("tenant_id", sa.String(255), primary_key=True),
+        sa.Column("dimension", sa.String(20), primary_key=True),
+        sa.Column("day", sa.String(10), primary_key=True),
+        sa.Column("bucket", sa.String(50), primary_key=True),
+        sa.Column("label", sa.String(200), nullable=True),
+        sa.Column("document_count", sa.Integer, default=0),
+        sa.Column("total_amount", sa.Float, default=0.0),
+        sa.Column("confidence_sum", sa.Float, default=0.0),
+        sa.Column("manual_review_count", sa.Integer, default=0),
+        sa.Column("processing_ms_sum", sa.Float, default=0.0),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    op.create_table(
+        "dashboard_recent_documents",
+        sa.Column("document_id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("filename", sa.String(255)),
+        sa.Column("vendor_name", sa.String(200), nullable=True),
+        sa.Column("amount", sa.Float, default=0.0),
+        sa.Column("payment_status", sa.String(20)),
+        sa.Column("gl_account_code", sa.String(20), nullable=True),
+        sa.Column("confidence", sa.Float, default=0.0),
+        sa.Column("billing_destination", sa.String(50), nullable=True),
+        sa.Column("processed_at", sa.DateTime),
+    )
+    op.create_index(
+        "ix_dashboard_recent_tenant_processed",
+        "dashboard_recent_documents",
+        ["tenant_id", "processed_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_dashboard_recent_tenant_processed",
+        table_name="dashboard_recent_documents",
+    )
+    op.drop_table("dashboard_recent_documents")
+    op.drop_table("dashboard_rollups")
@@ -0,0 +1,43 @@
+"""Add vendor_stats_documents table.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+
+What each processed document contributed to vendor_stats, so reprocessing
+a document replaces its contribution and deleting it takes it back out.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vendor_stats_documents",
+        sa.Column("document_id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("vendor_id", sa.String(36), nullable=False),
+        sa.Column("amount", sa.Float, default=0.0),
+        sa.Column("document_date", sa.DateTime, nullable=False),
+        sa.Column("gl_account_code", sa.String(50), nullable=True),
+        sa.Column("gl_account_name", sa.String(200), nullable=True),
+        sa.Column("payment_status", sa.String(50), nullable=True),
+    )
+    op.create_index(
+        "ix_vendor_stats_documents_vendor", "vendor_stats_documents", ["vendor_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_vendor_stats_documents_vendor", table_name="vendor_stats_documents"
+    )
+    op.drop_table("vendor_stats_documents")
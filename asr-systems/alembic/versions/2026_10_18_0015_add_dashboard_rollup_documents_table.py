@@ -0,0 +1,54 @@
+"""Add dashboard_rollup_documents table.
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18
+
+What each processed document contributed to dashboard_rollups, so
+reprocessing a document replaces its contribution and deleting it takes it
+back out.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0015"
+down_revision: Union[str, None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_rollup_documents",
+        sa.Column("document_id", sa.String(36), primary_key=True),
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("day", sa.String(10), nullable=False),
+        sa.Column("amount", sa.Float, default=0.0),
+        sa.Column("payment_status", sa.String(20)),
+        sa.Column("billing_destination", sa.String(50), nullable=True),
+        sa.Column("gl_account_code", sa.String(50), nullable=True),
+        sa.Column("gl_account_name", sa.String(200), nullable=True),
+        sa.Column("vendor_name", sa.String(200), nullable=True),
+        sa.Column("invoice_day", sa.String(10), nullable=True),
+        sa.Column("gl_confidence", sa.Float, default=0.0),
+        sa.Column("payment_confidence", sa.Float, default=0.0),
+        sa.Column("routing_confidence", sa.Float, default=0.0),
+        sa.Column("manual_review", sa.Integer, default=0),
+        sa.Column("processing_ms", sa.Float, default=0.0),
+    )
+    op.create_index(
+        "ix_dashboard_rollup_documents_tenant",
+        "dashboard_rollup_documents",
+        ["tenant_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_dashboard_rollup_documents_tenant",
+        table_name="dashboard_rollup_documents",
+    )
+    op.drop_table("dashboard_rollup_documents")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+ASR Audit Trail Writer Benchmark
+Simulates concurrent documents each emitting a handful of audit events and
+compares documents per second with per-row commits against the buffered
+writer's batched multi-row inserts on SQLite, including the final flush.
+
+Usage:
+    python benchmarks/bench_audit_writer.py [--documents 2000] [--events-per-document 4]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from config.database import close_database, init_database
+from services.audit_trail_service import AuditTrailService
+from shared.core.models import AuditTrailEntry
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditWriterBenchmarkResult:
+    """Audit writer benchmark result"""
+
+    documents: int
+    events: int
+    per_row_seconds: float
+    per_row_documents_per_second: float
+    batched_seconds: float
+    batched_documents_per_second: float
+    batched_flushes: int
+    speedup: float
+
+
+async def _process_document(
+    service: AuditTrailService, n: int, events_per_document: int
+) -> None:
+    for step in range(events_per_document):
+        await service.record(
+            AuditTrailEntry(
+                document_id=f"doc-{n:06d}",
+                event_type=f"stage_{step}",
+                event_data={"step": step, "destination": "open_payable"},
+                system_component="benchmark",
+                tenant_id=f"tenant-{n % 8}",
+            )
+        )
+
+
+async def _run(
+    documents: int, events_per_document: int, concurrency: int, **service_kwargs
+):
+    with tempfile.TemporaryDirectory() as tmp:
+        await init_database(f"sqlite:///{tmp}/bench.db")
+        try:
+            service = AuditTrailService(**service_kwargs)
+            await service.initialize()
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def one(n: int) -> None:
+                async with semaphore:
+                    await _process_document(service, n, events_per_document)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(n) for n in range(documents)))
+            await service.cleanup()  # counts the final flush
+            seconds = time.perf_counter() - start
+            stats = service.get_statistics()
+            assert stats["records_written"] == documents * events_per_document
+        finally:
+            await close_database()
+    return seconds, stats
+
+
+async def run_benchmark(
+    documents: int, events_per_document: int, concurrency: int, batch_size: int
+) -> AuditWriterBenchmarkResult:
+    per_row_seconds, _ = await _run(documents, events_per_document, concurrency)
+    batched_seconds, stats = await _run(
+        documents,
+        events_per_document,
+        concurrency,
+        buffered=True,
+        flush_batch_size=batch_size,
+        flush_interval_seconds=0.05,
+    )
+    per_row_rate = documents / per_row_seconds
+    batched_rate = documents / batched_seconds
+    return AuditWriterBenchmarkResult(
+        documents=documents,
+        events=documents * events_per_document,
+        per_row_seconds=per_row_seconds,
+        per_row_documents_per_second=per_row_rate,
+        batched_seconds=batched_seconds,
+        batched_documents_per_second=batched_rate,
+        batched_flushes=stats["flushes"],
+        speedup=batched_rate / max(per_row_rate, 1e-9),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--events-per-document", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    result = asyncio.run(
+        run_benchmark(
+            args.documents, args.events_per_document, args.concurrency, args.batch_size
+        )
+    )
+
+    logger.info("📊 Audit trail writer benchmark:")
+    logger.info(f"   • Documents: {result.documents} ({result.events} events)")
+    logger.info(
+        f"   • Per-row commits: {result.per_row_seconds:.2f}s "
+        f"({result.per_row_documents_per_second:,.0f} docs/s)"
+    )
+    logger.info(
+        f"   • Batched writer: {result.batched_seconds:.2f}s "
+        f"({result.batched_documents_per_second:,.0f} docs/s, "
+        f"{result.batched_flushes} flushes)"
+    )
+    logger.info(f"   • Throughput speedup: {result.speedup:.1f}x")
+    return asdict(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+ASR Server Cold-Start Budget Benchmark
+Launches the server entry points (start_server.py and main_server.py, plus a
+frozen PyInstaller executable when given) as fresh processes, times each one
+to its first 200 from /health/live, and fails when the median exceeds the
+budget. One extra run per source entry point records an import-time profile
+(PYTHONPROFILEIMPORTTIME) and reports the slowest imports.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 3] [--budget-seconds 5]
+    python benchmarks/bench_cold_start.py --executable \\
+        dist/ASR_Production_Server/ASR_Production_Server.exe \\
+        --frozen-budget-seconds 15
+"""
+
+import argparse
+import logging
+import os
+import re
+import socket
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ENTRY_POINTS = {
+    "start_server": [ROOT / "start_server.py"],
+    "main_server": [ROOT / "production_server" / "main_server.py"],
+}
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class ColdStartResult:
+    """Time to /health/live for one entry point"""
+
+    entry_point: str
+    runs: int
+    median_seconds: float
+    max_seconds: float
+    budget_seconds: float
+    within_budget: bool
+    slowest_imports: List[Dict[str, Any]]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _launch(
+    command: List[str], workdir: str, timeout: float, profile: bool = False
+) -> Dict[str, Any]:
+    """Start one server process and time it to its first healthy liveness probe."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT),
+        "API_HOST": "127.0.0.1",
+        "API_PORT": str(port),
+        "DEBUG": "true",
+        "ANTHROPIC_API_KEY": os.environ.get("ANTHROPIC_API_KEY", "bench-key"),
+        "DATABASE_URL": f"sqlite:///{workdir}/cold_start.db",
+        "STORAGE_BASE_PATH": str(Path(workdir) / "storage"),
+    }
+    if profile:
+        env["PYTHONPROFILEIMPORTTIME"] = "1"
+
+    url = f"http://127.0.0.1:{port}/health/live"
+    stderr_path = Path(workdir) / "stderr.log"
+    with open(stderr_path, "w+b") as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(  # nosec B603
+            command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=stderr
+        )
+        ready: Optional[float] = None
+        ready_bytes = 0
+        try:
+            while time.perf_counter() - start < timeout and proc.poll() is None:
+                try:
+                    with urllib.request.urlopen(url, timeout=1) as response:  # nosec
+                        if response.status == 200:
+                            ready = time.perf_counter() - start
+                            # Imports logged after this ran once live
+                            ready_bytes = stderr_path.stat().st_size
+                            break
+                except OSError:
+                    time.sleep(0.05)
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        stderr.seek(0)
+        raw = stderr.read()
+
+    if ready is None:
+        output = raw.decode("utf-8", errors="replace")
+        raise RuntimeError(
+            f"{' '.join(command)} was not live within {timeout:.0f}s:\n"
+            f"{output[-2000:]}"
+        )
+    return {
+        "ready_seconds": ready,
+        "stderr_until_ready": raw[:ready_bytes].decode("utf-8", errors="replace"),
+    }
+
+
+def _slowest_imports(stderr: str, top: int) -> List[Dict[str, Any]]:
+    """Top-level imports before the server was live, by cumulative time."""
+    imports = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match and not match.group(3):
+            imports.append(
+                {
+                    "module": match.group(4),
+                    "self_ms": int(match.group(1)) / 1000,
+                    "cumulative_ms": int(match.group(2)) / 1000,
+                }
+            )
+    imports.sort(key=lambda i: i["cumulative_ms"], reverse=True)
+    return imports[:top]
+
+
+def run_benchmark(
+    name: str,
+    command: List[str],
+    runs: int,
+    budget: float,
+    timeout: float,
+    profile: bool,
+    top: int,
+) -> ColdStartResult:
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            samples.append(_launch(command, workdir, timeout)["ready_seconds"])
+
+    slowest: List[Dict[str, Any]] = []
+    if profile:
+        with tempfile.TemporaryDirectory() as workdir:
+            profiled = _launch(command, workdir, timeout, profile=True)
+        slowest = _slowest_imports(profiled["stderr_until_ready"], top)
+
+    median = statistics.median(samples)
+    return ColdStartResult(
+        entry_point=name,
+        runs=runs,
+        median_seconds=median,
+        max_seconds=max(samples),
+        budget_seconds=budget,
+        within_budget=median <= budget,
+        slowest_imports=slowest,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget-seconds", type=float, default=5.0)
+    parser.add_argument("--executable", help="frozen server executable to time")
+    parser.add_argument("--frozen-budget-seconds", type=float, default=15.0)
+    parser.add_argument("--timeout-seconds", type=float, default=120.0)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--no-profile", action="store_true", help="skip the import-time profile"
+    )
+    args = parser.parse_args()
+
+    targets = [
+        (name, [sys.executable, str(script)], args.budget_seconds, True)
+        for name, (script,) in ENTRY_POINTS.items()
+    ]
+    if args.executable:
+        # Frozen builds ignore PYTHON* variables, so they are timed only
+        targets.append(
+            ("frozen", [args.executable], args.frozen_budget_seconds, False)
+        )
+
+    results = [
+        run_benchmark(
+            name,
+            command,
+            args.runs,
+            budget,
+            args.timeout_seconds,
+            profile and not args.no_profile,
+            args.top,
+        )
+        for name, command, budget, profile in targets
+    ]
+
+    logger.info("📊 Cold start to /health/live (median of %d runs):", args.runs)
+    for result in results:
+        verdict = "✅" if result.within_budget else "❌ over budget"
+        logger.info(
+            f"   • {result.entry_point}: {result.median_seconds:.2f}s "
+            f"(max {result.max_seconds:.2f}s, budget {result.budget_seconds:.1f}s) "
+            f"{verdict}"
+        )
+        for item in result.slowest_imports:
+            logger.info(
+                f"       {item['module']}: {item['cumulative_ms']:.0f}ms "
+                f"({item['self_ms']:.0f}ms self)"
+            )
+    return {
+        "within_budget": all(r.within_budget for r in results),
+        "results": [asdict(r) for r in results],
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main()["within_budget"] else 1)
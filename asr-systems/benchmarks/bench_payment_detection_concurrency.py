@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+ASR Payment Detection Concurrency Benchmark
+Compares p50/p99 detection latency and Claude call counts for the previous
+sequential method loop, concurrent execution, and concurrent execution with
+early-exit consensus.  Claude methods are replaced by stubs with randomized
+latency, so no API key or network access is needed.
+
+Usage:
+    python benchmarks/bench_payment_detection_concurrency.py [--documents 200] [--claude-ms 150]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import PaymentDetectionMethod, PaymentStatus
+
+from services.payment_detection_service import (
+    _CLAUDE_METHODS,
+    MethodResult,
+    PaymentDetectionService,
+)
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+ALL_METHODS = [m.value for m in PaymentDetectionMethod]
+
+CLEAR_DOCUMENTS = [
+    "PAID IN FULL check #{n} balance due: $0.00",
+    "Payment received, thank you. Zero balance. Ref #{n}",
+    "Invoice total due: ${n}.00 please remit by due date",
+    "VOID - cancelled invoice {n}",
+]
+AMBIGUOUS_DOCUMENTS = [
+    "Invoice {n} for services rendered",
+    "Statement {n} - see attached",
+]
+
+
+@dataclass
+class DetectionBenchmarkResult:
+    """Latency and Claude usage for one detection strategy"""
+
+    strategy: str
+    documents: int
+    p50_ms: float
+    p99_ms: float
+    claude_calls: int
+
+
+def _claude_stub(method: PaymentDetectionMethod, rng: random.Random, mean_ms: float):
+    async def _detect(*args, **kwargs):
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * mean_ms / 1000)
+        return MethodResult(
+            method=method,
+            payment_status=PaymentStatus.UNPAID,
+            confidence=0.85,
+            reasoning="stub",
+            details={},
+            processing_time=0.0,
+        )
+
+    return _detect
+
+
+async def _build(
+    early_exit: bool, claude_ms: float, seed: int
+) -> PaymentDetectionService:
+    service = PaymentDetectionService(
+        {"enabled": False},
+        ALL_METHODS,
+        early_exit_threshold=0.8 if early_exit else None,
+    )
+    await service.initialize()
+    rng = random.Random(seed)
+    service._detect_claude_vision = _claude_stub(  # type: ignore[method-assign]
+        PaymentDetectionMethod.CLAUDE_VISION, rng, claude_ms
+    )
+    service._detect_claude_text = _claude_stub(  # type: ignore[method-assign]
+        PaymentDetectionMethod.CLAUDE_TEXT, rng, claude_ms
+    )
+    return service
+
+
+async def _sequential_detect(
+    service: PaymentDetectionService, text: str, image: bytes
+) -> int:
+    """The pre-concurrency loop: await each enabled method in turn."""
+    results = []
+    calls = 0
+    for method in service.enabled_methods:
+        if method == PaymentDetectionMethod.CLAUDE_VISION:
+            results.append(await service._detect_claude_vision(image, text))
+        elif method == PaymentDetectionMethod.CLAUDE_TEXT:
+            results.append(await service._detect_claude_text(text))
+        elif method == PaymentDetectionMethod.REGEX_PATTERNS:
+            results.append(service._detect_regex_patterns(text))
+        elif method == PaymentDetectionMethod.KEYWORD_MATCHING:
+            results.append(service._detect_keywords(text))
+        else:
+            results.append(service._detect_amount_analysis(text, None))
+        calls += 1 if method in _CLAUDE_METHODS else 0
+    service._calculate_consensus(results)
+    return calls
+
+
+def _summarize(
+    strategy: str, timings: List[float], claude_calls: int
+) -> DetectionBenchmarkResult:
+    timings = sorted(timings)
+    return DetectionBenchmarkResult(
+        strategy=strategy,
+        documents=len(timings),
+        p50_ms=timings[len(timings) // 2] * 1000,
+        p99_ms=timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        claude_calls=claude_calls,
+    )
+
+
+async def run_benchmark(
+    documents: int, claude_ms: float
+) -> List[DetectionBenchmarkResult]:
+    rng = random.Random(7)
+    corpus = []
+    for n in range(documents):
+        templates = CLEAR_DOCUMENTS if rng.random() < 0.6 else AMBIGUOUS_DOCUMENTS
+        corpus.append(rng.choice(templates).format(n=n + 100))
+    image = b"fake-image-bytes"
+
+    results = []
+
+    sequential = await _build(early_exit=False, claude_ms=claude_ms, seed=1)
+    timings, calls = [], 0
+    for text in corpus:
+        start = time.perf_counter()
+        calls += await _sequential_detect(sequential, text, image)
+        timings.append(time.perf_counter() - start)
+    results.append(_summarize("sequential (before)", timings, calls))
+
+    for label, early_exit in (("concurrent", False), ("concurrent + early exit", True)):
+        service = await _build(early_exit=early_exit, claude_ms=claude_ms, seed=1)
+        timings = []
+        for text in corpus:
+            start = time.perf_counter()
+            await service.detect_payment_status(text, document_image=image)
+            timings.append(time.perf_counter() - start)
+        results.append(
+            _summarize(label, timings, service.get_statistics()["claude_calls"])
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--claude-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.documents, args.claude_ms))
+
+    logger.info(
+        f"📊 Payment detection benchmark ({args.documents} documents, "
+        f"Claude stub ~{args.claude_ms:.0f} ms):"
+    )
+    for r in results:
+        logger.info(
+            f"   • {r.strategy}: p50 {r.p50_ms:.1f} ms, p99 {r.p99_ms:.1f} ms, "
+            f"{r.claude_calls} Claude calls"
+        )
+    return [asdict(r) for r in results]
+
+
+if __name__ == "__main__":
+    main()
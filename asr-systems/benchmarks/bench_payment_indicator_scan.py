@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+ASR Payment Indicator Scan Benchmark
+Compares the single-pass combined indicator scanner against the previous
+per-pattern regex searches plus lowercase keyword scan on synthetic OCR
+dumps, and checks that both produce the same per-category counts.
+
+Usage:
+    python benchmarks/bench_payment_indicator_scan.py [--size-mb 1] [--rounds 5]
+"""
+
+import argparse
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.constants import PAYMENT_INDICATORS
+
+from services.payment_indicator_scanner import (
+    EXTRA_PATTERNS,
+    KEYWORD_KIND,
+    PATTERN_KIND,
+    PAYMENT_CATEGORIES,
+    PaymentIndicatorScanner,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OCR_LINES = [
+    "INVOICE #{n}   DATE: 0{m}/1{m}/2026   TERMS: NET 30",
+    "Qty {m}  Lumber 2x4x8 SPF #2           @ ${n}.{m}0   ${n}.00",
+    "Ship To: {n} Industrial Pkwy, Suite {m}",
+    "Subtotal        ${n}.00   Tax  ${m}.50",
+    "Thank you for your business! Remit to P.O. Box {n}",
+    "l0t  {n}  reference  --  each  unit  S/N {n}{m}",
+    "Page {m} of 9   Customer acct {n}",
+    "B@lance Due: ${n}.00  Due Date: 0{m}/30/2026",
+    "Payment received - check #{n}  PAID IN FULL",
+    "CREDIT MEMO {n} applied to account",
+]
+
+
+@dataclass
+class ScanBenchmarkResult:
+    """Timing for one OCR dump size"""
+
+    size_bytes: int
+    per_pattern_ms: float
+    single_pass_ms: float
+    speedup: float
+    counts_match: bool
+
+
+def _ocr_dump(size: int, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    total = 0
+    while total < size:
+        line = rng.choice(OCR_LINES).format(
+            n=rng.randint(100, 99999), m=rng.randint(1, 9)
+        )
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def _compile_per_pattern() -> Dict[str, List[re.Pattern]]:
+    """The previous implementation: one IGNORECASE pattern per indicator."""
+    compiled = {}
+    for category in PAYMENT_CATEGORIES:
+        keywords = PAYMENT_INDICATORS[f"{category.upper()}_KEYWORDS"]
+        compiled[category] = [
+            re.compile(rf"\b{re.escape(k)}\b", re.IGNORECASE) for k in keywords
+        ] + [
+            re.compile(rf"\b(?:{'|'.join(leads)}){tail}", re.IGNORECASE)
+            for leads, tail in EXTRA_PATTERNS[category]
+        ]
+    return compiled
+
+
+def _per_pattern_counts(text: str, compiled) -> Tuple[Dict[str, int], Dict[str, int]]:
+    patterns = {c: sum(1 for p in compiled[c] if p.search(text)) for c in compiled}
+    lowered = text.lower()
+    keywords = {
+        c: sum(
+            1
+            for k in PAYMENT_INDICATORS[f"{c.upper()}_KEYWORDS"]
+            if k.lower() in lowered
+        )
+        for c in compiled
+    }
+    return patterns, keywords
+
+
+def _time(fn, rounds: int) -> Tuple[float, object]:
+    timings, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def run_benchmark(size_mb: float, rounds: int) -> ScanBenchmarkResult:
+    text = _ocr_dump(int(size_mb * 1024 * 1024))
+    compiled = _compile_per_pattern()
+    scanner = PaymentIndicatorScanner()
+
+    legacy_s, legacy = _time(lambda: _per_pattern_counts(text, compiled), rounds)
+
+    def single_pass():
+        scan = scanner.scan(text)
+        return scan.counts(PATTERN_KIND), scan.counts(KEYWORD_KIND)
+
+    single_s, single = _time(single_pass, rounds)
+    return ScanBenchmarkResult(
+        size_bytes=len(text),
+        per_pattern_ms=legacy_s * 1000,
+        single_pass_ms=single_s * 1000,
+        speedup=legacy_s / single_s if single_s else 0.0,
+        counts_match=legacy == single,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    result = run_benchmark(args.size_mb, args.rounds)
+
+    logger.info(f"📊 Payment indicator scan ({result.size_bytes:,} byte OCR dump):")
+    logger.info(f"   • Per-pattern searches: {result.per_pattern_ms:.1f} ms")
+    logger.info(f"   • Single-pass scan:     {result.single_pass_ms:.1f} ms")
+    logger.info(f"   • Speedup: {result.speedup:.1f}x")
+    logger.info(f"   • Counts match: {'✅' if result.counts_match else '❌'}")
+    return asdict(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+ASR Claude Prompt Compaction Evaluation
+Checks that relevance-windowed compaction keeps payment status accuracy
+unchanged while reducing the median prompt size. Labelled multi-page
+statements are classified from the full text, the compacted excerpt, and a
+head-truncated excerpt of the same budget. Offline runs use the local
+detection methods as the classifier; --live sends every variant to Claude.
+
+Usage:
+    python benchmarks/bench_prompt_compaction.py [--documents 200] [--budget 2000] [--live]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import PaymentStatus
+
+from services.claude_prompt_builder import (
+    CHARS_PER_TOKEN,
+    compact_document_text,
+    estimate_tokens,
+)
+from services.payment_detection_service import PaymentDetectionService
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+LINES_PER_PAGE = 50
+
+DECISIVE_LINES = {
+    PaymentStatus.PAID: [
+        "Payment received - check #{n}  PAID IN FULL",
+        "Balance due: $0.00   Zero balance - thank you",
+    ],
+    PaymentStatus.UNPAID: [
+        "BALANCE DUE: ${amount}   Please remit by due date",
+        "Total due: ${amount}  - account is overdue",
+    ],
+    PaymentStatus.PARTIAL: [
+        "Partial payment received ${amount}; balance remaining ${amount}",
+    ],
+    PaymentStatus.VOID: [
+        "VOID - this invoice has been cancelled, credit memo issued",
+    ],
+}
+
+FILLER_LINES = [
+    "{n:05d}  2x4x8 SPF stud grade              qty {q:>3}   ea",
+    "{n:05d}  Drywall screws 1-5/8 (box)         qty {q:>3}   bx",
+    "{n:05d}  Delivery to jobsite, lot {q}          1      ls",
+    "Ship to: {n} Industrial Parkway, Suite {q}",
+    "Page footer - customer copy - ref {n}",
+]
+
+
+@dataclass
+class CompactionEvalResult:
+    """Accuracy and prompt size for one prompt strategy"""
+
+    strategy: str
+    documents: int
+    accuracy: float
+    median_tokens: int
+    p90_tokens: int
+
+
+def _corpus(documents: int, seed: int = 3) -> List[Tuple[str, PaymentStatus]]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(documents):
+        label = rng.choice(list(DECISIVE_LINES))
+        pages = rng.choice([1, 2, 5, 10, 20, 40])
+        lines = [
+            rng.choice(FILLER_LINES).format(
+                n=rng.randint(1, 99999), q=rng.randint(1, 99)
+            )
+            for _ in range(pages * LINES_PER_PAGE)
+        ]
+        amount = f"{rng.randint(100, 9999)}.{rng.randint(0, 99):02d}"
+        decisive = rng.choice(DECISIVE_LINES[label]).format(
+            n=rng.randint(1000, 9999), amount=amount
+        )
+        lines.insert(rng.randrange(len(lines) + 1), decisive)
+        corpus.append(("ACME SUPPLY CO - STATEMENT\n" + "\n".join(lines), label))
+    return corpus
+
+
+def _head(text: str, budget: int) -> str:
+    return text[: budget * CHARS_PER_TOKEN]
+
+
+async def _local_classifier() -> Callable[[str], Awaitable[PaymentStatus]]:
+    service = PaymentDetectionService(
+        {"enabled": False},
+        ["regex_patterns", "keyword_matching", "amount_analysis"],
+    )
+    await service.initialize()
+
+    async def classify(text: str) -> PaymentStatus:
+        consensus = await service.detect_payment_status(text)
+        return consensus.payment_status
+
+    return classify
+
+
+async def _claude_classifier() -> Callable[[str], Awaitable[PaymentStatus]]:
+    try:
+        from config.production_settings import production_settings
+    except Exception:  # pragma: no cover - settings need a configured env
+        raise SystemExit("--live needs the production settings environment")
+    service = PaymentDetectionService(
+        production_settings.get_claude_config(), ["claude_text"]
+    )
+    await service.initialize()
+    if not service.claude_client:
+        raise SystemExit("--live needs ANTHROPIC_API_KEY and the anthropic SDK")
+    # No budget: each strategy already chose the text to send
+    service.text_token_budget = None
+
+    async def classify(text: str) -> PaymentStatus:
+        result = await service._detect_claude_text(text)
+        return result.payment_status
+
+    return classify
+
+
+async def run_evaluation(
+    documents: int, budget: int, live: bool
+) -> List[CompactionEvalResult]:
+    corpus = _corpus(documents)
+    classify = await (_claude_classifier() if live else _local_classifier())
+    scanner_service = PaymentDetectionService({"enabled": False}, [])
+    await scanner_service.initialize()
+
+    strategies: Dict[str, Callable[[str], str]] = {
+        "full text": lambda text: text,
+        "compacted": lambda text: compact_document_text(
+            text, scanner_service._scan_indicators(text), budget
+        ).text,
+        "head truncated": lambda text: _head(text, budget),
+    }
+
+    results = []
+    for name, build in strategies.items():
+        correct = 0
+        tokens = []
+        for text, label in corpus:
+            sent = build(text)
+            tokens.append(estimate_tokens(sent))
+            correct += 1 if await classify(sent) == label else 0
+        tokens.sort()
+        results.append(
+            CompactionEvalResult(
+                strategy=name,
+                documents=len(corpus),
+                accuracy=correct / len(corpus),
+                median_tokens=int(statistics.median(tokens)),
+                p90_tokens=tokens[int(len(tokens) * 0.9) - 1],
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        default=bool(os.environ.get("ASR_EVAL_LIVE")),
+        help="Classify with Claude instead of the local methods",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run_evaluation(args.documents, args.budget, args.live))
+
+    classifier = "Claude" if args.live else "local methods"
+    logger.info(
+        f"📊 Prompt compaction evaluation ({args.documents} documents, "
+        f"budget {args.budget} tokens, classifier: {classifier}):"
+    )
+    for r in results:
+        logger.info(
+            f"   • {r.strategy}: accuracy {r.accuracy:.1%}, "
+            f"median {r.median_tokens} tokens, p90 {r.p90_tokens} tokens"
+        )
+    return [asdict(r) for r in results]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ASR Server Startup Benchmark
+Measures cold-start time to readiness, each run in a fresh interpreter, for
+the previous strictly sequential initialization (warmups inline, create_all
+always) against the dependency-aware startup plan (concurrent steps,
+deferred warmups, create_all skipped on a migrated database), and breaks
+the parallel startup down by step and critical path.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).parent.parent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_RESULT_PREFIX = "STARTUP_RESULT "
+
+MODES = {
+    "sequential": {
+        "STARTUP_PARALLEL_ENABLED": "false",
+        "STARTUP_DEFER_WARMUPS": "false",
+        "DB_SKIP_CREATE_ALL_WHEN_CURRENT": "false",
+    },
+    "parallel": {
+        "STARTUP_PARALLEL_ENABLED": "true",
+        "STARTUP_DEFER_WARMUPS": "true",
+        "DB_SKIP_CREATE_ALL_WHEN_CURRENT": "true",
+    },
+}
+
+
+@dataclass
+class StartupBenchmarkResult:
+    """Server startup benchmark result"""
+
+    runs: int
+    import_seconds: float
+    sequential_ready_seconds: float
+    parallel_ready_seconds: float
+    speedup: float
+    create_all: str
+    critical_path: List[str]
+    slowest_steps: List[Dict[str, Any]]
+    deferred: List[str]
+
+
+def _child() -> None:
+    """One cold start: import the app, run lifespan startup, report timings."""
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(ROOT / "shared"))
+    sys.path.insert(0, str(ROOT / "production_server"))
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    import production_server.api.main as main_module
+
+    imported = time.perf_counter()
+
+    async def run() -> Dict[str, Any]:
+        ready_start = time.perf_counter()
+        async with main_module.lifespan(main_module.app):
+            ready = time.perf_counter() - ready_start
+            timings = main_module._startup_plan.get_timings()
+            schema = main_module.get_schema_status()
+        return {"ready_seconds": ready, "timings": timings, "schema": schema}
+
+    result = asyncio.run(run())
+    result["import_seconds"] = imported - start
+    print(_RESULT_PREFIX + json.dumps(result))
+
+
+def _cold_start(mode: str, database_url: str, storage: str) -> Dict[str, Any]:
+    env = {
+        **os.environ,
+        **MODES[mode],
+        "DATABASE_URL": database_url,
+        "STORAGE_BASE_PATH": storage,
+    }
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, __file__, "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX) :])
+    raise RuntimeError(f"{mode} startup produced no result:\n{proc.stderr[-2000:]}")
+
+
+def _migrate(database_url: str) -> None:
+    # Out of process, as in the container entrypoint
+    subprocess.run(  # nosec B603
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": database_url},
+        capture_output=True,
+        check=True,
+    )
+
+
+def run_benchmark(runs: int) -> StartupBenchmarkResult:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/bench.db"
+        _migrate(database_url)  # deployments run migrations before the server
+
+        samples: Dict[str, List[Dict[str, Any]]] = {mode: [] for mode in MODES}
+        for _ in range(runs):
+            for mode in MODES:
+                samples[mode].append(_cold_start(mode, database_url, tmp))
+
+    def median(mode: str, key: str) -> float:
+        return statistics.median(s[key] for s in samples[mode])
+
+    parallel = samples["parallel"][-1]
+    steps = sorted(
+        parallel["timings"]["steps"], key=lambda s: s["duration_ms"], reverse=True
+    )
+    sequential_ready = median("sequential", "ready_seconds")
+    parallel_ready = median("parallel", "ready_seconds")
+    return StartupBenchmarkResult(
+        runs=runs,
+        import_seconds=median("parallel", "import_seconds"),
+        sequential_ready_seconds=sequential_ready,
+        parallel_ready_seconds=parallel_ready,
+        speedup=sequential_ready / max(parallel_ready, 1e-9),
+        create_all=parallel["schema"].get("create_all", "unknown"),
+        critical_path=parallel["timings"]["critical_path"],
+        slowest_steps=[
+            {"name": s["name"], "start_ms": s["start_ms"], "ms": s["duration_ms"]}
+            for s in steps[:5]
+        ],
+        deferred=[s["name"] for s in parallel["timings"]["deferred"]],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return None
+
+    result = run_benchmark(args.runs)
+
+    logger.info(
+        "📊 Server startup benchmark (median of %d cold starts):", result.runs
+    )
+    logger.info(f"   • Module import: {result.import_seconds:.2f}s")
+    logger.info(
+        f"   • Sequential startup to ready: {result.sequential_ready_seconds:.2f}s"
+    )
+    logger.info(
+        f"   • Parallel startup to ready: {result.parallel_ready_seconds:.2f}s "
+        f"({result.speedup:.1f}x, create_all {result.create_all})"
+    )
+    logger.info(f"   • Critical path: {' → '.join(result.critical_path)}")
+    for step in result.slowest_steps:
+        logger.info(
+            f"   • {step['name']}: {step['ms']:.1f}ms (from {step['start_ms']:.1f}ms)"
+        )
+    logger.info(f"   • Deferred until ready: {', '.join(result.deferred) or 'none'}")
+    return asdict(result)
+
+
+if __name__ == "__main__":
+    main()
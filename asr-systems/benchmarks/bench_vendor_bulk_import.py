@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+ASR Vendor Bulk Import Benchmark
+Times a streamed CSV vendor import (create, then merge-update) through the
+single-transaction bulk path on SQLite, and compares throughput with the
+previous per-row create/update/list path on a smaller sample.
+
+Usage:
+    python benchmarks/bench_vendor_bulk_import.py [--rows 100000] [--legacy-rows 1000]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from config.database import close_database, init_database
+from services.vendor_import_export import VendorImportExportService
+from services.vendor_service import VendorService
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkImportBenchmarkResult:
+    """Bulk import benchmark result"""
+
+    rows: int
+    create_seconds: float
+    merge_seconds: float
+    rows_per_second: float
+    peak_memory_mib: float
+    legacy_rows: int
+    legacy_seconds: float
+    legacy_rows_per_second: float
+    speedup: float
+
+
+def _csv_file(rows: int, note: str) -> io.BytesIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["name", "display_name", "aliases", "payment_terms_days", "notes"])
+    for i in range(rows):
+        writer.writerow(
+            [f"Vendor {i:06d}", f"Vendor {i:06d} Inc", f"V{i:06d}", 30, note]
+        )
+    return io.BytesIO(buf.getvalue().encode("utf-8"))
+
+
+async def _legacy_import(service: VendorService, rows: list, tenant_id: str) -> None:
+    """The pre-bulk import loop: per-row create + list + update."""
+    existing = await service.list_vendors(tenant_id=tenant_id)
+    name_map = {v["name"].lower(): v for v in existing}
+    for row in rows:
+        name = row["name"]
+        current = name_map.get(name.lower())
+        if current:
+            await service.update_vendor(current["id"], row, tenant_id=tenant_id)
+            continue
+        await service.create_vendor(
+            name=name, tenant_id=tenant_id, display_name=row["display_name"]
+        )
+        vendor_list = await service.list_vendors(tenant_id=tenant_id)
+        new_vendor = next(
+            (v for v in vendor_list if v["name"].lower() == name.lower()), None
+        )
+        if new_vendor:
+            await service.update_vendor(
+                new_vendor["id"],
+                {"aliases": row["aliases"], "payment_terms_days": 30},
+                tenant_id=tenant_id,
+            )
+
+
+async def run_benchmark(rows: int, legacy_rows: int) -> BulkImportBenchmarkResult:
+    with tempfile.TemporaryDirectory() as tmp:
+        await init_database(f"sqlite:///{tmp}/bench.db")
+        try:
+            service = VendorService()
+            await service.initialize()
+            importer = VendorImportExportService(service)
+
+            create_file = _csv_file(rows, "created")
+            tracemalloc.start()
+            start = time.perf_counter()
+            created = await importer.import_vendors_file(
+                create_file, "csv", mode="merge", tenant_id="bench"
+            )
+            create_seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            merge_file = _csv_file(rows, "merged")
+            start = time.perf_counter()
+            merged = await importer.import_vendors_file(
+                merge_file, "csv", mode="merge", tenant_id="bench"
+            )
+            merge_seconds = time.perf_counter() - start
+            assert created["created"] == rows and merged["updated"] == rows
+
+            legacy = [
+                {
+                    "name": f"Legacy {i:06d}",
+                    "display_name": f"Legacy {i:06d} Inc",
+                    "aliases": [f"L{i:06d}"],
+                }
+                for i in range(legacy_rows)
+            ]
+            start = time.perf_counter()
+            await _legacy_import(service, legacy, "legacy")
+            legacy_seconds = time.perf_counter() - start
+        finally:
+            await close_database()
+
+    rows_per_second = rows / create_seconds
+    legacy_rate = legacy_rows / max(legacy_seconds, 1e-9)
+    return BulkImportBenchmarkResult(
+        rows=rows,
+        create_seconds=create_seconds,
+        merge_seconds=merge_seconds,
+        rows_per_second=rows_per_second,
+        peak_memory_mib=peak / (1024 * 1024),
+        legacy_rows=legacy_rows,
+        legacy_seconds=legacy_seconds,
+        legacy_rows_per_second=legacy_rate,
+        speedup=rows_per_second / max(legacy_rate, 1e-9),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--legacy-rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.rows, args.legacy_rows))
+
+    logger.info("📊 Vendor bulk import benchmark:")
+    logger.info(f"   • Rows: {result.rows}")
+    logger.info(
+        f"   • Bulk create: {result.create_seconds:.2f}s "
+        f"({result.rows_per_second:,.0f} rows/s, peak {result.peak_memory_mib:.1f} MiB)"
+    )
+    logger.info(f"   • Bulk merge-update: {result.merge_seconds:.2f}s")
+    logger.info(
+        f"   • Legacy per-row path ({result.legacy_rows} rows): "
+        f"{result.legacy_seconds:.2f}s ({result.legacy_rows_per_second:,.0f} rows/s)"
+    )
+    logger.info(f"   • Throughput speedup: {result.speedup:.0f}x")
+    return asdict(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+ASR Vendor Export Streaming Benchmark
+Compares peak memory and time-to-first-byte of the keyset-paginated CSV
+export stream against the buffered list_vendors + StringIO export at
+increasing tenant sizes.
+
+Usage:
+    python benchmarks/bench_vendor_export_stream.py [--sizes 10000 50000]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from config.database import close_database, init_database
+from services.vendor_import_export import VendorImportExportService
+from services.vendor_service import VendorService
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportBenchmarkResult:
+    """Export benchmark result for one tenant size"""
+
+    vendors: int
+    buffered_seconds: float
+    buffered_peak_mib: float
+    stream_seconds: float
+    stream_first_chunk_ms: float
+    stream_peak_mib: float
+
+
+async def _measure_buffered(exporter: VendorImportExportService) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    await exporter.export_vendors_csv("bench")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def _measure_stream(exporter: VendorImportExportService) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_chunk_ms = None
+    async for chunk in exporter.stream_vendors_csv("bench"):
+        if first_chunk_ms is None and chunk.count("\n") > 1:
+            first_chunk_ms = (time.perf_counter() - start) * 1000
+        del chunk  # a real client consumes and discards each chunk
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, first_chunk_ms or 0.0, peak
+
+
+async def run_benchmark(sizes: List[int]) -> List[ExportBenchmarkResult]:
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            await init_database(f"sqlite:///{tmp}/bench.db")
+            try:
+                service = VendorService()
+                await service.initialize()
+                exporter = VendorImportExportService(service)
+                await service.bulk_import(
+                    (
+                        [
+                            {
+                                "name": f"Vendor {i:06d}",
+                                "aliases": [f"V{i:06d}"],
+                                "notes": "x" * 64,
+                            }
+                            for i in range(n, min(n + 5000, size))
+                        ]
+                        for n in range(0, size, 5000)
+                    ),
+                    mode="merge",
+                    tenant_id="bench",
+                )
+
+                buffered_seconds, buffered_peak = await _measure_buffered(exporter)
+                stream_seconds, first_ms, stream_peak = await _measure_stream(exporter)
+            finally:
+                await close_database()
+
+        results.append(
+            ExportBenchmarkResult(
+                vendors=size,
+                buffered_seconds=buffered_seconds,
+                buffered_peak_mib=buffered_peak / (1024 * 1024),
+                stream_seconds=stream_seconds,
+                stream_first_chunk_ms=first_ms,
+                stream_peak_mib=stream_peak / (1024 * 1024),
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.sizes))
+
+    logger.info("📊 Vendor export streaming benchmark (CSV):")
+    for r in results:
+        logger.info(f"   • {r.vendors} vendors")
+        logger.info(
+            f"     - Buffered: {r.buffered_seconds:.2f}s, "
+            f"peak {r.buffered_peak_mib:.1f} MiB"
+        )
+        logger.info(
+            f"     - Streamed: {r.stream_seconds:.2f}s, first rows after "
+            f"{r.stream_first_chunk_ms:.1f} ms, peak {r.stream_peak_mib:.1f} MiB"
+        )
+    return [asdict(r) for r in results]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+ASR Claude Vision Image Preprocessing Benchmark
+Measures bytes uploaded to Claude Vision before and after preprocessing for
+typical scans (300 DPI TIFF, large PNG, phone JPEG, multi-page PDF), and
+preparation throughput with and without the process pool.
+
+Usage:
+    python benchmarks/bench_vision_preprocessing.py [--documents 24] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List
+
+# Add shared modules to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from PIL import Image, ImageDraw
+
+from services.image_preprocessor import ImagePreprocessorService, prepare_image
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger("services").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SizeResult:
+    """Upload size for one source format"""
+
+    source: str
+    original_bytes: int
+    sent_bytes: int
+    media_type: str
+    dimensions: str
+
+
+@dataclass
+class ThroughputResult:
+    """Preparation throughput for one executor configuration"""
+
+    executor: str
+    documents: int
+    total_seconds: float
+    documents_per_second: float
+
+
+def _page(seed: int, size=(2550, 3300)) -> Image.Image:
+    """A letter page at 300 DPI: paper grain plus lines of 'text'."""
+    page = Image.merge(
+        "RGB", [Image.effect_noise(size, 12).point(lambda v: 200 + v // 5)] * 3
+    )
+    draw = ImageDraw.Draw(page)
+    for line in range(60):
+        y = 200 + line * 48
+        width = 600 + (seed * 97 + line * 131) % 1500
+        draw.rectangle((200, y, 200 + width, y + 18), fill=(30, 30, 30))
+    return page
+
+
+def _encode(image: Image.Image, fmt: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def _sources(seed: int = 0) -> Dict[str, bytes]:
+    pages = [_page(seed + n) for n in range(3)]
+    return {
+        "300 DPI TIFF": _encode(pages[0], "TIFF", compression="tiff_lzw"),
+        "300 DPI PNG": _encode(pages[0], "PNG"),
+        "phone JPEG (4032x3024)": _encode(
+            pages[0].resize((3024, 4032)), "JPEG", quality=92
+        ),
+        "3-page PDF": _encode(
+            pages[0], "PDF", resolution=300, save_all=True, append_images=pages[1:]
+        ),
+    }
+
+
+def measure_sizes() -> List[SizeResult]:
+    results = []
+    for source, content in _sources().items():
+        prepared = prepare_image(content)
+        results.append(
+            SizeResult(
+                source=source,
+                original_bytes=len(content),
+                sent_bytes=len(prepared.data) if prepared else 0,
+                media_type=prepared.media_type if prepared else "-",
+                dimensions=f"{prepared.width}x{prepared.height}" if prepared else "-",
+            )
+        )
+    return results
+
+
+async def measure_throughput(documents: int, workers: int) -> List[ThroughputResult]:
+    corpus = [
+        _encode(_page(seed), "TIFF", compression="tiff_lzw")
+        for seed in range(documents)
+    ]
+    results = []
+    for label, max_workers in (("thread", 0), (f"{workers} processes", workers)):
+        service = ImagePreprocessorService(max_workers=max_workers)
+        await service.initialize()
+        start = time.perf_counter()
+        await asyncio.gather(*(service.prepare(content) for content in corpus))
+        elapsed = time.perf_counter() - start
+        await service.cleanup()
+        results.append(
+            ThroughputResult(
+                executor=label,
+                documents=documents,
+                total_seconds=round(elapsed, 3),
+                documents_per_second=round(documents / elapsed, 2),
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    sizes = measure_sizes()
+    logger.info("📊 Vision upload size per source:")
+    for r in sizes:
+        logger.info(
+            f"   • {r.source}: {r.original_bytes / 1024:.0f} KiB -> "
+            f"{r.sent_bytes / 1024:.0f} KiB {r.media_type} {r.dimensions} "
+            f"({r.sent_bytes / r.original_bytes:.1%})"
+        )
+
+    throughput = asyncio.run(measure_throughput(args.documents, args.workers))
+    logger.info(f"📊 Preparation throughput ({args.documents} TIFF scans):")
+    for t in throughput:
+        logger.info(
+            f"   • {t.executor}: {t.total_seconds:.2f}s, "
+            f"{t.documents_per_second:.1f} documents/s"
+        )
+    return {
+        "sizes": [asdict(r) for r in sizes],
+        "throughput": [asdict(t) for t in throughput],
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -128,7 +128,7 @@ a = Analysis(
         'psycopg2',
         'aiosqlite',
 
-        # AI Services
+        # AI Services (anthropic is imported on first use via importlib)
         'anthropic',
         'openai',
 
@@ -208,7 +208,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed binaries are unpacked on every launch, slowing cold start
+    upx=False,
     console=True,  # Keep console for server monitoring
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -224,7 +225,7 @@ coll = COLLECT(
     a.binaries,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='ASR_Production_Server'
 )
@@ -21,9 +21,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import Depends, FastAPI, File, HTTPException, UploadFile, status
+from fastapi import Depends, FastAPI, File, HTTPException, Query, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared"))
@@ -36,11 +36,13 @@ from shared.api.schemas import (
     AuthLoginRequestSchema,
     AuthLoginResponseSchema,
     AuthMeResponseSchema,
+    BatchReprocessRequestSchema,
     ClassificationResponseSchema,
     DeleteDocumentResponseSchema,
     DocumentUploadResponseSchema,
     GLAccountCreateRequestSchema,
     GLAccountUpdateRequestSchema,
+    GLClassificationOverrideRequestSchema,
     ScannerHeartbeatSchema,
     ScannerRegistrationSchema,
     SettingsResponseSchema,
@@ -146,28 +148,107 @@ except (ImportError, SystemError):
     )
 
 try:
-    from ..api.dashboard_routes import register_dashboard_routes
+    from ..api.dashboard_routes import (
+        register_dashboard_routes,
+        set_dashboard_service,
+    )
+    from ..services.dashboard_rollup_service import DashboardRollupService
+    from ..utils.response_cache import SingleFlightCache
 except (ImportError, SystemError):
-    from api.dashboard_routes import register_dashboard_routes  # type: ignore[no-redef]
+    from utils.response_cache import SingleFlightCache  # type: ignore[no-redef]
+
+    from api.dashboard_routes import (  # type: ignore[no-redef]
+        register_dashboard_routes,
+        set_dashboard_service,
+    )
+    from services.dashboard_rollup_service import (  # type: ignore[no-redef]
+        DashboardRollupService,
+    )
+
+try:
+    from ..services.health_monitor_service import HealthMonitorService
+    from ..utils.startup import StartupPlan
+except (ImportError, SystemError):
+    from utils.startup import StartupPlan  # type: ignore[no-redef]
+
+    from services.health_monitor_service import (  # type: ignore[no-redef]
+        HealthMonitorService,
+    )
 
 try:
     from ..config.database import (
         check_database_connectivity,
         close_database,
+        get_schema_status,
         init_database,
     )
 except (ImportError, SystemError):
     from config.database import (  # type: ignore[no-redef]
         check_database_connectivity,
         close_database,
+        get_schema_status,
         init_database,
     )
 
 try:
+    from ..services.audit_aggregation_service import AuditAggregationService
+    from ..services.audit_archive_service import AuditArchiveService
+    from ..services.audit_retention_service import AuditRetentionService
     from ..services.audit_trail_service import AuditTrailService
 except (ImportError, SystemError):
+    from services.audit_aggregation_service import (  # type: ignore[no-redef]
+        AuditAggregationService,
+    )
+    from services.audit_archive_service import (  # type: ignore[no-redef]
+        AuditArchiveService,
+    )
+    from services.audit_retention_service import (  # type: ignore[no-redef]
+        AuditRetentionService,
+    )
     from services.audit_trail_service import AuditTrailService  # type: ignore[no-redef]
 
+try:
+    from ..services.classification_cache_service import ClassificationCacheService
+except (ImportError, SystemError):
+    from services.classification_cache_service import (  # type: ignore[no-redef]
+        ClassificationCacheService,
+    )
+
+try:
+    from ..services.claude_batch_service import ClaudeBatchService
+except (ImportError, SystemError):
+    from services.claude_batch_service import (  # type: ignore[no-redef]
+        ClaudeBatchService,
+    )
+
+try:
+    from ..services.claude_client_service import ClaudeClientService
+except (ImportError, SystemError):
+    from services.claude_client_service import (  # type: ignore[no-redef]
+        ClaudeClientService,
+    )
+
+try:
+    from ..services.claude_usage_service import ClaudeUsageService
+except (ImportError, SystemError):
+    from services.claude_usage_service import (  # type: ignore[no-redef]
+        ClaudeUsageService,
+    )
+
+try:
+    from ..services.claude_response_cache_service import ClaudeResponseCacheService
+except (ImportError, SystemError):
+    from services.claude_response_cache_service import (  # type: ignore[no-redef]
+        ClaudeResponseCacheService,
+    )
+
+try:
+    from ..services.image_preprocessor import ImagePreprocessorService
+except (ImportError, SystemError):
+    from services.image_preprocessor import (  # type: ignore[no-redef]
+        ImagePreprocessorService,
+    )
+
 try:
     from ..services.vendor_service import VendorService
 except (ImportError, SystemError):
@@ -214,8 +295,21 @@ document_processor_service: Optional[DocumentProcessorService] = None
 storage_service: Optional[ProductionStorageService] = None
 scanner_manager_service: Optional[ScannerManagerService] = None
 audit_trail_service: Optional[AuditTrailService] = None
+audit_retention_service: Optional[AuditRetentionService] = None
+audit_archive_service: Optional[AuditArchiveService] = None
+audit_aggregation_service: Optional[AuditAggregationService] = None
+dashboard_rollup_service: Optional[DashboardRollupService] = None
+dashboard_cache: Optional[SingleFlightCache] = None
+health_monitor_service: Optional[HealthMonitorService] = None
+_startup_plan: Optional[StartupPlan] = None
 vendor_service: Optional[VendorService] = None
 vendor_import_export_service: Optional[VendorImportExportService] = None
+classification_cache_service: Optional[ClassificationCacheService] = None
+claude_response_cache_service: Optional[ClaudeResponseCacheService] = None
+image_preprocessor_service: Optional[ImagePreprocessorService] = None
+claude_client_service: Optional[ClaudeClientService] = None
+claude_batch_service: Optional[ClaudeBatchService] = None
+claude_usage_service: Optional[ClaudeUsageService] = None
 
 # Per-tenant upload quota tracking: {tenant_id: deque of upload timestamps}
 _upload_timestamps: Dict[str, collections.deque] = {}
@@ -243,122 +337,488 @@ def _check_upload_quota(tenant_id: str) -> None:
     dq.append(now)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan manager with sophisticated component initialization"""
-    global gl_account_service, payment_detection_service, billing_router_service
-    global document_processor_service, storage_service, scanner_manager_service
-    global audit_trail_service, vendor_service, vendor_import_export_service
-    global _server_start_time, _shutting_down
+# ---------------------------------------------------------------------------
+# Startup steps — run by a StartupPlan in dependency order (see lifespan)
+# ---------------------------------------------------------------------------
 
-    _shutting_down = False
-    _server_start_time = time.time()
-    logger.info("🚀 Starting ASR Production Server...")
-    logger.info("Initializing sophisticated document processing capabilities...")
 
-    try:
-        # Initialize database
-        await init_database(
-            database_url=production_settings.DATABASE_URL,
-            pool_size=production_settings.DB_POOL_SIZE,
-            max_overflow=production_settings.DB_POOL_OVERFLOW,
-            pool_recycle=production_settings.DB_POOL_RECYCLE,
-        )
-        logger.info("✅ Database engine initialized")
-
-        # Verify DB connectivity and warn about SQLite in production
-        db_check = await check_database_connectivity()
-        if db_check["status"] == "connected":
-            logger.info(
-                "Database connectivity verified: dialect=%s latency=%.1fms",
-                db_check["dialect"],
-                db_check["latency_ms"],
-            )
-            if (
-                db_check["dialect"] == "sqlite"
-                and production_settings.is_production
-                and not production_settings.DEBUG
-            ):
-                logger.warning(
-                    "⚠️ SQLite detected in production mode — data will be lost on ECS/Fargate restarts. Use PostgreSQL for durability."
-                )
-        else:
-            logger.error("Database connectivity check failed: %s", db_check)
+async def _start_database() -> None:
+    await init_database(
+        database_url=production_settings.DATABASE_URL,
+        pool_size=production_settings.DB_POOL_SIZE,
+        max_overflow=production_settings.DB_POOL_OVERFLOW,
+        pool_recycle=production_settings.DB_POOL_RECYCLE,
+        skip_create_when_current=production_settings.DB_SKIP_CREATE_ALL_WHEN_CURRENT,
+    )
+    logger.info("✅ Database engine initialized (%s)", get_schema_status())
 
-        # Initialize audit trail service
-        audit_trail_service = AuditTrailService(
-            enabled=production_settings.AUDIT_TRAIL_ENABLED,
-            retention_days=production_settings.AUDIT_RETENTION_DAYS,
+    # Verify DB connectivity and warn about SQLite in production
+    db_check = await check_database_connectivity()
+    if db_check["status"] == "connected":
+        logger.info(
+            "Database connectivity verified: dialect=%s latency=%.1fms",
+            db_check["dialect"],
+            db_check["latency_ms"],
         )
-        await audit_trail_service.initialize()
-        logger.info("✅ Audit Trail Service initialized")
+        if (
+            db_check["dialect"] == "sqlite"
+            and production_settings.is_production
+            and not production_settings.DEBUG
+        ):
+            logger.warning(
+                "⚠️ SQLite detected in production mode — data will be lost on "
+                "ECS/Fargate restarts. Use PostgreSQL for durability."
+            )
+    else:
+        logger.error("Database connectivity check failed: %s", db_check)
+
+
+async def _start_audit_trail() -> None:
+    global audit_trail_service
+    audit_trail_service = AuditTrailService(
+        enabled=production_settings.AUDIT_TRAIL_ENABLED,
+        retention_days=production_settings.AUDIT_RETENTION_DAYS,
+        buffered=production_settings.AUDIT_BUFFER_ENABLED,
+        max_buffered_events=production_settings.AUDIT_BUFFER_MAX_EVENTS,
+        flush_batch_size=production_settings.AUDIT_FLUSH_BATCH_SIZE,
+        flush_interval_seconds=production_settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        overflow_policy=production_settings.AUDIT_OVERFLOW_POLICY,
+    )
+    await audit_trail_service.initialize()
+    logger.info("✅ Audit Trail Service initialized")
 
-        # Initialize vendor service
-        vendor_service = VendorService()
-        await vendor_service.initialize()
-        logger.info("✅ Vendor Service initialized")
 
-        # Initialize vendor import/export service
-        vendor_import_export_service = VendorImportExportService(vendor_service)
-        logger.info("✅ Vendor Import/Export Service initialized")
+async def _start_audit_retention() -> None:
+    global audit_retention_service
+    # Scheduled, chunked audit retention purges
+    audit_retention_service = AuditRetentionService(
+        audit_trail_service,
+        enabled=production_settings.AUDIT_TRAIL_ENABLED
+        and production_settings.AUDIT_RETENTION_PURGE_ENABLED,
+        retention_days=production_settings.AUDIT_RETENTION_DAYS,
+        batch_size=production_settings.AUDIT_RETENTION_BATCH_SIZE,
+        pause_seconds=production_settings.AUDIT_RETENTION_PAUSE_SECONDS,
+        interval_seconds=production_settings.AUDIT_RETENTION_INTERVAL_HOURS * 3600,
+        drop_partitions=production_settings.AUDIT_RETENTION_DROP_PARTITIONS,
+    )
+    await audit_retention_service.initialize()
+    logger.info("✅ Audit Retention Service initialized")
 
-        # Initialize storage service
-        storage_service = ProductionStorageService(production_settings.storage_config)
-        await storage_service.initialize()
-        logger.info("✅ Storage service initialized")
 
-        # Initialize GL Account Service (79 QuickBooks accounts)
-        gl_account_service = GLAccountService(
-            config_path=production_settings.GL_ACCOUNTS_CONFIG_PATH,
-            vendor_service=vendor_service,
-        )
-        await gl_account_service.initialize()
-        account_count = len(gl_account_service.get_all_accounts())
-        logger.info(
-            f"✅ GL Account Service initialized: {account_count} accounts loaded"
-        )
+async def _start_audit_aggregation() -> None:
+    global audit_aggregation_service
+    # SQL time-bucket aggregation for operations dashboards
+    audit_aggregation_service = AuditAggregationService(
+        audit_trail_service,
+        enabled=production_settings.AUDIT_TRAIL_ENABLED,
+        max_buckets=production_settings.AUDIT_AGGREGATION_MAX_BUCKETS,
+        cache_max_buckets=production_settings.AUDIT_AGGREGATION_CACHE_BUCKETS,
+        closed_grace_seconds=max(
+            60.0, 2 * production_settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        ),
+    )
+    await audit_aggregation_service.initialize()
+    logger.info("✅ Audit Aggregation Service initialized")
+
+
+async def _start_vendors() -> None:
+    global vendor_service, vendor_import_export_service
+    vendor_service = VendorService()
+    # The match index loads lazily per tenant until the deferred warmup
+    await vendor_service.initialize(
+        warm_index=not production_settings.STARTUP_DEFER_WARMUPS
+    )
+    logger.info("✅ Vendor Service initialized")
+
+    vendor_import_export_service = VendorImportExportService(vendor_service)
+    logger.info("✅ Vendor Import/Export Service initialized")
+
+
+async def _warm_vendor_match_index() -> None:
+    if vendor_service:
+        count = await vendor_service.warm_match_index()
+        logger.info(f"✅ Vendor match index warmed ({count} vendors)")
+
+
+async def _start_storage() -> None:
+    global storage_service
+    storage_service = ProductionStorageService(production_settings.storage_config)
+    await storage_service.initialize()
+    logger.info("✅ Storage service initialized")
+
+
+async def _start_audit_archive() -> None:
+    global audit_archive_service
+    # Cold archival of aged audit events (reads fall back to it)
+    audit_archive_service = AuditArchiveService(
+        audit_trail_service,
+        storage_service,
+        enabled=production_settings.AUDIT_TRAIL_ENABLED
+        and production_settings.AUDIT_ARCHIVE_ENABLED,
+        archive_after_days=production_settings.AUDIT_ARCHIVE_AFTER_DAYS,
+        rows_per_file=production_settings.AUDIT_ARCHIVE_ROWS_PER_FILE,
+        compression=production_settings.AUDIT_ARCHIVE_COMPRESSION,
+        interval_seconds=production_settings.AUDIT_ARCHIVE_INTERVAL_HOURS * 3600,
+    )
+    await audit_archive_service.initialize()
+    logger.info("✅ Audit Archive Service initialized")
+
+
+async def _start_classification_cache() -> None:
+    global classification_cache_service
+    # Classification memoization cache (shared by GL + payment)
+    classification_cache_service = ClassificationCacheService(
+        enabled=production_settings.CLASSIFICATION_CACHE_ENABLED,
+        max_entries=production_settings.CLASSIFICATION_CACHE_MAX_ENTRIES,
+        ttl_seconds=production_settings.CLASSIFICATION_CACHE_TTL_SECONDS,
+        persistent=production_settings.CLASSIFICATION_CACHE_PERSISTENT,
+    )
+    await classification_cache_service.initialize()
+    logger.info("✅ Classification Cache Service initialized")
+
+
+async def _start_claude_response_cache() -> None:
+    global claude_response_cache_service
+    # Claude response cache (raw responses, shared by workers)
+    claude_response_cache_service = ClaudeResponseCacheService(
+        enabled=production_settings.CLAUDE_RESPONSE_CACHE_ENABLED,
+        max_entries=production_settings.CLAUDE_RESPONSE_CACHE_MAX_ENTRIES,
+        max_rows=production_settings.CLAUDE_RESPONSE_CACHE_MAX_ROWS,
+        max_response_bytes=production_settings.CLAUDE_RESPONSE_CACHE_MAX_RESPONSE_BYTES,
+        ttl_seconds=production_settings.CLAUDE_RESPONSE_CACHE_TTL_SECONDS,
+    )
+    await claude_response_cache_service.initialize()
+    logger.info("✅ Claude Response Cache Service initialized")
+
+
+async def _purge_claude_response_cache() -> None:
+    if claude_response_cache_service:
+        purged = await claude_response_cache_service.purge_expired()
+        logger.info(f"✅ Claude response cache purged ({purged} stale rows)")
+
+
+async def _start_gl_accounts() -> None:
+    global gl_account_service
+    # GL Account Service (79 QuickBooks accounts)
+    gl_account_service = GLAccountService(
+        config_path=production_settings.GL_ACCOUNTS_CONFIG_PATH,
+        vendor_service=vendor_service,
+        result_cache=classification_cache_service,
+        local_model_path=production_settings.GL_LOCAL_MODEL_PATH,
+        local_model_min_confidence=production_settings.GL_LOCAL_MODEL_MIN_CONFIDENCE,
+    )
+    await gl_account_service.initialize()
+    account_count = len(gl_account_service.get_all_accounts())
+    logger.info(f"✅ GL Account Service initialized: {account_count} accounts loaded")
+
+
+async def _start_claude_client() -> None:
+    global claude_client_service
+    # Shared, concurrency-limited Claude client
+    claude_client_service = ClaudeClientService(
+        production_settings.ANTHROPIC_API_KEY,
+        base_url=production_settings.CLAUDE_BASE_URL,
+        initial_concurrency=production_settings.CLAUDE_INITIAL_CONCURRENCY,
+        min_concurrency=production_settings.CLAUDE_MIN_CONCURRENCY,
+        max_concurrency=production_settings.CLAUDE_MAX_CONCURRENCY,
+        latency_target_seconds=(
+            production_settings.CLAUDE_LATENCY_TARGET_SECONDS or None
+        ),
+        request_timeout_seconds=production_settings.API_TIMEOUT,
+        lazy_import=production_settings.LAZY_SDK_IMPORTS,
+    )
+    await claude_client_service.initialize()
+    logger.info("✅ Claude Client Service initialized")
+
+
+async def _connect_claude_client() -> None:
+    # Import the SDK now rather than on the first upload
+    if claude_client_service and claude_client_service.available:
+        await claude_client_service.connect()
+
+
+async def _start_image_preprocessor() -> None:
+    global image_preprocessor_service
+    # Claude Vision image preprocessing (process pool)
+    image_preprocessor_service = ImagePreprocessorService(
+        enabled=production_settings.VISION_PREPROCESS_ENABLED,
+        max_workers=production_settings.VISION_PREPROCESS_WORKERS,
+        max_long_edge=production_settings.VISION_MAX_LONG_EDGE,
+        max_bytes=production_settings.VISION_MAX_IMAGE_BYTES,
+        pdf_pages=production_settings.VISION_PDF_PAGES,
+        cache_bytes=production_settings.VISION_PREPROCESS_CACHE_BYTES,
+    )
+    await image_preprocessor_service.initialize()
+    logger.info("✅ Image Preprocessor Service initialized")
+
+
+async def _start_claude_usage() -> None:
+    global claude_usage_service
+    # Per-tenant Claude usage accounting and budgets
+    claude_usage_service = ClaudeUsageService(
+        enabled=production_settings.CLAUDE_USAGE_TRACKING_ENABLED,
+        input_cost_per_mtok=production_settings.CLAUDE_INPUT_COST_PER_MTOK,
+        output_cost_per_mtok=production_settings.CLAUDE_OUTPUT_COST_PER_MTOK,
+        default_budgets={
+            "calls": production_settings.CLAUDE_TENANT_DAILY_CALL_BUDGET,
+            "tokens": production_settings.CLAUDE_TENANT_DAILY_TOKEN_BUDGET,
+            "spend_usd": production_settings.CLAUDE_TENANT_DAILY_SPEND_BUDGET_USD,
+            "latency_seconds": (
+                production_settings.CLAUDE_TENANT_DAILY_LATENCY_BUDGET_SECONDS
+            ),
+        },
+        tenant_budgets=production_settings.CLAUDE_TENANT_BUDGETS,
+        flush_interval_seconds=production_settings.CLAUDE_USAGE_FLUSH_SECONDS,
+    )
+    await claude_usage_service.initialize()
+    logger.info("✅ Claude Usage Service initialized")
+
+
+async def _start_payment_detection() -> None:
+    global payment_detection_service
+    # Payment Detection Service (5-method consensus)
+    payment_detection_service = PaymentDetectionService(
+        production_settings.get_claude_config(),
+        production_settings.PAYMENT_DETECTION_METHODS,
+        result_cache=classification_cache_service,
+        response_cache=claude_response_cache_service,
+        early_exit_threshold=(
+            production_settings.PAYMENT_CONSENSUS_THRESHOLD
+            if production_settings.PAYMENT_EARLY_EXIT_ENABLED
+            else None
+        ),
+        local_method_timeout=production_settings.PAYMENT_LOCAL_METHOD_TIMEOUT_SECONDS,
+        claude_method_timeout=production_settings.PAYMENT_CLAUDE_METHOD_TIMEOUT_SECONDS,
+        text_token_budget=(
+            production_settings.PAYMENT_CLAUDE_TEXT_TOKEN_BUDGET or None
+        ),
+        image_preprocessor=image_preprocessor_service,
+        claude_client_service=claude_client_service,
+        usage_service=claude_usage_service,
+    )
+    await payment_detection_service.initialize()
+    method_count = len(payment_detection_service.get_enabled_methods())
+    logger.info(
+        f"✅ Payment Detection Service initialized: {method_count} methods enabled"
+    )
+
+
+async def _start_billing_router() -> None:
+    global billing_router_service
+    # Billing Router Service (4 destinations)
+    billing_router_service = BillingRouterService(
+        production_settings.BILLING_DESTINATIONS,
+        production_settings.ROUTING_CONFIDENCE_THRESHOLD,
+        audit_trail_service=audit_trail_service,
+        config_path=production_settings.ROUTING_RULES_CONFIG_PATH,
+    )
+    await billing_router_service.initialize()
+    destination_count = len(billing_router_service.get_available_destinations())
+    logger.info(
+        f"✅ Billing Router Service initialized: {destination_count} destinations"
+    )
+
+
+async def _start_dashboard() -> None:
+    global dashboard_rollup_service, dashboard_cache
+    # Materialized dashboard rollups (fed by the pipeline)
+    dashboard_rollup_service = DashboardRollupService(
+        enabled=production_settings.DASHBOARD_ROLLUPS_ENABLED,
+        metadata_path=(
+            Path(production_settings.storage_config.get("base_path", "./storage"))
+            / "metadata"
+        ),
+        recent_limit=production_settings.DASHBOARD_RECENT_DOCUMENTS,
+    )
+    await dashboard_rollup_service.initialize()
+    dashboard_cache = SingleFlightCache(
+        "dashboard",
+        ttl_seconds=production_settings.DASHBOARD_CACHE_TTL_SECONDS,
+        stale_seconds=production_settings.DASHBOARD_CACHE_STALE_SECONDS,
+        max_entries=production_settings.DASHBOARD_CACHE_MAX_ENTRIES,
+        enabled=production_settings.DASHBOARD_CACHE_ENABLED,
+    )
+    set_dashboard_service(dashboard_rollup_service, dashboard_cache)
+    logger.info("✅ Dashboard Rollup Service initialized")
+
+
+async def _start_document_processor() -> None:
+    global document_processor_service
+    # The startup plan runs these steps first; a missing one is a plan bug
+    if (
+        gl_account_service is None
+        or payment_detection_service is None
+        or billing_router_service is None
+        or storage_service is None
+    ):
+        raise RuntimeError("Document processor started before its dependencies")
+    # Document Processor Service (orchestrates all processing)
+    document_processor_service = DocumentProcessorService(
+        gl_account_service=gl_account_service,
+        payment_detection_service=payment_detection_service,
+        billing_router_service=billing_router_service,
+        storage_service=storage_service,
+        audit_trail_service=audit_trail_service,
+        vendor_service=vendor_service,
+        dashboard_rollup_service=(
+            dashboard_rollup_service
+            if production_settings.DASHBOARD_ROLLUPS_ENABLED
+            else None
+        ),
+    )
+    await document_processor_service.initialize()
+    logger.info("✅ Document Processor Service initialized")
+
+
+async def _start_claude_batch() -> None:
+    global claude_batch_service
+    # Batch-mode reprocessing
+    claude_batch_service = ClaudeBatchService(
+        payment_detection_service=payment_detection_service,
+        document_processor_service=document_processor_service,
+        storage_service=storage_service,
+        claude_client_service=claude_client_service,
+        poll_interval_seconds=production_settings.CLAUDE_BATCH_POLL_INTERVAL_SECONDS,
+        max_requests_per_batch=production_settings.CLAUDE_BATCH_MAX_REQUESTS,
+    )
+    await claude_batch_service.initialize()
+    logger.info("✅ Claude Batch Service initialized")
+
+
+async def _resume_claude_batches() -> None:
+    # Pick up batch jobs left unfinished by the previous process
+    if claude_batch_service and claude_batch_service.available:
+        await claude_batch_service.resume_unfinished_jobs()
+
+
+async def _start_scanner_manager() -> None:
+    global scanner_manager_service
+    scanner_manager_service = ScannerManagerService(
+        max_clients=production_settings.MAX_SCANNER_CLIENTS
+    )
+    await scanner_manager_service.initialize()
+    logger.info("✅ Scanner Manager Service initialized")
+
+
+async def _start_health_monitor() -> None:
+    global health_monitor_service
+    # Background health checks; probes read the latest snapshot
+    health_monitor_service = HealthMonitorService(
+        enabled=production_settings.HEALTH_MONITOR_ENABLED,
+        interval_seconds=production_settings.HEALTH_CHECK_INTERVAL,
+        timeout_seconds=production_settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    _register_health_checks(health_monitor_service)
+    await health_monitor_service.initialize()
+    logger.info("✅ Health Monitor Service initialized")
+
 
-        # Initialize Payment Detection Service (5-method consensus)
-        payment_detection_service = PaymentDetectionService(
-            production_settings.get_claude_config(),
-            production_settings.PAYMENT_DETECTION_METHODS,
+def _build_startup_plan() -> StartupPlan:
+    """Service initialization graph: each step names the steps it needs."""
+    plan = StartupPlan(concurrent=production_settings.STARTUP_PARALLEL_ENABLED)
+
+    def warmup(name: str, func: Any, after: List[str]) -> None:
+        # Deferred warmups run once the server is ready
+        if production_settings.STARTUP_DEFER_WARMUPS:
+            plan.defer(name, func)
+        else:
+            plan.add(name, func, after=after)
+
+    plan.add("database", _start_database)
+    plan.add("storage", _start_storage)
+    plan.add("claude_client", _start_claude_client)
+    plan.add("image_preprocessor", _start_image_preprocessor)
+    plan.add("audit_trail", _start_audit_trail, after=["database"])
+    plan.add("audit_retention", _start_audit_retention, after=["audit_trail"])
+    plan.add("audit_aggregation", _start_audit_aggregation, after=["audit_trail"])
+    plan.add("audit_archive", _start_audit_archive, after=["audit_trail", "storage"])
+    plan.add("vendors", _start_vendors, after=["database"])
+    plan.add("classification_cache", _start_classification_cache, after=["database"])
+    plan.add("claude_response_cache", _start_claude_response_cache, after=["database"])
+    plan.add("claude_usage", _start_claude_usage, after=["database"])
+    plan.add("dashboard", _start_dashboard, after=["database"])
+    plan.add(
+        "gl_accounts", _start_gl_accounts, after=["vendors", "classification_cache"]
+    )
+    plan.add(
+        "payment_detection",
+        _start_payment_detection,
+        after=[
+            "classification_cache",
+            "claude_response_cache",
+            "claude_client",
+            "image_preprocessor",
+            "claude_usage",
+        ],
+    )
+    plan.add("billing_router", _start_billing_router, after=["audit_trail"])
+    plan.add(
+        "document_processor",
+        _start_document_processor,
+        after=[
+            "gl_accounts",
+            "payment_detection",
+            "billing_router",
+            "storage",
+            "audit_trail",
+            "vendors",
+            "dashboard",
+        ],
+    )
+    warmup("vendor_match_index", _warm_vendor_match_index, ["vendors"])
+    warmup("claude_client_connect", _connect_claude_client, ["claude_client"])
+    warmup(
+        "claude_response_cache_purge",
+        _purge_claude_response_cache,
+        ["claude_response_cache"],
+    )
+    if production_settings.CLAUDE_BATCH_ENABLED:
+        plan.add(
+            "claude_batch",
+            _start_claude_batch,
+            after=["document_processor", "claude_client", "storage"],
         )
-        await payment_detection_service.initialize()
-        method_count = len(payment_detection_service.get_enabled_methods())
+        warmup("claude_batch_resume", _resume_claude_batches, ["claude_batch"])
+    if production_settings.SCANNER_API_ENABLED:
+        plan.add("scanner_manager", _start_scanner_manager)
+    # Last: the health checks cover every other service
+    plan.add("health_monitor", _start_health_monitor, after=plan.step_names())
+    return plan
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan manager with sophisticated component initialization"""
+    global _server_start_time, _shutting_down, _startup_plan
+
+    _shutting_down = False
+    _server_start_time = time.time()
+    logger.info("🚀 Starting ASR Production Server...")
+    logger.info("Initializing sophisticated document processing capabilities...")
+
+    try:
+        # Independent services start concurrently; see _build_startup_plan
+        _startup_plan = plan = _build_startup_plan()
+        await plan.run()
         logger.info(
-            f"✅ Payment Detection Service initialized: {method_count} methods enabled"
+            "✅ Services initialized in %.2fs (critical path: %s)",
+            plan.total_seconds or 0.0,
+            " → ".join(plan.critical_path()),
         )
 
-        # Initialize Billing Router Service (4 destinations)
-        billing_router_service = BillingRouterService(
-            production_settings.BILLING_DESTINATIONS,
-            production_settings.ROUTING_CONFIDENCE_THRESHOLD,
-            audit_trail_service=audit_trail_service,
-            config_path=production_settings.ROUTING_RULES_CONFIG_PATH,
+        account_count = (
+            len(gl_account_service.get_all_accounts()) if gl_account_service else 0
         )
-        await billing_router_service.initialize()
-        destination_count = len(billing_router_service.get_available_destinations())
-        logger.info(
-            f"✅ Billing Router Service initialized: {destination_count} destinations"
+        method_count = (
+            len(payment_detection_service.get_enabled_methods())
+            if payment_detection_service
+            else 0
         )
-
-        # Initialize Document Processor Service (orchestrates all processing)
-        document_processor_service = DocumentProcessorService(
-            gl_account_service=gl_account_service,
-            payment_detection_service=payment_detection_service,
-            billing_router_service=billing_router_service,
-            storage_service=storage_service,
+        destination_count = (
+            len(billing_router_service.get_available_destinations())
+            if billing_router_service
+            else 0
         )
-        await document_processor_service.initialize()
-        logger.info("✅ Document Processor Service initialized")
-
-        # Initialize Scanner Manager Service
-        if production_settings.SCANNER_API_ENABLED:
-            scanner_manager_service = ScannerManagerService(
-                max_clients=production_settings.MAX_SCANNER_CLIENTS
-            )
-            await scanner_manager_service.initialize()
-            logger.info("✅ Scanner Manager Service initialized")
 
         logger.info("=" * 60)
         logger.info("🎯 Sophisticated Capabilities Ready:")
@@ -373,6 +833,9 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ Failed to initialize services: {e}")
         raise
 
+    # Non-critical warmups run while the server is already serving
+    plan.start_deferred()
+
     yield  # Application runs here
 
     _shutting_down = True
@@ -382,16 +845,30 @@ async def lifespan(app: FastAPI):
     # Give in-flight requests a few seconds to complete before tearing down services
     await asyncio.sleep(2)
 
+    await plan.cleanup()
+
     # Cleanup services
     services_to_cleanup = [
+        health_monitor_service,
+        claude_batch_service,
+        audit_archive_service,
         storage_service,
         gl_account_service,
         payment_detection_service,
         billing_router_service,
         document_processor_service,
+        dashboard_cache,
+        dashboard_rollup_service,
         scanner_manager_service,
+        audit_retention_service,
+        audit_aggregation_service,
         audit_trail_service,
         vendor_service,
+        classification_cache_service,
+        claude_response_cache_service,
+        image_preprocessor_service,
+        claude_client_service,
+        claude_usage_service,
     ]
 
     for service in services_to_cleanup:
@@ -401,6 +878,7 @@ async def lifespan(app: FastAPI):
                     await service.cleanup()
             except Exception as e:
                 logger.error(f"Error during service cleanup: {e}")
+    set_dashboard_service(None)
 
     await close_database()
 
@@ -502,9 +980,7 @@ if production_settings.RATE_LIMIT_ENABLED:
     )
 
 # Register dashboard metrics routes (matches frontend MetricsService.ts calls)
-register_dashboard_routes(
-    app, Path(production_settings.storage_config.get("base_path", "./storage"))
-)
+register_dashboard_routes(app, default_tenant_id=production_settings.DEFAULT_TENANT_ID)
 
 
 # Authentication dependency
@@ -650,7 +1126,11 @@ async def health_check():
 
 
 async def _build_health_response() -> SystemHealthResponseSchema:
-    """Shared logic for readiness & legacy health endpoints."""
+    """Shared logic for readiness & legacy health endpoints.
+
+    Component results come from the health monitor's latest snapshot, so a
+    probe never waits on the database or a storage scan.
+    """
     health_status = SystemHealthResponseSchema(
         system_type=SystemType.PRODUCTION_SERVER,
         overall_status="healthy",
@@ -660,111 +1140,128 @@ async def _build_health_response() -> SystemHealthResponseSchema:
         timestamp=datetime.utcnow(),
     )
 
+    if health_monitor_service is None:
+        health_status.overall_status = "unhealthy"
+        return health_status
+
     try:
-        # Database connectivity
-        db_health = await check_database_connectivity()
-        health_status.components["database"] = db_health  # type: ignore[index]
-        if db_health.get("status") not in ("connected",):
-            health_status.overall_status = "unhealthy"
-        elif (
-            db_health.get("dialect") in ("sqlite", "aiosqlite")
-            and production_settings.is_production
-            and not production_settings.DEBUG
-        ):
-            db_health["degraded"] = True
-            db_health["warning"] = "SQLite in production — ephemeral storage risk"
-            health_status.overall_status = "degraded"
-
-        # GL Account Service
-        if gl_account_service:
-            accounts = gl_account_service.get_all_accounts()
-            health_status.components["gl_accounts"] = {  # type: ignore[index]
-                "status": "healthy",
-                "count": len(accounts),
-                "expected": 79,
-            }
-        else:
-            health_status.components["gl_accounts"] = {"status": "not_initialized"}  # type: ignore[index]
-
-        # Payment Detection Service
-        if payment_detection_service:
-            methods = payment_detection_service.get_enabled_methods()
-            health_status.components["payment_detection"] = {  # type: ignore[index]
-                "status": "healthy",
-                "methods": len(methods),
-                "enabled_methods": methods,
-            }
-        else:
-            health_status.components["payment_detection"] = {  # type: ignore[index]
-                "status": "not_initialized"
-            }
+        components = await health_monitor_service.get_snapshot()
+    except Exception as e:
+        logger.error(f"Health check error: {e}")
+        health_status.overall_status = "unhealthy"
+        return health_status
+    health_status.components = components
 
-        # Billing Router Service
-        if billing_router_service:
-            destinations = billing_router_service.get_available_destinations()
-            health_status.components["billing_router"] = {  # type: ignore[index]
-                "status": "healthy",
-                "destinations": len(destinations),
-                "available_destinations": destinations,
-            }
-        else:
-            health_status.components["billing_router"] = {"status": "not_initialized"}  # type: ignore[index]
+    db_health = components.get("database", {})
+    stale = sorted(name for name, c in components.items() if c.get("stale"))
+    if db_health.get("status") != "connected":
+        health_status.overall_status = "unhealthy"
+    elif (
+        db_health.get("degraded")
+        or components.get("claude_ai", {}).get("status") == "not_configured"
+        or stale
+    ):
+        health_status.overall_status = "degraded"
+    health_status.metrics["stale_components"] = stale
+    return health_status
 
-        # Storage Service (with timeout to prevent health check from hanging)
-        if storage_service:
-            try:
-                storage_health = await asyncio.wait_for(
-                    storage_service.get_health(), timeout=2.0
-                )
-                storage_healthy = (
-                    storage_health.get("status") == "healthy"
-                    if isinstance(storage_health, dict)
-                    else bool(storage_health)
-                )
-                health_status.components["storage"] = {  # type: ignore[index]
-                    "status": "healthy" if storage_healthy else "unhealthy",
-                    "backend": production_settings.STORAGE_BACKEND,
-                }
-            except asyncio.TimeoutError:
-                health_status.components["storage"] = {  # type: ignore[index]
-                    "status": "degraded",
-                    "reason": "health check timed out",
-                    "backend": production_settings.STORAGE_BACKEND,
-                }
-        else:
-            health_status.components["storage"] = {"status": "not_initialized"}  # type: ignore[index]
 
-        # Scanner Manager
-        if scanner_manager_service and production_settings.SCANNER_API_ENABLED:
-            active_scanners = len(
-                await scanner_manager_service.get_connected_scanners()
-            )
-            health_status.components["scanner_manager"] = {  # type: ignore[index]
-                "status": "healthy",
-                "active_scanners": active_scanners,
-                "max_scanners": production_settings.MAX_SCANNER_CLIENTS,
-            }
+def _register_health_checks(monitor: HealthMonitorService) -> None:
+    """Register the component checks behind the readiness probe."""
+    monitor.register(
+        "database",
+        _check_database_health,
+        interval_seconds=production_settings.HEALTH_DATABASE_CHECK_INTERVAL,
+    )
+    monitor.register("gl_accounts", _check_gl_accounts_health)
+    monitor.register("payment_detection", _check_payment_detection_health)
+    monitor.register("billing_router", _check_billing_router_health)
+    monitor.register(
+        "storage",
+        _check_storage_health,
+        interval_seconds=production_settings.HEALTH_STORAGE_CHECK_INTERVAL,
+        timeout_seconds=production_settings.HEALTH_STORAGE_CHECK_TIMEOUT_SECONDS,
+    )
+    if scanner_manager_service and production_settings.SCANNER_API_ENABLED:
+        monitor.register("scanner_manager", _check_scanner_manager_health)
+    monitor.register("audit_trail", _check_audit_trail_health)
+    monitor.register("claude_ai", _check_claude_ai_health)
+
+
+async def _check_database_health() -> Dict[str, Any]:
+    db_health = await check_database_connectivity()
+    if (
+        db_health.get("status") == "connected"
+        and db_health.get("dialect") in ("sqlite", "aiosqlite")
+        and production_settings.is_production
+        and not production_settings.DEBUG
+    ):
+        db_health["degraded"] = True
+        db_health["warning"] = "SQLite in production — ephemeral storage risk"
+    return db_health
 
-        # Audit Trail
-        if audit_trail_service:
-            health_status.components["audit_trail"] = (  # type: ignore[index]
-                audit_trail_service.get_statistics()
-            )
-        else:
-            health_status.components["audit_trail"] = {"status": "not_initialized"}  # type: ignore[index]
 
-        # Claude AI
-        if production_settings.ANTHROPIC_API_KEY:
-            health_status.components["claude_ai"] = {"status": "configured"}  # type: ignore[index]
-        else:
-            health_status.components["claude_ai"] = {"status": "not_configured"}  # type: ignore[index]
-            health_status.overall_status = "degraded"
+async def _check_gl_accounts_health() -> Dict[str, Any]:
+    if not gl_account_service:
+        return {"status": "not_initialized"}
+    accounts = gl_account_service.get_all_accounts()
+    return {"status": "healthy", "count": len(accounts), "expected": 79}
 
-    except Exception as e:
-        logger.error(f"Health check error: {e}")
-        health_status.overall_status = "unhealthy"
 
-    return health_status
+async def _check_payment_detection_health() -> Dict[str, Any]:
+    if not payment_detection_service:
+        return {"status": "not_initialized"}
+    methods = payment_detection_service.get_enabled_methods()
+    return {"status": "healthy", "methods": len(methods), "enabled_methods": methods}
+
+
+async def _check_billing_router_health() -> Dict[str, Any]:
+    if not billing_router_service:
+        return {"status": "not_initialized"}
+    destinations = billing_router_service.get_available_destinations()
+    return {
+        "status": "healthy",
+        "destinations": len(destinations),
+        "available_destinations": destinations,
+    }
+
+
+async def _check_storage_health() -> Dict[str, Any]:
+    if not storage_service:
+        return {"status": "not_initialized"}
+    storage_health = await storage_service.get_health()
+    storage_healthy = (
+        storage_health.get("status") == "healthy"
+        if isinstance(storage_health, dict)
+        else bool(storage_health)
+    )
+    return {
+        "status": "healthy" if storage_healthy else "unhealthy",
+        "backend": production_settings.STORAGE_BACKEND,
+    }
+
+
+async def _check_scanner_manager_health() -> Dict[str, Any]:
+    if not scanner_manager_service:
+        return {"status": "not_initialized"}
+    active_scanners = len(await scanner_manager_service.get_connected_scanners())
+    return {
+        "status": "healthy",
+        "active_scanners": active_scanners,
+        "max_scanners": production_settings.MAX_SCANNER_CLIENTS,
+    }
+
+
+async def _check_audit_trail_health() -> Dict[str, Any]:
+    if not audit_trail_service:
+        return {"status": "not_initialized"}
+    return audit_trail_service.get_statistics()
+
+
+async def _check_claude_ai_health() -> Dict[str, Any]:
+    if production_settings.ANTHROPIC_API_KEY:
+        return {"status": "configured"}
+    return {"status": "not_configured"}
 
 
 # ---------------------------------------------------------------------------
@@ -925,6 +1422,74 @@ async def classify_document(
         )
 
 
+@app.post(
+    "/api/v1/documents/{document_id}/gl-override",
+    response_model=APISuccessResponseSchema,
+    tags=["Documents"],
+)
+async def override_document_gl_account(
+    document_id: str,
+    request: GLClassificationOverrideRequestSchema,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Record a manual GL correction; used as training feedback for the local model"""
+    try:
+        validate_document_id(document_id)
+        if not gl_account_service or not audit_trail_service or not storage_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="GL Account, audit trail or storage service not available",
+            )
+        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+        # Overrides become training labels, so only the owning tenant may add one
+        if not await storage_service.retrieve_document(
+            document_id, tenant_id=tenant_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document {document_id} not found",
+            )
+        if not gl_account_service.validate_gl_account(
+            request.gl_account_code, tenant_id=tenant_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown GL account {request.gl_account_code}",
+            )
+
+        from shared.core.models import AuditTrailEntry
+
+        await audit_trail_service.record(
+            AuditTrailEntry(
+                document_id=document_id,
+                event_type="gl_classification_override",
+                event_data={
+                    "gl_account_code": request.gl_account_code,
+                    "previous_gl_account_code": request.previous_gl_account_code,
+                },
+                user_id=user.get("user_id"),
+                system_component="api",
+                tenant_id=tenant_id,
+            )
+        )
+        return APISuccessResponseSchema(
+            message="GL override recorded",
+            data={
+                "document_id": document_id,
+                "gl_account_code": request.gl_account_code,
+            },
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"GL override error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to record GL override",
+        )
+
+
 # Document deletion endpoint
 @app.delete(
     "/api/v1/documents/{document_id}",
@@ -952,6 +1517,29 @@ async def delete_document(
                 detail=f"Document {document_id} not found",
             )
 
+        if vendor_service:
+            try:
+                await vendor_service.forget_document_rollups(
+                    document_id, tenant_id=user.get("tenant_id")
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to drop deleted document from vendor stats: {e}"
+                )
+
+        if dashboard_rollup_service:
+            try:
+                await dashboard_rollup_service.forget_document(
+                    document_id, user.get("tenant_id", "unknown")
+                )
+                if dashboard_cache:
+                    tenant = user.get("tenant_id", "unknown")
+                    dashboard_cache.invalidate(
+                        lambda key: isinstance(key, tuple) and key[0] == tenant
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to drop deleted document from dashboard: {e}")
+
         # Log to audit trail
         if audit_trail_service:
             from shared.core.models import AuditTrailEntry
@@ -998,14 +1586,17 @@ async def list_gl_accounts(
                 detail="GL Account service not available",
             )
 
-        accounts = gl_account_service.get_accounts(category=category, search=search)
+        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+        accounts = gl_account_service.get_accounts(
+            category=category, search=search, tenant_id=tenant_id
+        )
 
         return APISuccessResponseSchema(
             message="GL accounts retrieved",
             data={
                 "accounts": accounts,
                 "total_count": len(accounts),
-                "categories": gl_account_service.get_categories(),
+                "categories": gl_account_service.get_categories(tenant_id),
             },
         )
 
@@ -1143,9 +1734,14 @@ async def list_audit_logs(
     event_type: Optional[str] = None,
     since: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
     user: Dict[str, Any] = Depends(get_current_user),
 ):
-    """List audit trail entries for a tenant with optional filters."""
+    """List audit trail entries for a tenant with optional filters.
+
+    Entries are newest first. Pass the returned ``next_cursor`` as
+    ``cursor`` to fetch the following page.
+    """
     try:
         if not audit_trail_service:
             raise HTTPException(
@@ -1157,18 +1753,23 @@ async def list_audit_logs(
         if since:
             since_dt = datetime.fromisoformat(since)
 
-        entries = await audit_trail_service.query_by_tenant(
-            tenant_id=tenant_id,
-            event_type=event_type,
-            since=since_dt,
-            limit=limit,
-        )
+        try:
+            entries, next_cursor = await audit_trail_service.query_page(
+                tenant_id=tenant_id,
+                event_type=event_type,
+                since=since_dt,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         return APISuccessResponseSchema(
             message="Audit logs retrieved",
             data=AuditLogListResponseSchema(
                 entries=[AuditLogEntrySchema(**e) for e in entries],
                 total_count=len(entries),
+                next_cursor=next_cursor,
             ).model_dump(),
         )
 
@@ -1182,6 +1783,82 @@ async def list_audit_logs(
         )
 
 
+@app.get("/api/v1/audit-logs/export", tags=["Audit"])
+async def export_audit_logs(
+    event_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Export the tenant's full audit log as NDJSON, oldest first.
+
+    The response is streamed in chunks from the archive and the hot table,
+    so memory does not grow with the length of the history.
+    """
+    if not audit_trail_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Audit trail service not available",
+        )
+    try:
+        since_dt = datetime.fromisoformat(since) if since else None
+        until_dt = datetime.fromisoformat(until) if until else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since/until timestamp")
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    return StreamingResponse(
+        audit_trail_service.stream_ndjson(
+            tenant_id, event_type=event_type, since=since_dt, until=until_dt
+        ),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit-log.ndjson"'},
+    )
+
+
+@app.get(
+    "/api/v1/audit-logs/aggregate",
+    response_model=APISuccessResponseSchema,
+    tags=["Audit"],
+)
+async def aggregate_audit_logs(
+    bucket: str = "hour",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    event_type: Optional[List[str]] = Query(None),
+    group_by: Optional[List[str]] = Query(None),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Count the tenant's audit events per time bucket and event type.
+
+    ``group_by`` adds ``event_data`` fields to the grouping, e.g.
+    ``?event_type=billing_routing&group_by=destination`` for documents
+    routed per destination per hour. Closed buckets are served from cache.
+    """
+    if not audit_aggregation_service or not audit_aggregation_service.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Audit aggregation not available",
+        )
+    try:
+        since_dt = datetime.fromisoformat(since) if since else None
+        until_dt = datetime.fromisoformat(until) if until else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since/until timestamp")
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    try:
+        result = await audit_aggregation_service.aggregate(
+            tenant_id,
+            bucket=bucket,
+            since=since_dt,
+            until=until_dt,
+            event_types=event_type,
+            group_by=group_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return APISuccessResponseSchema(message="Audit aggregation computed", data=result)
+
+
 @app.get(
     "/api/v1/audit-logs/{document_id}",
     response_model=APISuccessResponseSchema,
@@ -1211,6 +1888,7 @@ async def get_document_audit_logs(
             data=AuditLogListResponseSchema(
                 entries=[AuditLogEntrySchema(**e) for e in entries],
                 total_count=len(entries),
+                next_cursor=None,
             ).model_dump(),
         )
 
@@ -1224,6 +1902,54 @@ async def get_document_audit_logs(
         )
 
 
+@app.get(
+    "/api/v1/audit-archive",
+    response_model=APISuccessResponseSchema,
+    tags=["Audit"],
+)
+async def get_audit_archive_manifest(
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Archived audit trail files for the tenant, oldest first."""
+    if not audit_archive_service or not audit_archive_service.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Audit archive not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    segments = await audit_archive_service.get_manifest(tenant_id)
+    return APISuccessResponseSchema(
+        message="Audit archive manifest retrieved",
+        data={
+            "segments": segments,
+            "total_rows": sum(s["rows"] for s in segments),
+        },
+    )
+
+
+@app.get(
+    "/api/v1/audit-retention",
+    response_model=APISuccessResponseSchema,
+    tags=["Audit"],
+)
+async def get_audit_retention_progress(
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Progress of the running audit retention purge and the last finished one."""
+    if not audit_retention_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Audit retention not available",
+        )
+    return APISuccessResponseSchema(
+        message="Audit retention progress retrieved",
+        data={
+            **audit_retention_service.get_progress(),
+            "statistics": audit_retention_service.get_statistics(),
+        },
+    )
+
+
 # ---------------------------------------------------------------------------
 # Reprocess / extract detail endpoints (match frontend DocumentService.ts)
 # ---------------------------------------------------------------------------
@@ -1266,6 +1992,109 @@ async def reprocess_document(
         )
 
 
+@app.get(
+    "/api/v1/usage/claude",
+    response_model=APISuccessResponseSchema,
+    tags=["System"],
+)
+async def get_claude_usage(user: Dict[str, Any] = Depends(get_current_user)):
+    """Today's Claude usage, budgets and remaining allowance for the tenant."""
+    if not claude_usage_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Claude usage tracking not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    return APISuccessResponseSchema(
+        message="Claude usage retrieved",
+        data=claude_usage_service.get_tenant_report(tenant_id),
+    )
+
+
+@app.post(
+    "/api/v1/reprocessing/batch",
+    response_model=APISuccessResponseSchema,
+    tags=["Documents"],
+)
+async def start_batch_reprocessing(
+    request: BatchReprocessRequestSchema,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Reprocess a backlog of documents through Claude Message Batches.
+
+    Returns a job id immediately; poll the job endpoint for progress.
+    """
+    if not claude_batch_service or not claude_batch_service.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Batch reprocessing not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    try:
+        job_id = await claude_batch_service.start_job(request.document_ids, tenant_id)
+    except Exception as e:
+        logger.error(f"Batch reprocessing start error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start batch reprocessing",
+        )
+    return APISuccessResponseSchema(
+        message="Batch reprocessing started",
+        data={"job_id": job_id, "documents": len(request.document_ids)},
+    )
+
+
+@app.get(
+    "/api/v1/reprocessing/batch/{job_id}",
+    response_model=APISuccessResponseSchema,
+    tags=["Documents"],
+)
+async def get_batch_reprocessing_job(
+    job_id: str,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Progress of a batch reprocessing job."""
+    if not claude_batch_service:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Batch reprocessing not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    job = await claude_batch_service.get_job(job_id, tenant_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return APISuccessResponseSchema(
+        message="Batch reprocessing job retrieved",
+        data=claude_batch_service.job_summary(job),
+    )
+
+
+@app.post(
+    "/api/v1/reprocessing/batch/{job_id}/resume",
+    response_model=APISuccessResponseSchema,
+    tags=["Documents"],
+)
+async def resume_batch_reprocessing_job(
+    job_id: str,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Resume a failed or interrupted batch reprocessing job."""
+    if not claude_batch_service or not claude_batch_service.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Batch reprocessing not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    job = await claude_batch_service.get_job(job_id, tenant_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    resumed = await claude_batch_service.resume_job(job_id, tenant_id)
+    return APISuccessResponseSchema(
+        message="Batch reprocessing resumed" if resumed else "Nothing to resume",
+        data={"job_id": job_id, "resumed": resumed, "status": job["status"]},
+    )
+
+
 @app.get("/extract/invoice/{document_id}/details", tags=["Documents"])
 async def get_extract_details(
     document_id: str,
@@ -1367,35 +2196,33 @@ async def export_vendors(
     format: str = "json",
     user: Dict[str, Any] = Depends(get_current_user),
 ):
-    """Export all vendors in JSON or CSV format."""
-    try:
-        if not vendor_import_export_service:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Import/export service not available",
-            )
-        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+    """Export all vendors as JSON (default), NDJSON or CSV.
 
-        if format == "csv":
-            csv_data = await vendor_import_export_service.export_vendors_csv(
-                tenant_id=tenant_id
-            )
-            return JSONResponse(
-                content={"success": True, "format": "csv", "data": csv_data},
-            )
-        else:
-            json_data = await vendor_import_export_service.export_vendors_json(
-                tenant_id=tenant_id
-            )
-            return {"success": True, "format": "json", "data": json_data}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Export vendors error: {e}")
+    The response is streamed from keyset-paginated pages, so memory and
+    time-to-first-byte do not grow with the number of vendors.
+    """
+    if not vendor_import_export_service:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to export vendors",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Import/export service not available",
+        )
+    tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+
+    if format == "csv":
+        return StreamingResponse(
+            vendor_import_export_service.stream_vendors_csv(tenant_id=tenant_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="vendors.csv"'},
+        )
+    if format == "ndjson":
+        return StreamingResponse(
+            vendor_import_export_service.stream_vendors_ndjson(tenant_id=tenant_id),
+            media_type="application/x-ndjson",
         )
+    return StreamingResponse(
+        vendor_import_export_service.stream_vendors_json(tenant_id=tenant_id),
+        media_type="application/json",
+    )
 
 
 @app.get("/vendors/{vendor_id}", tags=["Vendors"])
@@ -1589,10 +2416,10 @@ async def import_vendors(
             )
         tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
 
-        # Collect valid GL codes for validation
+        # Collect valid GL codes (base + tenant overlay) for validation
         gl_codes: set = set()
-        if gl_account_service and gl_account_service.gl_accounts:
-            gl_codes = set(gl_account_service.gl_accounts.keys())
+        if gl_account_service and gl_account_service.initialized:
+            gl_codes = gl_account_service.get_account_codes(tenant_id)
 
         result = await vendor_import_export_service.import_vendors_json(
             data=body.vendors,
@@ -1611,6 +2438,64 @@ async def import_vendors(
         )
 
 
+@app.post(
+    "/vendors/import/file",
+    response_model=VendorImportResultSchema,
+    tags=["Vendors"],
+)
+async def import_vendors_file(
+    file: UploadFile = File(...),
+    mode: str = "merge",
+    format: Optional[str] = None,
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Import vendors from an uploaded CSV, NDJSON or JSON file.
+
+    The upload is stream-parsed and applied in a single transaction.  The
+    format defaults to the file extension.
+    """
+    try:
+        if not vendor_import_export_service:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Import/export service not available",
+            )
+        if mode not in ("merge", "overwrite", "append"):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Import mode must be merge, overwrite, or append",
+            )
+        file_format = (format or Path(file.filename or "").suffix.lstrip(".")).lower()
+        if file_format == "jsonl":
+            file_format = "ndjson"
+        if file_format not in ("csv", "ndjson", "json"):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Import format must be csv, ndjson, or json",
+            )
+        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
+
+        gl_codes: set = set()
+        if gl_account_service and gl_account_service.initialized:
+            gl_codes = gl_account_service.get_account_codes(tenant_id)
+
+        return await vendor_import_export_service.import_vendors_file(
+            file.file,
+            file_format,
+            mode=mode,
+            tenant_id=tenant_id,
+            gl_codes=gl_codes if gl_codes else None,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Import vendors file error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to import vendors",
+        )
+
+
 @app.post("/vendors/import/validate", tags=["Vendors"])
 async def validate_vendor_import(
     body: VendorImportRequestSchema,
@@ -1623,11 +2508,11 @@ async def validate_vendor_import(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Import/export service not available",
             )
+        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
         gl_codes: set = set()
-        if gl_account_service and gl_account_service.gl_accounts:
-            gl_codes = set(gl_account_service.gl_accounts.keys())
+        if gl_account_service and gl_account_service.initialized:
+            gl_codes = gl_account_service.get_account_codes(tenant_id)
 
-        tenant_id = user.get("tenant_id", production_settings.DEFAULT_TENANT_ID)
         result = vendor_import_export_service.validate_import_data(
             data=body.vendors,
             gl_codes=gl_codes if gl_codes else None,
@@ -1892,11 +2777,93 @@ async def api_status():
     else:
         services_status["gl_accounts"] = {"status": "not_initialized"}
 
+    if classification_cache_service:
+        services_status["classification_cache"] = {
+            "status": "active" if classification_cache_service.enabled else "disabled",
+            **classification_cache_service.get_statistics(),
+        }
+
+    if claude_response_cache_service:
+        services_status["claude_response_cache"] = {
+            "status": (
+                "active" if claude_response_cache_service.enabled else "disabled"
+            ),
+            **claude_response_cache_service.get_statistics(),
+        }
+
+    if claude_client_service:
+        services_status["claude_client"] = {
+            "status": "active" if claude_client_service.available else "disabled",
+            **claude_client_service.get_statistics(),
+        }
+
+    if audit_archive_service:
+        services_status["audit_archive"] = {
+            "status": "active" if audit_archive_service.enabled else "disabled",
+            **audit_archive_service.get_statistics(),
+        }
+
+    if dashboard_rollup_service:
+        services_status["dashboard_rollups"] = {
+            "status": "active" if dashboard_rollup_service.enabled else "disabled",
+            **dashboard_rollup_service.get_statistics(),
+        }
+
+    if _startup_plan:
+        services_status["startup"] = {
+            "status": "complete",
+            **_startup_plan.get_timings(),
+            "schema": get_schema_status(),
+        }
+
+    if health_monitor_service:
+        services_status["health_monitor"] = {
+            "status": "active" if health_monitor_service.enabled else "disabled",
+            **health_monitor_service.get_statistics(),
+        }
+
+    if dashboard_cache:
+        services_status["dashboard_cache"] = {
+            "status": "active" if dashboard_cache.enabled else "disabled",
+            **dashboard_cache.get_statistics(),
+        }
+
+    if audit_aggregation_service:
+        services_status["audit_aggregation"] = {
+            "status": "active" if audit_aggregation_service.enabled else "disabled",
+            **audit_aggregation_service.get_statistics(),
+        }
+
+    if audit_retention_service:
+        services_status["audit_retention"] = {
+            "status": "active" if audit_retention_service.enabled else "disabled",
+            **audit_retention_service.get_statistics(),
+        }
+
+    if claude_usage_service:
+        services_status["claude_usage"] = {
+            "status": "active" if claude_usage_service.enabled else "disabled",
+            **claude_usage_service.get_statistics(),
+        }
+
+    if claude_batch_service:
+        services_status["claude_batch"] = {
+            "status": "active" if claude_batch_service.available else "disabled",
+            **claude_batch_service.get_statistics(),
+        }
+
+    if image_preprocessor_service:
+        services_status["image_preprocessor"] = {
+            "status": "active" if image_preprocessor_service.enabled else "disabled",
+            **image_preprocessor_service.get_statistics(),
+        }
+
     if payment_detection_service:
         methods = payment_detection_service.get_enabled_methods()
         services_status["payment_detection"] = {
             "status": "active",
             "methods": len(methods),
+            **payment_detection_service.get_statistics(),
         }
     else:
         services_status["payment_detection"] = {"status": "not_initialized"}
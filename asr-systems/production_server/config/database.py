@@ -4,9 +4,12 @@ SQLAlchemy async engine and session management for audit trail persistence.
 """
 
 import logging
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Set
 
+import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -27,6 +30,37 @@ class Base(DeclarativeBase):
 # Module-level state
 _engine: Optional[AsyncEngine] = None
 _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_schema_status: Dict[str, Any] = {}
+
+_ALEMBIC_VERSIONS = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+_REVISION_LINE = re.compile(
+    r"^(down_revision|revision)\b[^=\n]*=\s*(?:[\"']([^\"']+)[\"']|None)", re.M
+)
+
+
+@lru_cache(maxsize=None)
+def alembic_head_revision(versions_dir: Path = _ALEMBIC_VERSIONS) -> Optional[str]:
+    """Head revision of the migration scripts, without importing Alembic.
+
+    Reads the ``revision``/``down_revision`` assignments of each script.
+    Returns None when the scripts are not shipped or the history branches.
+    """
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+    try:
+        scripts = list(versions_dir.glob("*.py"))
+    except OSError:
+        return None
+    for script in scripts:
+        try:
+            source = script.read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for kind, value in _REVISION_LINE.findall(source):
+            if value:
+                (revisions if kind == "revision" else parents).add(value)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
 
 
 def _convert_database_url(url: str) -> str:
@@ -43,9 +77,16 @@ async def init_database(
     pool_size: int = 20,
     max_overflow: int = 30,
     pool_recycle: int = 3600,
+    skip_create_when_current: bool = True,
 ) -> None:
-    """Create async engine, session factory, and run table creation."""
-    global _engine, _session_factory
+    """Create async engine, session factory, and run table creation.
+
+    With ``skip_create_when_current``, ``create_all`` is skipped when the
+    database's ``alembic_version`` already matches the migration head: the
+    schema is known to be complete, so startup avoids one inspection round
+    trip per table.
+    """
+    global _engine, _session_factory, _schema_status
 
     # Dispose previous engine if re-initializing (e.g. tests calling init_database multiple times)
     if _engine is not None:
@@ -73,25 +114,71 @@ async def init_database(
     # Import all ORM models so Base.metadata.create_all() registers their tables
     try:
         from ..models import (  # noqa: F401
+            AuditArchiveSegmentRecord,
+            AuditRetentionRunRecord,
             AuditTrailRecord,
+            ClassificationCacheRecord,
+            ClaudeBatchJobRecord,
+            ClaudeResponseCacheRecord,
+            ClaudeTenantUsageRecord,
+            DashboardRecentDocumentRecord,
+            DashboardRollupDocumentRecord,
+            DashboardRollupRecord,
             GLAccountRecord,
             VendorRecord,
+            VendorStatsDocumentRecord,
+            VendorStatsRecord,
         )
     except (ImportError, SystemError):
         from models import (  # type: ignore[no-redef, attr-defined]  # noqa: F401
+            AuditArchiveSegmentRecord,
+            AuditRetentionRunRecord,
             AuditTrailRecord,
+            ClassificationCacheRecord,
+            ClaudeBatchJobRecord,
+            ClaudeResponseCacheRecord,
+            ClaudeTenantUsageRecord,
+            DashboardRecentDocumentRecord,
+            DashboardRollupDocumentRecord,
+            DashboardRollupRecord,
             GLAccountRecord,
             VendorRecord,
+            VendorStatsDocumentRecord,
+            VendorStatsRecord,
         )
 
-    async with _engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    head = alembic_head_revision() if skip_create_when_current else None
+    current = await _alembic_current_revision(_engine) if head else None
+    if head and current == head:
+        _schema_status = {"alembic_revision": current, "create_all": "skipped"}
+    else:
+        async with _engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_status = {"alembic_revision": current, "create_all": "ran"}
 
     logger.info(
         "Database engine initialized (%s)", "SQLite" if is_sqlite else "PostgreSQL"
     )
 
 
+async def _alembic_current_revision(engine: AsyncEngine) -> Optional[str]:
+    """The revision stamped in ``alembic_version``, or None if unavailable."""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                sa.text("SELECT version_num FROM alembic_version")
+            )
+            rows = result.fetchall()
+    except Exception:
+        return None  # never migrated (no table) or not reachable yet
+    return rows[0][0] if len(rows) == 1 else None
+
+
+def get_schema_status() -> Dict[str, Any]:
+    """How the last ``init_database`` handled schema creation."""
+    return dict(_schema_status)
+
+
 async def close_database() -> None:
     """Dispose the async engine."""
     global _engine, _session_factory
@@ -116,6 +116,99 @@ class ProductionSettings(BaseSettings):
         description="Claude temperature for consistency",
     )
 
+    CLAUDE_BASE_URL: Optional[str] = Field(
+        default=None,
+        description="Override the Claude API base URL (proxies, local fake server)",
+    )
+
+    # Adaptive concurrency limit shared by all Claude API calls in a worker
+    CLAUDE_INITIAL_CONCURRENCY: int = Field(
+        default=4,
+        description="Concurrent Claude requests allowed before any adaptation",
+    )
+
+    CLAUDE_MIN_CONCURRENCY: int = Field(
+        default=1,
+        description="Floor for the adaptive Claude concurrency limit",
+    )
+
+    CLAUDE_MAX_CONCURRENCY: int = Field(
+        default=16,
+        description="Ceiling for the adaptive Claude concurrency limit",
+    )
+
+    CLAUDE_LATENCY_TARGET_SECONDS: float = Field(
+        default=20.0,
+        description="Claude calls slower than this shrink the limit (0 disables)",
+    )
+
+    # Batch-mode reprocessing through the Message Batches API
+    CLAUDE_BATCH_ENABLED: bool = Field(
+        default=True,
+        description="Allow reprocessing backlogs through Claude Message Batches",
+    )
+
+    CLAUDE_BATCH_POLL_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds between Message Batch status checks",
+    )
+
+    CLAUDE_BATCH_MAX_REQUESTS: int = Field(
+        default=10000,
+        description="Claude requests per submitted Message Batch",
+    )
+
+    # Per-tenant Claude usage accounting and daily budgets (0 = unlimited);
+    # tenants over budget get local-only payment detection
+    CLAUDE_USAGE_TRACKING_ENABLED: bool = Field(
+        default=True,
+        description="Record per-tenant Claude calls, tokens, spend and latency",
+    )
+
+    CLAUDE_INPUT_COST_PER_MTOK: float = Field(
+        default=3.0,
+        description="USD per million Claude input tokens, for spend estimates",
+    )
+
+    CLAUDE_OUTPUT_COST_PER_MTOK: float = Field(
+        default=15.0,
+        description="USD per million Claude output tokens, for spend estimates",
+    )
+
+    CLAUDE_TENANT_DAILY_CALL_BUDGET: int = Field(
+        default=0,
+        description="Claude API calls per tenant per UTC day",
+    )
+
+    CLAUDE_TENANT_DAILY_TOKEN_BUDGET: int = Field(
+        default=0,
+        description="Claude tokens (input + output) per tenant per UTC day",
+    )
+
+    CLAUDE_TENANT_DAILY_SPEND_BUDGET_USD: float = Field(
+        default=0.0,
+        description="Estimated Claude spend per tenant per UTC day",
+    )
+
+    CLAUDE_TENANT_DAILY_LATENCY_BUDGET_SECONDS: float = Field(
+        default=0.0,
+        description="Seconds spent waiting on Claude per tenant per UTC day",
+    )
+
+    CLAUDE_TENANT_BUDGETS: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description=(
+            "Per-tenant overrides as JSON, e.g. "
+            '{"acme": {"spend_usd": 50, "calls": 0}}; keys: calls, tokens, '
+            "spend_usd, latency_seconds"
+        ),
+    )
+
+    CLAUDE_USAGE_FLUSH_SECONDS: float = Field(
+        default=5.0,
+        description="Interval for writing Claude usage to the database",
+    )
+
     # Storage Configuration
     STORAGE_BACKEND: str = Field(
         default="local",
@@ -207,6 +300,18 @@ class ProductionSettings(BaseSettings):
         description="Minimum confidence for GL classification",
     )
 
+    GL_LOCAL_MODEL_PATH: Optional[str] = Field(
+        default="data/models/gl_classifier.npz",
+        description=(
+            "Trained local GL model (train_gl_classifier.py); ignored if absent"
+        ),
+    )
+
+    GL_LOCAL_MODEL_MIN_CONFIDENCE: float = Field(
+        default=0.55,
+        description=("Minimum local model probability to contribute a classification"),
+    )
+
     # Payment Detection Configuration (5-method consensus)
     PAYMENT_DETECTION_ENABLED: bool = Field(
         default=True,
@@ -229,6 +334,112 @@ class ProductionSettings(BaseSettings):
         description="Minimum consensus confidence for payment detection",
     )
 
+    PAYMENT_EARLY_EXIT_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Skip Claude methods when local methods agree above "
+            "PAYMENT_CONSENSUS_THRESHOLD"
+        ),
+    )
+
+    PAYMENT_LOCAL_METHOD_TIMEOUT_SECONDS: float = Field(
+        default=2.0,
+        description="Timeout for each local (regex/keyword/amount) detection method",
+    )
+
+    PAYMENT_CLAUDE_METHOD_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        description="Timeout for each Claude detection method, including retries",
+    )
+
+    PAYMENT_CLAUDE_TEXT_TOKEN_BUDGET: int = Field(
+        default=2000,
+        description=(
+            "Estimated token budget for document text sent to Claude Text; longer "
+            "documents are reduced to the most relevant windows (0 sends it all)"
+        ),
+    )
+
+    # Claude Vision image preprocessing
+    VISION_PREPROCESS_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Rasterize PDFs, convert TIFFs and downscale scans for Claude Vision"
+        ),
+    )
+
+    VISION_PREPROCESS_WORKERS: int = Field(
+        default=2,
+        description="Worker processes for image preparation (0 uses a thread)",
+    )
+
+    VISION_MAX_LONG_EDGE: int = Field(
+        default=1568,
+        description="Vision images are downscaled to this long edge in pixels",
+    )
+
+    VISION_MAX_IMAGE_BYTES: int = Field(
+        default=1024 * 1024,
+        description="Byte budget for vision images after JPEG recompression",
+    )
+
+    VISION_PDF_PAGES: int = Field(
+        default=1,
+        description="Leading PDF pages rasterized (stacked) into the vision image",
+    )
+
+    VISION_PREPROCESS_CACHE_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Memory for prepared images cached by content hash",
+    )
+
+    # Classification memoization cache
+    CLASSIFICATION_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Memoize GL classification and payment detection results",
+    )
+
+    CLASSIFICATION_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="Maximum entries held in the in-memory LRU tier",
+    )
+
+    CLASSIFICATION_CACHE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600,
+        description="Time-to-live for cached classification results",
+    )
+
+    CLASSIFICATION_CACHE_PERSISTENT: bool = Field(
+        default=True,
+        description="Back the in-memory cache with the classification_cache table",
+    )
+
+    # Claude response cache (raw text/vision responses, shared by workers)
+    CLAUDE_RESPONSE_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache Claude responses by model, prompt version and content hash",
+    )
+
+    CLAUDE_RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=2000,
+        description="Maximum responses held in each worker's in-memory LRU tier",
+    )
+
+    CLAUDE_RESPONSE_CACHE_MAX_ROWS: int = Field(
+        default=100000,
+        description="Maximum rows kept in the claude_response_cache table",
+    )
+
+    CLAUDE_RESPONSE_CACHE_MAX_RESPONSE_BYTES: int = Field(
+        default=64 * 1024,
+        description="Responses larger than this are not cached",
+    )
+
+    CLAUDE_RESPONSE_CACHE_TTL_SECONDS: int = Field(
+        default=30 * 24 * 3600,
+        description="Time-to-live for cached Claude responses",
+    )
+
     # Billing Router Configuration (4 destinations)
     ROUTING_RULES_CONFIG_PATH: str = Field(
         default="config/routing_rules.yaml",
@@ -271,6 +482,153 @@ class ProductionSettings(BaseSettings):
         description="Audit trail retention period in days",
     )
 
+    AUDIT_BUFFER_ENABLED: bool = Field(
+        default=True,
+        description="Queue audit trail entries and write them in batches "
+        "from a background writer",
+    )
+
+    AUDIT_BUFFER_MAX_EVENTS: int = Field(
+        default=10000,
+        description="Maximum audit trail entries held in the write buffer",
+    )
+
+    AUDIT_FLUSH_BATCH_SIZE: int = Field(
+        default=500,
+        description="Audit trail entries written per flush transaction",
+    )
+
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="Maximum time an audit trail entry waits in the buffer",
+    )
+
+    AUDIT_OVERFLOW_POLICY: str = Field(
+        default="block",
+        description="What to do when the audit buffer is full "
+        "(block, drop_oldest, drop_newest, sync)",
+    )
+
+    AUDIT_RETENTION_PURGE_ENABLED: bool = Field(
+        default=True,
+        description="Run the scheduled audit trail retention purge",
+    )
+
+    AUDIT_RETENTION_INTERVAL_HOURS: float = Field(
+        default=24.0,
+        description="Hours between audit trail retention purges",
+    )
+
+    AUDIT_RETENTION_BATCH_SIZE: int = Field(
+        default=5000,
+        description="Audit trail rows deleted per retention transaction",
+    )
+
+    AUDIT_RETENTION_PAUSE_SECONDS: float = Field(
+        default=0.1,
+        description="Pause between audit trail retention delete batches",
+    )
+
+    AUDIT_RETENTION_DROP_PARTITIONS: bool = Field(
+        default=False,
+        description="On PostgreSQL, drop audit_trail range partitions lying "
+        "wholly before the retention cutoff instead of deleting their rows",
+    )
+
+    AUDIT_ARCHIVE_ENABLED: bool = Field(
+        default=True,
+        description="Move aged audit trail events to compressed files in "
+        "the storage backend",
+    )
+
+    AUDIT_ARCHIVE_AFTER_DAYS: int = Field(
+        default=365,
+        description="Age in days after which audit trail events are archived",
+    )
+
+    AUDIT_ARCHIVE_ROWS_PER_FILE: int = Field(
+        default=50000,
+        description="Maximum audit trail events per archive file",
+    )
+
+    AUDIT_ARCHIVE_COMPRESSION: str = Field(
+        default="auto",
+        description="Audit archive compression (auto, zst, gz); auto uses "
+        "zstd when zstandard is installed, otherwise gzip",
+    )
+
+    AUDIT_ARCHIVE_INTERVAL_HOURS: float = Field(
+        default=24.0,
+        description="Hours between audit archive runs",
+    )
+
+    AUDIT_AGGREGATION_MAX_BUCKETS: int = Field(
+        default=2000,
+        description="Maximum time buckets one audit aggregation query may span",
+    )
+
+    AUDIT_AGGREGATION_CACHE_BUCKETS: int = Field(
+        default=20000,
+        description="Closed audit aggregation buckets kept in memory",
+    )
+
+    DASHBOARD_ROLLUPS_ENABLED: bool = Field(
+        default=True,
+        description="Maintain per-tenant dashboard rollups from the document "
+        "pipeline (backfilled once from storage metadata when empty)",
+    )
+
+    DASHBOARD_RECENT_DOCUMENTS: int = Field(
+        default=25,
+        description="Recent documents kept per tenant for the dashboard",
+    )
+
+    DASHBOARD_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Cache dashboard metric responses per tenant, coalescing "
+        "concurrent requests for the same metric",
+    )
+
+    DASHBOARD_CACHE_TTL_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds a cached dashboard response is served as fresh",
+    )
+
+    DASHBOARD_CACHE_STALE_SECONDS: float = Field(
+        default=300.0,
+        description="Seconds past the TTL a cached dashboard response is still "
+        "served while it refreshes in the background",
+    )
+
+    DASHBOARD_CACHE_MAX_ENTRIES: int = Field(
+        default=1000,
+        description="Maximum cached dashboard responses across all tenants",
+    )
+
+    # Startup Configuration
+    STARTUP_PARALLEL_ENABLED: bool = Field(
+        default=True,
+        description="Initialize independent services concurrently at startup",
+    )
+
+    STARTUP_DEFER_WARMUPS: bool = Field(
+        default=True,
+        description="Run non-critical warmups (vendor match index, cache purge, "
+        "batch job resumption) after the server is ready",
+    )
+
+    DB_SKIP_CREATE_ALL_WHEN_CURRENT: bool = Field(
+        default=True,
+        description="Skip create_all at startup when alembic_version matches the "
+        "migration head",
+    )
+
+    LAZY_SDK_IMPORTS: bool = Field(
+        default=True,
+        description="Import optional SDKs (anthropic) on first use or in a "
+        "deferred warmup instead of during startup",
+    )
+
     # Background Processing Configuration
     BACKGROUND_PROCESSING_ENABLED: bool = Field(
         default=True,
@@ -378,7 +736,35 @@ class ProductionSettings(BaseSettings):
 
     HEALTH_CHECK_INTERVAL: int = Field(
         default=60,
-        description="Health check interval in seconds",
+        description="Default interval in seconds for background component "
+        "health checks",
+    )
+
+    HEALTH_MONITOR_ENABLED: bool = Field(
+        default=True,
+        description="Refresh component health in the background and serve "
+        "probes from the latest snapshot (off: check on every probe)",
+    )
+
+    HEALTH_DATABASE_CHECK_INTERVAL: int = Field(
+        default=15,
+        description="Interval in seconds for the background database check",
+    )
+
+    HEALTH_STORAGE_CHECK_INTERVAL: int = Field(
+        default=300,
+        description="Interval in seconds for the background storage check, "
+        "which scans the archive",
+    )
+
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        description="Timeout for one background component health check",
+    )
+
+    HEALTH_STORAGE_CHECK_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        description="Timeout for the background storage health check",
     )
 
     @property
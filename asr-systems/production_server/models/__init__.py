@@ -1,7 +1,31 @@
 """ASR Production Server - ORM Models"""
 
+from .audit_archive_segment import AuditArchiveSegmentRecord
+from .audit_retention_run import AuditRetentionRunRecord
 from .audit_trail import AuditTrailRecord
+from .classification_cache import ClassificationCacheRecord
+from .claude_batch_job import ClaudeBatchJobRecord
+from .claude_response_cache import ClaudeResponseCacheRecord
+from .claude_usage import ClaudeTenantUsageRecord
+from .dashboard_recent_document import DashboardRecentDocumentRecord
+from .dashboard_rollup import DashboardRollupDocumentRecord, DashboardRollupRecord
 from .gl_account import GLAccountRecord
 from .vendor import VendorRecord
+from .vendor_stats import VendorStatsDocumentRecord, VendorStatsRecord
 
-__all__ = ["AuditTrailRecord", "GLAccountRecord", "VendorRecord"]
+__all__ = [
+    "AuditArchiveSegmentRecord",
+    "AuditRetentionRunRecord",
+    "AuditTrailRecord",
+    "ClassificationCacheRecord",
+    "ClaudeBatchJobRecord",
+    "ClaudeResponseCacheRecord",
+    "ClaudeTenantUsageRecord",
+    "DashboardRecentDocumentRecord",
+    "DashboardRollupDocumentRecord",
+    "DashboardRollupRecord",
+    "GLAccountRecord",
+    "VendorRecord",
+    "VendorStatsDocumentRecord",
+    "VendorStatsRecord",
+]
@@ -0,0 +1,41 @@
+"""
+ASR Production Server - Audit Archive Segment ORM Model
+Manifest of archived audit trail files: one row per compressed JSONL file
+of a tenant's events for one month, with its time range and a Bloom filter
+of the document ids it holds so lookups only open matching files.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class AuditArchiveSegmentRecord(Base):
+    """One archived file of audit trail events."""
+
+    __tablename__ = "audit_archive_segments"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255), index=True)
+    month: Mapped[str] = mapped_column(String(7))  # YYYY-MM
+    storage_key: Mapped[str] = mapped_column(String(1024))
+    compression: Mapped[str] = mapped_column(String(10))
+    row_count: Mapped[int] = mapped_column(Integer, default=0)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    min_timestamp: Mapped[datetime] = mapped_column(DateTime)
+    max_timestamp: Mapped[datetime] = mapped_column(DateTime)
+    document_filter: Mapped[str] = mapped_column(Text)  # base64 Bloom filter
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+
+    __table_args__ = (
+        Index("ix_audit_archive_tenant_max_ts", "tenant_id", "max_timestamp"),
+    )
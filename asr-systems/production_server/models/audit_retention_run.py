@@ -0,0 +1,42 @@
+"""
+ASR Production Server - Audit Retention Run ORM Model
+Progress of an audit trail retention purge: the cutoff it deletes up to and
+how far it got, so an interrupted purge resumes with the same cutoff.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import JSON, DateTime, Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class AuditRetentionRunRecord(Base):
+    """One retention purge of the audit trail."""
+
+    __tablename__ = "audit_retention_runs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), index=True)
+    cutoff: Mapped[datetime] = mapped_column(DateTime)
+    deleted: Mapped[int] = mapped_column(Integer, default=0)
+    batches: Mapped[int] = mapped_column(Integer, default=0)
+    # Oldest timestamp still to delete; the last batch's newest row
+    watermark: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    partitions_dropped: Mapped[List[str]] = mapped_column(JSON, default=list)
+    elapsed_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,37 @@
+"""
+ASR Production Server - Classification Cache ORM Model
+Persistent tier of the GL classification / payment detection memoization cache.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class ClassificationCacheRecord(Base):
+    """Memoized classification result keyed by content hash and ruleset version."""
+
+    __tablename__ = "classification_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    tenant_id: Mapped[str] = mapped_column(String(255), default="default")
+    ruleset_version: Mapped[str] = mapped_column(String(64))
+    result: Mapped[dict] = mapped_column(JSON, default=dict)
+    claude_calls: Mapped[int] = mapped_column(Integer, default=0)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        index=True,
+    )
+
+    __table_args__ = (
+        Index("ix_classification_cache_kind_tenant", "kind", "tenant_id"),
+    )
@@ -0,0 +1,43 @@
+"""
+ASR Production Server - Claude Batch Job ORM Model
+Progress of a batch-mode reprocessing job: the Message Batches submitted for
+it, how far planning and reprocessing got, and result counts, so a job can
+be resumed after a restart.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class ClaudeBatchJobRecord(Base):
+    """One batch reprocessing job for a tenant."""
+
+    __tablename__ = "claude_batch_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255), index=True)
+    status: Mapped[str] = mapped_column(String(20), index=True)
+    document_ids: Mapped[List[str]] = mapped_column(JSON, default=list)
+    # [{"id", "status", "requests": {custom_id: [kind, content hash]}}]
+    batches: Mapped[List[Dict[str, Any]]] = mapped_column(JSON, default=list)
+    planned: Mapped[int] = mapped_column(Integer, default=0)
+    reprocessed: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    results: Mapped[Dict[str, int]] = mapped_column(JSON, default=dict)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
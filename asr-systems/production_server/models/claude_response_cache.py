@@ -0,0 +1,35 @@
+"""
+ASR Production Server - Claude Response Cache ORM Model
+Raw Claude text/vision responses keyed by model, prompt template version and
+content hash, shared by every worker that talks to the same database.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class ClaudeResponseCacheRecord(Base):
+    """Cached Claude response for one (kind, model, prompt version, content hash)."""
+
+    __tablename__ = "claude_response_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20))
+    model: Mapped[str] = mapped_column(String(100))
+    prompt_version: Mapped[str] = mapped_column(String(64))
+    content_hash: Mapped[str] = mapped_column(String(64))
+    response_text: Mapped[str] = mapped_column(Text)
+    latency_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        index=True,
+    )
@@ -0,0 +1,34 @@
+"""
+ASR Production Server - Claude Usage ORM Model
+Per-tenant, per-day Claude consumption (calls, tokens, estimated spend and
+latency) that budgets are enforced against.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class ClaudeTenantUsageRecord(Base):
+    """Claude usage of one tenant on one UTC day ("2026-10-18")."""
+
+    __tablename__ = "claude_tenant_usage"
+
+    tenant_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    usage_date: Mapped[str] = mapped_column(String(10), primary_key=True)
+    calls: Mapped[int] = mapped_column(Integer, default=0)
+    batch_calls: Mapped[int] = mapped_column(Integer, default=0)
+    input_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    downgrades: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
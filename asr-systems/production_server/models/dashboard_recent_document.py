@@ -0,0 +1,36 @@
+"""
+ASR Production Server - Dashboard Recent Document ORM Model
+The latest processed documents per tenant for the dashboard's recent list,
+trimmed to a fixed size on every insert.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class DashboardRecentDocumentRecord(Base):
+    """Summary of a recently processed document."""
+
+    __tablename__ = "dashboard_recent_documents"
+
+    document_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255))
+    filename: Mapped[str] = mapped_column(String(255), default="")
+    vendor_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    amount: Mapped[float] = mapped_column(Float, default=0.0)
+    payment_status: Mapped[str] = mapped_column(String(20), default="unknown")
+    gl_account_code: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    confidence: Mapped[float] = mapped_column(Float, default=0.0)
+    billing_destination: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    processed_at: Mapped[datetime] = mapped_column(DateTime)
+
+    __table_args__ = (
+        Index("ix_dashboard_recent_tenant_processed", "tenant_id", "processed_at"),
+    )
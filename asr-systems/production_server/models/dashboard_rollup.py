@@ -0,0 +1,62 @@
+"""
+ASR Production Server - Dashboard Rollup ORM Model
+Per-tenant daily rollups (document totals, GL accounts, payment status,
+billing destinations, vendors and unpaid invoice dates for aging) maintained
+by the document pipeline so dashboard metrics are an indexed read, plus what
+each document contributed so it can be taken back out.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class DashboardRollupRecord(Base):
+    """One rollup bucket for a tenant and day, e.g. ("gl_account", "5000")."""
+
+    __tablename__ = "dashboard_rollups"
+
+    # Primary key order serves (tenant, dimension, day range) scans
+    tenant_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(50), primary_key=True)
+    label: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    document_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_amount: Mapped[float] = mapped_column(Float, default=0.0)
+    confidence_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    manual_review_count: Mapped[int] = mapped_column(Integer, default=0)
+    processing_ms_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+
+
+class DashboardRollupDocumentRecord(Base):
+    """The rollup contribution of one document, reversed on reprocess or delete."""
+
+    __tablename__ = "dashboard_rollup_documents"
+
+    document_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255))
+    day: Mapped[str] = mapped_column(String(10))
+    amount: Mapped[float] = mapped_column(Float, default=0.0)
+    payment_status: Mapped[str] = mapped_column(String(20), default="unknown")
+    billing_destination: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    gl_account_code: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    gl_account_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    vendor_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    invoice_day: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    gl_confidence: Mapped[float] = mapped_column(Float, default=0.0)
+    payment_confidence: Mapped[float] = mapped_column(Float, default=0.0)
+    routing_confidence: Mapped[float] = mapped_column(Float, default=0.0)
+    manual_review: Mapped[int] = mapped_column(Integer, default=0)
+    processing_ms: Mapped[float] = mapped_column(Float, default=0.0)
+
+    __table_args__ = (Index("ix_dashboard_rollup_documents_tenant", "tenant_id"),)
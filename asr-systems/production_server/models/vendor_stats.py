@@ -0,0 +1,56 @@
+"""
+ASR Production Server - Vendor Statistics ORM Models
+Incrementally maintained per-vendor rollups (monthly, GL account and
+payment-status buckets) so vendor stats are an indexed read, plus what each
+document contributed so it can be taken back out.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+try:
+    from ..config.database import Base
+except (ImportError, SystemError):
+    from config.database import Base  # type: ignore[no-redef]
+
+
+class VendorStatsRecord(Base):
+    """One rollup bucket for a vendor.
+
+    For example ``("month", "2026-10")`` or ``("gl_account", "5000")``.
+    """
+
+    __tablename__ = "vendor_stats"
+
+    vendor_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    bucket: Mapped[str] = mapped_column(String(50), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255))
+    label: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    document_count: Mapped[int] = mapped_column(Integer, default=0)
+    total_amount: Mapped[float] = mapped_column(Float, default=0.0)
+    last_document_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+
+    __table_args__ = (Index("ix_vendor_stats_tenant", "tenant_id"),)
+
+
+class VendorStatsDocumentRecord(Base):
+    """The rollup contribution of one document, reversed on reprocess or delete."""
+
+    __tablename__ = "vendor_stats_documents"
+
+    document_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(255))
+    vendor_id: Mapped[str] = mapped_column(String(36))
+    amount: Mapped[float] = mapped_column(Float, default=0.0)
+    document_date: Mapped[datetime] = mapped_column(DateTime)
+    gl_account_code: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    gl_account_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    payment_status: Mapped[str | None] = mapped_column(String(50), nullable=True)
+
+    __table_args__ = (Index("ix_vendor_stats_documents_vendor", "vendor_id"),)
@@ -0,0 +1,368 @@
+"""
+ASR Production Server - Audit Aggregation Service
+Time-bucketed counts over the audit trail for operations dashboards, e.g.
+documents routed per destination per hour or manual overrides per day.
+
+Counts are computed in SQL, grouped by time bucket, event type and up to a
+few ``event_data`` fields, with a tenant + timestamp range predicate that
+is served by the ``ix_audit_trail_tenant_timestamp`` index. Buckets that
+have closed (ended more than ``closed_grace_seconds`` ago, so buffered
+writes have landed) never change again and are cached; repeated dashboard
+queries only hit the table for the open bucket and any closed buckets not
+seen before.
+
+Only the hot ``audit_trail`` table is aggregated; events already moved to
+the cold archive are not counted.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, literal_column, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.audit_trail import AuditTrailRecord
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.audit_trail import AuditTrailRecord  # type: ignore[no-redef]
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = ("hour", "day", "month")
+
+# Range used when the caller gives no ``since``
+_DEFAULT_SPAN = {
+    "hour": timedelta(hours=24),
+    "day": timedelta(days=30),
+    "month": timedelta(days=365),
+}
+
+# SQLite has no date_trunc; strftime yields ISO strings instead
+_SQLITE_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+MAX_GROUP_FIELDS = 3
+_FIELD_SEGMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+
+_CacheKey = Tuple[str, str, Tuple[str, ...], Tuple[str, ...], datetime]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def floor_bucket(value: datetime, bucket: str) -> datetime:
+    """Start of the bucket containing ``value``."""
+    value = value.replace(minute=0, second=0, microsecond=0)
+    if bucket == "hour":
+        return value
+    value = value.replace(hour=0)
+    if bucket == "day":
+        return value
+    return value.replace(day=1)
+
+
+def next_bucket(start: datetime, bucket: str) -> datetime:
+    """Start of the bucket following the one starting at ``start``."""
+    if bucket == "hour":
+        return start + timedelta(hours=1)
+    if bucket == "day":
+        return start + timedelta(days=1)
+    return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _field_path(field: str) -> Any:
+    parts = field.split(".")
+    return parts[0] if len(parts) == 1 else tuple(parts)
+
+
+def _record_buckets(source: str, count: int) -> None:
+    try:
+        from services.metrics_service import record_audit_aggregation_buckets
+    except ImportError:
+        try:
+            from .metrics_service import record_audit_aggregation_buckets
+        except ImportError:
+            return
+    record_audit_aggregation_buckets(source, count)
+
+
+class AuditAggregationService:
+    """SQL time-bucket aggregation over the audit trail with a closed-bucket cache."""
+
+    def __init__(
+        self,
+        audit_trail_service: Any,
+        enabled: bool = True,
+        max_buckets: int = 2000,
+        cache_max_buckets: int = 20000,
+        closed_grace_seconds: float = 60.0,
+    ) -> None:
+        self.audit_trail_service = audit_trail_service
+        self.enabled = enabled
+        self.max_buckets = max(1, max_buckets)
+        self.cache_max_buckets = max(0, cache_max_buckets)
+        self.closed_grace_seconds = closed_grace_seconds
+        self.initialized = False
+
+        self._cache: "OrderedDict[_CacheKey, List[Dict[str, Any]]]" = OrderedDict()
+        self._queries: int = 0
+        self._cache_hits: int = 0
+        self._queried_buckets: int = 0
+
+    async def initialize(self) -> None:
+        self.initialized = True
+        logger.info(
+            "Audit Aggregation Service initialized (enabled=%s, max_buckets=%d, "
+            "cache=%d buckets)",
+            self.enabled,
+            self.max_buckets,
+            self.cache_max_buckets,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Audit Aggregation Service...")
+        self._cache.clear()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+
+    async def aggregate(
+        self,
+        tenant_id: str,
+        bucket: str = "hour",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        event_types: Optional[Sequence[str]] = None,
+        group_by: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """Count the tenant's audit events per bucket, event type and field.
+
+        ``group_by`` names ``event_data`` fields (dotted for nested keys,
+        e.g. ``document_context.vendor_name``). Buckets are aligned to UTC
+        hour/day/month boundaries and cover ``[since, until)``; rows come
+        back oldest bucket first. Raises ValueError on an unknown bucket, an
+        invalid field name or a range spanning more than ``max_buckets``.
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(
+                f"Unknown bucket {bucket!r}; expected one of {', '.join(BUCKETS)}"
+            )
+        fields = tuple(group_by or ())
+        self._validate_fields(fields)
+        types = tuple(sorted(set(event_types or ())))
+
+        now = _now()
+        end = _naive_utc(until) if until else now
+        begin = _naive_utc(since) if since else end - _DEFAULT_SPAN[bucket]
+        if begin >= end:
+            raise ValueError("since must be earlier than until")
+        start = floor_bucket(begin, bucket)
+        if floor_bucket(end, bucket) != end:
+            end = next_bucket(floor_bucket(end, bucket), bucket)
+
+        starts: List[datetime] = []
+        cursor = start
+        while cursor < end:
+            starts.append(cursor)
+            if len(starts) > self.max_buckets:
+                raise ValueError(
+                    f"Range spans more than {self.max_buckets} {bucket} buckets"
+                )
+            cursor = next_bucket(cursor, bucket)
+
+        # Buckets starting before this have ended at least the grace ago
+        closed_until = floor_bucket(
+            now - timedelta(seconds=self.closed_grace_seconds), bucket
+        )
+        closed = [b for b in starts if b < closed_until]
+        open_starts = starts[len(closed) :]
+
+        def key(b: datetime) -> _CacheKey:
+            return (tenant_id, bucket, types, fields, b)
+
+        by_bucket: Dict[datetime, List[Dict[str, Any]]] = {}
+        missing = [b for b in closed if key(b) not in self._cache]
+        if missing or open_starts:
+            # Buffered audit writes must land before counting
+            await self.audit_trail_service.flush()
+        if missing:
+            # One query over the missing span; cached buckets inside it are
+            # recounted too, which is cheaper than many small queries
+            span_end = next_bucket(missing[-1], bucket)
+            fresh = await self._query(
+                tenant_id, bucket, types, fields, missing[0], span_end
+            )
+            for b in closed:
+                if missing[0] <= b < span_end:
+                    by_bucket[b] = fresh.get(b, [])
+                    self._store(key(b), by_bucket[b])
+        hits = 0
+        for b in closed:
+            if b not in by_bucket:
+                self._cache.move_to_end(key(b))
+                by_bucket[b] = self._cache[key(b)]
+                hits += 1
+        if open_starts:
+            by_bucket.update(
+                await self._query(tenant_id, bucket, types, fields, open_starts[0], end)
+            )
+
+        self._cache_hits += hits
+        self._queried_buckets += len(starts) - hits
+        _record_buckets("cache", hits)
+        _record_buckets("query", len(starts) - hits)
+
+        return {
+            "bucket": bucket,
+            "since": start.isoformat(),
+            "until": end.isoformat(),
+            "event_types": list(types),
+            "group_by": list(fields),
+            "rows": [row for b in sorted(by_bucket) for row in by_bucket[b]],
+            "cached_buckets": hits,
+            "queried_buckets": len(starts) - hits,
+        }
+
+    def build_statement(
+        self,
+        dialect: str,
+        tenant_id: str,
+        bucket: str,
+        event_types: Sequence[str],
+        fields: Sequence[str],
+        start: datetime,
+        end: datetime,
+    ) -> Select:
+        """GROUP BY statement for one tenant and time range.
+
+        Grouping is positional so PostgreSQL accepts the bound bucket unit
+        and JSON keys in the select list.
+        """
+        if dialect == "sqlite":
+            bucket_col = func.strftime(
+                _SQLITE_FORMATS[bucket], AuditTrailRecord.timestamp
+            )
+        else:
+            bucket_col = func.date_trunc(bucket, AuditTrailRecord.timestamp)
+        field_cols = [
+            AuditTrailRecord.event_data[_field_path(f)].as_string() for f in fields
+        ]
+        stmt = (
+            select(
+                bucket_col,
+                AuditTrailRecord.event_type,
+                *field_cols,
+                func.count(),
+            )
+            .where(AuditTrailRecord.tenant_id == tenant_id)
+            .where(AuditTrailRecord.timestamp >= start)
+            .where(AuditTrailRecord.timestamp < end)
+        )
+        if event_types:
+            stmt = stmt.where(AuditTrailRecord.event_type.in_(list(event_types)))
+        return stmt.group_by(
+            *(literal_column(str(n)) for n in range(1, len(fields) + 3))
+        )
+
+    async def _query(
+        self,
+        tenant_id: str,
+        bucket: str,
+        event_types: Sequence[str],
+        fields: Sequence[str],
+        start: datetime,
+        end: datetime,
+    ) -> Dict[datetime, List[Dict[str, Any]]]:
+        async with get_async_session() as session:
+            dialect = session.bind.dialect.name if session.bind is not None else ""
+            stmt = self.build_statement(
+                dialect, tenant_id, bucket, event_types, fields, start, end
+            )
+            result = await session.execute(stmt)
+            rows = result.all()
+        self._queries += 1
+
+        by_bucket: Dict[datetime, List[Dict[str, Any]]] = {}
+        for row in rows:
+            b = row[0]
+            if isinstance(b, str):
+                b = datetime.fromisoformat(b)
+            b = _naive_utc(b)
+            values = [None if v is None else str(v) for v in row[2:-1]]
+            by_bucket.setdefault(b, []).append(
+                {
+                    "bucket": b.isoformat(),
+                    "event_type": row[1],
+                    "fields": dict(zip(fields, values)),
+                    "count": int(row[-1]),
+                }
+            )
+        for bucket_rows in by_bucket.values():
+            bucket_rows.sort(
+                key=lambda r: (
+                    r["event_type"],
+                    [v or "" for v in r["fields"].values()],
+                )
+            )
+        return by_bucket
+
+    def _store(self, key: _CacheKey, rows: List[Dict[str, Any]]) -> None:
+        if not self.cache_max_buckets:
+            return
+        self._cache[key] = rows
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_buckets:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _validate_fields(fields: Sequence[str]) -> None:
+        if len(fields) > MAX_GROUP_FIELDS:
+            raise ValueError(
+                f"At most {MAX_GROUP_FIELDS} event_data fields can be grouped"
+            )
+        for field in fields:
+            parts = field.split(".")
+            if len(parts) > 3 or not all(_FIELD_SEGMENT.match(p) for p in parts):
+                raise ValueError(f"Invalid event_data field {field!r}")
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> int:
+        """Drop cached buckets for one tenant, or all of them."""
+        keys = [k for k in self._cache if tenant_id is None or k[0] == tenant_id]
+        for k in keys:
+            del self._cache[k]
+        return len(keys)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return stats for the health endpoint."""
+        served = self._cache_hits + self._queried_buckets
+        return {
+            "enabled": self.enabled,
+            "initialized": self.initialized,
+            "max_buckets": self.max_buckets,
+            "cached_buckets": len(self._cache),
+            "cache_max_buckets": self.cache_max_buckets,
+            "queries": self._queries,
+            "bucket_cache_hits": self._cache_hits,
+            "buckets_queried": self._queried_buckets,
+            "cache_hit_rate": self._cache_hits / served if served else 0.0,
+        }
@@ -0,0 +1,591 @@
+"""
+ASR Production Server - Audit Archive Service
+Cold tier for the audit trail.
+
+Events older than ``archive_after_days`` are moved out of the hot
+``audit_trail`` table into compressed JSONL files in the storage backend,
+one or more files per tenant and month::
+
+    audit-archive/<tenant>/<YYYY-MM>/<segment id>.jsonl.zst
+
+Each file gets a row in ``audit_archive_segments`` holding its time range,
+row count and a Bloom filter of its document ids. The manifest row is
+written and the archived rows are deleted in one transaction, after the
+file is safely stored, so an event is always either hot or archived.
+
+``AuditTrailService`` consults the archive when reading: document lookups
+open only the files whose filter matches, and tenant listings read the
+newest files first until the requested page is filled. Files whose events
+have all passed the retention period are deleted with their manifest rows.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.audit_archive_segment import AuditArchiveSegmentRecord
+    from ..models.audit_trail import AuditTrailRecord
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.audit_archive_segment import (  # type: ignore[no-redef]
+        AuditArchiveSegmentRecord,
+    )
+    from models.audit_trail import AuditTrailRecord  # type: ignore[no-redef]
+
+try:
+    import zstandard
+
+    _HAS_ZSTD = True
+except ImportError:
+    _HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "audit-archive"
+COMPRESSIONS = ("auto", "zst", "gz")
+
+# Ids per DELETE statement, below SQLite's bound-parameter limit
+_DELETE_CHUNK = 500
+_BLOOM_FALSE_POSITIVE_RATE = 0.01
+_BLOOM_HASHES = 7
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _month_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, 1)
+
+
+def _next_month(ts: datetime) -> datetime:
+    return datetime(ts.year + ts.month // 12, ts.month % 12 + 1, 1)
+
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == "zst":
+        compressed: bytes = zstandard.ZstdCompressor(level=10).compress(data)
+        return compressed
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zst":
+        if not _HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read .zst audit archives")
+        raw: bytes = zstandard.ZstdDecompressor().decompress(data)
+        return raw
+    return gzip.decompress(data)
+
+
+def _bloom_positions(value: str, bits: int) -> Iterable[int]:
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return ((h1 + i * h2) % bits for i in range(_BLOOM_HASHES))
+
+
+def _bloom_encode(values: Iterable[str]) -> str:
+    """Base64 Bloom filter over *values* at about a 1% false-positive rate."""
+    unique = set(values)
+    bits = max(
+        64,
+        math.ceil(
+            -len(unique) * math.log(_BLOOM_FALSE_POSITIVE_RATE) / (math.log(2) ** 2)
+        ),
+    )
+    array = bytearray((bits + 7) // 8)
+    bits = len(array) * 8
+    for value in unique:
+        for position in _bloom_positions(value, bits):
+            array[position // 8] |= 1 << (position % 8)
+    return base64.b64encode(bytes(array)).decode("ascii")
+
+
+def _bloom_contains(encoded: str, value: str) -> bool:
+    array = base64.b64decode(encoded)
+    bits = len(array) * 8
+    if not bits:
+        return False
+    return all(
+        array[position // 8] & (1 << (position % 8))
+        for position in _bloom_positions(value, bits)
+    )
+
+
+def _record_archived(rows: int, size_bytes: int) -> None:
+    try:
+        from services.metrics_service import record_audit_archived
+    except ImportError:
+        try:
+            from .metrics_service import record_audit_archived
+        except ImportError:
+            return
+    record_audit_archived(rows, size_bytes)
+
+
+def _record_segment_read(source: str) -> None:
+    try:
+        from services.metrics_service import record_audit_archive_read
+    except ImportError:
+        try:
+            from .metrics_service import record_audit_archive_read
+        except ImportError:
+            return
+    record_audit_archive_read(source)
+
+
+class AuditArchiveService:
+    """Moves aged audit events to compressed files and reads them back."""
+
+    def __init__(
+        self,
+        audit_trail_service: Any,
+        storage_service: Any,
+        enabled: bool = True,
+        archive_after_days: int = 365,
+        rows_per_file: int = 50000,
+        compression: str = "auto",
+        interval_seconds: float = 86400.0,
+        initial_delay_seconds: float = 120.0,
+        cache_segments: int = 8,
+    ) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown audit archive compression {compression!r}; "
+                f"expected one of {', '.join(COMPRESSIONS)}"
+            )
+        if compression == "zst" and not _HAS_ZSTD:
+            raise ValueError("zstandard is not installed; use 'gz' or 'auto'")
+        self.audit_trail_service = audit_trail_service
+        self.storage = storage_service
+        self.enabled = enabled and storage_service is not None
+        self.archive_after_days = archive_after_days
+        self.rows_per_file = max(1, rows_per_file)
+        if compression == "auto":
+            compression = "zst" if _HAS_ZSTD else "gz"
+        self.compression = compression
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self.cache_segments = max(0, cache_segments)
+        self.initialized = False
+
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._last_run: Optional[Dict[str, Any]] = None
+        self._stats: Dict[str, int] = {
+            "runs": 0,
+            "segments_written": 0,
+            "rows_archived": 0,
+            "bytes_written": 0,
+            "segments_expired": 0,
+            "segments_read": 0,
+            "cache_hits": 0,
+            "conflicts": 0,
+        }
+
+    async def initialize(self) -> None:
+        if self.enabled:
+            # Reads fall back to the archive from now on
+            self.audit_trail_service.archive = self
+            if self._task is None and self.interval_seconds > 0:
+                self._stop.clear()
+                self._task = asyncio.create_task(self._scheduler_loop())
+        self.initialized = True
+        logger.info(
+            "Audit Archive Service initialized (enabled=%s, after=%d days, "
+            "compression=%s)",
+            self.enabled,
+            self.archive_after_days,
+            self.compression,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Audit Archive Service...")
+        # An archive run stops after its current file
+        self._stop.set()
+        task, self._task = self._task, None
+        if task is not None:
+            await task
+        if getattr(self.audit_trail_service, "archive", None) is self:
+            self.audit_trail_service.archive = None
+        self._cache.clear()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Archiving
+    # ------------------------------------------------------------------
+
+    async def archive_expired(self) -> Dict[str, Any]:
+        """Archive every event older than the cutoff, then expire old files.
+
+        The cutoff is rounded down to a month boundary, so a tenant's month
+        is archived once it has wholly aged out.
+        """
+        async with self._run_lock:
+            start = time.perf_counter()
+            cutoff = _month_start(_now() - timedelta(days=self.archive_after_days))
+            run = {"cutoff": cutoff.isoformat(), "segments": 0, "rows": 0, "bytes": 0}
+            await self.audit_trail_service.flush()
+
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(
+                        AuditTrailRecord.tenant_id, func.min(AuditTrailRecord.timestamp)
+                    )
+                    .where(AuditTrailRecord.timestamp < cutoff)
+                    .group_by(AuditTrailRecord.tenant_id)
+                )
+                oldest = [(row[0], row[1]) for row in result.all()]
+
+            for tenant_id, first in oldest:
+                month = _month_start(first)
+                while month < cutoff and not self._stop.is_set():
+                    await self._archive_month(tenant_id, month, run)
+                    month = _next_month(month)
+
+            run["segments_expired"] = await self._expire_segments()
+            run["seconds"] = round(time.perf_counter() - start, 3)
+            self._stats["runs"] += 1
+            self._last_run = run
+            logger.info(
+                "Audit archive run: %d rows in %d files (%d bytes), "
+                "%d expired files removed",
+                run["rows"],
+                run["segments"],
+                run["bytes"],
+                run["segments_expired"],
+            )
+            return run
+
+    async def _archive_month(
+        self, tenant_id: str, month: datetime, run: Dict[str, Any]
+    ) -> None:
+        month_end = _next_month(month)
+        while not self._stop.is_set():
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(AuditTrailRecord)
+                    .where(AuditTrailRecord.tenant_id == tenant_id)
+                    .where(AuditTrailRecord.timestamp >= month)
+                    .where(AuditTrailRecord.timestamp < month_end)
+                    .order_by(AuditTrailRecord.timestamp, AuditTrailRecord.id)
+                    .limit(self.rows_per_file)
+                )
+                records = list(result.scalars().all())
+            if not records:
+                return
+            await self._write_segment(tenant_id, month, records, run)
+            if len(records) < self.rows_per_file:
+                return
+
+    async def _write_segment(
+        self,
+        tenant_id: str,
+        month: datetime,
+        records: List[AuditTrailRecord],
+        run: Dict[str, Any],
+    ) -> None:
+        rows = [self.audit_trail_service._row_to_dict(r) for r in records]
+        payload = "".join(
+            json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in rows
+        ).encode("utf-8")
+        compressed = await asyncio.to_thread(_compress, payload, self.compression)
+
+        segment_id = str(uuid4())
+        month_label = month.strftime("%Y-%m")
+        key = (
+            f"{ARCHIVE_PREFIX}/{tenant_id}/{month_label}/"
+            f"{segment_id}.jsonl.{self.compression}"
+        )
+        # Raises StorageError, leaving the rows in the hot table
+        await self.storage.put_blob(key, compressed)
+
+        ids = [r.id for r in records]
+        async with get_async_session() as session:
+            deleted = 0
+            for i in range(0, len(ids), _DELETE_CHUNK):
+                result = await session.execute(
+                    delete(AuditTrailRecord).where(
+                        AuditTrailRecord.id.in_(ids[i : i + _DELETE_CHUNK])
+                    )
+                )
+                deleted += result.rowcount or 0  # type: ignore[attr-defined]
+            if deleted != len(ids):
+                # Another worker archived (or purged) some of these rows first
+                await session.rollback()
+                await self.storage.delete_blob(key)
+                self._stats["conflicts"] += 1
+                logger.warning(
+                    "Audit archive segment for %s %s lost a race; discarded",
+                    tenant_id,
+                    month_label,
+                )
+                return
+            session.add(
+                AuditArchiveSegmentRecord(
+                    id=segment_id,
+                    tenant_id=tenant_id,
+                    month=month_label,
+                    storage_key=key,
+                    compression=self.compression,
+                    row_count=len(rows),
+                    size_bytes=len(compressed),
+                    min_timestamp=records[0].timestamp,
+                    max_timestamp=records[-1].timestamp,
+                    document_filter=_bloom_encode(r.document_id for r in records),
+                )
+            )
+            await session.commit()
+
+        run["segments"] += 1
+        run["rows"] += len(rows)
+        run["bytes"] += len(compressed)
+        self._stats["segments_written"] += 1
+        self._stats["rows_archived"] += len(rows)
+        self._stats["bytes_written"] += len(compressed)
+        _record_archived(len(rows), len(compressed))
+
+    async def _expire_segments(self) -> int:
+        """Delete archive files whose newest event is past retention."""
+        retention_days = getattr(self.audit_trail_service, "retention_days", None)
+        if not retention_days:
+            return 0
+        cutoff = _now() - timedelta(days=retention_days)
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(
+                    AuditArchiveSegmentRecord.id, AuditArchiveSegmentRecord.storage_key
+                ).where(AuditArchiveSegmentRecord.max_timestamp < cutoff)
+            )
+            expired = [(row[0], row[1]) for row in result.all()]
+        for segment_id, key in expired:
+            async with get_async_session() as session:
+                await session.execute(
+                    delete(AuditArchiveSegmentRecord).where(
+                        AuditArchiveSegmentRecord.id == segment_id
+                    )
+                )
+                await session.commit()
+            await self.storage.delete_blob(key)
+            self._cache.pop(segment_id, None)
+        self._stats["segments_expired"] += len(expired)
+        return len(expired)
+
+    async def _scheduler_loop(self) -> None:
+        delay = self.initial_delay_seconds
+        while True:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.archive_expired()
+            except Exception:
+                logger.exception("Scheduled audit archive run failed")
+            delay = self.interval_seconds
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    async def query_document(
+        self, document_id: str, tenant_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Archived events for a document, oldest first."""
+        stmt = select(
+            AuditArchiveSegmentRecord.id,
+            AuditArchiveSegmentRecord.storage_key,
+            AuditArchiveSegmentRecord.compression,
+            AuditArchiveSegmentRecord.document_filter,
+        )
+        if tenant_id:
+            stmt = stmt.where(AuditArchiveSegmentRecord.tenant_id == tenant_id)
+        async with get_async_session() as session:
+            result = await session.execute(
+                stmt.order_by(AuditArchiveSegmentRecord.min_timestamp)
+            )
+            segments = result.all()
+
+        entries: List[Dict[str, Any]] = []
+        for segment_id, key, compression, document_filter in segments:
+            if not _bloom_contains(document_filter, document_id):
+                continue
+            for row in await self._read_segment(segment_id, key, compression):
+                if row["document_id"] == document_id and (
+                    not tenant_id or row["tenant_id"] == tenant_id
+                ):
+                    entries.append(row)
+        return entries
+
+    async def query_tenant(
+        self,
+        tenant_id: str,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        before: Optional[Tuple[datetime, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest archived events for a tenant, newest first.
+
+        *before* is a ``(timestamp, id)`` keyset position; only events
+        strictly before it are returned.
+        """
+        stmt = select(
+            AuditArchiveSegmentRecord.id,
+            AuditArchiveSegmentRecord.storage_key,
+            AuditArchiveSegmentRecord.compression,
+            AuditArchiveSegmentRecord.min_timestamp,
+            AuditArchiveSegmentRecord.max_timestamp,
+        ).where(AuditArchiveSegmentRecord.tenant_id == tenant_id)
+        if since:
+            stmt = stmt.where(AuditArchiveSegmentRecord.max_timestamp >= since)
+        if before:
+            stmt = stmt.where(AuditArchiveSegmentRecord.min_timestamp <= before[0])
+        async with get_async_session() as session:
+            result = await session.execute(
+                stmt.order_by(AuditArchiveSegmentRecord.max_timestamp.desc())
+            )
+            segments = result.all()
+
+        since_iso = since.isoformat() if since else None
+        before_key = (before[0].isoformat(), before[1]) if before else None
+        entries: List[Dict[str, Any]] = []
+        oldest_kept: Optional[datetime] = None
+        for segment_id, key, compression, min_ts, max_ts in segments:
+            # Files are read newest first; stop once the page is full and no
+            # remaining file can hold anything newer than what we have
+            if len(entries) >= limit and oldest_kept and max_ts < oldest_kept:
+                break
+            for row in await self._read_segment(segment_id, key, compression):
+                if event_type and row["event_type"] != event_type:
+                    continue
+                if since_iso and (row["timestamp"] or "") < since_iso:
+                    continue
+                if before_key and (row["timestamp"] or "", row["id"]) >= before_key:
+                    continue
+                entries.append(row)
+            entries.sort(key=lambda r: (r["timestamp"] or "", r["id"]), reverse=True)
+            del entries[limit:]
+            if entries and entries[-1]["timestamp"]:
+                oldest_kept = datetime.fromisoformat(entries[-1]["timestamp"])
+        return entries
+
+    async def iter_tenant(
+        self,
+        tenant_id: str,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield a tenant's archived events oldest first, one file at a time.
+
+        Files read here bypass the cache, so an export holds at most one
+        file's events in memory.
+        """
+        stmt = select(
+            AuditArchiveSegmentRecord.id,
+            AuditArchiveSegmentRecord.storage_key,
+            AuditArchiveSegmentRecord.compression,
+        ).where(AuditArchiveSegmentRecord.tenant_id == tenant_id)
+        if since:
+            stmt = stmt.where(AuditArchiveSegmentRecord.max_timestamp >= since)
+        if until:
+            stmt = stmt.where(AuditArchiveSegmentRecord.min_timestamp < until)
+        async with get_async_session() as session:
+            result = await session.execute(
+                stmt.order_by(AuditArchiveSegmentRecord.min_timestamp)
+            )
+            segments = result.all()
+
+        since_iso = since.isoformat() if since else None
+        until_iso = until.isoformat() if until else None
+        for segment_id, key, compression in segments:
+            rows = [
+                row
+                for row in await self._read_segment(
+                    segment_id, key, compression, cache=False
+                )
+                if (not event_type or row["event_type"] == event_type)
+                and (not since_iso or (row["timestamp"] or "") >= since_iso)
+                and (not until_iso or (row["timestamp"] or "") < until_iso)
+            ]
+            if rows:
+                rows.sort(key=lambda r: (r["timestamp"] or "", r["id"]))
+                yield rows
+
+    async def _read_segment(
+        self, segment_id: str, key: str, compression: str, cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        cached = self._cache.get(segment_id)
+        if cached is not None:
+            self._cache.move_to_end(segment_id)
+            self._stats["cache_hits"] += 1
+            _record_segment_read("cache")
+            return cached
+        blob = await self.storage.get_blob(key)
+        if blob is None:
+            logger.error("Audit archive file missing: %s", key)
+            return []
+        payload = await asyncio.to_thread(_decompress, blob, compression)
+        rows = [json.loads(line) for line in payload.splitlines() if line]
+        self._stats["segments_read"] += 1
+        _record_segment_read("storage")
+        if cache and self.cache_segments:
+            self._cache[segment_id] = rows
+            while len(self._cache) > self.cache_segments:
+                self._cache.popitem(last=False)
+        return rows
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    async def get_manifest(self, tenant_id: str) -> List[Dict[str, Any]]:
+        """Archived files for a tenant, oldest first."""
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(AuditArchiveSegmentRecord)
+                .where(AuditArchiveSegmentRecord.tenant_id == tenant_id)
+                .order_by(AuditArchiveSegmentRecord.min_timestamp)
+            )
+            return [
+                {
+                    "segment_id": r.id,
+                    "month": r.month,
+                    "rows": r.row_count,
+                    "size_bytes": r.size_bytes,
+                    "compression": r.compression,
+                    "min_timestamp": r.min_timestamp.isoformat(),
+                    "max_timestamp": r.max_timestamp.isoformat(),
+                }
+                for r in result.scalars().all()
+            ]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return stats for the health endpoint."""
+        return {
+            "enabled": self.enabled,
+            "initialized": self.initialized,
+            "archive_after_days": self.archive_after_days,
+            "compression": self.compression,
+            "cached_segments": len(self._cache),
+            "last_run": self._last_run,
+            **self._stats,
+        }
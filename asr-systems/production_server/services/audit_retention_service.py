@@ -0,0 +1,389 @@
+"""
+ASR Production Server - Audit Retention Service
+Background retention for the audit trail.
+
+A scheduler runs a purge every ``interval_seconds``. A purge fixes its
+cutoff when it starts, then deletes expired rows in bounded primary-key
+batches (one short transaction each) with a pause between batches, so it
+never holds long locks or writes one huge transaction to the WAL. Progress
+is saved in ``audit_retention_runs`` every few batches; a purge interrupted
+by shutdown or an error resumes with the same cutoff on the next run.
+
+On PostgreSQL, when ``audit_trail`` is a range-partitioned table and
+``drop_partitions`` is set, partitions lying wholly before the cutoff are
+detached and dropped first; the batched delete then handles the remainder.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import select, text
+
+try:
+    from ..config.database import get_async_session
+    from ..models.audit_retention_run import AuditRetentionRunRecord
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.audit_retention_run import (  # type: ignore[no-redef]
+        AuditRetentionRunRecord,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Run statuses
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_AUDIT_TABLE = "audit_trail"
+
+_PARTITIONS_SQL = text(
+    "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound, "
+    "c.reltuples "
+    "FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "JOIN pg_class p ON p.oid = i.inhparent "
+    "WHERE p.relname = :table AND p.relkind = 'p'"
+)
+
+_RANGE_BOUND = re.compile(r"FOR VALUES FROM \('([^']*)'\) TO \('([^']*)'\)")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _partition_upper_bound(bound: Optional[str]) -> Optional[datetime]:
+    """Upper bound of a ``FOR VALUES FROM (...) TO (...)`` range partition.
+
+    Returns None for default, list and MAXVALUE partitions, which are never
+    dropped.
+    """
+    match = _RANGE_BOUND.search(bound or "")
+    if not match:
+        return None
+    try:
+        upper = datetime.fromisoformat(match.group(2))
+    except ValueError:
+        return None
+    if upper.tzinfo:
+        upper = upper.astimezone(timezone.utc).replace(tzinfo=None)
+    return upper
+
+
+def _record_deleted(method: str, count: int) -> None:
+    try:
+        from services.metrics_service import record_audit_retention_deleted
+    except ImportError:
+        try:
+            from .metrics_service import record_audit_retention_deleted
+        except ImportError:
+            return
+    record_audit_retention_deleted(method, count)
+
+
+class AuditRetentionService:
+    """Scheduled, chunked and resumable audit trail retention purges."""
+
+    def __init__(
+        self,
+        audit_trail_service: Any,
+        enabled: bool = True,
+        retention_days: int = 2555,
+        batch_size: int = 5000,
+        pause_seconds: float = 0.1,
+        interval_seconds: float = 86400.0,
+        initial_delay_seconds: float = 60.0,
+        drop_partitions: bool = False,
+        save_every: int = 10,
+    ) -> None:
+        self.audit_trail_service = audit_trail_service
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self.batch_size = max(1, batch_size)
+        self.pause_seconds = pause_seconds
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self.drop_partitions = drop_partitions
+        self.save_every = max(1, save_every)
+        self.initialized = False
+
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self._run_lock = asyncio.Lock()
+        self._current: Optional[Dict[str, Any]] = None
+        self._last: Optional[Dict[str, Any]] = None
+        self._runs: int = 0
+        self._total_deleted: int = 0
+
+    async def initialize(self) -> None:
+        if self.enabled and self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._scheduler_loop())
+        self.initialized = True
+        logger.info(
+            "Audit Retention Service initialized (enabled=%s, retention=%d days, "
+            "batch=%d, drop_partitions=%s)",
+            self.enabled,
+            self.retention_days,
+            self.batch_size,
+            self.drop_partitions,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Audit Retention Service...")
+        # A running purge stops after its current batch and saves progress
+        self._stop.set()
+        task, self._task = self._task, None
+        if task is not None:
+            await task
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    async def run_purge(self) -> Dict[str, Any]:
+        """Resume the unfinished purge, or start one with a fresh cutoff.
+
+        Runs until no expired rows are left or the service is stopping, and
+        returns the run's progress.
+        """
+        async with self._run_lock:
+            run = await self._load_unfinished()
+            if run is None:
+                cutoff = _now() - timedelta(days=self.retention_days)
+                run = {
+                    "id": str(uuid4()),
+                    "status": RUNNING,
+                    "cutoff": cutoff,
+                    "deleted": 0,
+                    "batches": 0,
+                    "watermark": None,
+                    "partitions_dropped": [],
+                    "elapsed_seconds": 0.0,
+                    "error": None,
+                    "started_at": _now(),
+                    "finished_at": None,
+                }
+                await self._save(run)
+            else:
+                logger.info(
+                    "Resuming audit retention purge %s (cutoff %s, %d deleted)",
+                    run["id"],
+                    run["cutoff"].isoformat(),
+                    run["deleted"],
+                )
+            self._current = run
+            try:
+                await self._execute(run)
+            finally:
+                self._current = None
+                self._last = run
+                self._runs += 1
+            return self.run_summary(run)
+
+    async def _execute(self, run: Dict[str, Any]) -> None:
+        segment_start = time.perf_counter()
+        elapsed_before = run["elapsed_seconds"]
+
+        def checkpoint() -> None:
+            run["elapsed_seconds"] = elapsed_before + (
+                time.perf_counter() - segment_start
+            )
+
+        try:
+            if self.drop_partitions:
+                await self._drop_expired_partitions(run)
+
+            since_save = 0
+            while not self._stop.is_set():
+                count, newest = await self.audit_trail_service.delete_expired_batch(
+                    run["cutoff"], self.batch_size
+                )
+                if count:
+                    run["deleted"] += count
+                    run["batches"] += 1
+                    run["watermark"] = newest
+                    self._total_deleted += count
+                    _record_deleted("batch", count)
+                if count < self.batch_size:
+                    run["status"] = COMPLETED
+                    run["finished_at"] = _now()
+                    break
+                since_save += 1
+                if since_save >= self.save_every:
+                    checkpoint()
+                    await self._save(run)
+                    since_save = 0
+                if self.pause_seconds > 0:
+                    try:
+                        await asyncio.wait_for(
+                            self._stop.wait(), timeout=self.pause_seconds
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        except Exception as e:
+            logger.exception("Audit retention purge %s failed", run["id"])
+            # Left unfinished: the next run resumes it with the same cutoff
+            run["status"] = FAILED
+            run["error"] = str(e)
+
+        checkpoint()
+        await self._save(run)
+        summary = self.run_summary(run)
+        logger.info(
+            "Audit retention purge %s %s: %d rows deleted in %d batches "
+            "(%.0f rows/s)",
+            run["id"],
+            run["status"],
+            run["deleted"],
+            run["batches"],
+            summary["rows_per_second"],
+        )
+
+    async def _drop_expired_partitions(self, run: Dict[str, Any]) -> None:
+        """Detach and drop partitions lying wholly before the cutoff."""
+        async with get_async_session() as session:
+            dialect = session.get_bind().dialect
+            if dialect.name != "postgresql":
+                return
+            result = await session.execute(_PARTITIONS_SQL, {"table": _AUDIT_TABLE})
+            partitions: List[Tuple[str, Optional[str], float]] = [
+                (row[0], row[1], row[2]) for row in result.all()
+            ]
+        quote = dialect.identifier_preparer.quote
+
+        for name, bound, estimated_rows in partitions:
+            upper = _partition_upper_bound(bound)
+            if upper is None or upper > run["cutoff"]:
+                continue
+            async with get_async_session() as session:
+                await session.execute(
+                    text(
+                        f"ALTER TABLE {quote(_AUDIT_TABLE)} "
+                        f"DETACH PARTITION {quote(name)}"
+                    )
+                )
+                await session.execute(text(f"DROP TABLE {quote(name)}"))
+                await session.commit()
+            rows = max(0, int(estimated_rows))
+            run["partitions_dropped"].append(name)
+            run["deleted"] += rows
+            self._total_deleted += rows
+            _record_deleted("partition", rows)
+            logger.info(
+                "Dropped expired audit trail partition %s (~%d rows)", name, rows
+            )
+            await self._save(run)
+
+    async def _scheduler_loop(self) -> None:
+        delay = self.initial_delay_seconds
+        while True:
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.run_purge()
+            except Exception:
+                logger.exception("Scheduled audit retention purge failed")
+            delay = self.interval_seconds
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def _load_unfinished(self) -> Optional[Dict[str, Any]]:
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(AuditRetentionRunRecord)
+                .where(AuditRetentionRunRecord.status.in_([RUNNING, FAILED]))
+                .where(AuditRetentionRunRecord.finished_at.is_(None))
+                .order_by(AuditRetentionRunRecord.started_at.desc())
+                .limit(1)
+            )
+            record = result.scalars().first()
+            if record is None:
+                return None
+            return {
+                "id": record.id,
+                "status": RUNNING,
+                "cutoff": record.cutoff,
+                "deleted": record.deleted,
+                "batches": record.batches,
+                "watermark": record.watermark,
+                "partitions_dropped": list(record.partitions_dropped or []),
+                "elapsed_seconds": record.elapsed_seconds,
+                "error": None,
+                "started_at": record.started_at,
+                "finished_at": None,
+            }
+
+    async def _save(self, run: Dict[str, Any]) -> None:
+        async with get_async_session() as session:
+            await session.merge(
+                AuditRetentionRunRecord(
+                    id=run["id"],
+                    status=run["status"],
+                    cutoff=run["cutoff"],
+                    deleted=run["deleted"],
+                    batches=run["batches"],
+                    watermark=run["watermark"],
+                    partitions_dropped=list(run["partitions_dropped"]),
+                    elapsed_seconds=run["elapsed_seconds"],
+                    error=run["error"],
+                    started_at=run["started_at"],
+                    updated_at=_now(),
+                    finished_at=run["finished_at"],
+                )
+            )
+            await session.commit()
+
+    # ------------------------------------------------------------------
+    # Progress / Stats
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def run_summary(run: Dict[str, Any]) -> Dict[str, Any]:
+        """API view of a run's progress."""
+        elapsed = run["elapsed_seconds"]
+        return {
+            "run_id": run["id"],
+            "status": run["status"],
+            "cutoff": run["cutoff"].isoformat(),
+            "deleted": run["deleted"],
+            "batches": run["batches"],
+            "watermark": run["watermark"].isoformat() if run["watermark"] else None,
+            "partitions_dropped": list(run["partitions_dropped"]),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": run["deleted"] / elapsed if elapsed > 0 else 0.0,
+            "error": run["error"],
+        }
+
+    def get_progress(self) -> Dict[str, Any]:
+        """The running purge, if any, and the last finished one."""
+        return {
+            "running": self.run_summary(self._current) if self._current else None,
+            "last_run": self.run_summary(self._last) if self._last else None,
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return stats for the health endpoint."""
+        return {
+            "enabled": self.enabled,
+            "initialized": self.initialized,
+            "retention_days": self.retention_days,
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval_seconds,
+            "drop_partitions": self.drop_partitions,
+            "running": self._current is not None,
+            "runs": self._runs,
+            "total_deleted": self._total_deleted,
+        }
@@ -2,14 +2,27 @@
 ASR Production Server - Audit Trail Service
 Persists audit trail entries to the database. Failures are logged but never
 propagate — audit recording must not break the document routing pipeline.
+
+With buffering enabled, record() only queues the entry; a background writer
+flushes the queue in multi-row inserts, one transaction per batch, whenever
+a batch fills up or the flush interval elapses, and once more on cleanup.
+A batch whose insert fails goes back to the head of the queue and the writer
+retries it with exponential backoff; entries are only ever discarded by the
+overflow policy, or when the database is still failing at shutdown.
 """
 
+import asyncio
+import base64
+import json
 import logging
+import time
+import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
 from shared.core.models import AuditTrailEntry
-from sqlalchemy import delete, select
+from sqlalchemy import and_, delete, insert, or_, select
 
 try:
     from ..config.database import get_async_session
@@ -20,54 +33,314 @@ except (ImportError, SystemError):
 
 logger = logging.getLogger(__name__)
 
+# What record() does when the buffer is full: wait for the writer to make
+# room, discard the oldest or the incoming entry, or write the entry inline.
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "sync")
+
+# Ceiling for the writer's backoff between retries of a failed batch
+MAX_RETRY_BACKOFF_SECONDS = 30.0
+# Flush attempts cleanup() makes before giving up on the remaining entries
+SHUTDOWN_FLUSH_ATTEMPTS = 3
+
+
+def _record_events(outcome: str, count: int = 1) -> None:
+    try:
+        from services.metrics_service import record_audit_events
+    except ImportError:
+        try:
+            from .metrics_service import record_audit_events
+        except ImportError:
+            return
+    record_audit_events(outcome, count)
+
+
+def _observe_flush(rows: int, duration: float, depth: int) -> None:
+    try:
+        from services.metrics_service import (
+            observe_audit_flush,
+            set_audit_buffer_depth,
+        )
+    except ImportError:
+        try:
+            from .metrics_service import observe_audit_flush, set_audit_buffer_depth
+        except ImportError:
+            return
+    observe_audit_flush(rows, duration)
+    set_audit_buffer_depth(depth)
+
 
 class AuditTrailService:
     """Async audit trail persistence following the project's initialize/cleanup pattern."""
 
-    def __init__(self, enabled: bool = True, retention_days: int = 2555) -> None:
+    def __init__(
+        self,
+        enabled: bool = True,
+        retention_days: int = 2555,
+        buffered: bool = False,
+        max_buffered_events: int = 10000,
+        flush_batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        overflow_policy: str = "block",
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown audit overflow policy {overflow_policy!r}; "
+                f"expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
         self.enabled = enabled
         self.retention_days = retention_days
+        self.buffered = buffered
+        self.max_buffered_events = max(1, max_buffered_events)
+        self.flush_batch_size = max(1, flush_batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
         self.initialized = False
         self._records_written: int = 0
 
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._writer: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._dropped: int = 0
+        self._failed: int = 0
+        self._retries: int = 0
+        self._flushes: int = 0
+        self._overflow_writes: int = 0
+        # Cold tier consulted by reads; set by AuditArchiveService
+        self.archive: Optional[Any] = None
+
     async def initialize(self) -> None:
+        if self.enabled and self.buffered and self._writer is None:
+            self._stopping = False
+            self._writer = asyncio.create_task(self._writer_loop())
         self.initialized = True
         logger.info(
-            "Audit Trail Service initialized (enabled=%s, retention=%d days)",
+            "Audit Trail Service initialized (enabled=%s, retention=%d days, "
+            "buffered=%s)",
             self.enabled,
             self.retention_days,
+            self.buffered,
         )
 
     async def cleanup(self) -> None:
         logger.info("Cleaning up Audit Trail Service...")
+        writer = self._writer
+        if writer is not None:
+            # Let the writer finish its current batch rather than cancelling
+            # it halfway through a transaction
+            self._stopping = True
+            self._wake.set()
+            await writer
+            self._writer = None
+        # Release producers blocked on a full buffer; they now write inline
+        async with self._space:
+            self._space.notify_all()
+        written = 0
+        delay = self.flush_interval_seconds
+        for attempt in range(SHUTDOWN_FLUSH_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_BACKOFF_SECONDS)
+            batch_written, complete = await self._flush_batches()
+            written += batch_written
+            if complete:
+                break
+        if written:
+            logger.info("Flushed %d buffered audit trail entries", written)
+        if self._buffer:
+            self._drop(len(self._buffer), "database unavailable at shutdown")
+            self._buffer.clear()
         self.initialized = False
 
     # ------------------------------------------------------------------
     # Write
     # ------------------------------------------------------------------
 
+    @property
+    def _buffering(self) -> bool:
+        return self._writer is not None and not self._writer.done()
+
     async def record(self, entry: AuditTrailEntry) -> None:
-        """Persist an AuditTrailEntry. Never raises — logs on failure."""
+        """Persist an AuditTrailEntry. Never raises — logs on failure.
+
+        When buffered, the entry is queued for the background writer and
+        the call returns without touching the database.
+        """
         if not self.enabled:
             return
-        try:
-            async with get_async_session() as session:
-                row = AuditTrailRecord(
-                    document_id=entry.document_id,
-                    event_type=entry.event_type,
-                    event_data=entry.event_data,
-                    user_id=entry.user_id,
-                    system_component=entry.system_component,
-                    timestamp=entry.timestamp,
-                    tenant_id=entry.tenant_id,
+        row = self._entry_to_row(entry)
+        if not self._buffering:
+            await self._write([row])
+            return
+
+        if len(self._buffer) >= self.max_buffered_events:
+            if self.overflow_policy == "drop_newest":
+                self._drop(1)
+                return
+            if self.overflow_policy == "drop_oldest":
+                self._buffer.popleft()
+                self._drop(1)
+            elif self.overflow_policy == "sync":
+                self._overflow_writes += 1
+                await self._write([row])
+                return
+            elif not await self._wait_for_space():
+                await self._write([row])
+                return
+
+        self._buffer.append(row)
+        _record_events("queued")
+        if len(self._buffer) >= self.flush_batch_size:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Write every buffered entry now. Returns the number of rows written.
+
+        Stops at the first batch that fails to insert; that batch is back at
+        the head of the buffer for the writer to retry.
+        """
+        written, _ = await self._flush_batches()
+        return written
+
+    async def _flush_batches(self) -> Tuple[int, bool]:
+        """Flush the buffer; returns (rows written, whether every batch went in)."""
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                count = min(self.flush_batch_size, len(self._buffer))
+                batch = [self._buffer.popleft() for _ in range(count)]
+                async with self._space:
+                    self._space.notify_all()
+                try:
+                    written += await self._insert(batch)
+                except Exception:
+                    logger.warning(
+                        "Failed to persist batch of %d audit trail entries; "
+                        "requeued for retry",
+                        len(batch),
+                        exc_info=True,
+                    )
+                    self._requeue(batch)
+                    return written, False
+        return written, True
+
+    async def _writer_loop(self) -> None:
+        backoff = 0.0
+        while not self._stopping:
+            if backoff:
+                await self._pause(backoff)
+            else:
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), timeout=self.flush_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            try:
+                _, complete = await self._flush_batches()
+            except Exception:
+                logger.exception("Audit trail writer flush failed")
+                complete = False
+            if complete:
+                backoff = 0.0
+            else:
+                backoff = min(
+                    max(backoff * 2, self.flush_interval_seconds),
+                    MAX_RETRY_BACKOFF_SECONDS,
                 )
-                session.add(row)
-                await session.commit()
-                self._records_written += 1
-        except Exception:
-            logger.exception(
-                "Failed to persist audit trail entry for document %s", entry.document_id
+
+    async def _pause(self, seconds: float) -> None:
+        """Sleep out a retry backoff; only cleanup() cuts it short."""
+        deadline = time.monotonic() + seconds
+        while not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+
+    def _requeue(self, batch: List[Dict[str, Any]]) -> None:
+        """Put a failed batch back at the head of the buffer, oldest first.
+
+        Entries recorded while the insert was in flight may push the buffer
+        past its bound; the drop policies trim the excess, while block and
+        sync keep everything and hold producers off until it drains.
+        """
+        self._retries += len(batch)
+        _record_events("requeued", len(batch))
+        self._buffer.extendleft(reversed(batch))
+        excess = len(self._buffer) - self.max_buffered_events
+        if excess <= 0:
+            return
+        if self.overflow_policy == "drop_oldest":
+            for _ in range(excess):
+                self._buffer.popleft()
+            self._drop(excess)
+        elif self.overflow_policy == "drop_newest":
+            for _ in range(excess):
+                self._buffer.pop()
+            self._drop(excess)
+
+    async def _wait_for_space(self) -> bool:
+        """Block until the writer drains the buffer below its bound.
+
+        Returns False when the writer has stopped, in which case the caller
+        writes the entry itself.
+        """
+        self._wake.set()
+        async with self._space:
+            await self._space.wait_for(
+                lambda: len(self._buffer) < self.max_buffered_events
+                or not self._buffering
             )
+        return self._buffering
+
+    def _drop(self, count: int, reason: Optional[str] = None) -> None:
+        self._dropped += count
+        _record_events("dropped", count)
+        logger.warning(
+            "Audit trail %s; dropped %d entr%s (policy=%s)",
+            reason or f"buffer full ({self.max_buffered_events} events)",
+            count,
+            "y" if count == 1 else "ies",
+            self.overflow_policy,
+        )
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows in one transaction. Never raises — logs on failure."""
+        try:
+            return await self._insert(rows)
+        except Exception:
+            self._failed += len(rows)
+            _record_events("failed", len(rows))
+            if len(rows) == 1:
+                logger.exception(
+                    "Failed to persist audit trail entry for document %s",
+                    rows[0]["document_id"],
+                )
+            else:
+                logger.exception(
+                    "Failed to persist batch of %d audit trail entries", len(rows)
+                )
+            return 0
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows in one transaction; raises on failure."""
+        start = time.perf_counter()
+        async with get_async_session() as session:
+            await session.execute(insert(AuditTrailRecord), rows)
+            await session.commit()
+        self._records_written += len(rows)
+        self._flushes += 1
+        _record_events("written", len(rows))
+        _observe_flush(len(rows), time.perf_counter() - start, len(self._buffer))
+        return len(rows)
 
     # ------------------------------------------------------------------
     # Read
@@ -77,6 +350,7 @@ class AuditTrailService:
         self, document_id: str, tenant_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Return audit entries for a document, optionally scoped to tenant."""
+        await self.flush()
         try:
             async with get_async_session() as session:
                 stmt = select(AuditTrailRecord).where(
@@ -86,10 +360,20 @@ class AuditTrailService:
                     stmt = stmt.where(AuditTrailRecord.tenant_id == tenant_id)
                 stmt = stmt.order_by(AuditTrailRecord.timestamp)
                 result = await session.execute(stmt)
-                return [self._row_to_dict(r) for r in result.scalars().all()]
+                entries = [self._row_to_dict(r) for r in result.scalars().all()]
         except Exception:
             logger.exception("Failed to query audit trail for document %s", document_id)
             return []
+        if self.archive is None:
+            return entries
+        try:
+            archived = await self.archive.query_document(document_id, tenant_id)
+        except Exception:
+            logger.exception(
+                "Failed to query audit archive for document %s", document_id
+            )
+            return entries
+        return self._merge(archived, entries, limit=None, newest_first=False)
 
     async def query_by_tenant(
         self,
@@ -99,6 +383,29 @@ class AuditTrailService:
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Return audit entries for a tenant with optional filters."""
+        entries, _ = await self.query_page(
+            tenant_id, event_type=event_type, since=since, limit=limit
+        )
+        return entries
+
+    async def query_page(
+        self,
+        tenant_id: str,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of a tenant's entries, newest first, and the
+        cursor for the next page (None on the last page).
+
+        Pages are keyset-paginated on ``(timestamp, id)``: each page starts
+        strictly after the previous page's last entry, so paging stays
+        cheap and stable however deep it goes. Raises ValueError for a
+        malformed *cursor*.
+        """
+        before = self.decode_cursor(cursor) if cursor else None
+        await self.flush()
         try:
             async with get_async_session() as session:
                 stmt = select(AuditTrailRecord).where(
@@ -108,33 +415,163 @@ class AuditTrailService:
                     stmt = stmt.where(AuditTrailRecord.event_type == event_type)
                 if since:
                     stmt = stmt.where(AuditTrailRecord.timestamp >= since)
-                stmt = stmt.order_by(AuditTrailRecord.timestamp.desc()).limit(limit)
+                if before:
+                    stmt = stmt.where(
+                        or_(
+                            AuditTrailRecord.timestamp < before[0],
+                            and_(
+                                AuditTrailRecord.timestamp == before[0],
+                                AuditTrailRecord.id < before[1],
+                            ),
+                        )
+                    )
+                stmt = stmt.order_by(
+                    AuditTrailRecord.timestamp.desc(), AuditTrailRecord.id.desc()
+                ).limit(limit)
                 result = await session.execute(stmt)
-                return [self._row_to_dict(r) for r in result.scalars().all()]
+                entries = [self._row_to_dict(r) for r in result.scalars().all()]
         except Exception:
             logger.exception("Failed to query audit trail for tenant %s", tenant_id)
-            return []
+            return [], None
+        # Older events only matter when the hot table could not fill the page
+        if self.archive is not None and len(entries) < limit:
+            try:
+                archived = await self.archive.query_tenant(
+                    tenant_id,
+                    event_type=event_type,
+                    since=since,
+                    limit=limit,
+                    before=before,
+                )
+                entries = self._merge(archived, entries, limit=limit, newest_first=True)
+            except Exception:
+                logger.exception(
+                    "Failed to query audit archive for tenant %s", tenant_id
+                )
+        if entries and len(entries) >= limit:
+            return entries, self.encode_cursor(entries[-1])
+        return entries, None
+
+    async def iter_tenant_events(
+        self,
+        tenant_id: str,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield all of a tenant's entries, oldest first, in chunks.
+
+        Archived events come first, one archive file at a time, then the
+        hot table is streamed through a server-side cursor with
+        ``yield_per``, so memory stays flat for any history length.
+        """
+        await self.flush()
+        if self.archive is not None:
+            async for chunk in self.archive.iter_tenant(
+                tenant_id, event_type=event_type, since=since, until=until
+            ):
+                yield chunk
+
+        stmt = select(*AuditTrailRecord.__table__.columns).where(
+            AuditTrailRecord.tenant_id == tenant_id
+        )
+        if event_type:
+            stmt = stmt.where(AuditTrailRecord.event_type == event_type)
+        if since:
+            stmt = stmt.where(AuditTrailRecord.timestamp >= since)
+        if until:
+            stmt = stmt.where(AuditTrailRecord.timestamp < until)
+        stmt = stmt.order_by(AuditTrailRecord.timestamp, AuditTrailRecord.id)
+        async with get_async_session() as session:
+            result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+            async for partition in result.partitions():
+                yield [
+                    self._row_to_dict(AuditTrailRecord(**row._mapping))
+                    for row in partition
+                ]
+
+    async def stream_ndjson(
+        self,
+        tenant_id: str,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> AsyncIterator[str]:
+        """Yield a tenant's audit log as NDJSON, one chunk of lines at a time."""
+        async for chunk in self.iter_tenant_events(
+            tenant_id, event_type=event_type, since=since, until=until
+        ):
+            yield "".join(json.dumps(e, default=str) + "\n" for e in chunk)
+
+    @staticmethod
+    def encode_cursor(entry: Dict[str, Any]) -> str:
+        raw = json.dumps([entry["timestamp"], entry["id"]]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            timestamp, entry_id = json.loads(raw)
+            return datetime.fromisoformat(timestamp), str(entry_id)
+        except Exception:
+            raise ValueError(f"Invalid audit log cursor: {cursor!r}")
 
     # ------------------------------------------------------------------
     # Maintenance
     # ------------------------------------------------------------------
 
-    async def purge_expired(self) -> int:
-        """Delete records older than retention_days. Returns count deleted."""
+    async def purge_expired(self, batch_size: int = 5000) -> int:
+        """Delete records older than retention_days. Returns count deleted.
+
+        Deletes in batches of *batch_size* rows, one short transaction each,
+        rather than in a single unbounded DELETE.
+        """
         cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
+        await self.flush()
+        deleted = 0
         try:
-            async with get_async_session() as session:
-                stmt = delete(AuditTrailRecord).where(
-                    AuditTrailRecord.timestamp < cutoff
-                )
-                result = await session.execute(stmt)
-                await session.commit()
-                deleted: int = result.rowcount if result.rowcount is not None else 0  # type: ignore[attr-defined]
-                logger.info("Purged %d expired audit trail records", deleted)
-                return deleted
+            while True:
+                count, _ = await self.delete_expired_batch(cutoff, batch_size)
+                deleted += count
+                if count < batch_size:
+                    break
         except Exception:
             logger.exception("Failed to purge expired audit trail records")
-            return 0
+        logger.info("Purged %d expired audit trail records", deleted)
+        return deleted
+
+    async def delete_expired_batch(
+        self, cutoff: datetime, limit: int
+    ) -> Tuple[int, Optional[datetime]]:
+        """Delete up to *limit* of the oldest records before *cutoff*.
+
+        Selects the batch's primary keys through the timestamp index and
+        deletes them by key in one transaction. Returns the number deleted
+        and the newest timestamp in the batch (None once nothing is left).
+        Raises on database errors so callers can stop and resume later.
+        """
+        cutoff = cutoff.replace(tzinfo=None) if cutoff.tzinfo else cutoff
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(AuditTrailRecord.id, AuditTrailRecord.timestamp)
+                .where(AuditTrailRecord.timestamp < cutoff)
+                .order_by(AuditTrailRecord.timestamp)
+                .limit(limit)
+            )
+            rows = result.all()
+            if not rows:
+                return 0, None
+            result = await session.execute(
+                delete(AuditTrailRecord).where(
+                    AuditTrailRecord.id.in_([row.id for row in rows])
+                )
+            )
+            await session.commit()
+        rowcount = result.rowcount  # type: ignore[attr-defined]
+        deleted: int = rowcount if rowcount is not None else len(rows)
+        return deleted, rows[-1].timestamp
 
     # ------------------------------------------------------------------
     # Health / Stats
@@ -147,12 +584,46 @@ class AuditTrailService:
             "initialized": self.initialized,
             "records_written": self._records_written,
             "retention_days": self.retention_days,
+            "buffered": self._buffering,
+            "buffered_events": len(self._buffer),
+            "max_buffered_events": self.max_buffered_events,
+            "overflow_policy": self.overflow_policy,
+            "flushes": self._flushes,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "retries": self._retries,
+            "overflow_writes": self._overflow_writes,
         }
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _merge(
+        archived: List[Dict[str, Any]],
+        entries: List[Dict[str, Any]],
+        limit: Optional[int],
+        newest_first: bool,
+    ) -> List[Dict[str, Any]]:
+        seen = {e["id"] for e in entries}
+        merged = entries + [e for e in archived if e["id"] not in seen]
+        merged.sort(key=lambda e: (e["timestamp"] or "", e["id"]), reverse=newest_first)
+        return merged[:limit] if limit is not None else merged
+
+    @staticmethod
+    def _entry_to_row(entry: AuditTrailEntry) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "document_id": entry.document_id,
+            "event_type": entry.event_type,
+            "event_data": entry.event_data,
+            "user_id": entry.user_id,
+            "system_component": entry.system_component,
+            "timestamp": entry.timestamp,
+            "tenant_id": entry.tenant_id,
+        }
+
     @staticmethod
     def _row_to_dict(row: AuditTrailRecord) -> Dict[str, Any]:
         return {
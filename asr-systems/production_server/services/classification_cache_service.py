@@ -0,0 +1,326 @@
+"""
+ASR Production Server - Classification Cache Service
+Two-tier memoization (in-memory LRU + database) for GL classification and
+payment detection results. Keys combine a hash of the normalized document
+text with vendor, tenant and the ruleset version of the producing service,
+so any GL account or pattern change makes earlier entries unreachable.
+Cache failures are logged and treated as misses — they never break processing.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.classification_cache import ClassificationCacheRecord
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.classification_cache import (  # type: ignore[no-redef]
+        ClassificationCacheRecord,
+    )
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so re-scans of the same page match."""
+    return _WHITESPACE_RE.sub(" ", (text or "").lower()).strip()
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 hex digest over *parts* (used for keys and versions)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            digest.update(part)
+        else:
+            digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _record_lookup(kind: str, outcome: str) -> None:
+    try:
+        from services.metrics_service import record_classification_cache_lookup
+    except ImportError:
+        try:
+            from .metrics_service import record_classification_cache_lookup
+        except ImportError:
+            return
+    record_classification_cache_lookup(kind, outcome)
+
+
+def _record_saved_calls(kind: str, count: int) -> None:
+    try:
+        from services.metrics_service import record_claude_calls_saved
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_calls_saved
+        except ImportError:
+            return
+    record_claude_calls_saved(kind, count)
+
+
+@dataclass
+class _CacheEntry:
+    kind: str
+    tenant_id: str
+    result: Dict[str, Any]
+    claude_calls: int
+    stored_at: float
+
+
+class ClassificationCacheService:
+    """Memoizes classification results following the initialize/cleanup pattern."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 10000,
+        ttl_seconds: int = 7 * 24 * 3600,
+        persistent: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.initialized = False
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "claude_calls_saved": 0,
+        }
+
+    async def initialize(self) -> None:
+        self.initialized = True
+        logger.info(
+            "Classification Cache Service initialized (enabled=%s, max_entries=%d, "
+            "ttl=%ds, persistent=%s)",
+            self.enabled,
+            self.max_entries,
+            self.ttl_seconds,
+            self.persistent,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Classification Cache Service...")
+        self._entries.clear()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        kind: str,
+        text: str,
+        vendor_name: Optional[str],
+        tenant_id: Optional[str],
+        ruleset_version: str,
+        extra: str = "",
+    ) -> str:
+        """Build the cache key for one classification request."""
+        return fingerprint(
+            kind,
+            fingerprint(normalize_text(text)),
+            normalize_text(vendor_name or ""),
+            tenant_id or "default",
+            ruleset_version,
+            extra,
+        )
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    async def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result dict for *key*, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_fresh(entry.stored_at):
+                self._entries.move_to_end(key)
+                self._on_hit(kind, "memory_hit", entry.claude_calls)
+                return dict(entry.result)
+            del self._entries[key]
+
+        if self.persistent:
+            row = await self._load_row(key)
+            if row is not None:
+                result, claude_calls, tenant_id = row
+                self._remember(key, kind, tenant_id, result, claude_calls)
+                self._on_hit(kind, "db_hit", claude_calls)
+                return dict(result)
+
+        self._stats["misses"] += 1
+        _record_lookup(kind, "miss")
+        return None
+
+    async def put(
+        self,
+        kind: str,
+        key: str,
+        tenant_id: Optional[str],
+        ruleset_version: str,
+        result: Dict[str, Any],
+        claude_calls: int = 0,
+    ) -> None:
+        """Store *result* in both tiers. Never raises."""
+        if not self.enabled:
+            return
+        tenant = tenant_id or "default"
+        self._remember(key, kind, tenant, result, claude_calls)
+        self._stats["stores"] += 1
+
+        if not self.persistent:
+            return
+        try:
+            async with get_async_session() as session:
+                await session.merge(
+                    ClassificationCacheRecord(
+                        cache_key=key,
+                        kind=kind,
+                        tenant_id=tenant,
+                        ruleset_version=ruleset_version,
+                        result=result,
+                        claude_calls=claude_calls,
+                        hit_count=0,
+                        created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning(
+                "Failed to persist classification cache entry", exc_info=True
+            )
+
+    async def invalidate(
+        self, kind: Optional[str] = None, tenant_id: Optional[str] = None
+    ) -> int:
+        """Drop cached entries for *kind* / *tenant_id* (None means all).
+
+        Returns the number of persistent rows removed.
+        """
+        for key in [
+            k
+            for k, e in self._entries.items()
+            if (kind is None or e.kind == kind)
+            and (tenant_id is None or e.tenant_id == tenant_id)
+        ]:
+            del self._entries[key]
+
+        if not self.persistent:
+            return 0
+        try:
+            async with get_async_session() as session:
+                stmt = delete(ClassificationCacheRecord)
+                if kind is not None:
+                    stmt = stmt.where(ClassificationCacheRecord.kind == kind)
+                if tenant_id is not None:
+                    stmt = stmt.where(ClassificationCacheRecord.tenant_id == tenant_id)
+                result = await session.execute(stmt)
+                await session.commit()
+                deleted: int = result.rowcount or 0  # type: ignore[attr-defined]
+                return deleted
+        except Exception:
+            logger.warning("Failed to invalidate classification cache", exc_info=True)
+            return 0
+
+    async def purge_expired(self) -> int:
+        """Delete persistent rows older than the TTL. Returns count deleted."""
+        if not self.persistent:
+            return 0
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=self.ttl_seconds
+        )
+        try:
+            async with get_async_session() as session:
+                result = await session.execute(
+                    delete(ClassificationCacheRecord).where(
+                        ClassificationCacheRecord.created_at < cutoff
+                    )
+                )
+                await session.commit()
+                deleted: int = result.rowcount or 0  # type: ignore[attr-defined]
+                return deleted
+        except Exception:
+            logger.exception("Failed to purge expired classification cache rows")
+            return 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the derived hit rate."""
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "memory_entries": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return (time.time() - stored_at) < self.ttl_seconds
+
+    def _remember(
+        self,
+        key: str,
+        kind: str,
+        tenant_id: str,
+        result: Dict[str, Any],
+        claude_calls: int,
+    ) -> None:
+        self._entries[key] = _CacheEntry(
+            kind=kind,
+            tenant_id=tenant_id,
+            result=dict(result),
+            claude_calls=claude_calls,
+            stored_at=time.time(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _on_hit(self, kind: str, outcome: str, claude_calls: int) -> None:
+        self._stats["memory_hits" if outcome == "memory_hit" else "db_hits"] += 1
+        self._stats["claude_calls_saved"] += claude_calls
+        _record_lookup(kind, outcome)
+        _record_saved_calls(kind, claude_calls)
+
+    async def _load_row(self, key: str) -> Optional[Tuple[Dict[str, Any], int, str]]:
+        try:
+            async with get_async_session() as session:
+                row = (
+                    await session.execute(
+                        select(ClassificationCacheRecord).where(
+                            ClassificationCacheRecord.cache_key == key
+                        )
+                    )
+                ).scalar_one_or_none()
+                if row is None:
+                    return None
+                created = row.created_at.replace(tzinfo=timezone.utc).timestamp()
+                if not self._is_fresh(created):
+                    return None
+                return dict(row.result or {}), row.claude_calls or 0, row.tenant_id
+        except Exception:
+            logger.warning("Classification cache lookup failed", exc_info=True)
+            return None
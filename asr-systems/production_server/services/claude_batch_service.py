@@ -0,0 +1,511 @@
+"""
+ASR Production Server - Claude Batch Service
+Batch-mode Claude processing for reprocessing backlogs.
+
+A job walks a list of stored documents in four resumable stages:
+
+1. **submit** — plan the Claude requests each document's payment detection
+   would make (local methods first; nothing is planned for documents they
+   settle or content already answered) and submit them as Message Batches.
+2. **poll** — wait until every batch has ended.
+3. **collect** — stream the batch results and prime each response for its
+   content hash in the payment detection service.
+4. **reprocess** — run every document through ``reprocess_document``; the
+   Claude methods find their primed responses, so consensus, billing routing
+   and storage follow the normal path without further API calls.
+
+Progress is saved in ``claude_batch_jobs`` after each submitted batch and
+every few reprocessed documents. A job interrupted by a restart or failure
+resumes from its last saved stage; collection is repeated on every resume,
+since primed responses only live as long as the process (or the response
+cache).
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from uuid import uuid4
+
+from shared.core.exceptions import CLAUDEAPIError, DocumentError
+from sqlalchemy import select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.claude_batch_job import ClaudeBatchJobRecord
+    from ..utils.concurrency_limiter import background_priority
+    from .payment_detection_service import ClaudeBatchRequest
+except (ImportError, SystemError):
+    from utils.concurrency_limiter import (  # type: ignore[no-redef]
+        background_priority,
+    )
+
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.claude_batch_job import (  # type: ignore[no-redef]
+        ClaudeBatchJobRecord,
+    )
+    from services.payment_detection_service import (  # type: ignore[no-redef]
+        ClaudeBatchRequest,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Job statuses, in stage order
+SUBMITTING = "submitting"
+PROCESSING = "processing"
+REPROCESSING = "reprocessing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Batch result types reported by the API
+_RESULT_TYPES = ("succeeded", "errored", "canceled", "expired")
+
+
+def _record_batch_requests(outcome: str, count: int) -> None:
+    try:
+        from services.metrics_service import record_claude_batch_requests
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_batch_requests
+        except ImportError:
+            return
+    record_claude_batch_requests(outcome, count)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _response_text(message: Any) -> str:
+    for block in getattr(message, "content", None) or []:
+        if getattr(block, "type", "text") == "text":
+            text: str = block.text
+            return text
+    return ""
+
+
+class ClaudeBatchService:
+    """Runs batch reprocessing jobs (initialize/cleanup pattern).
+
+    Args:
+        payment_detection_service: Plans requests and receives responses.
+        document_processor_service: Extracts detection inputs and reprocesses.
+        storage_service: Source of the stored documents.
+        claude_client_service: Shared client exposing ``batches``.
+        poll_interval_seconds: Delay between batch status checks.
+        max_requests_per_batch: Requests per submitted Message Batch.
+        max_batch_bytes: Approximate JSON size limit per Message Batch.
+        save_every: Reprocessed documents between progress saves.
+    """
+
+    def __init__(
+        self,
+        payment_detection_service: Any,
+        document_processor_service: Any,
+        storage_service: Any,
+        claude_client_service: Any,
+        poll_interval_seconds: float = 60.0,
+        max_requests_per_batch: int = 10000,
+        max_batch_bytes: int = 200 * 1024 * 1024,
+        save_every: int = 25,
+    ) -> None:
+        self.payment_detection_service = payment_detection_service
+        self.document_processor_service = document_processor_service
+        self.storage_service = storage_service
+        self.claude_client_service = claude_client_service
+        self.poll_interval_seconds = poll_interval_seconds
+        self.max_requests_per_batch = max_requests_per_batch
+        self.max_batch_bytes = max_batch_bytes
+        self.save_every = max(1, save_every)
+        self.initialized = False
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, int] = {
+            "jobs_started": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "batches_submitted": 0,
+            "requests_submitted": 0,
+            "responses_primed": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return bool(
+            self.claude_client_service is not None
+            and self.claude_client_service.available
+        )
+
+    async def initialize(self) -> None:
+        self.initialized = True
+        logger.info(
+            "Claude Batch Service initialized (available=%s, poll_interval=%.0fs, "
+            "max_requests_per_batch=%d)",
+            self.available,
+            self.poll_interval_seconds,
+            self.max_requests_per_batch,
+        )
+
+    async def cleanup(self) -> None:
+        """Stop running jobs; their saved progress lets them resume later."""
+        logger.info("Cleaning up Claude Batch Service...")
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    async def start_job(self, document_ids: List[str], tenant_id: str) -> str:
+        """Create a job for *document_ids* and run it in the background."""
+        if not self.available:
+            raise CLAUDEAPIError("Claude client not available for batch processing")
+        if not document_ids:
+            raise DocumentError("No documents to reprocess")
+        job_id = str(uuid4())
+        job: Dict[str, Any] = {
+            "id": job_id,
+            "tenant_id": tenant_id,
+            "status": SUBMITTING,
+            "document_ids": list(dict.fromkeys(document_ids)),
+            "batches": [],
+            "planned": 0,
+            "reprocessed": 0,
+            "failed": 0,
+            "results": {},
+            "error": None,
+            "created_at": _now(),
+        }
+        await self._save(job)
+        self._stats["jobs_started"] += 1
+        self._spawn(job_id)
+        logger.info(
+            "Claude batch job %s started for %d documents (tenant %s)",
+            job_id,
+            len(job["document_ids"]),
+            tenant_id,
+        )
+        return job_id
+
+    async def resume_job(self, job_id: str, tenant_id: Optional[str] = None) -> bool:
+        """Resume an unfinished or failed job. False if it is not resumable."""
+        job = await self.get_job(job_id, tenant_id)
+        if job is None or job["status"] == COMPLETED or job_id in self._tasks:
+            return False
+        if not self.available:
+            raise CLAUDEAPIError("Claude client not available for batch processing")
+        self._spawn(job_id)
+        return True
+
+    async def resume_unfinished_jobs(self) -> int:
+        """Resume every job that was still running when the server stopped."""
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(ClaudeBatchJobRecord.id).where(
+                    ClaudeBatchJobRecord.status.in_(
+                        [SUBMITTING, PROCESSING, REPROCESSING]
+                    )
+                )
+            )
+            job_ids = [row[0] for row in result.all()]
+        for job_id in job_ids:
+            if job_id not in self._tasks:
+                self._spawn(job_id)
+        if job_ids:
+            logger.info("Resuming %d unfinished Claude batch jobs", len(job_ids))
+        return len(job_ids)
+
+    async def get_job(
+        self, job_id: str, tenant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Saved job state, scoped to *tenant_id* when given."""
+        async with get_async_session() as session:
+            record = await session.get(ClaudeBatchJobRecord, job_id)
+            if record is None:
+                return None
+            if tenant_id is not None and record.tenant_id != tenant_id:
+                return None
+            return {
+                "id": record.id,
+                "tenant_id": record.tenant_id,
+                "status": record.status,
+                "document_ids": list(record.document_ids or []),
+                "batches": list(record.batches or []),
+                "planned": record.planned or 0,
+                "reprocessed": record.reprocessed or 0,
+                "failed": record.failed or 0,
+                "results": dict(record.results or {}),
+                "error": record.error,
+                "created_at": record.created_at,
+            }
+
+    def job_summary(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """API view of a job: progress counts without request maps."""
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "running": job["id"] in self._tasks,
+            "documents": len(job["document_ids"]),
+            "planned": job["planned"],
+            "reprocessed": job["reprocessed"],
+            "failed": job["failed"],
+            "batches": [
+                {
+                    "id": batch["id"],
+                    "status": batch["status"],
+                    "requests": len(batch["requests"]),
+                }
+                for batch in job["batches"]
+            ],
+            "results": job["results"],
+            "error": job["error"],
+        }
+
+    async def run_job(self, job_id: str) -> Dict[str, Any]:
+        """Run (or continue) a job to completion in the current task."""
+        job = await self.get_job(job_id)
+        if job is None:
+            raise DocumentError(f"Batch job not found: {job_id}")
+        if job["status"] == COMPLETED:
+            return job
+
+        try:
+            with background_priority():
+                if job["status"] == FAILED:
+                    job["status"] = self._resume_status(job)
+                    job["error"] = None
+                if job["status"] == SUBMITTING:
+                    await self._submit(job)
+                    job["status"] = PROCESSING
+                    await self._save(job)
+                if job["status"] == PROCESSING:
+                    await self._poll(job)
+                    job["status"] = REPROCESSING
+                    await self._save(job)
+                await self._collect(job)
+                await self._reprocess(job)
+            job["status"] = COMPLETED
+            await self._save(job)
+            self._stats["jobs_completed"] += 1
+            logger.info(
+                "Claude batch job %s completed: %d reprocessed, %d failed",
+                job_id,
+                job["reprocessed"],
+                job["failed"],
+            )
+        except asyncio.CancelledError:
+            await self._save(job)
+            raise
+        except Exception as e:
+            job["status"] = FAILED
+            job["error"] = str(e)
+            await self._save(job)
+            self._stats["jobs_failed"] += 1
+            logger.error(f"❌ Claude batch job {job_id} failed: {e}")
+        return job
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "available": self.available,
+            "running_jobs": len(self._tasks),
+        }
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    async def _submit(self, job: Dict[str, Any]) -> None:
+        """Plan requests from ``planned`` onwards and submit them in batches.
+
+        ``planned`` only advances once a document's requests are submitted,
+        so a resumed job re-plans whatever was still pending.
+        """
+        seen: Set[str] = {
+            custom_id for batch in job["batches"] for custom_id in batch["requests"]
+        }
+        pending: List[ClaudeBatchRequest] = []
+        pending_bytes = 0
+        document_ids = job["document_ids"]
+
+        for index in range(job["planned"], len(document_ids)):
+            for request in await self._plan_document(
+                document_ids[index], job["tenant_id"]
+            ):
+                if request.custom_id in seen:
+                    continue
+                size = len(json.dumps(request.params))
+                if pending and (
+                    len(pending) >= self.max_requests_per_batch
+                    or pending_bytes + size > self.max_batch_bytes
+                ):
+                    # Documents before this one are fully covered
+                    await self._submit_batch(job, pending, planned=index)
+                    pending, pending_bytes = [], 0
+                seen.add(request.custom_id)
+                pending.append(request)
+                pending_bytes += size
+            if not pending:
+                job["planned"] = index + 1
+        if pending:
+            await self._submit_batch(job, pending, planned=len(document_ids))
+        job["planned"] = len(document_ids)
+
+    async def _plan_document(
+        self, document_id: str, tenant_id: str
+    ) -> List[ClaudeBatchRequest]:
+        document = await self.storage_service.retrieve_document(
+            document_id, tenant_id=tenant_id
+        )
+        if not document:
+            # Reported as a failure when the document is reprocessed
+            return []
+        text, image = await self.document_processor_service.prepare_detection_inputs(
+            document.content, document.metadata.filename
+        )
+        requests: List[ClaudeBatchRequest] = (
+            await self.payment_detection_service.plan_claude_requests(
+                text, image, tenant_id=tenant_id
+            )
+        )
+        return requests
+
+    async def _submit_batch(
+        self, job: Dict[str, Any], requests: List[ClaudeBatchRequest], planned: int
+    ) -> None:
+        batch = await self.claude_client_service.batches.create(
+            requests=[
+                {"custom_id": request.custom_id, "params": request.params}
+                for request in requests
+            ]
+        )
+        job["batches"].append(
+            {
+                "id": batch.id,
+                "status": batch.processing_status,
+                "requests": {
+                    request.custom_id: [request.kind, request.digest]
+                    for request in requests
+                },
+            }
+        )
+        job["planned"] = planned
+        await self._save(job)
+        self._stats["batches_submitted"] += 1
+        self._stats["requests_submitted"] += len(requests)
+        _record_batch_requests("submitted", len(requests))
+        logger.info(
+            "Claude batch job %s submitted batch %s (%d requests)",
+            job["id"],
+            batch.id,
+            len(requests),
+        )
+
+    async def _poll(self, job: Dict[str, Any]) -> None:
+        """Wait until every batch of the job has ended."""
+        while True:
+            changed = False
+            for batch in job["batches"]:
+                if batch["status"] == "ended":
+                    continue
+                current = await self.claude_client_service.batches.retrieve(batch["id"])
+                if current.processing_status != batch["status"]:
+                    batch["status"] = current.processing_status
+                    changed = True
+            if changed:
+                await self._save(job)
+            if all(batch["status"] == "ended" for batch in job["batches"]):
+                return
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _collect(self, job: Dict[str, Any]) -> None:
+        """Prime the payment detection service with every batch response."""
+        counts = {result_type: 0 for result_type in (*_RESULT_TYPES, "primed")}
+        # Usage is accounted to the tenant once per job, not on every resume
+        first_collection = not job["results"]
+        usage_service = getattr(self.payment_detection_service, "usage_service", None)
+        for batch in job["batches"]:
+            results = await self.claude_client_service.batches.results(batch["id"])
+            async for item in results:
+                result_type = item.result.type
+                counts[result_type] = counts.get(result_type, 0) + 1
+                if result_type != "succeeded":
+                    continue
+                if first_collection and usage_service is not None:
+                    usage = getattr(item.result.message, "usage", None)
+                    usage_service.record(
+                        job["tenant_id"],
+                        int(getattr(usage, "input_tokens", 0) or 0),
+                        int(getattr(usage, "output_tokens", 0) or 0),
+                        batch=True,
+                    )
+                request = batch["requests"].get(item.custom_id)
+                if request is None:
+                    continue
+                kind, digest = request
+                if await self.payment_detection_service.prime_claude_response(
+                    kind, digest, _response_text(item.result.message)
+                ):
+                    counts["primed"] += 1
+
+        if first_collection:
+            for result_type in _RESULT_TYPES:
+                _record_batch_requests(result_type, counts[result_type])
+            self._stats["responses_primed"] += counts["primed"]
+        job["results"] = counts
+        await self._save(job)
+
+    async def _reprocess(self, job: Dict[str, Any]) -> None:
+        """Reprocess documents from ``reprocessed`` onwards."""
+        document_ids = job["document_ids"]
+        for index in range(job["reprocessed"], len(document_ids)):
+            result = await self.document_processor_service.reprocess_document(
+                document_ids[index], tenant_id=job["tenant_id"]
+            )
+            if not result.success:
+                job["failed"] += 1
+            job["reprocessed"] = index + 1
+            if job["reprocessed"] % self.save_every == 0:
+                await self._save(job)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resume_status(job: Dict[str, Any]) -> str:
+        """Stage a failed job restarts from."""
+        if job["planned"] < len(job["document_ids"]):
+            return SUBMITTING
+        if any(batch["status"] != "ended" for batch in job["batches"]):
+            return PROCESSING
+        return REPROCESSING
+
+    def _spawn(self, job_id: str) -> None:
+        task = asyncio.create_task(self.run_job(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        async with get_async_session() as session:
+            await session.merge(
+                ClaudeBatchJobRecord(
+                    id=job["id"],
+                    tenant_id=job["tenant_id"],
+                    status=job["status"],
+                    document_ids=list(job["document_ids"]),
+                    batches=json.loads(json.dumps(job["batches"])),
+                    planned=job["planned"],
+                    reprocessed=job["reprocessed"],
+                    failed=job["failed"],
+                    results=dict(job["results"]),
+                    error=job["error"],
+                    created_at=job["created_at"],
+                    updated_at=_now(),
+                )
+            )
+            await session.commit()
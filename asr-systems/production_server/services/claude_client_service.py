@@ -0,0 +1,259 @@
+"""
+ASR Production Server - Claude Client Service
+One pooled AsyncAnthropic client for the whole process, with every request
+passing through an adaptive concurrency limiter.
+
+Under a burst of uploads the limiter queues Claude calls instead of firing
+them all at once. It shrinks on 429/529 responses, honouring Retry-After,
+and on calls over the latency target; it grows back while calls succeed.
+Interactive uploads are granted slots ahead of background reprocessing
+(see ``utils.concurrency_limiter.background_priority``).
+
+The SDK's own retries are disabled: callers retry through ``async_retry``,
+and every attempt queues through the limiter again.
+
+Importing the SDK takes seconds, most of a cold start. With ``lazy_import``
+``initialize`` only checks that it is installed; the client is built by
+``connect``, on the first request or from a warmup after the server is ready.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+from shared.core.exceptions import CLAUDEAPIError
+
+try:
+    from ..utils.concurrency_limiter import (
+        PRIORITY_NAMES,
+        AdaptiveConcurrencyLimiter,
+    )
+except (ImportError, SystemError):
+    from utils.concurrency_limiter import (  # type: ignore[no-redef]
+        PRIORITY_NAMES,
+        AdaptiveConcurrencyLimiter,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Upstream "slow down" responses: rate limited, overloaded
+_PUSHBACK_STATUSES = {429, 529}
+
+
+def _record_request(
+    priority: int, outcome: str, queue_wait: float, concurrency_limit: int
+) -> None:
+    try:
+        from services.metrics_service import record_claude_request
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_request
+        except ImportError:
+            return
+    record_claude_request(
+        PRIORITY_NAMES.get(priority, str(priority)),
+        outcome,
+        queue_wait,
+        concurrency_limit,
+    )
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After header of an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _LimitedMessages:
+    """``client.messages`` stand-in whose ``create`` goes through the limiter."""
+
+    def __init__(self, service: "ClaudeClientService") -> None:
+        self._service = service
+
+    async def create(self, **kwargs: Any) -> Any:
+        return await self._service.create_message(**kwargs)
+
+
+class _Batches:
+    """``client.messages.batches`` stand-in that connects the client first."""
+
+    def __init__(self, service: "ClaudeClientService") -> None:
+        self._service = service
+
+    def __getattr__(self, name: str) -> Any:
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            client = await self._service.connect()
+            return await getattr(client.messages.batches, name)(*args, **kwargs)
+
+        return call
+
+
+class ClaudeClientService:
+    """Shared, concurrency-limited Claude client (initialize/cleanup pattern).
+
+    Exposes ``messages.create`` like ``AsyncAnthropic`` so services can use
+    it in place of their own client. Rate-limit and overload responses are
+    raised as ``CLAUDEAPIError`` with ``api_status`` set; other SDK errors
+    propagate unchanged.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        latency_target_seconds: Optional[float] = None,
+        request_timeout_seconds: float = 60.0,
+        lazy_import: bool = True,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url
+        self.request_timeout_seconds = request_timeout_seconds
+        self.lazy_import = lazy_import
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_concurrency,
+            min_limit=min_concurrency,
+            max_limit=max_concurrency,
+            latency_target=latency_target_seconds,
+        )
+        self.messages = _LimitedMessages(self)
+        self._batches = _Batches(self)
+        self.client: Optional[Any] = None
+        self.initialized = False
+        self._sdk_installed = False
+        self._connect_lock = asyncio.Lock()
+        # Per-outcome counters: success, overloaded (429/529), error
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "success": 0,
+            "overloaded": 0,
+            "error": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None or self._sdk_installed
+
+    @property
+    def batches(self) -> Any:
+        """The SDK's Message Batches resource, connecting on first call.
+
+        Batch calls are few and asynchronous on the provider side, so they
+        bypass the concurrency limiter.
+        """
+        if not self.available:
+            raise CLAUDEAPIError("Claude client not available")
+        return self._batches
+
+    async def initialize(self) -> None:
+        if self.api_key:
+            self._sdk_installed = importlib.util.find_spec("anthropic") is not None
+            if not self._sdk_installed:
+                logger.warning(
+                    "❌ Anthropic library not available, Claude AI methods disabled"
+                )
+            elif not self.lazy_import:
+                self.client = await self._build_client()
+        self.initialized = True
+        logger.info(
+            "Claude Client Service initialized (available=%s, connected=%s, "
+            "concurrency=%d..%d, latency_target=%s)",
+            self.available,
+            self.client is not None,
+            self.limiter.min_limit,
+            self.limiter.max_limit,
+            self.limiter.latency_target,
+        )
+
+    async def connect(self) -> Any:
+        """The SDK client, imported and built on the first call."""
+        if self.client is not None:
+            return self.client
+        if not self.available:
+            raise CLAUDEAPIError("Claude client not available")
+        async with self._connect_lock:
+            if self.client is None:
+                self.client = await self._build_client()
+        if self.client is None:
+            raise CLAUDEAPIError("Claude client not available")
+        return self.client
+
+    async def _build_client(self) -> Optional[Any]:
+        try:
+            # The SDK import is slow; keep it off the event loop
+            anthropic = await asyncio.to_thread(importlib.import_module, "anthropic")
+            import httpx
+        except ImportError:
+            self._sdk_installed = False
+            logger.warning(
+                "❌ Anthropic library not available, Claude AI methods disabled"
+            )
+            return None
+
+        # Connection pool sized for the largest limit the limiter can reach
+        http_client = anthropic.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=self.limiter.max_limit,
+                max_keepalive_connections=self.limiter.max_limit,
+            ),
+        )
+        return anthropic.AsyncAnthropic(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=0,
+            timeout=self.request_timeout_seconds,
+            http_client=http_client,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Claude Client Service...")
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        self._sdk_installed = False
+        self.initialized = False
+
+    async def create_message(self, **kwargs: Any) -> Any:
+        """``messages.create`` under a concurrency slot at the caller's priority."""
+        client = await self.connect()
+
+        self._stats["requests"] += 1
+        async with self.limiter.slot() as slot:
+            outcome = "error"
+            try:
+                response = await client.messages.create(**kwargs)
+                outcome = "success"
+                return response
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                if status not in _PUSHBACK_STATUSES:
+                    raise
+                outcome = "overloaded"
+                slot.mark_overloaded(_retry_after(e))
+                raise CLAUDEAPIError(
+                    f"Claude API pushback ({status}): {e}", api_status=status
+                ) from e
+            finally:
+                self._stats[outcome] += 1
+                _record_request(
+                    slot.priority, outcome, slot.wait_seconds, self.limiter.limit
+                )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "available": self.available,
+            "connected": self.client is not None,
+            "limiter": self.limiter.get_statistics(),
+        }
@@ -0,0 +1,171 @@
+"""
+ASR Production Server - Claude Prompt Builder
+Relevance-windowed compaction of document text for Claude text analysis.
+A payment status decision hinges on a few lines around "balance due",
+"paid", check numbers and amounts, so long documents are reduced to the
+windows around payment indicator matches and amounts, plus the document head
+and tail, under a token budget. Short documents are sent unchanged.
+
+Token counts here are estimates (about four characters per token); the
+exact input and output counts come from the API response usage.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    from .payment_indicator_scanner import (
+        KEYWORD_KIND,
+        PATTERN_KIND,
+        PAYMENT_CATEGORIES,
+        IndicatorScan,
+    )
+except ImportError:
+    from services.payment_indicator_scanner import (  # type: ignore[no-redef]
+        KEYWORD_KIND,
+        PATTERN_KIND,
+        PAYMENT_CATEGORIES,
+        IndicatorScan,
+    )
+
+CHARS_PER_TOKEN = 4
+
+# Long lines (or OCR dumps without line breaks) are chunked to this size
+SEGMENT_CHARS = 240
+# Neighbouring segments kept on each side of a selected segment
+DEFAULT_CONTEXT_SEGMENTS = 1
+# Leading/trailing characters that score as document head/tail
+DEFAULT_EDGE_CHARS = 400
+
+# Anchor weights: bounded patterns are the strongest evidence; keyword
+# substrings and bare amounts mostly add context around them
+PATTERN_WEIGHT = 3.0
+KEYWORD_WEIGHT = 1.0
+AMOUNT_WEIGHT = 1.0
+EDGE_WEIGHT = 2.0
+
+OMISSION_MARKER = "\n[...]\n"
+
+_AMOUNT_RE = re.compile(r"\$\s*\d[\d,]*(?:\.\d{2})?|\b\d{1,3}(?:,\d{3})*\.\d{2}\b")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (ceil of chars / CHARS_PER_TOKEN)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass
+class CompactedText:
+    """Document text selected for a prompt"""
+
+    text: str
+    original_tokens: int
+    tokens: int
+    windows: int
+    compacted: bool
+
+
+def compact_document_text(
+    document_text: str,
+    scan: Optional[IndicatorScan],
+    token_budget: Optional[int],
+    context_segments: int = DEFAULT_CONTEXT_SEGMENTS,
+    edge_chars: int = DEFAULT_EDGE_CHARS,
+) -> CompactedText:
+    """Select the most relevant windows of *document_text* within *token_budget*.
+
+    The text is split into segments (lines, with long lines chunked). Each
+    anchor — an indicator match in *scan* or a currency amount — adds its
+    weight to the segment it starts in. Segments are taken best-first,
+    each with ``context_segments`` neighbours either side, until the budget
+    is spent; the head and tail of the document compete as well. The
+    selection is emitted in document order with ``[...]`` marking gaps.
+    """
+    original_tokens = estimate_tokens(document_text)
+    if token_budget is None or original_tokens <= token_budget:
+        return CompactedText(document_text, original_tokens, original_tokens, 1, False)
+
+    segments = _segments(document_text)
+    starts = [start for start, _ in segments]
+    scores = [0.0] * len(segments)
+
+    def add(position: int, weight: float) -> None:
+        scores[bisect_right(starts, position) - 1] += weight
+
+    if scan is not None:
+        for kind, weight in (
+            (PATTERN_KIND, PATTERN_WEIGHT),
+            (KEYWORD_KIND, KEYWORD_WEIGHT),
+        ):
+            for category in PAYMENT_CATEGORIES:
+                for start, _ in scan.positions(kind, category):
+                    add(start, weight)
+    for match in _AMOUNT_RE.finditer(document_text):
+        add(match.start(), AMOUNT_WEIGHT)
+    for index, (start, end) in enumerate(segments):
+        if start < edge_chars or end > len(document_text) - edge_chars:
+            scores[index] += EDGE_WEIGHT
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    chosen = [False] * len(segments)
+    used = 0
+    for index in sorted(
+        (i for i, score in enumerate(scores) if score > 0),
+        key=lambda i: (-scores[i], i),
+    ):
+        block = [
+            i
+            for i in range(
+                max(0, index - context_segments),
+                min(len(segments), index + context_segments + 1),
+            )
+            if not chosen[i]
+        ]
+        cost = sum(segments[i][1] - segments[i][0] + 1 for i in block)
+        if not block or used + cost + len(OMISSION_MARKER) > budget_chars:
+            continue
+        for i in block:
+            chosen[i] = True
+        used += cost + len(OMISSION_MARKER)
+
+    parts: List[str] = []
+    windows = 0
+    previous = -1
+    for index, (start, end) in enumerate(segments):
+        if not chosen[index]:
+            continue
+        if previous >= 0 and index == previous + 1:
+            # Keep the original separator: a newline, or nothing between
+            # chunks of one long line
+            parts.append(document_text[segments[previous][1] : start])
+        else:
+            if index > 0:
+                parts.append(OMISSION_MARKER)
+            windows += 1
+        parts.append(document_text[start:end])
+        previous = index
+    if previous != len(segments) - 1:
+        parts.append(OMISSION_MARKER)
+    text = "".join(parts).strip("\n")
+
+    return CompactedText(text, original_tokens, estimate_tokens(text), windows, True)
+
+
+def _segments(text: str) -> List[Tuple[int, int]]:
+    """Line spans of *text*, with lines longer than SEGMENT_CHARS chunked."""
+    segments: List[Tuple[int, int]] = []
+    position = 0
+    length = len(text)
+    while position <= length:
+        newline = text.find("\n", position)
+        end = length if newline < 0 else newline
+        while end - position > SEGMENT_CHARS:
+            segments.append((position, position + SEGMENT_CHARS))
+            position += SEGMENT_CHARS
+        segments.append((position, end))
+        if newline < 0:
+            break
+        position = newline + 1
+    return segments
@@ -0,0 +1,331 @@
+"""
+ASR Production Server - Claude Response Cache Service
+Two-tier cache (in-memory LRU + database) for raw Claude text and vision
+responses. Keys combine the request kind, model, prompt template version and
+a hash of the exact content sent (document text or image bytes), so
+re-uploads and reprocessing of identical content skip the API call while any
+model or prompt change makes earlier entries unreachable.
+
+Only successful, definite responses are stored: callers never pass API
+errors or circuit-breaker failures here, and responses that parse to
+UNKNOWN are rejected by the caller. Cache failures are logged and treated as
+misses — they never break detection.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.claude_response_cache import ClaudeResponseCacheRecord
+    from .classification_cache_service import fingerprint
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.claude_response_cache import (  # type: ignore[no-redef]
+        ClaudeResponseCacheRecord,
+    )
+    from services.classification_cache_service import (  # type: ignore[no-redef]
+        fingerprint,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Row-count limit is enforced after every this many stores
+_PRUNE_EVERY = 100
+
+
+def content_hash(content: Any) -> str:
+    """SHA-256 of the exact text or bytes sent to Claude."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def _record_lookup(kind: str, outcome: str) -> None:
+    try:
+        from services.metrics_service import record_claude_response_cache_lookup
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_response_cache_lookup
+        except ImportError:
+            return
+    record_claude_response_cache_lookup(kind, outcome)
+
+
+def _record_seconds_saved(kind: str, seconds: float) -> None:
+    try:
+        from services.metrics_service import record_claude_seconds_saved
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_seconds_saved
+        except ImportError:
+            return
+    record_claude_seconds_saved(kind, seconds)
+
+
+@dataclass
+class _CachedResponse:
+    kind: str
+    response_text: str
+    latency_seconds: float
+    stored_at: float
+
+
+class ClaudeResponseCacheService:
+    """Caches Claude responses following the initialize/cleanup pattern."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 2000,
+        max_rows: int = 100000,
+        max_response_bytes: int = 64 * 1024,
+        ttl_seconds: int = 30 * 24 * 3600,
+        persistent: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.max_response_bytes = max_response_bytes
+        self.ttl_seconds = ttl_seconds
+        self.persistent = persistent
+        self.initialized = False
+        self._entries: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._stores_since_prune = 0
+        self._stats: Dict[str, Any] = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "rejected": 0,
+            "evicted_rows": 0,
+            "seconds_saved": 0.0,
+        }
+
+    async def initialize(self) -> None:
+        self.initialized = True
+        logger.info(
+            "Claude Response Cache Service initialized (enabled=%s, max_entries=%d, "
+            "max_rows=%d, ttl=%ds, persistent=%s)",
+            self.enabled,
+            self.max_entries,
+            self.max_rows,
+            self.ttl_seconds,
+            self.persistent,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Claude Response Cache Service...")
+        self._entries.clear()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(kind: str, model: str, prompt_version: str, digest: str) -> str:
+        """Build the cache key for one Claude request."""
+        return fingerprint(kind, model, prompt_version, digest)
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    async def get(self, kind: str, key: str) -> Optional[str]:
+        """Return the cached response text for *key*, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_fresh(entry.stored_at):
+                self._entries.move_to_end(key)
+                self._on_hit(kind, "memory_hit", entry.latency_seconds)
+                return entry.response_text
+            del self._entries[key]
+
+        if self.persistent:
+            row = await self._load_row(key)
+            if row is not None:
+                response_text, latency, stored_at = row
+                self._remember(key, kind, response_text, latency, stored_at)
+                self._on_hit(kind, "db_hit", latency)
+                return response_text
+
+        self._stats["misses"] += 1
+        _record_lookup(kind, "miss")
+        return None
+
+    async def put(
+        self,
+        kind: str,
+        key: str,
+        model: str,
+        prompt_version: str,
+        digest: str,
+        response_text: str,
+        latency_seconds: float,
+    ) -> bool:
+        """Store a successful response in both tiers. Never raises.
+
+        Returns False when the response is empty or over
+        ``max_response_bytes`` and was not stored.
+        """
+        if not self.enabled:
+            return False
+        if (
+            not response_text
+            or len(response_text.encode("utf-8")) > self.max_response_bytes
+        ):
+            self._stats["rejected"] += 1
+            return False
+
+        self._remember(key, kind, response_text, latency_seconds, time.time())
+        self._stats["stores"] += 1
+
+        if not self.persistent:
+            return True
+        try:
+            async with get_async_session() as session:
+                await session.merge(
+                    ClaudeResponseCacheRecord(
+                        cache_key=key,
+                        kind=kind,
+                        model=model,
+                        prompt_version=prompt_version,
+                        content_hash=digest,
+                        response_text=response_text,
+                        latency_seconds=latency_seconds,
+                        hit_count=0,
+                        created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning(
+                "Failed to persist Claude response cache entry", exc_info=True
+            )
+            return True
+
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= _PRUNE_EVERY:
+            self._stores_since_prune = 0
+            await self.enforce_row_limit()
+        return True
+
+    async def purge_expired(self) -> int:
+        """Delete rows older than the TTL, then enforce ``max_rows``."""
+        if not self.persistent:
+            return 0
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=self.ttl_seconds
+        )
+        try:
+            async with get_async_session() as session:
+                result = await session.execute(
+                    delete(ClaudeResponseCacheRecord).where(
+                        ClaudeResponseCacheRecord.created_at < cutoff
+                    )
+                )
+                await session.commit()
+                purged: int = result.rowcount or 0  # type: ignore[attr-defined]
+        except Exception:
+            logger.exception("Failed to purge expired Claude response cache rows")
+            return 0
+        return purged + await self.enforce_row_limit()
+
+    async def enforce_row_limit(self) -> int:
+        """Delete the oldest rows beyond ``max_rows``. Returns count deleted."""
+        try:
+            async with get_async_session() as session:
+                total = (
+                    await session.execute(
+                        select(func.count()).select_from(ClaudeResponseCacheRecord)
+                    )
+                ).scalar_one()
+                excess = total - self.max_rows
+                if excess <= 0:
+                    return 0
+                oldest = (
+                    select(ClaudeResponseCacheRecord.cache_key)
+                    .order_by(ClaudeResponseCacheRecord.created_at)
+                    .limit(excess)
+                )
+                result = await session.execute(
+                    delete(ClaudeResponseCacheRecord).where(
+                        ClaudeResponseCacheRecord.cache_key.in_(oldest)
+                    )
+                )
+                await session.commit()
+                evicted: int = result.rowcount or 0  # type: ignore[attr-defined]
+        except Exception:
+            logger.warning(
+                "Failed to enforce Claude response cache size", exc_info=True
+            )
+            return 0
+        self._stats["evicted_rows"] += evicted
+        return evicted
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return hit/miss counters, the derived hit rate and seconds saved."""
+        hits = self._stats["memory_hits"] + self._stats["db_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "seconds_saved": round(self._stats["seconds_saved"], 3),
+            "memory_entries": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return (time.time() - stored_at) < self.ttl_seconds
+
+    def _remember(
+        self,
+        key: str,
+        kind: str,
+        response_text: str,
+        latency_seconds: float,
+        stored_at: float,
+    ) -> None:
+        self._entries[key] = _CachedResponse(
+            kind=kind,
+            response_text=response_text,
+            latency_seconds=latency_seconds,
+            stored_at=stored_at,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _on_hit(self, kind: str, outcome: str, latency_seconds: float) -> None:
+        self._stats["memory_hits" if outcome == "memory_hit" else "db_hits"] += 1
+        self._stats["seconds_saved"] += latency_seconds
+        _record_lookup(kind, outcome)
+        _record_seconds_saved(kind, latency_seconds)
+
+    async def _load_row(self, key: str) -> Optional[Tuple[str, float, float]]:
+        try:
+            async with get_async_session() as session:
+                row = await session.get(ClaudeResponseCacheRecord, key)
+                if row is None:
+                    return None
+                stored_at = row.created_at.replace(tzinfo=timezone.utc).timestamp()
+                if not self._is_fresh(stored_at):
+                    return None
+                return row.response_text, row.latency_seconds or 0.0, stored_at
+        except Exception:
+            logger.warning("Claude response cache lookup failed", exc_info=True)
+            return None
@@ -0,0 +1,436 @@
+"""
+ASR Production Server - Claude Usage Service
+Per-tenant accounting of Claude calls, tokens, estimated spend and latency,
+with daily budgets.
+
+Usage is accumulated in memory and flushed to ``claude_tenant_usage`` as
+increments every few seconds (and on shutdown), so each worker adds its own
+share and re-reads the day's totals, which then include the other workers'.
+Budget checks only read the in-memory totals and cost nothing per request.
+
+Budgets are per UTC day. Defaults apply to every tenant; per-tenant
+overrides replace individual limits (a limit of 0 means unlimited). When a
+tenant is over budget, payment detection runs its local methods only.
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+
+from sqlalchemy import Table, func, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.claude_usage import ClaudeTenantUsageRecord
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.claude_usage import (  # type: ignore[no-redef]
+        ClaudeTenantUsageRecord,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Message Batches are billed at half the interactive price
+BATCH_PRICE_RATIO = 0.5
+
+# Budget names and the usage field each one limits
+BUDGET_FIELDS = {
+    "calls": "calls",
+    "tokens": "tokens",
+    "spend_usd": "cost_usd",
+    "latency_seconds": "latency_seconds",
+}
+
+
+def _record_usage(
+    tenant_id: str,
+    mode: str,
+    input_tokens: int,
+    output_tokens: int,
+    cost_usd: float,
+    latency_seconds: float,
+) -> None:
+    try:
+        from services.metrics_service import record_claude_tenant_usage
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_tenant_usage
+        except ImportError:
+            return
+    record_claude_tenant_usage(
+        tenant_id, mode, input_tokens, output_tokens, cost_usd, latency_seconds
+    )
+
+
+def _record_downgrade(tenant_id: str, budget: str) -> None:
+    try:
+        from services.metrics_service import record_claude_budget_downgrade
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_budget_downgrade
+        except ImportError:
+            return
+    record_claude_budget_downgrade(tenant_id, budget)
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+@dataclass
+class TenantUsage:
+    """Claude usage of one tenant over one day."""
+
+    calls: int = 0
+    batch_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_seconds: float = 0.0
+    downgrades: int = 0
+
+    @property
+    def tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, other: "TenantUsage") -> None:
+        for field in fields(self):
+            setattr(
+                self, field.name, getattr(self, field.name) + getattr(other, field.name)
+            )
+
+
+class ClaudeUsageService:
+    """Tracks per-tenant Claude usage and budgets (initialize/cleanup pattern).
+
+    Args:
+        enabled: Record usage and enforce budgets.
+        input_cost_per_mtok / output_cost_per_mtok: USD per million tokens,
+            for the spend estimate.
+        default_budgets: Daily limits for every tenant, keyed by
+            ``calls``, ``tokens``, ``spend_usd`` and ``latency_seconds``.
+        tenant_budgets: Per-tenant overrides of those limits.
+        flush_interval_seconds: How often increments are written.
+        persistent: Write usage to the database.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        input_cost_per_mtok: float = 3.0,
+        output_cost_per_mtok: float = 15.0,
+        default_budgets: Optional[Dict[str, float]] = None,
+        tenant_budgets: Optional[Dict[str, Dict[str, float]]] = None,
+        flush_interval_seconds: float = 5.0,
+        persistent: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.input_cost_per_mtok = input_cost_per_mtok
+        self.output_cost_per_mtok = output_cost_per_mtok
+        # Unset defaults are dropped; a 0 override lifts a default limit
+        self.default_budgets = {
+            name: limit
+            for name, limit in self._validated(default_budgets or {}).items()
+            if limit > 0
+        }
+        self.tenant_budgets = {
+            tenant: self._validated(budgets)
+            for tenant, budgets in (tenant_budgets or {}).items()
+        }
+        self.flush_interval_seconds = flush_interval_seconds
+        self.persistent = persistent
+        self.initialized = False
+        self._day = _today()
+        # Today's totals per tenant (all workers, as of the last flush)
+        self._totals: Dict[str, TenantUsage] = {}
+        # Increments not yet written, keyed by (tenant, day)
+        self._pending: Dict[Tuple[str, str], TenantUsage] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stats: Dict[str, int] = {"recorded": 0, "downgrades": 0, "flushes": 0}
+
+    async def initialize(self) -> None:
+        if self.enabled and self.persistent:
+            try:
+                await self._load_totals()
+            except Exception:
+                logger.warning("Failed to load Claude usage totals", exc_info=True)
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        self.initialized = True
+        logger.info(
+            "Claude Usage Service initialized (enabled=%s, default budgets=%s, "
+            "%d tenant overrides)",
+            self.enabled,
+            self.default_budgets or "unlimited",
+            len(self.tenant_budgets),
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Claude Usage Service...")
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def estimate_cost(
+        self, input_tokens: int, output_tokens: int, batch: bool = False
+    ) -> float:
+        cost = (
+            input_tokens * self.input_cost_per_mtok
+            + output_tokens * self.output_cost_per_mtok
+        ) / 1_000_000
+        return cost * BATCH_PRICE_RATIO if batch else cost
+
+    def record(
+        self,
+        tenant_id: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_seconds: float = 0.0,
+        batch: bool = False,
+    ) -> None:
+        """Account one Claude call to *tenant_id*."""
+        if not self.enabled:
+            return
+        cost = self.estimate_cost(input_tokens, output_tokens, batch)
+        self._add(
+            tenant_id,
+            TenantUsage(
+                calls=0 if batch else 1,
+                batch_calls=1 if batch else 0,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=cost,
+                latency_seconds=latency_seconds,
+            ),
+        )
+        self._stats["recorded"] += 1
+        _record_usage(
+            tenant_id,
+            "batch" if batch else "interactive",
+            input_tokens,
+            output_tokens,
+            cost,
+            latency_seconds,
+        )
+
+    def record_downgrade(self, tenant_id: str, budget: str) -> None:
+        """Count a detection that skipped Claude because of *budget*."""
+        if not self.enabled:
+            return
+        self._add(tenant_id, TenantUsage(downgrades=1))
+        self._stats["downgrades"] += 1
+        _record_downgrade(tenant_id, budget)
+
+    # ------------------------------------------------------------------
+    # Budgets
+    # ------------------------------------------------------------------
+
+    def budgets_for(self, tenant_id: str) -> Dict[str, float]:
+        return {**self.default_budgets, **self.tenant_budgets.get(tenant_id, {})}
+
+    def exceeded_budget(self, tenant_id: str) -> Optional[str]:
+        """Name of the first daily budget *tenant_id* has used up, if any."""
+        if not self.enabled:
+            return None
+        budgets = self.budgets_for(tenant_id)
+        if not budgets:
+            return None
+        usage = self.usage(tenant_id)
+        for name, limit in budgets.items():
+            if limit > 0 and getattr(usage, BUDGET_FIELDS[name]) >= limit:
+                return name
+        return None
+
+    def usage(self, tenant_id: str) -> TenantUsage:
+        """Today's usage of *tenant_id* (a copy)."""
+        self._roll_day()
+        usage = TenantUsage()
+        usage.add(self._totals.get(tenant_id, TenantUsage()))
+        return usage
+
+    def get_tenant_report(self, tenant_id: str) -> Dict[str, Any]:
+        """Today's usage, budgets and remaining allowance for one tenant."""
+        usage = self.usage(tenant_id)
+        budgets = self.budgets_for(tenant_id)
+        return {
+            "tenant_id": tenant_id,
+            "date": self._day,
+            "usage": {
+                **asdict(usage),
+                "tokens": usage.tokens,
+                "cost_usd": round(usage.cost_usd, 6),
+                "latency_seconds": round(usage.latency_seconds, 3),
+            },
+            "budgets": budgets,
+            "remaining": {
+                name: max(0.0, limit - getattr(usage, BUDGET_FIELDS[name]))
+                for name, limit in budgets.items()
+                if limit > 0
+            },
+            "exceeded": self.exceeded_budget(tenant_id),
+        }
+
+    def get_statistics(self) -> Dict[str, Any]:
+        self._roll_day()
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "tenants_today": len(self._totals),
+            "cost_usd_today": round(
+                sum(usage.cost_usd for usage in self._totals.values()), 6
+            ),
+            "pending_rows": len(self._pending),
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """Write pending increments and refresh today's totals. Never raises."""
+        if not self.persistent or not self._pending:
+            return 0
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            try:
+                async with get_async_session() as session:
+                    await self._upsert(session, pending)
+                    await session.commit()
+            except Exception:
+                logger.warning("Failed to persist Claude usage", exc_info=True)
+                # Keep the increments for the next attempt
+                for key, usage in pending.items():
+                    self._pending.setdefault(key, TenantUsage()).add(usage)
+                return 0
+            self._stats["flushes"] += 1
+            try:
+                await self._load_totals()
+            except Exception:
+                logger.warning("Failed to refresh Claude usage totals", exc_info=True)
+            return len(pending)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    async def _load_totals(self) -> None:
+        """Replace today's totals with the database rows plus unflushed usage."""
+        self._roll_day()
+        day = self._day
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(ClaudeTenantUsageRecord).where(
+                    ClaudeTenantUsageRecord.usage_date == day
+                )
+            )
+            rows = result.scalars().all()
+        totals: Dict[str, TenantUsage] = {}
+        for row in rows:
+            totals[row.tenant_id] = TenantUsage(
+                **{
+                    field.name: getattr(row, field.name) or 0
+                    for field in fields(TenantUsage)
+                }
+            )
+        for (tenant_id, pending_day), usage in self._pending.items():
+            if pending_day == day:
+                totals.setdefault(tenant_id, TenantUsage()).add(usage)
+        if day == self._day:
+            self._totals = totals
+
+    @staticmethod
+    async def _upsert(
+        session: Any, pending: Dict[Tuple[str, str], TenantUsage]
+    ) -> None:
+        """Increment usage rows with INSERT .. ON CONFLICT DO UPDATE."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = [
+            {
+                "tenant_id": tenant_id,
+                "usage_date": day,
+                **asdict(usage),
+                "updated_at": now,
+            }
+            for (tenant_id, day), usage in pending.items()
+        ]
+        dialect = session.bind.dialect.name if session.bind is not None else ""
+        dialect_insert: Optional[Callable[[Table], Any]] = None
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            dialect_insert = pg_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            dialect_insert = sqlite_insert
+
+        table = cast(Table, ClaudeTenantUsageRecord.__table__)
+        if dialect_insert is not None:
+            stmt = dialect_insert(table)
+            incoming = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.tenant_id, table.c.usage_date],
+                set_={
+                    **{
+                        field.name: func.coalesce(table.c[field.name], 0)
+                        + incoming[field.name]
+                        for field in fields(TenantUsage)
+                    },
+                    "updated_at": incoming.updated_at,
+                },
+            )
+            await session.execute(stmt, rows)
+            return
+
+        # Portable fallback: read the touched rows, then insert or update
+        for row in rows:
+            existing = await session.get(
+                ClaudeTenantUsageRecord, (row["tenant_id"], row["usage_date"])
+            )
+            if existing is None:
+                session.add(ClaudeTenantUsageRecord(**row))
+                continue
+            for field in fields(TenantUsage):
+                setattr(
+                    existing,
+                    field.name,
+                    (getattr(existing, field.name) or 0) + row[field.name],
+                )
+            existing.updated_at = row["updated_at"]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _add(self, tenant_id: str, usage: TenantUsage) -> None:
+        self._roll_day()
+        self._totals.setdefault(tenant_id, TenantUsage()).add(usage)
+        if self.persistent:
+            self._pending.setdefault((tenant_id, self._day), TenantUsage()).add(usage)
+
+    def _roll_day(self) -> None:
+        """Start from zero when the UTC day changes."""
+        today = _today()
+        if today != self._day:
+            self._day = today
+            self._totals = {}
+
+    @staticmethod
+    def _validated(budgets: Dict[str, float]) -> Dict[str, float]:
+        unknown = set(budgets) - set(BUDGET_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown Claude budget(s) {sorted(unknown)}; "
+                f"expected {sorted(BUDGET_FIELDS)}"
+            )
+        return {name: float(limit) for name, limit in budgets.items()}
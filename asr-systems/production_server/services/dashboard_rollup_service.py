@@ -0,0 +1,917 @@
+"""
+ASR Production Server - Dashboard Rollup Service
+Materialized per-tenant dashboard metrics.
+
+The document pipeline folds every processed document into daily rollup
+buckets (document totals, GL accounts, payment status, billing destination,
+vendor and the invoice dates of unpaid documents, which aging is computed
+from) plus a short list of recent documents. Dashboard endpoints then read
+a handful of pre-aggregated rows for the caller's tenant instead of loading
+every metadata file in storage.
+
+Deployments that predate the rollups are backfilled once from the storage
+metadata files in the background when the rollup table is empty.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import ColumnElement, Table, delete, func, select
+
+try:
+    from ..config.database import get_async_session
+    from ..models.dashboard_recent_document import DashboardRecentDocumentRecord
+    from ..models.dashboard_rollup import (
+        DashboardRollupDocumentRecord,
+        DashboardRollupRecord,
+    )
+except (ImportError, SystemError):
+    from config.database import get_async_session  # type: ignore[no-redef]
+    from models.dashboard_recent_document import (  # type: ignore[no-redef]
+        DashboardRecentDocumentRecord,
+    )
+    from models.dashboard_rollup import (  # type: ignore[no-redef]
+        DashboardRollupDocumentRecord,
+        DashboardRollupRecord,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Rollup dimensions maintained by record_documents()
+DIM_TOTAL = "total"
+DIM_GL_ACCOUNT = "gl_account"
+DIM_PAYMENT_STATUS = "payment_status"
+DIM_DESTINATION = "destination"
+DIM_VENDOR = "vendor"
+DIM_UNPAID = "unpaid_invoice"  # bucket is the invoice date, for aging
+
+UNPAID_STATUSES = ("unpaid", "partial")
+AGING_BUCKETS: Tuple[Tuple[str, int, Optional[int]], ...] = (
+    ("0-30", 0, 30),
+    ("31-60", 31, 60),
+    ("61-90", 61, 90),
+    ("90+", 91, None),
+)
+TREND_PERIODS = {"7d": 7, "30d": 30, "90d": 90}
+TOTAL_GL_ACCOUNTS = 79
+
+_BACKFILL_CHUNK = 500
+
+# (dimension, bucket, label, confidence, manual reviews, processing ms)
+_BucketKey = Tuple[str, str, Optional[str], float, int, float]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _value(value: Any) -> Optional[str]:
+    """Enum members and plain strings alike, None when empty."""
+    value = getattr(value, "value", value)
+    return str(value) if value not in (None, "") else None
+
+
+def _percent(part: float, whole: float) -> float:
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+def _trend(current: float, previous: float, period: str) -> Dict[str, Any]:
+    return {
+        "value": current,
+        "direction": "up" if current >= previous else "down",
+        "period": period,
+        "isPositive": current >= previous,
+    }
+
+
+def _read_metadata_files(metadata_dir: Path) -> List[Dict[str, Any]]:
+    """Blocking scan of storage metadata files; run in a worker thread."""
+    documents: List[Dict[str, Any]] = []
+    for meta_file in metadata_dir.glob("**/*.json"):
+        try:
+            with meta_file.open("r") as f:
+                meta = json.load(f)
+        except Exception:
+            continue
+        processed_at = _naive_utc(meta.get("stored_at"))
+        if not meta.get("document_id") or processed_at is None:
+            continue
+        documents.append(
+            {
+                "document_id": meta["document_id"],
+                "tenant_id": meta.get("tenant_id") or meta_file.parent.name,
+                "filename": meta.get("filename", ""),
+                "processed_at": processed_at,
+            }
+        )
+    return documents
+
+
+class DashboardRollupService:
+    """Incrementally maintained dashboard rollups with per-tenant reads."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        metadata_path: Optional[Path] = None,
+        recent_limit: int = 25,
+    ) -> None:
+        self.enabled = enabled
+        self.metadata_path = metadata_path
+        self.recent_limit = max(1, recent_limit)
+        self.initialized = False
+
+        self._backfill_task: Optional[asyncio.Task] = None
+        self._documents_recorded: int = 0
+        self._backfilled: int = 0
+
+    async def initialize(self) -> None:
+        if self.enabled and self.metadata_path is not None:
+            self._backfill_task = asyncio.create_task(self._backfill_if_empty())
+        self.initialized = True
+        logger.info(
+            "Dashboard Rollup Service initialized (enabled=%s, recent=%d)",
+            self.enabled,
+            self.recent_limit,
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Dashboard Rollup Service...")
+        task, self._backfill_task = self._backfill_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.initialized = False
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    async def record_documents(self, documents: Sequence[Dict[str, Any]]) -> int:
+        """Fold processed documents into the tenant rollups.
+
+        Each document dict carries ``document_id``, ``tenant_id`` and
+        ``processed_at``, and optionally ``filename``, ``vendor_name``,
+        ``amount``, ``invoice_date``, ``gl_account_code``,
+        ``gl_account_name``, ``gl_confidence``, ``payment_status``,
+        ``payment_confidence``, ``billing_destination``,
+        ``routing_confidence``, ``manual_review`` and ``processing_ms``.
+        Documents are pre-aggregated in memory and written in one
+        transaction as a single batched upsert, plus the recent list.
+
+        Each document is counted once: what it contributed last time is
+        subtracted first, so reprocessing moves it between buckets instead
+        of counting it again.
+
+        Returns the number of bucket rows touched.
+        """
+        if not documents:
+            return 0
+        now = _now()
+        keyed: Dict[str, Dict[str, Any]] = {}
+        recent: Dict[str, Dict[str, Any]] = {}
+
+        for doc in documents:
+            processed_at = _naive_utc(doc.get("processed_at")) or now
+            contribution = self._contribution(doc, processed_at)
+            document_id = contribution["document_id"]
+            keyed[document_id] = contribution
+            recent[document_id] = {
+                "document_id": document_id,
+                "tenant_id": contribution["tenant_id"],
+                "filename": (doc.get("filename") or "")[:255],
+                "vendor_name": contribution["vendor_name"],
+                "amount": contribution["amount"],
+                "payment_status": contribution["payment_status"],
+                "gl_account_code": contribution["gl_account_code"],
+                "confidence": contribution["gl_confidence"],
+                "billing_destination": contribution["billing_destination"],
+                "processed_at": processed_at,
+            }
+
+        async with get_async_session() as session:
+            previous = await self._pop_contributions(session, list(keyed))
+            touched = await self._apply_contributions(
+                session,
+                [(c, -1) for c in previous] + [(c, 1) for c in keyed.values()],
+                now,
+            )
+            session.add_all(
+                DashboardRollupDocumentRecord(**contribution)
+                for contribution in keyed.values()
+            )
+            for row in recent.values():
+                await session.merge(DashboardRecentDocumentRecord(**row))
+            await session.flush()
+            for tenant_id in {row["tenant_id"] for row in recent.values()}:
+                await self._trim_recent(session, tenant_id)
+            await session.commit()
+        self._documents_recorded += len(documents)
+        return touched
+
+    @staticmethod
+    def _contribution(doc: Dict[str, Any], processed_at: datetime) -> Dict[str, Any]:
+        """What one document adds to its tenant's rollups, normalized."""
+        status = _value(doc.get("payment_status")) or "unknown"
+        invoice_day = None
+        if status in UNPAID_STATUSES:
+            invoice_date = _naive_utc(doc.get("invoice_date")) or processed_at
+            invoice_day = invoice_date.strftime("%Y-%m-%d")
+        vendor = " ".join((doc.get("vendor_name") or "").split())
+        return {
+            "document_id": doc["document_id"],
+            "tenant_id": doc["tenant_id"],
+            "day": processed_at.strftime("%Y-%m-%d"),
+            "amount": float(doc.get("amount") or 0.0),
+            "payment_status": status,
+            "billing_destination": _value(doc.get("billing_destination")),
+            "gl_account_code": _value(doc.get("gl_account_code")),
+            "gl_account_name": doc.get("gl_account_name"),
+            "vendor_name": vendor[:200] or None,
+            "invoice_day": invoice_day,
+            "gl_confidence": float(doc.get("gl_confidence") or 0.0),
+            "payment_confidence": float(doc.get("payment_confidence") or 0.0),
+            "routing_confidence": float(doc.get("routing_confidence") or 0.0),
+            "manual_review": 1 if doc.get("manual_review") else 0,
+            "processing_ms": float(doc.get("processing_ms") or 0.0),
+        }
+
+    @staticmethod
+    def _bucket_keys(doc: Dict[str, Any]) -> List[_BucketKey]:
+        """The rollup buckets a contribution counts towards."""
+        manual = doc["manual_review"]
+        keys: List[_BucketKey] = [
+            (
+                DIM_TOTAL,
+                "all",
+                None,
+                doc["gl_confidence"],
+                manual,
+                doc["processing_ms"],
+            ),
+            (
+                DIM_PAYMENT_STATUS,
+                doc["payment_status"],
+                None,
+                doc["payment_confidence"],
+                0,
+                0.0,
+            ),
+        ]
+        if doc["gl_account_code"]:
+            keys.append(
+                (
+                    DIM_GL_ACCOUNT,
+                    doc["gl_account_code"],
+                    doc["gl_account_name"],
+                    doc["gl_confidence"],
+                    0,
+                    0.0,
+                )
+            )
+        if doc["billing_destination"]:
+            keys.append(
+                (
+                    DIM_DESTINATION,
+                    doc["billing_destination"],
+                    None,
+                    doc["routing_confidence"],
+                    manual,
+                    0.0,
+                )
+            )
+        vendor = doc["vendor_name"]
+        if vendor:
+            keys.append((DIM_VENDOR, vendor.casefold()[:50], vendor, 0.0, 0, 0.0))
+        if doc["invoice_day"]:
+            keys.append((DIM_UNPAID, doc["invoice_day"], None, 0.0, 0, 0.0))
+        return keys
+
+    @staticmethod
+    async def _pop_contributions(
+        session: Any, document_ids: List[str], tenant_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Remove and return the recorded contributions of *document_ids*."""
+        if not document_ids:
+            return []
+        # Core rows, not ORM instances: the replacements reuse these keys
+        table = cast(Table, DashboardRollupDocumentRecord.__table__)
+        where: List[ColumnElement[bool]] = [table.c.document_id.in_(document_ids)]
+        if tenant_id is not None:
+            where.append(table.c.tenant_id == tenant_id)
+        result = await session.execute(select(table).where(*where))
+        previous = [dict(row._mapping) for row in result]
+        if previous:
+            await session.execute(delete(table).where(*where))
+        return previous
+
+    async def _apply_contributions(
+        self,
+        session: Any,
+        contributions: List[Tuple[Dict[str, Any], int]],
+        now: datetime,
+    ) -> int:
+        """Add (sign 1) or subtract (sign -1) contributions; returns buckets touched."""
+        buckets: Dict[tuple, Dict[str, Any]] = {}
+        for doc, sign in contributions:
+            tenant_id, day = doc["tenant_id"], doc["day"]
+            for dimension, bucket, label, confidence, manual, ms in self._bucket_keys(
+                doc
+            ):
+                entry = buckets.setdefault(
+                    (tenant_id, dimension, day, bucket),
+                    {
+                        "tenant_id": tenant_id,
+                        "dimension": dimension,
+                        "day": day,
+                        "bucket": bucket,
+                        "label": None,
+                        "document_count": 0,
+                        "total_amount": 0.0,
+                        "confidence_sum": 0.0,
+                        "manual_review_count": 0,
+                        "processing_ms_sum": 0.0,
+                        "updated_at": now,
+                    },
+                )
+                entry["document_count"] += sign
+                entry["total_amount"] += sign * doc["amount"]
+                entry["confidence_sum"] += sign * confidence
+                entry["manual_review_count"] += sign * manual
+                entry["processing_ms_sum"] += sign * ms
+                if sign > 0:
+                    # The first spelling seen names the bucket
+                    entry["label"] = entry["label"] or label
+
+        if not buckets:
+            return 0
+        await self._upsert_rollups(session, list(buckets.values()))
+        if any(sign < 0 for _, sign in contributions):
+            # Buckets emptied by subtraction would show up as zero rows
+            r = DashboardRollupRecord
+            await session.execute(
+                delete(r).where(
+                    r.tenant_id.in_({key[0] for key in buckets}),
+                    r.document_count <= 0,
+                )
+            )
+        return len(buckets)
+
+    @staticmethod
+    async def _upsert_rollups(session: Any, rows: List[Dict[str, Any]]) -> None:
+        """Increment rollup buckets with INSERT .. ON CONFLICT DO UPDATE."""
+        dialect = session.bind.dialect.name if session.bind is not None else ""
+        dialect_insert: Optional[Callable[[Table], Any]] = None
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            dialect_insert = pg_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            dialect_insert = sqlite_insert
+
+        table = cast(Table, DashboardRollupRecord.__table__)
+        counters = (
+            "document_count",
+            "total_amount",
+            "confidence_sum",
+            "manual_review_count",
+            "processing_ms_sum",
+        )
+        if dialect_insert is not None:
+            stmt = dialect_insert(table)
+            incoming = stmt.excluded
+            set_ = {c: table.c[c] + incoming[c] for c in counters}
+            set_["label"] = func.coalesce(table.c.label, incoming.label)
+            set_["updated_at"] = incoming.updated_at
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    table.c.tenant_id,
+                    table.c.dimension,
+                    table.c.day,
+                    table.c.bucket,
+                ],
+                set_=set_,
+            )
+            await session.execute(stmt, rows)
+            return
+
+        # Portable fallback: read the touched buckets, then insert or update
+        for row in rows:
+            existing = await session.get(
+                DashboardRollupRecord,
+                (row["tenant_id"], row["dimension"], row["day"], row["bucket"]),
+            )
+            if existing is None:
+                session.add(DashboardRollupRecord(**row))
+                continue
+            for column in counters:
+                setattr(existing, column, getattr(existing, column) + row[column])
+            existing.label = existing.label or row["label"]
+            existing.updated_at = row["updated_at"]
+
+    async def _trim_recent(self, session: Any, tenant_id: str) -> None:
+        recent = DashboardRecentDocumentRecord
+        keep = (
+            select(recent.document_id)
+            .where(recent.tenant_id == tenant_id)
+            .order_by(recent.processed_at.desc())
+            .limit(self.recent_limit)
+        )
+        await session.execute(
+            delete(recent)
+            .where(recent.tenant_id == tenant_id)
+            .where(recent.document_id.not_in(keep))
+        )
+
+    async def forget_document(self, document_id: str, tenant_id: str) -> bool:
+        """Take a deleted document out of the rollups and the recent list.
+
+        Returns ``True`` if the document had been rolled up.
+        """
+        recent = DashboardRecentDocumentRecord
+        async with get_async_session() as session:
+            previous = await self._pop_contributions(session, [document_id], tenant_id)
+            await self._apply_contributions(
+                session, [(c, -1) for c in previous], _now()
+            )
+            await session.execute(
+                delete(recent)
+                .where(recent.document_id == document_id)
+                .where(recent.tenant_id == tenant_id)
+            )
+            await session.commit()
+        return bool(previous)
+
+    async def _backfill_if_empty(self) -> None:
+        try:
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(DashboardRollupRecord.tenant_id).limit(1)
+                )
+                if result.first() is not None:
+                    return
+            await self.backfill_from_metadata()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Dashboard rollup backfill failed")
+
+    async def backfill_from_metadata(self) -> int:
+        """Seed document totals and the recent list from storage metadata.
+
+        Metadata files only record the upload, so backfilled documents count
+        towards totals and trends but not the classification breakdowns.
+        """
+        if self.metadata_path is None or not self.metadata_path.exists():
+            return 0
+        documents = await asyncio.to_thread(_read_metadata_files, self.metadata_path)
+        documents.sort(key=lambda d: d["processed_at"])
+        for start in range(0, len(documents), _BACKFILL_CHUNK):
+            await self.record_documents(documents[start : start + _BACKFILL_CHUNK])
+        self._backfilled += len(documents)
+        if documents:
+            logger.info(
+                "Backfilled dashboard rollups from %d metadata files", len(documents)
+            )
+        return len(documents)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def _summaries(
+        self,
+        tenant_id: str,
+        dimensions: Iterable[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Per-bucket sums over a day range, grouped by dimension."""
+        r = DashboardRollupRecord
+        stmt = (
+            select(
+                r.dimension,
+                r.bucket,
+                func.min(r.label),
+                func.sum(r.document_count),
+                func.sum(r.total_amount),
+                func.sum(r.confidence_sum),
+                func.sum(r.manual_review_count),
+                func.sum(r.processing_ms_sum),
+            )
+            .where(r.tenant_id == tenant_id)
+            .where(r.dimension.in_(list(dimensions)))
+            .group_by(r.dimension, r.bucket)
+        )
+        if since:
+            stmt = stmt.where(r.day >= since)
+        if until:
+            stmt = stmt.where(r.day < until)
+        async with get_async_session() as session:
+            result = await session.execute(stmt)
+            rows = result.all()
+
+        summaries: Dict[str, List[Dict[str, Any]]] = {d: [] for d in dimensions}
+        for dimension, bucket, label, count, amount, conf, manual, ms in rows:
+            summaries[dimension].append(
+                {
+                    "bucket": bucket,
+                    "label": label,
+                    "count": int(count or 0),
+                    "amount": float(amount or 0.0),
+                    "confidence_sum": float(conf or 0.0),
+                    "manual": int(manual or 0),
+                    "processing_ms": float(ms or 0.0),
+                }
+            )
+        for buckets in summaries.values():
+            buckets.sort(key=lambda s: (-s["count"], s["bucket"]))
+        return summaries
+
+    async def _daily_totals(
+        self, tenant_id: str, since: str
+    ) -> Dict[str, Dict[str, float]]:
+        r = DashboardRollupRecord
+        stmt = (
+            select(
+                r.day,
+                r.document_count,
+                r.total_amount,
+                r.confidence_sum,
+                r.manual_review_count,
+            )
+            .where(r.tenant_id == tenant_id)
+            .where(r.dimension == DIM_TOTAL)
+            .where(r.day >= since)
+        )
+        async with get_async_session() as session:
+            result = await session.execute(stmt)
+            return {
+                day: {
+                    "count": count,
+                    "amount": amount,
+                    "confidence_sum": conf,
+                    "manual": manual,
+                }
+                for day, count, amount, conf, manual in result.all()
+            }
+
+    @staticmethod
+    def _total(summaries: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        rows = summaries.get(DIM_TOTAL) or []
+        if rows:
+            return rows[0]
+        return {
+            "count": 0,
+            "amount": 0.0,
+            "confidence_sum": 0.0,
+            "manual": 0,
+            "processing_ms": 0.0,
+        }
+
+    @staticmethod
+    def _month_bounds(now: datetime) -> Tuple[str, str]:
+        month_start = now.replace(day=1)
+        previous = (month_start - timedelta(days=1)).replace(day=1)
+        return month_start.strftime("%Y-%m-%d"), previous.strftime("%Y-%m-%d")
+
+    async def get_kpis(self, tenant_id: str) -> Dict[str, Any]:
+        """Return dashboard KPI metrics."""
+        month_start, previous_start = self._month_bounds(_now())
+        dims = (DIM_TOTAL, DIM_GL_ACCOUNT, DIM_PAYMENT_STATUS, DIM_DESTINATION)
+        summaries = await self._summaries(tenant_id, dims)
+        this_month = self._total(
+            await self._summaries(tenant_id, (DIM_TOTAL,), since=month_start)
+        )
+        last_month = self._total(
+            await self._summaries(
+                tenant_id, (DIM_TOTAL,), since=previous_start, until=month_start
+            )
+        )
+        total = self._total(summaries)
+        count = total["count"]
+        payments = summaries[DIM_PAYMENT_STATUS]
+        payment_count = sum(p["count"] for p in payments)
+        payment_accuracy = _percent(
+            sum(p["confidence_sum"] for p in payments), payment_count
+        )
+        destinations = {d["bucket"]: d["count"] for d in summaries[DIM_DESTINATION]}
+        average_ms = total["processing_ms"] / count if count else 0.0
+        month_ms = (
+            this_month["processing_ms"] / this_month["count"]
+            if this_month["count"]
+            else 0.0
+        )
+
+        return {
+            "totalDocuments": count,
+            "documentsThisMonth": this_month["count"],
+            "documentsTrend": _trend(this_month["count"], last_month["count"], "month"),
+            "paymentAccuracy": payment_accuracy,
+            "paymentAccuracyTrend": _trend(payment_accuracy, 0, "month"),
+            "glAccountsUsed": len(summaries[DIM_GL_ACCOUNT]),
+            "totalGLAccounts": TOTAL_GL_ACCOUNTS,
+            "classificationAccuracy": _percent(total["confidence_sum"], count),
+            "totalAmountProcessed": round(total["amount"], 2),
+            "averageProcessingTime": round(average_ms, 1),
+            "manualReviewRate": _percent(total["manual"], count),
+            "processingTimeTrend": {
+                "value": round(month_ms, 1),
+                "direction": "up" if month_ms >= average_ms else "down",
+                "period": "month",
+                "isPositive": month_ms <= average_ms,
+            },
+            "openPayable": destinations.get("open_payable", 0),
+            "closedPayable": destinations.get("closed_payable", 0),
+            "openReceivable": destinations.get("open_receivable", 0),
+            "closedReceivable": destinations.get("closed_receivable", 0),
+            "recentDocuments": await self._recent_documents(tenant_id, 10),
+        }
+
+    async def _recent_documents(self, tenant_id: str, limit: int) -> List[Dict]:
+        recent = DashboardRecentDocumentRecord
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(recent)
+                .where(recent.tenant_id == tenant_id)
+                .order_by(recent.processed_at.desc())
+                .limit(limit)
+            )
+            rows = result.scalars().all()
+        return [
+            {
+                "id": r.document_id,
+                "filename": r.filename,
+                "vendor": r.vendor_name or "",
+                "amount": r.amount,
+                "status": r.payment_status,
+                "glAccount": r.gl_account_code or "",
+                "confidence": r.confidence,
+                "processedAt": r.processed_at.isoformat(),
+                "billingDestination": r.billing_destination or "open_payable",
+            }
+            for r in rows
+        ]
+
+    async def get_trends(self, tenant_id: str, period: str = "30d") -> Dict[str, Any]:
+        """Return daily document, amount and accuracy trends for the period."""
+        days = TREND_PERIODS.get(period, 30)
+        start = _now() - timedelta(days=days)
+        dates = [
+            (start + timedelta(days=i + 1)).strftime("%Y-%m-%d") for i in range(days)
+        ]
+        daily = await self._daily_totals(tenant_id, dates[0])
+
+        documents, amounts, accuracy = [], [], []
+        for day in dates:
+            row = daily.get(day)
+            total = int(row["count"]) if row else 0
+            manual = int(row["manual"]) if row else 0
+            documents.append(
+                {
+                    "date": day,
+                    "total": total,
+                    "classified": total - manual,
+                    "manualReview": manual,
+                }
+            )
+            amounts.append(
+                {"date": day, "amount": round(row["amount"], 2) if row else 0.0}
+            )
+            if row and total:
+                accuracy.append(
+                    {"date": day, "accuracy": _percent(row["confidence_sum"], total)}
+                )
+
+        return {
+            "period": period,
+            "documents": documents,
+            "amounts": amounts,
+            "accuracy": accuracy,
+        }
+
+    async def get_payment_status_distribution(self, tenant_id: str) -> Dict[str, Any]:
+        """Return payment status distribution."""
+        payments = (await self._summaries(tenant_id, (DIM_PAYMENT_STATUS,)))[
+            DIM_PAYMENT_STATUS
+        ]
+        total = sum(p["count"] for p in payments)
+        return {
+            "distribution": [
+                {
+                    "status": p["bucket"],
+                    "count": p["count"],
+                    "percentage": _percent(p["count"], total),
+                    "totalAmount": round(p["amount"], 2),
+                }
+                for p in payments
+            ],
+            "trends": [],
+        }
+
+    async def get_gl_account_usage(self, tenant_id: str) -> Dict[str, Any]:
+        """Return GL account usage statistics."""
+        accounts = (await self._summaries(tenant_id, (DIM_GL_ACCOUNT,)))[DIM_GL_ACCOUNT]
+        return {
+            "accounts": [self._gl_account(a) for a in accounts],
+            "categories": [],
+        }
+
+    @staticmethod
+    def _gl_account(summary: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "code": summary["bucket"],
+            "name": summary["label"] or summary["bucket"],
+            "count": summary["count"],
+            "amount": round(summary["amount"], 2),
+            "averageConfidence": _percent(summary["confidence_sum"], summary["count"]),
+        }
+
+    @staticmethod
+    def _vendor(summary: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": summary["label"] or summary["bucket"],
+            "count": summary["count"],
+            "amount": round(summary["amount"], 2),
+        }
+
+    async def get_vendor_metrics(self, tenant_id: str) -> Dict[str, Any]:
+        """Return vendor analytics."""
+        vendors = (await self._summaries(tenant_id, (DIM_VENDOR,)))[DIM_VENDOR]
+        return {
+            "topVendors": [self._vendor(v) for v in vendors[:10]],
+            "vendorGrowth": [],
+        }
+
+    async def get_executive_summary(self, tenant_id: str) -> Dict[str, Any]:
+        """Return executive summary."""
+        month_start, previous_start = self._month_bounds(_now())
+        summaries = await self._summaries(
+            tenant_id, (DIM_TOTAL, DIM_GL_ACCOUNT, DIM_PAYMENT_STATUS, DIM_VENDOR)
+        )
+        this_month = await self._summaries(
+            tenant_id, (DIM_TOTAL, DIM_VENDOR), since=month_start
+        )
+        last_month = await self._summaries(
+            tenant_id, (DIM_TOTAL, DIM_VENDOR), since=previous_start, until=month_start
+        )
+        total = self._total(summaries)
+        count = total["count"]
+        current, previous = self._total(this_month), self._total(last_month)
+        payments = summaries[DIM_PAYMENT_STATUS]
+        payment_accuracy = _percent(
+            sum(p["confidence_sum"] for p in payments),
+            sum(p["count"] for p in payments),
+        )
+        gl_accuracy = _percent(total["confidence_sum"], count)
+
+        return {
+            "totalDocumentsProcessed": count,
+            "totalValueProcessed": round(total["amount"], 2),
+            "averageProcessingTime": (
+                round(total["processing_ms"] / count, 1) if count else 0
+            ),
+            "overallAccuracy": round((gl_accuracy + payment_accuracy) / 2, 1),
+            "paymentDetectionAccuracy": payment_accuracy,
+            "glClassificationAccuracy": gl_accuracy,
+            "manualReviewRate": _percent(total["manual"], count),
+            "monthlyGrowth": {
+                "documents": _percent(
+                    current["count"] - previous["count"], previous["count"]
+                ),
+                "value": _percent(
+                    current["amount"] - previous["amount"], previous["amount"]
+                ),
+                "vendors": _percent(
+                    len(this_month[DIM_VENDOR]) - len(last_month[DIM_VENDOR]),
+                    len(last_month[DIM_VENDOR]),
+                ),
+            },
+            "topGLAccounts": [
+                self._gl_account(a) for a in summaries[DIM_GL_ACCOUNT][:5]
+            ],
+            "topVendors": [self._vendor(v) for v in summaries[DIM_VENDOR][:5]],
+            "alerts": [],
+        }
+
+    async def get_processing_accuracy(self, tenant_id: str) -> Dict[str, Any]:
+        """Return processing accuracy data."""
+        total = self._total(await self._summaries(tenant_id, (DIM_TOTAL,)))
+        trends = await self.get_trends(tenant_id, "30d")
+        return {
+            "overall": {
+                "accuracy": _percent(total["confidence_sum"], total["count"]),
+                "confidenceScores": [],
+            },
+            "methods": [],
+            "trends": trends["accuracy"],
+        }
+
+    async def get_billing_destination_metrics(self, tenant_id: str) -> Dict[str, Any]:
+        """Return billing destination analytics."""
+        destinations = (await self._summaries(tenant_id, (DIM_DESTINATION,)))[
+            DIM_DESTINATION
+        ]
+        total = sum(d["count"] for d in destinations)
+        manual = sum(d["manual"] for d in destinations)
+        return {
+            "destinations": [
+                {
+                    "destination": d["bucket"],
+                    "count": d["count"],
+                    "percentage": _percent(d["count"], total),
+                    "totalAmount": round(d["amount"], 2),
+                }
+                for d in destinations
+            ],
+            "routing": {
+                "automaticRouting": total - manual,
+                "manualOverrides": manual,
+                "routingAccuracy": _percent(
+                    sum(d["confidence_sum"] for d in destinations), total
+                ),
+            },
+            "trends": [],
+        }
+
+    async def get_aging(self, tenant_id: str) -> Dict[str, Any]:
+        """Age unpaid documents by invoice date into 30-day buckets."""
+        today = _now().date()
+        unpaid = (await self._summaries(tenant_id, (DIM_UNPAID,)))[DIM_UNPAID]
+        buckets: Dict[str, Dict[str, Any]] = {
+            name: {"range": name, "count": 0, "totalAmount": 0.0}
+            for name, _, _ in AGING_BUCKETS
+        }
+        for summary in unpaid:
+            try:
+                invoiced = datetime.strptime(summary["bucket"], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            age = max(0, (today - invoiced).days)
+            for name, low, high in AGING_BUCKETS:
+                if age >= low and (high is None or age <= high):
+                    buckets[name]["count"] += summary["count"]
+                    buckets[name]["totalAmount"] += summary["amount"]
+                    break
+        for bucket in buckets.values():
+            bucket["totalAmount"] = round(bucket["totalAmount"], 2)
+        oldest = min((s["bucket"] for s in unpaid), default=None)
+        return {
+            "buckets": list(buckets.values()),
+            "summary": {
+                "documentCount": sum(b["count"] for b in buckets.values()),
+                "totalOutstanding": round(
+                    sum(b["totalAmount"] for b in buckets.values()), 2
+                ),
+                "oldestInvoiceDate": oldest,
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return stats for the health endpoint."""
+        return {
+            "enabled": self.enabled,
+            "initialized": self.initialized,
+            "documents_recorded": self._documents_recorded,
+            "backfilled_documents": self._backfilled,
+            "backfill_running": bool(
+                self._backfill_task and not self._backfill_task.done()
+            ),
+            "recent_limit": self.recent_limit,
+        }
@@ -6,7 +6,7 @@ Orchestrates comprehensive document processing pipeline
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
 from shared.core.exceptions import DocumentError, ValidationError
@@ -28,17 +28,39 @@ except (ImportError, SystemError):
     )
 
 try:
-    from .billing_router_service import BillingRouterService
+    from .billing_router_service import BillingRouterService, DocumentContext
 except (ImportError, SystemError):
-    from billing_router_service import BillingRouterService  # type: ignore[no-redef]
+    from billing_router_service import (  # type: ignore[no-redef]
+        BillingRouterService,
+        DocumentContext,
+    )
 
 try:
     from .storage_service import ProductionStorageService
 except (ImportError, SystemError):
     from storage_service import ProductionStorageService  # type: ignore[no-redef]
 
+try:
+    from ..utils.concurrency_limiter import background_priority
+except (ImportError, SystemError):
+    from utils.concurrency_limiter import (  # type: ignore[no-redef]
+        background_priority,
+    )
+
+try:
+    from .gl_ml_classifier import FEEDBACK_EVENT, encode_features, token_hashes
+except (ImportError, SystemError):
+    from gl_ml_classifier import (  # type: ignore[no-redef]
+        FEEDBACK_EVENT,
+        encode_features,
+        token_hashes,
+    )
+
 logger = logging.getLogger(__name__)
 
+# Uploads that can be rendered into an image for Claude Vision
+VISION_EXTENSIONS = {"pdf", "jpg", "jpeg", "png", "gif", "tif", "tiff"}
+
 
 class DocumentProcessorService:
     """
@@ -58,11 +80,17 @@ class DocumentProcessorService:
         payment_detection_service: PaymentDetectionService,
         billing_router_service: BillingRouterService,
         storage_service: ProductionStorageService,
+        audit_trail_service: Optional[Any] = None,
+        vendor_service: Optional[Any] = None,
+        dashboard_rollup_service: Optional[Any] = None,
     ):
         self.gl_account_service = gl_account_service
         self.payment_detection_service = payment_detection_service
         self.billing_router_service = billing_router_service
         self.storage_service = storage_service
+        self.audit_trail_service = audit_trail_service
+        self.vendor_service = vendor_service
+        self.dashboard_rollup_service = dashboard_rollup_service
         self.initialized = False
 
     async def initialize(self) -> None:
@@ -99,6 +127,7 @@ class DocumentProcessorService:
         file_content: bytes,
         metadata: DocumentMetadata,
         request_id: Optional[str] = None,
+        document_id: Optional[str] = None,
     ) -> UploadResult:
         """
         Process document through complete pipeline
@@ -109,8 +138,12 @@ class DocumentProcessorService:
         3. Detect payment status using 5-method consensus
         4. Route to appropriate billing destination
         5. Create comprehensive audit trail
+
+        New uploads get a fresh ID. Reprocessing passes the existing
+        *document_id*, so the document is stored in place and its rollups
+        are replaced rather than counted again.
         """
-        document_id = str(uuid4())
+        document_id = document_id or str(uuid4())
         start_time = datetime.now()
         log_ctx = {"request_id": request_id or "none", "document_id": document_id}
 
@@ -141,13 +174,11 @@ class DocumentProcessorService:
 
             # Step 3: GL Account Classification
             logger.info("🏷️ Step 3: GL Account Classification...")
+            vendor_name = self._vendor_name(metadata)
             gl_result = await self.gl_account_service.classify_document_text(
                 document_text=text_content,
-                vendor_name=(
-                    metadata.scanner_metadata.get("vendor_name")  # type: ignore[attr-defined]
-                    if metadata.scanner_metadata  # type: ignore[attr-defined]
-                    else None
-                ),
+                vendor_name=vendor_name,
+                tenant_id=metadata.tenant_id,
             )
 
             logger.info(
@@ -155,37 +186,55 @@ class DocumentProcessorService:
             )
             logger.info(f"   • Confidence: {gl_result.confidence:.2%}")
             logger.info(f"   • Method: {gl_result.classification_method}")
+            await self._record_classification_feedback(
+                document_id, metadata.tenant_id, text_content, gl_result
+            )
 
             # Step 4: Payment Status Detection
             logger.info("💳 Step 4: Payment Status Detection...")
-            payment_result = await self.payment_detection_service.detect_payment_status(  # type: ignore[call-arg]
+            payment_result = await self.payment_detection_service.detect_payment_status(
                 document_text=text_content,
-                document_metadata=metadata,
-                gl_classification=gl_result,
+                document_image=self._vision_source(file_content, metadata.filename),
+                tenant_id=metadata.tenant_id,
             )
 
             logger.info(f"   • Payment Status: {payment_result.payment_status}")
-            logger.info(
-                f"   • Consensus Confidence: {payment_result.consensus_confidence:.2%}"  # type: ignore[attr-defined]
-            )
+            logger.info(f"   • Consensus Confidence: {payment_result.confidence:.2%}")
             logger.info(f"   • Methods Used: {', '.join(payment_result.methods_used)}")
 
             # Step 5: Billing Destination Routing
             logger.info("🗂️ Step 5: Billing Destination Routing...")
-            routing_result = await self.billing_router_service.route_document(  # type: ignore[call-arg]
-                document_id=document_id,
-                gl_classification=gl_result,
-                payment_detection=payment_result,
-                document_metadata=metadata,
+            routing_result = await self.billing_router_service.route_document(
+                DocumentContext(
+                    document_id=document_id,
+                    vendor_name=vendor_name,
+                    amount=metadata.amount,
+                    payment_consensus=payment_result,
+                    gl_account=gl_result.gl_account_code,
+                    tenant_id=metadata.tenant_id,
+                )
             )
 
             logger.info(f"   • Destination: {routing_result.destination}")
             logger.info(f"   • Routing Confidence: {routing_result.confidence:.2%}")
             logger.info(f"   • Reasoning: {routing_result.reasoning}")
 
+            await self._record_vendor_rollup(
+                document_id, metadata, gl_result, payment_result
+            )
+
             # Calculate processing time
             processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
+            await self._record_dashboard_rollup(
+                document_id,
+                metadata,
+                gl_result,
+                payment_result,
+                routing_result,
+                processing_time,
+            )
+
             # Create comprehensive result
             result = UploadResult(  # type: ignore[call-arg]
                 success=True,
@@ -204,7 +253,7 @@ class DocumentProcessorService:
                     },
                     "payment_detection": {
                         "status": payment_result.payment_status,
-                        "confidence": payment_result.consensus_confidence,  # type: ignore[attr-defined]
+                        "confidence": payment_result.confidence,
                         "methods_used": payment_result.methods_used,
                         "quality_score": payment_result.quality_score,
                         "method_results": payment_result.method_results,
@@ -273,6 +322,38 @@ class DocumentProcessorService:
                 processing_time_ms=int(processing_time),
             )
 
+    async def prepare_detection_inputs(
+        self, file_content: bytes, filename: str
+    ) -> Tuple[str, Optional[bytes]]:
+        """Text and vision source that payment detection receives for a file.
+
+        Lets batch reprocessing plan the same Claude requests that
+        ``process_document`` would make.
+        """
+        text_content = await self._extract_text_content(file_content, filename)
+        return text_content, self._vision_source(file_content, filename)
+
+    @staticmethod
+    def _vendor_name(metadata: DocumentMetadata) -> Optional[str]:
+        """Vendor detected on the document or reported by the scanner."""
+        scanner_metadata = getattr(metadata, "scanner_metadata", None) or {}
+        vendor_name: Optional[str] = metadata.vendor_name or scanner_metadata.get(
+            "vendor_name"
+        )
+        return vendor_name
+
+    @staticmethod
+    def _vision_source(file_content: bytes, filename: str) -> Optional[bytes]:
+        """Original bytes for Claude Vision when the upload is a PDF or image.
+
+        The payment detection service's image preprocessor rasterizes and
+        downscales them only if the vision method actually runs.
+        """
+        file_extension = filename.lower().split(".")[-1] if "." in filename else ""
+        if file_extension in VISION_EXTENSIONS:
+            return file_content
+        return None
+
     async def _extract_text_content(self, file_content: bytes, filename: str) -> str:
         """Extract text content from document for processing"""
         try:
@@ -281,7 +362,7 @@ class DocumentProcessorService:
             if file_extension == "pdf":
                 # PDF text extraction (simplified for now)
                 return await self._extract_pdf_text(file_content)
-            elif file_extension in ["jpg", "jpeg", "png", "tiff"]:
+            elif file_extension in ["jpg", "jpeg", "png", "tif", "tiff"]:
                 # OCR for image files (simplified for now)
                 return await self._extract_image_text(file_content)
             else:
@@ -317,6 +398,115 @@ class DocumentProcessorService:
             logger.warning(f"⚠️ Image OCR failed: {e}")
             return ""
 
+    async def _record_classification_feedback(
+        self, document_id: str, tenant_id: str, text_content: str, gl_result: Any
+    ) -> None:
+        """Record the GL decision with hashed text features for offline training.
+
+        Only hashed token features are stored, never the document text itself.
+        """
+        if not self.audit_trail_service:
+            return
+        try:
+            from shared.core.models import AuditTrailEntry
+
+            await self.audit_trail_service.record(
+                AuditTrailEntry(
+                    document_id=document_id,
+                    event_type=FEEDBACK_EVENT,
+                    event_data={
+                        "gl_account_code": gl_result.gl_account_code,
+                        "confidence": gl_result.confidence,
+                        "method": gl_result.classification_method,
+                        "features": encode_features(token_hashes(text_content)),
+                    },
+                    system_component="document_processor_service",
+                    tenant_id=tenant_id,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to record classification feedback: {e}")
+
+    async def _record_vendor_rollup(
+        self,
+        document_id: str,
+        metadata: DocumentMetadata,
+        gl_result: Any,
+        payment_result: Any,
+    ) -> None:
+        """Fold this document into its vendor's incremental statistics.
+
+        The vendor is resolved through the in-memory match index; documents
+        without a known vendor are not rolled up.
+        """
+        if not self.vendor_service:
+            return
+        vendor_name = self._vendor_name(metadata)
+        if not vendor_name:
+            return
+        try:
+            vendor = await self.vendor_service.match_vendor(
+                vendor_name, metadata.tenant_id
+            )
+            if not vendor:
+                return
+            await self.vendor_service.record_document_rollups(
+                [
+                    {
+                        "document_id": document_id,
+                        "vendor_id": vendor["id"],
+                        "tenant_id": metadata.tenant_id,
+                        "amount": metadata.amount,
+                        "document_date": metadata.invoice_date or metadata.uploaded_at,
+                        "gl_account_code": gl_result.gl_account_code,
+                        "gl_account_name": gl_result.gl_account_name,
+                        "payment_status": payment_result.payment_status,
+                    }
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update vendor statistics: {e}")
+
+    async def _record_dashboard_rollup(
+        self,
+        document_id: str,
+        metadata: DocumentMetadata,
+        gl_result: Any,
+        payment_result: Any,
+        routing_result: Any,
+        processing_ms: float,
+    ) -> None:
+        """Fold this document into the tenant's dashboard rollups."""
+        if not self.dashboard_rollup_service:
+            return
+        try:
+            await self.dashboard_rollup_service.record_documents(
+                [
+                    {
+                        "document_id": document_id,
+                        "tenant_id": metadata.tenant_id,
+                        "processed_at": datetime.utcnow(),
+                        "filename": metadata.filename,
+                        "vendor_name": self._vendor_name(metadata),
+                        "amount": metadata.amount,
+                        "invoice_date": metadata.invoice_date,
+                        "gl_account_code": gl_result.gl_account_code,
+                        "gl_account_name": gl_result.gl_account_name,
+                        "gl_confidence": gl_result.confidence,
+                        "payment_status": payment_result.payment_status,
+                        "payment_confidence": payment_result.confidence,
+                        "billing_destination": routing_result.destination,
+                        "routing_confidence": routing_result.confidence,
+                        "manual_review": bool(
+                            getattr(routing_result, "manual_override", False)
+                        ),
+                        "processing_ms": processing_ms,
+                    }
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update dashboard rollups: {e}")
+
     async def get_processing_status(
         self, document_id: str, tenant_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
@@ -350,10 +540,14 @@ class DocumentProcessorService:
             if not document_data:
                 raise DocumentError(f"Document not found: {document_id}")
 
-            # Reprocess with existing metadata
-            return await self.process_document(
-                file_content=document_data.content, metadata=document_data.metadata
-            )
+            # Reprocess with existing metadata; its Claude calls queue
+            # behind interactive uploads
+            with background_priority():
+                return await self.process_document(
+                    file_content=document_data.content,
+                    metadata=document_data.metadata,
+                    document_id=document_id,
+                )
 
         except Exception as e:
             logger.error(f"❌ Document reprocessing failed: {e}")
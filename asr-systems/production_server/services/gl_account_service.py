@@ -4,12 +4,14 @@ Manages 79 QuickBooks GL Accounts with keyword matching and sophisticated classi
 """
 
 import asyncio
+import hashlib
 import logging
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 import yaml  # type: ignore[import-untyped]
 
@@ -19,8 +21,57 @@ from shared.core.exceptions import ClassificationError, ValidationError
 from shared.core.models import GLAccount
 from sqlalchemy import select
 
+try:
+    from .gl_ml_classifier import load_local_model
+except (ImportError, SystemError):
+    from gl_ml_classifier import load_local_model  # type: ignore[no-redef]
+
 logger = logging.getLogger(__name__)
 
+# Accounts owned by this tenant form the shared base index; every other
+# tenant's accounts live in that tenant's overlay.
+BASE_TENANT_ID = "default"
+
+# Document-context patterns: (regex, gl_code) -> confidence
+GL_DOCUMENT_PATTERNS: Dict[Tuple[str, str], float] = {
+    # Fuel patterns
+    (r"\b(?:gallon|gal|diesel|gas|fuel)\b", "6900"): 0.8,
+    (r"\b(?:pump|station|fuel up)\b", "6900"): 0.7,
+    # Utilities patterns
+    (r"\b(?:electric|electricity|kwh|utility)\b", "6600"): 0.8,
+    (r"\b(?:water|sewer|gas bill)\b", "6600"): 0.8,
+    (r"\b(?:phone|internet|cable)\b", "6600"): 0.7,
+    # Materials patterns
+    (r"\b(?:lumber|plywood|drywall|materials)\b", "5000"): 0.8,
+    (r"\b(?:tools|hardware|supplies)\b", "5800"): 0.7,
+    # Professional services patterns
+    (r"\b(?:consultation|legal fee|attorney)\b", "5700"): 0.8,
+    (r"\b(?:accounting|tax prep|cpa)\b", "5700"): 0.7,
+    # Vehicle patterns
+    (r"\b(?:oil change|maintenance|repair)\b", "6100"): 0.7,
+    (r"\b(?:truck|vehicle|auto)\b", "5200"): 0.6,
+    # Insurance patterns
+    (r"\b(?:premium|coverage|policy)\b", "5500"): 0.7,
+    # Rent patterns
+    (r"\b(?:rent|lease|monthly)\b", "6000"): 0.7,
+}
+
+# Bump when the scoring logic in classify_document_text changes so that
+# memoized results computed by the old logic are not served.
+GL_CLASSIFIER_REVISION = 1
+
+
+def _record_gl_metric(result: "GLClassificationResult") -> None:
+    """Record Prometheus metric for classification"""
+    try:
+        from services.metrics_service import record_gl_classification
+    except ImportError:
+        try:
+            from .metrics_service import record_gl_classification
+        except ImportError:
+            return
+    record_gl_classification(result.classification_method, result.gl_account_code)
+
 
 def load_gl_accounts_from_yaml(config_path: str) -> Dict[str, Dict[str, Any]]:
     """Load GL accounts from a YAML config file.
@@ -62,6 +113,61 @@ class GLClassificationResult:
     classification_method: str
 
 
+@dataclass(frozen=True)
+class GLAccountIndex:
+    """Immutable compiled lookup structures for one layer of GL accounts.
+
+    The service holds a single base index for the standard accounts plus a
+    small overlay index per tenant that owns custom accounts. Layers are
+    merged at match time, so the base is never copied per tenant.
+    """
+
+    accounts: Mapping[str, GLAccount]
+    keyword_index: Mapping[str, Tuple[str, ...]]  # keyword -> (gl_codes)
+    category_index: Mapping[str, Tuple[str, ...]]  # category -> (gl_codes)
+    version: str = ""  # content hash of the accounts in this layer
+
+    @classmethod
+    def build(cls, accounts: Mapping[str, GLAccount]) -> "GLAccountIndex":
+        """Compile keyword and category indexes for *accounts*."""
+        keyword_index: Dict[str, List[str]] = {}
+        category_index: Dict[str, List[str]] = {}
+        digest = hashlib.sha256()
+        for code, account in accounts.items():
+            digest.update(
+                repr(
+                    (
+                        code,
+                        account.name,
+                        account.category,
+                        account.keywords,
+                        account.active,
+                    )
+                ).encode("utf-8")
+            )
+            for keyword in account.keywords:
+                # Normalize keyword for better matching
+                normalized_keyword = keyword.lower().strip()
+                codes = keyword_index.setdefault(normalized_keyword, [])
+                if code not in codes:
+                    codes.append(code)
+            category_index.setdefault(account.category, []).append(code)
+
+        return cls(
+            accounts=MappingProxyType(dict(accounts)),
+            keyword_index=MappingProxyType(
+                {k: tuple(v) for k, v in keyword_index.items()}
+            ),
+            category_index=MappingProxyType(
+                {k: tuple(v) for k, v in category_index.items()}
+            ),
+            version=digest.hexdigest()[:16],
+        )
+
+
+_EMPTY_INDEX = GLAccountIndex.build({})
+
+
 class GLAccountService:
     """
     Service for managing 79 QuickBooks GL Accounts with sophisticated classification
@@ -71,13 +177,40 @@ class GLAccountService:
         self,
         config_path: Optional[str] = None,
         vendor_service: Optional[Any] = None,
+        result_cache: Optional[Any] = None,
+        local_model: Optional[Any] = None,
+        local_model_path: Optional[str] = None,
+        local_model_min_confidence: float = 0.55,
     ):
         self.config_path = config_path
         self._vendor_service = vendor_service
+        self._result_cache = result_cache
+        # Optional offline-trained classifier (see gl_ml_classifier)
+        self.local_model = local_model
+        self.local_model_path = local_model_path
+        self.local_model_min_confidence = local_model_min_confidence
+        # Base accounts (shared by every tenant) and per-tenant custom accounts
         self.gl_accounts: Dict[str, GLAccount] = {}
-        self.keyword_index: Dict[str, List[str]] = {}  # keyword -> [gl_codes]
-        self.category_index: Dict[str, List[str]] = {}  # category -> [gl_codes]
+        self.tenant_accounts: Dict[str, Dict[str, GLAccount]] = {}
+        # Compiled, read-only indexes — rebuilt only for the layer that changed
+        self._base_index: GLAccountIndex = _EMPTY_INDEX
+        self._overlays: Dict[str, GLAccountIndex] = {}
         self.initialized = False
+        # Vendor default GL accounts feed classification, so vendor writes
+        # must drop memoized results too
+        add_listener = getattr(vendor_service, "add_change_listener", None)
+        if result_cache is not None and callable(add_listener):
+            add_listener(self._invalidate_cached_results)
+
+    @property
+    def keyword_index(self) -> Mapping[str, Tuple[str, ...]]:
+        """Keyword → GL codes for the shared base accounts."""
+        return self._base_index.keyword_index
+
+    @property
+    def category_index(self) -> Mapping[str, Tuple[str, ...]]:
+        """Category → GL codes for the shared base accounts."""
+        return self._base_index.category_index
 
     async def initialize(self):
         """Initialize GL Account service — tries DB first, then YAML, then constants."""
@@ -90,11 +223,13 @@ class GLAccountService:
                 # Fallback: YAML config → constants
                 self._load_gl_accounts()
 
-            # Build keyword index for fast searching
-            self._build_keyword_index()
+            # Compile the shared base index and one overlay per tenant
+            self._rebuild_base_index()
+            for tenant_id in list(self.tenant_accounts):
+                self._rebuild_overlay(tenant_id)
 
-            # Build category index
-            self._build_category_index()
+            if self.local_model is None and self.local_model_path:
+                self.local_model = load_local_model(self.local_model_path)
 
             self.initialized = True
 
@@ -102,6 +237,9 @@ class GLAccountService:
             logger.info(f"   • {len(self.gl_accounts)} GL accounts loaded")
             logger.info(f"   • {len(self.keyword_index)} keywords indexed")
             logger.info(f"   • {len(self.category_index)} categories available")
+            logger.info(f"   • {len(self._overlays)} tenant overlays")
+            if self.local_model is not None:
+                logger.info(f"   • Local model: {self.local_model.version}")
 
         except Exception as e:
             logger.error(f"Failed to initialize GL Account Service: {e}")
@@ -131,7 +269,7 @@ class GLAccountService:
                     return False
 
                 for row in rows:
-                    self.gl_accounts[row.code] = GLAccount(
+                    self._layer_for(row.tenant_id)[row.code] = GLAccount(
                         code=row.code,
                         name=row.name,
                         category=row.category,
@@ -139,7 +277,9 @@ class GLAccountService:
                         active=row.active,
                     )
                 logger.info(
-                    "Loaded %d GL accounts from database", len(self.gl_accounts)
+                    "Loaded %d GL accounts from database (%d tenant overlays)",
+                    len(rows),
+                    len(self.tenant_accounts),
                 )
                 return True
         except Exception as e:
@@ -174,25 +314,110 @@ class GLAccountService:
 
         logger.info("Loaded %d GL accounts from %s", len(self.gl_accounts), source)
 
-    def _build_keyword_index(self):
-        """Build reverse index of keywords to GL account codes"""
-        for code, account in self.gl_accounts.items():
-            for keyword in account.keywords:
-                # Normalize keyword for better matching
-                normalized_keyword = keyword.lower().strip()
-                if normalized_keyword not in self.keyword_index:
-                    self.keyword_index[normalized_keyword] = []
-                self.keyword_index[normalized_keyword].append(code)
-
-    def _build_category_index(self):
-        """Build index of categories to GL account codes"""
-        for code, account in self.gl_accounts.items():
-            if account.category not in self.category_index:
-                self.category_index[account.category] = []
-            self.category_index[account.category].append(code)
-
-    def get_all_accounts(self) -> List[Dict[str, Any]]:
-        """Get all 79 GL accounts"""
+    # ------------------------------------------------------------------
+    # Layered index management
+    # ------------------------------------------------------------------
+
+    def _layer_for(self, tenant_id: Optional[str]) -> Dict[str, GLAccount]:
+        """Return the mutable account dict that owns *tenant_id*'s accounts."""
+        if not tenant_id or tenant_id == BASE_TENANT_ID:
+            return self.gl_accounts
+        return self.tenant_accounts.setdefault(tenant_id, {})
+
+    def _rebuild_base_index(self) -> None:
+        """Recompile the shared base index from ``gl_accounts``."""
+        self._base_index = GLAccountIndex.build(self.gl_accounts)
+
+    def _rebuild_overlay(self, tenant_id: str) -> None:
+        """Recompile one tenant's overlay; drop it when the tenant has no accounts."""
+        accounts = self.tenant_accounts.get(tenant_id)
+        if accounts:
+            self._overlays[tenant_id] = GLAccountIndex.build(accounts)
+        else:
+            self.tenant_accounts.pop(tenant_id, None)
+            self._overlays.pop(tenant_id, None)
+
+    def _rebuild_layer(self, tenant_id: Optional[str]) -> None:
+        if not tenant_id or tenant_id == BASE_TENANT_ID:
+            self._rebuild_base_index()
+        else:
+            self._rebuild_overlay(tenant_id)
+
+    async def _invalidate_cached_results(self, tenant_id: Optional[str]) -> None:
+        """Drop memoized classifications made stale by a change to *tenant_id*'s layer.
+
+        Stale entries are already unreachable (the ruleset version is part of
+        the key); this just reclaims their space. A base change affects every tenant.
+        """
+        if self._result_cache is None:
+            return
+        scope = None if not tenant_id or tenant_id == BASE_TENANT_ID else tenant_id
+        await self._result_cache.invalidate(kind="gl", tenant_id=scope)
+
+    def _layers(self, tenant_id: Optional[str]) -> List[GLAccountIndex]:
+        """Indexes visible to *tenant_id*: the base plus its overlay, if any."""
+        overlay = self._overlays.get(tenant_id) if tenant_id else None
+        if overlay is None:
+            return [self._base_index]
+        return [self._base_index, overlay]
+
+    def _lookup(
+        self, code: str, tenant_id: Optional[str] = None
+    ) -> Optional[GLAccount]:
+        """Resolve *code* against the tenant overlay first, then the base."""
+        overlay = self._overlays.get(tenant_id) if tenant_id else None
+        if overlay is not None:
+            account = overlay.accounts.get(code)
+            if account is not None:
+                return account
+        return self._base_index.accounts.get(code)
+
+    def _visible_accounts(
+        self, tenant_id: Optional[str] = None
+    ) -> Dict[str, GLAccount]:
+        """Merged code → account view for *tenant_id* (overlay wins on conflict)."""
+        merged: Dict[str, GLAccount] = {}
+        for layer in self._layers(tenant_id):
+            merged.update(layer.accounts)
+        return merged
+
+    async def get_ruleset_version(self, tenant_id: Optional[str] = None) -> str:
+        """Version of everything that influences classification for *tenant_id*.
+
+        Changes whenever base or overlay accounts, the tenant's vendors,
+        document patterns or the classifier revision change, so memoized
+        results keyed on it go stale.
+        """
+        overlay = self._overlays.get(tenant_id) if tenant_id else None
+        get_vendor_version = getattr(self._vendor_service, "get_vendor_version", None)
+        vendor_version = (
+            await get_vendor_version(tenant_id) if callable(get_vendor_version) else ""
+        )
+        digest = hashlib.sha256(
+            repr(
+                (
+                    GL_CLASSIFIER_REVISION,
+                    sorted(GL_DOCUMENT_PATTERNS.items()),
+                    self._base_index.version,
+                    overlay.version if overlay is not None else "",
+                    vendor_version if isinstance(vendor_version, str) else "",
+                    getattr(self.local_model, "version", ""),
+                )
+            ).encode("utf-8")
+        )
+        return digest.hexdigest()[:16]
+
+    def get_overlay_statistics(self) -> Dict[str, Any]:
+        """Sizes of the base index and tenant overlays, for diagnostics."""
+        return {
+            "base_accounts": len(self._base_index.accounts),
+            "base_keywords": len(self._base_index.keyword_index),
+            "tenant_overlays": len(self._overlays),
+            "overlay_accounts": sum(len(o.accounts) for o in self._overlays.values()),
+        }
+
+    def get_all_accounts(self, tenant_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get all GL accounts visible to *tenant_id* (79 base + tenant overlay)"""
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
@@ -204,17 +429,24 @@ class GLAccountService:
                 "keywords": account.keywords,
                 "active": account.active,
             }
-            for account in self.gl_accounts.values()
+            for account in self._visible_accounts(tenant_id).values()
         ]
 
+    def get_account_codes(self, tenant_id: Optional[str] = None) -> set:
+        """Return the set of GL codes visible to *tenant_id*."""
+        return set(self._visible_accounts(tenant_id))
+
     def get_accounts(
-        self, category: Optional[str] = None, search: Optional[str] = None
+        self,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        tenant_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Get GL accounts with filtering"""
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
-        accounts = self.get_all_accounts()
+        accounts = self.get_all_accounts(tenant_id)
 
         # Filter by category
         if category:
@@ -241,19 +473,25 @@ class GLAccountService:
 
         return accounts
 
-    def get_account_by_code(self, code: str) -> Optional[GLAccount]:
+    def get_account_by_code(
+        self, code: str, tenant_id: Optional[str] = None
+    ) -> Optional[GLAccount]:
         """Get specific GL account by code"""
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
-        return self.gl_accounts.get(code)
+        return self._lookup(code, tenant_id)
 
-    def get_categories(self) -> Dict[str, List[str]]:
+    def get_categories(self, tenant_id: Optional[str] = None) -> Dict[str, List[str]]:
         """Get all categories with their GL account codes"""
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
-        return self.category_index.copy()
+        categories: Dict[str, List[str]] = {}
+        for layer in self._layers(tenant_id):
+            for category, codes in layer.category_index.items():
+                categories.setdefault(category, []).extend(codes)
+        return categories
 
     async def classify_document_text(
         self,
@@ -275,6 +513,39 @@ class GLAccountService:
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
+        if self._result_cache is None:
+            return await self._classify_uncached(document_text, vendor_name, tenant_id)
+
+        try:
+            ruleset_version = await self.get_ruleset_version(tenant_id)
+        except Exception:
+            logger.warning(
+                "Ruleset version unavailable, classifying without the cache",
+                exc_info=True,
+            )
+            return await self._classify_uncached(document_text, vendor_name, tenant_id)
+        cache_key = self._result_cache.make_key(
+            "gl", document_text, vendor_name, tenant_id, ruleset_version
+        )
+        cached = await self._result_cache.get("gl", cache_key)
+        if cached is not None:
+            result = GLClassificationResult(**cached)
+            _record_gl_metric(result)
+            return result
+
+        result = await self._classify_uncached(document_text, vendor_name, tenant_id)
+        await self._result_cache.put(
+            "gl", cache_key, tenant_id, ruleset_version, asdict(result)
+        )
+        return result
+
+    async def _classify_uncached(
+        self,
+        document_text: str,
+        vendor_name: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> GLClassificationResult:
+        """Run all classification methods and pick the best result."""
         try:
             # Normalize text for analysis
             normalized_text = document_text.lower()
@@ -288,33 +559,27 @@ class GLAccountService:
                 if vendor_result:
                     results.append(vendor_result)
 
-            # Method 2: Keyword matching in document text
-            keyword_result = self._classify_by_keywords(normalized_text)
+            # Method 2: Keyword matching in document text (base + tenant overlay)
+            keyword_result = self._classify_by_keywords(normalized_text, tenant_id)
             if keyword_result:
                 results.append(keyword_result)
 
             # Method 3: Pattern matching for common document types
-            pattern_result = self._classify_by_patterns(normalized_text)
+            pattern_result = self._classify_by_patterns(normalized_text, tenant_id)
             if pattern_result:
                 results.append(pattern_result)
 
             # Method 4: Category-based heuristics
-            category_result = self._classify_by_category_heuristics(normalized_text)
+            category_result = self._classify_by_category_heuristics(
+                normalized_text, tenant_id
+            )
             if category_result:
                 results.append(category_result)
 
-            # Record Prometheus metric for classification
-            def _record_gl_metric(result: GLClassificationResult) -> None:
-                try:
-                    from services.metrics_service import record_gl_classification
-                except ImportError:
-                    try:
-                        from .metrics_service import record_gl_classification
-                    except ImportError:
-                        return
-                record_gl_classification(
-                    result.classification_method, result.gl_account_code
-                )
+            # Method 5: Offline-trained local model (if one is loaded)
+            model_result = self._classify_by_local_model(document_text, tenant_id)
+            if model_result:
+                results.append(model_result)
 
             # Select best result based on confidence
             if results:
@@ -341,7 +606,7 @@ class GLAccountService:
             else:
                 # Default to miscellaneous expense if no matches
                 default_code = "7700"  # Miscellaneous
-                default_account = self.gl_accounts.get(default_code)
+                default_account = self._lookup(default_code, tenant_id)
 
                 if default_account:
                     default_result = GLClassificationResult(
@@ -382,7 +647,7 @@ class GLAccountService:
             matched = await self._vendor_service.match_vendor(vendor_name, tenant_id)
             if matched and matched.get("default_gl_account"):
                 gl_code = matched["default_gl_account"]
-                account = self.gl_accounts.get(gl_code)
+                account = self._lookup(gl_code, tenant_id)
                 if account:
                     logger.info(
                         "Vendor DB match: vendor=%s gl=%s method=database",
@@ -412,17 +677,20 @@ class GLAccountService:
 
         return None
 
-    def _classify_by_keywords(self, text: str) -> Optional[GLClassificationResult]:
+    def _classify_by_keywords(
+        self, text: str, tenant_id: Optional[str] = None
+    ) -> Optional[GLClassificationResult]:
         """Classify based on keyword matching in document text"""
         keyword_matches: Dict[str, Dict[str, Any]] = {}
 
-        for keyword, gl_codes in self.keyword_index.items():
-            if keyword in text:
-                for gl_code in gl_codes:
-                    if gl_code not in keyword_matches:
-                        keyword_matches[gl_code] = {"keywords": [], "score": 0}
-                    keyword_matches[gl_code]["keywords"].append(keyword)
-                    keyword_matches[gl_code]["score"] += 1
+        for layer in self._layers(tenant_id):
+            for keyword, gl_codes in layer.keyword_index.items():
+                if keyword in text:
+                    for gl_code in gl_codes:
+                        if gl_code not in keyword_matches:
+                            keyword_matches[gl_code] = {"keywords": [], "score": 0}
+                        keyword_matches[gl_code]["keywords"].append(keyword)
+                        keyword_matches[gl_code]["score"] += 1
 
         if keyword_matches:
             # Get best match by score
@@ -430,7 +698,7 @@ class GLAccountService:
             gl_code = best_match[0]
             match_data = best_match[1]
 
-            account = self.gl_accounts.get(gl_code)
+            account = self._lookup(gl_code, tenant_id)
             if account:
                 # Calculate confidence based on number of keyword matches
                 confidence = min(0.9, 0.6 + (int(match_data["score"]) * 0.1))
@@ -447,34 +715,45 @@ class GLAccountService:
 
         return None
 
-    def _classify_by_patterns(self, text: str) -> Optional[GLClassificationResult]:
-        """Classify based on document patterns and context"""
-        patterns = {
-            # Fuel patterns
-            (r"\b(?:gallon|gal|diesel|gas|fuel)\b", "6900"): 0.8,
-            (r"\b(?:pump|station|fuel up)\b", "6900"): 0.7,
-            # Utilities patterns
-            (r"\b(?:electric|electricity|kwh|utility)\b", "6600"): 0.8,
-            (r"\b(?:water|sewer|gas bill)\b", "6600"): 0.8,
-            (r"\b(?:phone|internet|cable)\b", "6600"): 0.7,
-            # Materials patterns
-            (r"\b(?:lumber|plywood|drywall|materials)\b", "5000"): 0.8,
-            (r"\b(?:tools|hardware|supplies)\b", "5800"): 0.7,
-            # Professional services patterns
-            (r"\b(?:consultation|legal fee|attorney)\b", "5700"): 0.8,
-            (r"\b(?:accounting|tax prep|cpa)\b", "5700"): 0.7,
-            # Vehicle patterns
-            (r"\b(?:oil change|maintenance|repair)\b", "6100"): 0.7,
-            (r"\b(?:truck|vehicle|auto)\b", "5200"): 0.6,
-            # Insurance patterns
-            (r"\b(?:premium|coverage|policy)\b", "5500"): 0.7,
-            # Rent patterns
-            (r"\b(?:rent|lease|monthly)\b", "6000"): 0.7,
-        }
+    def _classify_by_local_model(
+        self, text: str, tenant_id: Optional[str] = None
+    ) -> Optional[GLClassificationResult]:
+        """Classify with the hashed-feature model trained from audit feedback"""
+        if self.local_model is None:
+            return None
+        try:
+            gl_code, probability = self.local_model.predict(text)
+        except Exception as e:
+            logger.warning(f"Local model prediction failed: {e}")
+            return None
 
-        for (pattern, gl_code), confidence in patterns.items():
+        if probability < self.local_model_min_confidence:
+            return None
+        account = self._lookup(gl_code, tenant_id)
+        if not account:
+            return None
+
+        return GLClassificationResult(
+            gl_account_code=gl_code,
+            gl_account_name=account.name,
+            category=account.category,
+            # Capped below vendor matches, which are authoritative
+            confidence=min(0.85, probability),
+            reasoning=(
+                f"Local model {self.local_model.version} predicted with "
+                f"probability {probability:.2f}"
+            ),
+            keywords_matched=[],
+            classification_method="local_model",
+        )
+
+    def _classify_by_patterns(
+        self, text: str, tenant_id: Optional[str] = None
+    ) -> Optional[GLClassificationResult]:
+        """Classify based on document patterns and context"""
+        for (pattern, gl_code), confidence in GL_DOCUMENT_PATTERNS.items():
             if re.search(pattern, text, re.IGNORECASE):
-                account = self.gl_accounts.get(gl_code)
+                account = self._lookup(gl_code, tenant_id)
                 if account:
                     return GLClassificationResult(
                         gl_account_code=gl_code,
@@ -489,7 +768,7 @@ class GLAccountService:
         return None
 
     def _classify_by_category_heuristics(
-        self, text: str
+        self, text: str, tenant_id: Optional[str] = None
     ) -> Optional[GLClassificationResult]:
         """Classify using category-level heuristics"""
         # Simple heuristics for common expense types
@@ -498,7 +777,7 @@ class GLAccountService:
             common_expense_codes = ["5000", "6600", "6900", "5200", "5700"]
 
             for gl_code in common_expense_codes:
-                account = self.gl_accounts.get(gl_code)
+                account = self._lookup(gl_code, tenant_id)
                 if account:
                     return GLClassificationResult(
                         gl_account_code=gl_code,
@@ -546,18 +825,18 @@ class GLAccountService:
             await session.commit()
             await session.refresh(row)
 
-        # Update in-memory cache
-        self.gl_accounts[code] = GLAccount(
+        # Update in-memory cache — only the owning layer is recompiled
+        self._layer_for(tenant_id)[code] = GLAccount(
             code=code,
             name=name,
             category=category,
             keywords=keywords or [],
             active=True,
         )
-        self._build_keyword_index()
-        self._build_category_index()
+        self._rebuild_layer(tenant_id)
+        await self._invalidate_cached_results(tenant_id)
 
-        logger.info("Created GL account %s: %s", code, name)
+        logger.info("Created GL account %s: %s (tenant=%s)", code, name, tenant_id)
         return self._gl_record_to_dict(row)
 
     async def update_gl_account(
@@ -608,19 +887,20 @@ class GLAccountService:
             await session.refresh(row)
 
             # Refresh in-memory cache
+            layer = self._layer_for(row.tenant_id)
             if row.active:
-                self.gl_accounts[code] = GLAccount(
+                layer[code] = GLAccount(
                     code=code,
                     name=row.name,
                     category=row.category,
                     keywords=row.keywords or [],
                     active=row.active,
                 )
-            elif code in self.gl_accounts:
-                del self.gl_accounts[code]
+            else:
+                layer.pop(code, None)
 
-            self._build_keyword_index()
-            self._build_category_index()
+            self._rebuild_layer(row.tenant_id)
+            await self._invalidate_cached_results(row.tenant_id)
 
             logger.info("Updated GL account %s", code)
             return self._gl_record_to_dict(row)
@@ -659,13 +939,14 @@ class GLAccountService:
                 )
                 return "__FORBIDDEN__"
 
+            owner = row.tenant_id
             await session.delete(row)
             await session.commit()
 
         # Remove from cache
-        self.gl_accounts.pop(code, None)
-        self._build_keyword_index()
-        self._build_category_index()
+        self._layer_for(owner).pop(code, None)
+        self._rebuild_layer(owner)
+        await self._invalidate_cached_results(owner)
 
         logger.info("Deleted GL account %s", code)
         return True
@@ -718,18 +999,21 @@ class GLAccountService:
             "updated_at": row.updated_at.isoformat() if row.updated_at else None,
         }
 
-    def validate_gl_account(self, gl_code: str) -> bool:
+    def validate_gl_account(
+        self, gl_code: str, tenant_id: Optional[str] = None
+    ) -> bool:
         """Validate if GL account code exists and is active"""
         if not self.initialized:
             raise ClassificationError("GL Account service not initialized")
 
-        account = self.gl_accounts.get(gl_code)
+        account = self._lookup(gl_code, tenant_id)
         return account is not None and account.active
 
     async def cleanup(self):
         """Cleanup GL Account service"""
         logger.info("Cleaning up GL Account Service...")
         self.gl_accounts.clear()
-        self.keyword_index.clear()
-        self.category_index.clear()
+        self.tenant_accounts.clear()
+        self._base_index = _EMPTY_INDEX
+        self._overlays.clear()
         self.initialized = False
@@ -0,0 +1,386 @@
+"""
+ASR Production Server - Local GL Classifier
+Hashed-feature multinomial Naive Bayes trained offline from audit-trail
+feedback (automatic ``gl_classification`` events plus manual
+``gl_classification_override`` events). Served in-process by
+GLAccountService as the ``local_model`` classification method.
+
+NumPy is optional: without it the feature hashing helpers still work (so
+classification feedback keeps being recorded) but no model can be trained
+or loaded. It is imported when a model is first built or loaded, so servers
+without a trained model never pay for the import.
+"""
+
+import importlib.util
+import json
+import logging
+import re
+import statistics
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np: Any = None  # bound by _load_numpy
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_EVENT = "gl_classification"
+OVERRIDE_EVENT = "gl_classification_override"
+
+# Automatic labels below this confidence (or from these methods) are too
+# weak to learn from; training on them would just echo the 7700 fallback.
+MIN_FEEDBACK_CONFIDENCE = 0.6
+IGNORED_FEEDBACK_METHODS = frozenset({"default", "local_model"})
+OVERRIDE_WEIGHT = 3.0
+
+# Cap on distinct hashed tokens stored per audit event
+MAX_FEATURES_PER_DOCUMENT = 512
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+
+
+def _load_numpy() -> None:
+    global np
+    if np is None:
+        import numpy
+
+        np = numpy
+
+
+# ---------------------------------------------------------------------------
+# Feature hashing
+# ---------------------------------------------------------------------------
+
+
+def token_hashes(text: str) -> Dict[int, int]:
+    """Map document text to ``{crc32(token): count}`` over unigrams and bigrams.
+
+    Hashes are not reduced modulo a feature dimension, so audit events stay
+    valid if the model's dimension changes.
+    """
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts = Counter(zlib.crc32(g.encode("utf-8")) for g in grams)
+    if len(counts) > MAX_FEATURES_PER_DOCUMENT:
+        counts = Counter(dict(counts.most_common(MAX_FEATURES_PER_DOCUMENT)))
+    return dict(counts)
+
+
+def encode_features(hashes: Dict[int, int]) -> List[List[int]]:
+    """JSON-friendly form of :func:`token_hashes` for audit event payloads."""
+    return [[h, c] for h, c in sorted(hashes.items())]
+
+
+def decode_features(payload: Iterable[Sequence[int]]) -> Dict[int, int]:
+    return {int(h): int(c) for h, c in payload}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+
+class HashedNaiveBayesClassifier:
+    """Multinomial Naive Bayes over hashed token features."""
+
+    def __init__(self, n_features: int = 2**14, alpha: float = 0.1) -> None:
+        if not _HAS_NUMPY:
+            raise RuntimeError("numpy is required for the local GL classifier")
+        _load_numpy()
+        self.n_features = n_features
+        self.alpha = alpha
+        self.classes: List[str] = []
+        self.log_prior: Any = None
+        self.log_likelihood: Any = None  # shape (n_classes, n_features)
+        self.version = ""
+        self.trained_at: Optional[str] = None
+        self.training_samples = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.log_likelihood is not None
+
+    def _vectorize(self, hashes: Dict[int, int]) -> Tuple[Any, Any]:
+        buckets: Dict[int, int] = {}
+        for h, c in hashes.items():
+            idx = h % self.n_features
+            buckets[idx] = buckets.get(idx, 0) + c
+        idx = np.fromiter(buckets.keys(), dtype=np.int64, count=len(buckets))
+        counts = np.fromiter(buckets.values(), dtype=np.float32, count=len(buckets))
+        return idx, counts
+
+    def fit(
+        self, samples: Sequence[Tuple[Dict[int, int], str, float]]
+    ) -> "HashedNaiveBayesClassifier":
+        """Fit from ``(hashed_features, gl_code, weight)`` samples."""
+        if not samples:
+            raise ValueError("No training samples")
+        self.classes = sorted({label for _, label, _ in samples})
+        class_pos = {c: i for i, c in enumerate(self.classes)}
+        counts = np.zeros((len(self.classes), self.n_features), dtype=np.float64)
+        priors = np.zeros(len(self.classes), dtype=np.float64)
+
+        for hashes, label, weight in samples:
+            row = class_pos[label]
+            idx, vals = self._vectorize(hashes)
+            np.add.at(counts[row], idx, vals * weight)
+            priors[row] += weight
+
+        smoothed = counts + self.alpha
+        self.log_likelihood = (
+            np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        ).astype(np.float32)
+        self.log_prior = np.log(priors / priors.sum()).astype(np.float32)
+        self.training_samples = len(samples)
+        self.trained_at = datetime.now(timezone.utc).isoformat()
+        self.version = "%08x" % zlib.crc32(self.log_likelihood.tobytes())
+        return self
+
+    def predict_features(self, hashes: Dict[int, int]) -> Tuple[str, float]:
+        """Return ``(gl_code, probability)`` for pre-hashed features."""
+        if not self.is_trained:
+            raise RuntimeError("Model is not trained")
+        if not hashes:
+            best = int(np.argmax(self.log_prior))
+            return self.classes[best], float(np.exp(self.log_prior[best]))
+        idx, vals = self._vectorize(hashes)
+        scores = self.log_prior + self.log_likelihood[:, idx] @ vals
+        scores = scores - scores.max()
+        probs = np.exp(scores)
+        probs /= probs.sum()
+        best = int(np.argmax(probs))
+        return self.classes[best], float(probs[best])
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return ``(gl_code, probability)`` for raw document text."""
+        return self.predict_features(token_hashes(text))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> Path:
+        if not self.is_trained:
+            raise RuntimeError("Model is not trained")
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "n_features": self.n_features,
+            "alpha": self.alpha,
+            "classes": self.classes,
+            "version": self.version,
+            "trained_at": self.trained_at,
+            "training_samples": self.training_samples,
+        }
+        with open(target, "wb") as fh:
+            np.savez_compressed(
+                fh,
+                log_prior=self.log_prior,
+                log_likelihood=self.log_likelihood,
+                meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            )
+        return target
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNaiveBayesClassifier":
+        _load_numpy()
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            model = cls(n_features=meta["n_features"], alpha=meta["alpha"])
+            model.log_prior = data["log_prior"]
+            model.log_likelihood = data["log_likelihood"]
+        model.classes = list(meta["classes"])
+        model.version = meta["version"]
+        model.trained_at = meta.get("trained_at")
+        model.training_samples = meta.get("training_samples", 0)
+        return model
+
+
+def load_local_model(path: Optional[str]) -> Optional[HashedNaiveBayesClassifier]:
+    """Load a trained model if *path* exists and numpy is available; never raises."""
+    if not path or not _HAS_NUMPY:
+        return None
+    model_path = Path(path)
+    if not model_path.is_absolute():
+        # Resolve relative to asr-systems/
+        model_path = Path(__file__).parent.parent.parent / model_path
+    if not model_path.exists():
+        return None
+    try:
+        model = HashedNaiveBayesClassifier.load(str(model_path))
+        logger.info(
+            "Loaded local GL model %s (%d classes, %d samples)",
+            model.version,
+            len(model.classes),
+            model.training_samples,
+        )
+        return model
+    except Exception:
+        logger.warning(
+            "Failed to load local GL model from %s", model_path, exc_info=True
+        )
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Training data from the audit trail
+# ---------------------------------------------------------------------------
+
+
+def samples_from_events(
+    events: Iterable[Dict[str, Any]],
+) -> List[Tuple[str, Dict[int, int], str, float]]:
+    """Turn audit events into ``(document_id, features, label, weight)`` samples.
+
+    Features come from the latest ``gl_classification`` event per document;
+    a later ``gl_classification_override`` from the same tenant replaces its
+    label at higher weight. Documents are keyed by ``(tenant_id,
+    document_id)`` so one tenant's override never relabels another's document.
+    """
+    features: Dict[Tuple[str, str], Dict[int, int]] = {}
+    labels: Dict[Tuple[str, str], Tuple[str, float]] = {}
+    overrides: Dict[Tuple[str, str], str] = {}
+
+    for event in sorted(events, key=lambda e: e.get("timestamp") or ""):
+        data = event.get("event_data") or {}
+        doc_id = event.get("document_id")
+        code = data.get("gl_account_code")
+        if not doc_id or not code:
+            continue
+        key = (str(event.get("tenant_id") or ""), doc_id)
+        if event.get("event_type") == OVERRIDE_EVENT:
+            overrides[key] = str(code)
+        elif event.get("event_type") == FEEDBACK_EVENT and data.get("features"):
+            features[key] = decode_features(data["features"])
+            labels[key] = (str(code), float(data.get("confidence") or 0.0))
+            if data.get("method") in IGNORED_FEEDBACK_METHODS:
+                labels[key] = (str(code), 0.0)
+
+    samples = []
+    for key, hashes in features.items():
+        doc_id = key[1]
+        if key in overrides:
+            samples.append((doc_id, hashes, overrides[key], OVERRIDE_WEIGHT))
+            continue
+        code, confidence = labels[key]
+        if confidence >= MIN_FEEDBACK_CONFIDENCE:
+            samples.append((doc_id, hashes, code, confidence))
+    return samples
+
+
+async def load_training_events(
+    tenant_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    all_tenants: bool = False,
+) -> List[Dict[str, Any]]:
+    """Read one tenant's feedback and override events from ``audit_trail``.
+
+    Pooling every tenant's labels into one model must be asked for with
+    ``all_tenants=True``; otherwise *tenant_id* is required.
+    """
+    if tenant_id is None and not all_tenants:
+        raise ValueError("tenant_id is required unless all_tenants=True")
+    from sqlalchemy import select
+
+    try:
+        from ..config.database import get_async_session
+        from ..models.audit_trail import AuditTrailRecord
+    except (ImportError, SystemError):
+        from config.database import get_async_session  # type: ignore[no-redef]
+        from models.audit_trail import AuditTrailRecord  # type: ignore[no-redef]
+
+    async with get_async_session() as session:
+        stmt = select(AuditTrailRecord).where(
+            AuditTrailRecord.event_type.in_([FEEDBACK_EVENT, OVERRIDE_EVENT])
+        )
+        if not all_tenants:
+            stmt = stmt.where(AuditTrailRecord.tenant_id == tenant_id)
+        if since:
+            stmt = stmt.where(AuditTrailRecord.timestamp >= since)
+        rows = (await session.execute(stmt)).scalars().all()
+        return [
+            {
+                "document_id": r.document_id,
+                "tenant_id": r.tenant_id,
+                "event_type": r.event_type,
+                "event_data": r.event_data,
+                "timestamp": r.timestamp.isoformat() if r.timestamp else "",
+            }
+            for r in rows
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Training + evaluation
+# ---------------------------------------------------------------------------
+
+
+def _is_holdout(document_id: str, holdout_fraction: float) -> bool:
+    return (zlib.crc32(document_id.encode("utf-8")) % 1000) < holdout_fraction * 1000
+
+
+def evaluate(
+    model: HashedNaiveBayesClassifier,
+    samples: Sequence[Tuple[str, Dict[int, int], str, float]],
+    min_confidence: float = 0.55,
+) -> Dict[str, Any]:
+    """Accuracy, confident-prediction coverage/precision, and inference latency."""
+    if not samples:
+        return {"samples": 0}
+    correct = confident = confident_correct = 0
+    latencies: List[float] = []
+    for _, hashes, label, _ in samples:
+        start = time.perf_counter()
+        code, prob = model.predict_features(hashes)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hit = code == label
+        correct += hit
+        if prob >= min_confidence:
+            confident += 1
+            confident_correct += hit
+    latencies.sort()
+    return {
+        "samples": len(samples),
+        "accuracy": round(correct / len(samples), 4),
+        "min_confidence": min_confidence,
+        "coverage": round(confident / len(samples), 4),
+        "precision_at_min_confidence": (
+            round(confident_correct / confident, 4) if confident else None
+        ),
+        "latency_ms_p50": round(statistics.median(latencies), 4),
+        "latency_ms_p95": round(latencies[int(len(latencies) * 0.95)], 4),
+        "latency_ms_mean": round(statistics.mean(latencies), 4),
+    }
+
+
+def train_and_evaluate(
+    events: Iterable[Dict[str, Any]],
+    n_features: int = 2**14,
+    holdout_fraction: float = 0.2,
+    min_confidence: float = 0.55,
+) -> Tuple[HashedNaiveBayesClassifier, Dict[str, Any]]:
+    """Fit on a deterministic train split and report metrics on the holdout."""
+    samples = samples_from_events(events)
+    train = [s for s in samples if not _is_holdout(s[0], holdout_fraction)]
+    holdout = [s for s in samples if _is_holdout(s[0], holdout_fraction)]
+    if not train:
+        raise ValueError("No usable training samples in audit trail")
+
+    model = HashedNaiveBayesClassifier(n_features=n_features)
+    model.fit([(h, label, w) for _, h, label, w in train])
+
+    report = {
+        "model_version": model.version,
+        "trained_at": model.trained_at,
+        "classes": len(model.classes),
+        "train_samples": len(train),
+        "holdout_samples": len(holdout),
+        "overrides": sum(1 for s in samples if s[3] == OVERRIDE_WEIGHT),
+        "train": evaluate(model, train, min_confidence),
+        "holdout": evaluate(model, holdout, min_confidence),
+    }
+    return model, report
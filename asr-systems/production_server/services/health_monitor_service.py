@@ -0,0 +1,219 @@
+"""
+ASR Production Server - Health Monitor Service
+Background health checks with snapshot reads for probes.
+
+Each registered component check runs in its own loop on its own interval,
+bounded by a timeout, and stores its latest result. Readiness and health
+probes read those results from memory instead of touching the database or
+walking storage. A result older than its ``stale_after_seconds`` (three
+intervals plus the timeout by default) is flagged stale, so a hung or dead
+check loop shows up in the probe instead of freezing the last good answer.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CheckFunc = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Component statuses that count as a failing check
+_FAILING_STATUSES = ("unhealthy", "error", "degraded")
+
+
+def _observe(component: str, ok: bool, duration: float) -> None:
+    try:
+        from services.metrics_service import observe_health_check
+    except ImportError:
+        try:
+            from .metrics_service import observe_health_check
+        except ImportError:
+            return
+    observe_health_check(component, ok, duration)
+
+
+@dataclass
+class _Check:
+    name: str
+    func: CheckFunc
+    interval_seconds: float
+    timeout_seconds: float
+    stale_after_seconds: float
+    result: Optional[Dict[str, Any]] = None
+    checked_at: Optional[datetime] = None
+    checked_mono: Optional[float] = None
+    duration_ms: Optional[float] = None
+    runs: int = 0
+    failures: int = 0
+    first_done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class HealthMonitorService:
+    """Refreshes component health in the background; probes read snapshots."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval_seconds: float = 15.0,
+        timeout_seconds: float = 5.0,
+        startup_timeout_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.enabled = enabled
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.initialized = False
+        self._clock = clock
+
+        self._checks: Dict[str, _Check] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._stop = asyncio.Event()
+
+    def register(
+        self,
+        name: str,
+        func: CheckFunc,
+        interval_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+        stale_after_seconds: Optional[float] = None,
+    ) -> None:
+        """Add a component check; call before ``initialize``."""
+        interval = interval_seconds or self.interval_seconds
+        timeout = timeout_seconds or self.timeout_seconds
+        self._checks[name] = _Check(
+            name=name,
+            func=func,
+            interval_seconds=interval,
+            timeout_seconds=timeout,
+            stale_after_seconds=stale_after_seconds or 3 * interval + timeout,
+        )
+
+    async def initialize(self) -> None:
+        """Start one loop per check and wait (bounded) for the first round."""
+        if self.enabled and not self._tasks:
+            self._stop.clear()
+            self._tasks = [
+                asyncio.create_task(self._loop(check))
+                for check in self._checks.values()
+            ]
+            waiters = [
+                asyncio.ensure_future(c.first_done.wait())
+                for c in self._checks.values()
+            ]
+            if waiters:
+                # Slow checks keep running; their components read "pending"
+                await asyncio.wait(waiters, timeout=self.startup_timeout_seconds)
+                for waiter in waiters:
+                    waiter.cancel()
+        self.initialized = True
+        logger.info(
+            "Health Monitor Service initialized (enabled=%s, checks=%d)",
+            self.enabled,
+            len(self._checks),
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Health Monitor Service...")
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.initialized = False
+
+    async def _loop(self, check: _Check) -> None:
+        while not self._stop.is_set():
+            await self._run(check)
+            check.first_done.set()
+            try:
+                await asyncio.wait_for(self._stop.wait(), check.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, check: _Check) -> None:
+        start = self._clock()
+        try:
+            result = await asyncio.wait_for(check.func(), check.timeout_seconds)
+            if not isinstance(result, dict):
+                result = {"status": "healthy" if result else "unhealthy"}
+        except asyncio.TimeoutError:
+            result = {
+                "status": "degraded",
+                "reason": f"health check timed out after {check.timeout_seconds}s",
+            }
+        except Exception as e:
+            logger.warning("Health check %s failed: %s", check.name, e)
+            result = {"status": "error", "error": str(e)}
+        duration = self._clock() - start
+
+        ok = result.get("status") not in _FAILING_STATUSES
+        check.result = result
+        check.checked_at = datetime.utcnow()
+        check.checked_mono = self._clock()
+        check.duration_ms = round(duration * 1000, 2)
+        check.runs += 1
+        if not ok:
+            check.failures += 1
+        _observe(check.name, ok, duration)
+
+    async def refresh(self) -> None:
+        """Run every check now, concurrently."""
+        await asyncio.gather(*(self._run(c) for c in self._checks.values()))
+
+    async def get_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latest component results; checks run inline only when disabled."""
+        if not self.enabled:
+            await self.refresh()
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latest result per component with its age, duration and staleness.
+
+        Reads only stored results, so the cost does not depend on the size
+        of the database or the archive.
+        """
+        now = self._clock()
+        components: Dict[str, Dict[str, Any]] = {}
+        for name, check in self._checks.items():
+            if (
+                check.result is None
+                or check.checked_at is None
+                or check.checked_mono is None
+            ):
+                components[name] = {"status": "pending", "stale": True}
+                continue
+            age = now - check.checked_mono
+            components[name] = {
+                **check.result,
+                "checked_at": check.checked_at.isoformat() + "Z",
+                "check_duration_ms": check.duration_ms,
+                "age_seconds": round(age, 2),
+                "stale": self.enabled and age > check.stale_after_seconds,
+            }
+        return components
+
+    def get_statistics(self) -> Dict[str, Any]:
+        snapshot = self.snapshot()
+        return {
+            "enabled": self.enabled,
+            "initialized": self.initialized,
+            "checks": {
+                name: {
+                    "interval_seconds": check.interval_seconds,
+                    "timeout_seconds": check.timeout_seconds,
+                    "runs": check.runs,
+                    "failures": check.failures,
+                    "last_duration_ms": check.duration_ms,
+                }
+                for name, check in self._checks.items()
+            },
+            "stale_components": sorted(
+                name for name, c in snapshot.items() if c.get("stale")
+            ),
+        }
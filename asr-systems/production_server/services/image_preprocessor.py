@@ -0,0 +1,389 @@
+"""
+ASR Production Server - Claude Vision Image Preprocessor
+Turns uploaded documents into images Claude Vision can use efficiently:
+PDFs are rasterized (first page(s), stacked vertically), TIFF/BMP and other
+Pillow formats are converted, everything is downscaled to the model's useful
+resolution and recompressed as JPEG under a byte budget. JPEG/PNG/GIF/WebP
+uploads that are already small enough are passed through untouched.
+
+Decoding and resampling are CPU-bound, so they run in a process pool; results
+are cached in memory by content hash so the same upload is prepared once.
+
+PDF rasterization uses pypdfium2 when installed, else pdf2image (which needs
+the poppler binaries). Without either, PDFs simply have no vision image. The
+rasterizer is imported on the first PDF, not at server startup.
+"""
+
+import asyncio
+import importlib.util
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+_HAS_PDFIUM = importlib.util.find_spec("pypdfium2") is not None
+_HAS_PDF2IMAGE = importlib.util.find_spec("pdf2image") is not None
+
+# pdfium is not thread-safe; this only matters when preparing in threads
+_PDFIUM_LOCK = threading.Lock()
+
+try:
+    from .claude_response_cache_service import content_hash
+except ImportError:
+    from services.claude_response_cache_service import (  # type: ignore[no-redef]
+        content_hash,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Claude downsamples images whose long edge exceeds ~1568 px (or ~1.15
+# megapixels), so larger uploads only cost bytes and latency
+DEFAULT_MAX_LONG_EDGE = 1568
+MAX_PIXELS = 1568 * 735
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_PDF_PAGES = 1
+
+# Rasterize PDFs at this DPI before downscaling (a letter page is
+# 1275x1650 px at 150 DPI, already close to the long-edge limit)
+PDF_RENDER_DPI = 150
+
+# JPEG qualities tried in order; if none fits the budget the image is
+# shrunk by DOWNSCALE_STEP and the ladder is retried
+JPEG_QUALITIES = (85, 75, 65, 55, 45)
+DOWNSCALE_STEP = 0.75
+MIN_LONG_EDGE = 400
+
+# Media types accepted by the Claude API as-is
+PASSTHROUGH_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+
+_SIGNATURES: Tuple[Tuple[bytes, str], ...] = (
+    (b"%PDF", "application/pdf"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"BM", "image/bmp"),
+)
+
+
+def sniff_media_type(content: bytes) -> Optional[str]:
+    """Media type from the leading magic bytes, or None if unrecognised."""
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, media_type in _SIGNATURES:
+        if content.startswith(signature):
+            return media_type
+    return None
+
+
+@dataclass
+class PreparedImage:
+    """Image bytes ready to send to Claude Vision"""
+
+    data: bytes
+    media_type: str
+    width: int
+    height: int
+    source_type: str
+    original_bytes: int
+    pages: int = 1
+    converted: bool = True
+
+
+def prepare_image(
+    content: bytes,
+    max_long_edge: int = DEFAULT_MAX_LONG_EDGE,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    pdf_pages: int = DEFAULT_PDF_PAGES,
+) -> Optional[PreparedImage]:
+    """Rasterize/convert, downscale and recompress *content* for Claude Vision.
+
+    Runs in a worker process. Returns None when the content is not an image
+    or PDF, or a PDF cannot be rasterized here.
+    """
+    source_type = sniff_media_type(content)
+    if source_type is None:
+        return None
+
+    if source_type == "application/pdf":
+        pages = _rasterize_pdf(content, pdf_pages)
+        if not pages:
+            return None
+        image = _stack(pages)
+        page_count = len(pages)
+    else:
+        with Image.open(io.BytesIO(content)) as opened:
+            if (
+                source_type in PASSTHROUGH_TYPES
+                and len(content) <= max_bytes
+                and _fits(opened.size, max_long_edge)
+            ):
+                width, height = opened.size
+                return PreparedImage(
+                    content,
+                    source_type,
+                    width,
+                    height,
+                    source_type,
+                    len(content),
+                    converted=False,
+                )
+            # Multi-page TIFFs: the first frame is the first page
+            opened.seek(0)
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+        page_count = 1
+
+    image = _to_rgb(image)
+    image = _downscale(image, max_long_edge)
+    data = _encode_under_budget(image, max_bytes)
+    return PreparedImage(
+        data,
+        "image/jpeg",
+        image.width,
+        image.height,
+        source_type,
+        len(content),
+        pages=page_count,
+    )
+
+
+def _fits(size: Tuple[int, int], max_long_edge: int) -> bool:
+    width, height = size
+    return max(width, height) <= max_long_edge and width * height <= MAX_PIXELS
+
+
+def _rasterize_pdf(content: bytes, pages: int) -> List[Image.Image]:
+    if _HAS_PDFIUM:
+        import pypdfium2 as pdfium
+
+        with _PDFIUM_LOCK:
+            document = pdfium.PdfDocument(content)
+            try:
+                return [
+                    document[index].render(scale=PDF_RENDER_DPI / 72).to_pil()
+                    for index in range(min(pages, len(document)))
+                ]
+            finally:
+                document.close()
+    if _HAS_PDF2IMAGE:
+        from pdf2image import convert_from_bytes
+
+        images: List[Image.Image] = convert_from_bytes(
+            content, dpi=PDF_RENDER_DPI, first_page=1, last_page=pages
+        )
+        return images
+    return []
+
+
+def _stack(pages: List[Image.Image]) -> Image.Image:
+    """Stack page images top to bottom on a white canvas."""
+    if len(pages) == 1:
+        return pages[0]
+    width = max(page.width for page in pages)
+    canvas = Image.new("RGB", (width, sum(page.height for page in pages)), "white")
+    top = 0
+    for page in pages:
+        canvas.paste(_to_rgb(page), (0, top))
+        top += page.height
+    return canvas
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Flatten transparency onto white and convert to 8-bit RGB."""
+    if image.mode == "RGB":
+        return image
+    if image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    if image.mode.startswith("I;16") or image.mode == "I":
+        # 16-bit greyscale scans
+        image = image.convert("I").point(lambda value: value * (1 / 256))
+        image = image.convert("L")
+    return image.convert("RGB")
+
+
+def _downscale(image: Image.Image, max_long_edge: int) -> Image.Image:
+    scale = min(
+        1.0,
+        max_long_edge / max(image.size),
+        (MAX_PIXELS / (image.width * image.height)) ** 0.5,
+    )
+    if scale >= 1.0:
+        return image
+    size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(size, Image.Resampling.LANCZOS)
+
+
+def _encode_under_budget(image: Image.Image, max_bytes: int) -> bytes:
+    """JPEG-encode, stepping quality (then size) down until under *max_bytes*."""
+    while True:
+        for quality in JPEG_QUALITIES:
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=quality, optimize=True)
+            if buffer.tell() <= max_bytes:
+                return buffer.getvalue()
+        if max(image.size) * DOWNSCALE_STEP < MIN_LONG_EDGE:
+            # Smallest useful size: send it slightly over budget
+            return buffer.getvalue()
+        image = image.resize(
+            (int(image.width * DOWNSCALE_STEP), int(image.height * DOWNSCALE_STEP)),
+            Image.Resampling.LANCZOS,
+        )
+
+
+def _record_prepared(source_type: str, outcome: str, original: int, sent: int) -> None:
+    try:
+        from services.metrics_service import record_vision_image_prepared
+    except ImportError:
+        try:
+            from .metrics_service import record_vision_image_prepared
+        except ImportError:
+            return
+    record_vision_image_prepared(source_type, outcome, original, sent)
+
+
+class ImagePreprocessorService:
+    """Prepares Claude Vision images in a process pool, cached by content hash.
+
+    ``max_workers=0`` runs preparation in a thread instead (tests, or hosts
+    where spawning processes is undesirable).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_workers: int = 2,
+        max_long_edge: int = DEFAULT_MAX_LONG_EDGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        pdf_pages: int = DEFAULT_PDF_PAGES,
+        cache_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.enabled = enabled
+        self.max_workers = max_workers
+        self.max_long_edge = max_long_edge
+        self.max_bytes = max_bytes
+        self.pdf_pages = pdf_pages
+        self.cache_bytes = cache_bytes
+        self.initialized = False
+        self._executor: Optional[Executor] = None
+        self._cache: "OrderedDict[str, Optional[PreparedImage]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._stats: Dict[str, Any] = {
+            "prepared": 0,
+            "passthrough": 0,
+            "unsupported": 0,
+            "failures": 0,
+            "cache_hits": 0,
+            "original_bytes": 0,
+            "sent_bytes": 0,
+            "seconds": 0.0,
+        }
+
+    async def initialize(self) -> None:
+        if self.enabled and self.max_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.initialized = True
+        logger.info(
+            "Image Preprocessor Service initialized (enabled=%s, workers=%d, "
+            "max_long_edge=%d, max_bytes=%d, pdf_pages=%d, pdf_renderer=%s)",
+            self.enabled,
+            self.max_workers,
+            self.max_long_edge,
+            self.max_bytes,
+            self.pdf_pages,
+            "pypdfium2" if _HAS_PDFIUM else "pdf2image" if _HAS_PDF2IMAGE else "none",
+        )
+
+    async def cleanup(self) -> None:
+        logger.info("Cleaning up Image Preprocessor Service...")
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._cache.clear()
+        self._cached_bytes = 0
+        self.initialized = False
+
+    async def prepare(self, content: bytes) -> Optional[PreparedImage]:
+        """Return the vision image for *content*, or None if there is none.
+
+        Never raises: decode failures are logged and return None.
+        """
+        if not self.enabled or not content:
+            return None
+
+        key = content_hash(content)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self._stats["cache_hits"] += 1
+            return self._cache[key]
+
+        start_time = time.perf_counter()
+        try:
+            prepared = await self._run(content)
+        except Exception as e:
+            self._stats["failures"] += 1
+            logger.warning(f"⚠️ Vision image preparation failed: {e}")
+            _record_prepared(sniff_media_type(content) or "unknown", "failed", 0, 0)
+            return None
+        self._stats["seconds"] += time.perf_counter() - start_time
+
+        if prepared is None:
+            self._stats["unsupported"] += 1
+            source_type = sniff_media_type(content) or "unknown"
+            _record_prepared(source_type, "unsupported", 0, 0)
+        else:
+            outcome = "converted" if prepared.converted else "passthrough"
+            self._stats["prepared" if prepared.converted else "passthrough"] += 1
+            self._stats["original_bytes"] += prepared.original_bytes
+            self._stats["sent_bytes"] += len(prepared.data)
+            _record_prepared(
+                prepared.source_type,
+                outcome,
+                prepared.original_bytes,
+                len(prepared.data),
+            )
+        self._remember(key, prepared)
+        return prepared
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return preparation counters and the byte reduction ratio."""
+        original = self._stats["original_bytes"]
+        return {
+            **self._stats,
+            "seconds": round(self._stats["seconds"], 3),
+            "cache_entries": len(self._cache),
+            "cached_bytes": self._cached_bytes,
+            "byte_ratio": (
+                round(self._stats["sent_bytes"] / original, 4) if original else 0.0
+            ),
+        }
+
+    async def _run(self, content: bytes) -> Optional[PreparedImage]:
+        args = (content, self.max_long_edge, self.max_bytes, self.pdf_pages)
+        if self._executor is None:
+            return await asyncio.to_thread(prepare_image, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, prepare_image, *args)
+
+    def _remember(self, key: str, prepared: Optional[PreparedImage]) -> None:
+        size = len(prepared.data) if prepared else 0
+        if size > self.cache_bytes:
+            return
+        self._cache[key] = prepared
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted.data) if evicted else 0
@@ -5,7 +5,7 @@ GL classification, payment detection, and vendor operations.
 """
 
 try:
-    from prometheus_client import REGISTRY, Counter, Histogram
+    from prometheus_client import REGISTRY, Counter, Gauge, Histogram
 
     _HAS_PROM = True
 except ImportError:
@@ -51,6 +51,203 @@ if _HAS_PROM:
         ["method", "status"],
     )
 
+    asr_payment_detection_seconds = _get_or_create(
+        Histogram,
+        "asr_payment_detection_seconds",
+        "Payment detection latency by path (local, early_exit, full)",
+        ["path"],
+    )
+    asr_payment_claude_calls_total = _get_or_create(
+        Counter,
+        "asr_payment_claude_calls_total",
+        "Claude payment detection calls made or skipped by early exit",
+        ["outcome"],
+    )
+    asr_claude_tokens_total = _get_or_create(
+        Counter,
+        "asr_claude_tokens_total",
+        "Claude API tokens by request kind and direction (input, output)",
+        ["kind", "direction"],
+    )
+
+    # ---- Classification cache ----
+    asr_classification_cache_lookups_total = _get_or_create(
+        Counter,
+        "asr_classification_cache_lookups_total",
+        "Classification cache lookups by outcome (memory_hit, db_hit, miss)",
+        ["kind", "outcome"],
+    )
+    asr_claude_calls_saved_total = _get_or_create(
+        Counter,
+        "asr_claude_calls_saved_total",
+        "Claude API calls avoided by serving cached results",
+        ["kind"],
+    )
+
+    # ---- Claude response cache ----
+    asr_claude_response_cache_lookups_total = _get_or_create(
+        Counter,
+        "asr_claude_response_cache_lookups_total",
+        "Claude response cache lookups by outcome (memory_hit, db_hit, miss)",
+        ["kind", "outcome"],
+    )
+    asr_claude_response_cache_seconds_saved_total = _get_or_create(
+        Counter,
+        "asr_claude_response_cache_seconds_saved_total",
+        "Claude API latency avoided by serving cached responses",
+        ["kind"],
+    )
+
+    # ---- Claude API concurrency ----
+    asr_claude_requests_total = _get_or_create(
+        Counter,
+        "asr_claude_requests_total",
+        "Claude API requests by priority and outcome (success, overloaded, error)",
+        ["priority", "outcome"],
+    )
+    asr_claude_queue_wait_seconds = _get_or_create(
+        Histogram,
+        "asr_claude_queue_wait_seconds",
+        "Time Claude API requests waited for a concurrency slot",
+        ["priority"],
+    )
+    asr_claude_concurrency_limit = _get_or_create(
+        Gauge,
+        "asr_claude_concurrency_limit",
+        "Current adaptive limit on concurrent Claude API requests",
+    )
+
+    # ---- Claude Vision image preparation ----
+    asr_vision_images_prepared_total = _get_or_create(
+        Counter,
+        "asr_vision_images_prepared_total",
+        "Vision images prepared by source type and outcome "
+        "(converted, passthrough, unsupported, failed)",
+        ["source_type", "outcome"],
+    )
+    asr_vision_image_bytes_total = _get_or_create(
+        Counter,
+        "asr_vision_image_bytes_total",
+        "Vision image bytes before (original) and after (sent) preparation",
+        ["stage"],
+    )
+
+    # ---- Claude Message Batches ----
+    asr_claude_batch_requests_total = _get_or_create(
+        Counter,
+        "asr_claude_batch_requests_total",
+        "Claude requests sent through the Message Batches API, by outcome",
+        ["outcome"],
+    )
+
+    # ---- Per-tenant Claude usage and budgets ----
+    asr_claude_tenant_calls_total = _get_or_create(
+        Counter,
+        "asr_claude_tenant_calls_total",
+        "Claude API calls per tenant, interactive or batch",
+        ["tenant_id", "mode"],
+    )
+    asr_claude_tenant_tokens_total = _get_or_create(
+        Counter,
+        "asr_claude_tenant_tokens_total",
+        "Claude tokens per tenant",
+        ["tenant_id", "direction"],
+    )
+    asr_claude_tenant_cost_usd_total = _get_or_create(
+        Counter,
+        "asr_claude_tenant_cost_usd_total",
+        "Estimated Claude spend per tenant in USD",
+        ["tenant_id"],
+    )
+    asr_claude_tenant_latency_seconds = _get_or_create(
+        Histogram,
+        "asr_claude_tenant_latency_seconds",
+        "Claude API call latency per tenant",
+        ["tenant_id"],
+    )
+    asr_claude_budget_downgrades_total = _get_or_create(
+        Counter,
+        "asr_claude_budget_downgrades_total",
+        "Detections run local-only because the tenant's Claude budget ran out",
+        ["tenant_id", "budget"],
+    )
+
+    # ---- Audit trail writer ----
+    asr_audit_events_total = _get_or_create(
+        Counter,
+        "asr_audit_events_total",
+        "Audit trail events by outcome (queued, written, requeued, dropped, failed)",
+        ["outcome"],
+    )
+    asr_audit_flush_batch_size = _get_or_create(
+        Histogram,
+        "asr_audit_flush_batch_size",
+        "Audit trail rows written per flush transaction",
+    )
+    asr_audit_flush_seconds = _get_or_create(
+        Histogram,
+        "asr_audit_flush_seconds",
+        "Duration of audit trail flush transactions",
+    )
+    asr_audit_buffer_depth = _get_or_create(
+        Gauge,
+        "asr_audit_buffer_depth",
+        "Audit trail events waiting in the write buffer",
+    )
+
+    asr_audit_retention_deleted_total = _get_or_create(
+        Counter,
+        "asr_audit_retention_deleted_total",
+        "Audit trail rows removed by retention, by method (batch, partition)",
+        ["method"],
+    )
+
+    asr_audit_archived_rows_total = _get_or_create(
+        Counter,
+        "asr_audit_archived_rows_total",
+        "Audit trail rows moved to the cold archive",
+    )
+    asr_audit_archived_bytes_total = _get_or_create(
+        Counter,
+        "asr_audit_archived_bytes_total",
+        "Compressed bytes written to the audit archive",
+    )
+    asr_audit_archive_reads_total = _get_or_create(
+        Counter,
+        "asr_audit_archive_reads_total",
+        "Audit archive files read by queries, by source (storage, cache)",
+        ["source"],
+    )
+
+    asr_audit_aggregation_buckets_total = _get_or_create(
+        Counter,
+        "asr_audit_aggregation_buckets_total",
+        "Audit aggregation time buckets served, by source (cache, query)",
+        ["source"],
+    )
+
+    # ---- Endpoint response caches ----
+    asr_response_cache_lookups_total = _get_or_create(
+        Counter,
+        "asr_response_cache_lookups_total",
+        "Response cache lookups by cache and outcome (hit, stale, miss, coalesced)",
+        ["cache", "outcome"],
+    )
+
+    # ---- Background health checks ----
+    asr_health_check_seconds = _get_or_create(
+        Histogram,
+        "asr_health_check_seconds",
+        "Duration of background health checks by component",
+        ["component"],
+    )
+    asr_health_check_status = _get_or_create(
+        Gauge,
+        "asr_health_check_status",
+        "Latest background health check result by component (1 ok, 0 failing)",
+        ["component"],
+    )
+
     # ---- Vendor operations ----
     asr_vendor_operations_total = _get_or_create(
         Counter,
@@ -80,6 +277,142 @@ def record_payment_detection(method: str, status: str) -> None:
         asr_payment_detections_total.labels(method=method, status=status).inc()
 
 
+def observe_payment_detection_time(path: str, duration: float) -> None:
+    if _HAS_PROM:
+        asr_payment_detection_seconds.labels(path=path).observe(duration)
+
+
+def record_payment_claude_calls(outcome: str, count: int) -> None:
+    if _HAS_PROM and count > 0:
+        asr_payment_claude_calls_total.labels(outcome=outcome).inc(count)
+
+
+def record_claude_tokens(kind: str, direction: str, count: int) -> None:
+    if _HAS_PROM and count > 0:
+        asr_claude_tokens_total.labels(kind=kind, direction=direction).inc(count)
+
+
+def record_classification_cache_lookup(kind: str, outcome: str) -> None:
+    if _HAS_PROM:
+        asr_classification_cache_lookups_total.labels(kind=kind, outcome=outcome).inc()
+
+
+def record_claude_calls_saved(kind: str, count: int) -> None:
+    if _HAS_PROM and count > 0:
+        asr_claude_calls_saved_total.labels(kind=kind).inc(count)
+
+
+def record_claude_response_cache_lookup(kind: str, outcome: str) -> None:
+    if _HAS_PROM:
+        asr_claude_response_cache_lookups_total.labels(kind=kind, outcome=outcome).inc()
+
+
+def record_claude_seconds_saved(kind: str, seconds: float) -> None:
+    if _HAS_PROM and seconds > 0:
+        asr_claude_response_cache_seconds_saved_total.labels(kind=kind).inc(seconds)
+
+
+def record_claude_request(
+    priority: str, outcome: str, queue_wait: float, concurrency_limit: int
+) -> None:
+    if _HAS_PROM:
+        asr_claude_requests_total.labels(priority=priority, outcome=outcome).inc()
+        asr_claude_queue_wait_seconds.labels(priority=priority).observe(queue_wait)
+        asr_claude_concurrency_limit.set(concurrency_limit)
+
+
+def record_vision_image_prepared(
+    source_type: str, outcome: str, original_bytes: int, sent_bytes: int
+) -> None:
+    if _HAS_PROM:
+        asr_vision_images_prepared_total.labels(
+            source_type=source_type, outcome=outcome
+        ).inc()
+        if original_bytes > 0:
+            asr_vision_image_bytes_total.labels(stage="original").inc(original_bytes)
+            asr_vision_image_bytes_total.labels(stage="sent").inc(sent_bytes)
+
+
+def record_claude_batch_requests(outcome: str, count: int) -> None:
+    if _HAS_PROM and count > 0:
+        asr_claude_batch_requests_total.labels(outcome=outcome).inc(count)
+
+
+def record_claude_tenant_usage(
+    tenant_id: str,
+    mode: str,
+    input_tokens: int,
+    output_tokens: int,
+    cost_usd: float,
+    latency_seconds: float,
+) -> None:
+    if _HAS_PROM:
+        asr_claude_tenant_calls_total.labels(tenant_id=tenant_id, mode=mode).inc()
+        tokens = asr_claude_tenant_tokens_total
+        tokens.labels(tenant_id=tenant_id, direction="input").inc(input_tokens)
+        tokens.labels(tenant_id=tenant_id, direction="output").inc(output_tokens)
+        asr_claude_tenant_cost_usd_total.labels(tenant_id=tenant_id).inc(cost_usd)
+        if mode != "batch":
+            asr_claude_tenant_latency_seconds.labels(tenant_id=tenant_id).observe(
+                latency_seconds
+            )
+
+
+def record_claude_budget_downgrade(tenant_id: str, budget: str) -> None:
+    if _HAS_PROM:
+        asr_claude_budget_downgrades_total.labels(
+            tenant_id=tenant_id, budget=budget
+        ).inc()
+
+
+def record_audit_events(outcome: str, count: int = 1) -> None:
+    if _HAS_PROM and count:
+        asr_audit_events_total.labels(outcome=outcome).inc(count)
+
+
+def observe_audit_flush(rows: int, duration: float) -> None:
+    if _HAS_PROM:
+        asr_audit_flush_batch_size.observe(rows)
+        asr_audit_flush_seconds.observe(duration)
+
+
+def set_audit_buffer_depth(depth: int) -> None:
+    if _HAS_PROM:
+        asr_audit_buffer_depth.set(depth)
+
+
+def record_audit_retention_deleted(method: str, count: int) -> None:
+    if _HAS_PROM and count:
+        asr_audit_retention_deleted_total.labels(method=method).inc(count)
+
+
+def record_audit_archived(rows: int, size_bytes: int) -> None:
+    if _HAS_PROM:
+        asr_audit_archived_rows_total.inc(rows)
+        asr_audit_archived_bytes_total.inc(size_bytes)
+
+
+def record_audit_archive_read(source: str) -> None:
+    if _HAS_PROM:
+        asr_audit_archive_reads_total.labels(source=source).inc()
+
+
+def record_audit_aggregation_buckets(source: str, count: int) -> None:
+    if _HAS_PROM and count:
+        asr_audit_aggregation_buckets_total.labels(source=source).inc(count)
+
+
+def record_response_cache_lookup(cache: str, outcome: str) -> None:
+    if _HAS_PROM:
+        asr_response_cache_lookups_total.labels(cache=cache, outcome=outcome).inc()
+
+
+def observe_health_check(component: str, ok: bool, duration: float) -> None:
+    if _HAS_PROM:
+        asr_health_check_seconds.labels(component=component).observe(duration)
+        asr_health_check_status.labels(component=component).set(1 if ok else 0)
+
+
 def record_vendor_operation(operation: str, tenant_id: str) -> None:
     if _HAS_PROM:
         asr_vendor_operations_total.labels(
@@ -9,15 +9,28 @@ Sophisticated 5-method consensus system for payment status detection:
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 import re
 import statistics
 import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Pattern, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
-from shared.core.constants import CONFIDENCE_THRESHOLDS, PAYMENT_INDICATORS
+from shared.core.constants import CONFIDENCE_THRESHOLDS
 from shared.core.exceptions import CLAUDEAPIError, PaymentDetectionError
 
 try:
@@ -25,6 +38,47 @@ try:
 except (ImportError, SystemError):
     from utils.retry import CircuitBreaker, async_retry  # type: ignore[no-redef]
 
+try:
+    from .claude_prompt_builder import CompactedText, compact_document_text
+except ImportError:
+    from services.claude_prompt_builder import (  # type: ignore[no-redef]
+        CompactedText,
+        compact_document_text,
+    )
+
+try:
+    from .classification_cache_service import fingerprint
+    from .claude_response_cache_service import content_hash
+except ImportError:
+    from services.classification_cache_service import (  # type: ignore[no-redef]
+        fingerprint,
+    )
+    from services.claude_response_cache_service import (  # type: ignore[no-redef]
+        content_hash,
+    )
+
+try:
+    from .image_preprocessor import sniff_media_type
+except ImportError:
+    from services.image_preprocessor import (  # type: ignore[no-redef]
+        sniff_media_type,
+    )
+
+try:
+    from .payment_indicator_scanner import (
+        KEYWORD_KIND,
+        PATTERN_KIND,
+        IndicatorScan,
+        PaymentIndicatorScanner,
+    )
+except ImportError:
+    from services.payment_indicator_scanner import (  # type: ignore[no-redef]
+        KEYWORD_KIND,
+        PATTERN_KIND,
+        IndicatorScan,
+        PaymentIndicatorScanner,
+    )
+
 # Import shared components
 from shared.core.models import (
     PaymentConsensusResult,
@@ -34,6 +88,123 @@ from shared.core.models import (
 
 logger = logging.getLogger(__name__)
 
+_CLAUDE_METHODS = (
+    PaymentDetectionMethod.CLAUDE_VISION,
+    PaymentDetectionMethod.CLAUDE_TEXT,
+)
+# Methods that read the indicator scan (Claude Text for its excerpt)
+_SCAN_METHODS = (
+    PaymentDetectionMethod.REGEX_PATTERNS,
+    PaymentDetectionMethod.KEYWORD_MATCHING,
+    PaymentDetectionMethod.CLAUDE_TEXT,
+)
+
+# Detection latencies kept for p50/p99 reporting
+_LATENCY_WINDOW = 1000
+
+# Primed batch responses kept in memory without a response cache
+_MAX_PRIMED_RESPONSES = 50000
+
+# Usage of detections without a tenant is accounted here
+_UNSCOPED_TENANT = "default"
+
+# Tenant the current detection's Claude calls are accounted to
+_detection_tenant: ContextVar[str] = ContextVar(
+    "detection_tenant", default=_UNSCOPED_TENANT
+)
+
+# Claude API requests sent by the current detection, retries included; one
+# list shared by its method tasks, None outside _run_detection
+_claude_requests: ContextVar[Optional[List[int]]] = ContextVar(
+    "claude_requests", default=None
+)
+
+
+def _count_claude_request() -> None:
+    sent = _claude_requests.get()
+    if sent is not None:
+        sent[0] += 1
+
+
+CLAUDE_VISION_PROMPT = """
+Analyze this document image for payment status indicators. Look for:
+1. Stamps or markings indicating "PAID"
+2. Balance amounts (zero balance = paid)
+3. Payment method references (check numbers, card transactions)
+4. Due dates and payment terms
+5. Any visual indicators of payment status
+
+Respond with:
+- PAID: if the document shows payment has been completed
+- UNPAID: if the document shows an outstanding balance
+- PARTIAL: if partial payment is indicated
+- VOID: if the document is void/cancelled
+- UNKNOWN: if payment status cannot be determined
+
+Include your confidence (0.0-1.0) and reasoning.
+"""
+
+CLAUDE_TEXT_PROMPT = """
+Analyze this document text for payment status indicators:
+
+{document_text}
+
+Determine the payment status based on:
+1. Explicit payment references (paid, check numbers, etc.)
+2. Balance amounts (zero balance typically means paid)
+3. Payment terms and due dates
+4. Context clues about payment completion
+
+Respond with:
+- PAID: if payment has been completed
+- UNPAID: if there's an outstanding balance
+- PARTIAL: if partial payment is indicated
+- VOID: if document is void/cancelled
+- UNKNOWN: if status cannot be determined
+
+Include confidence (0.0-1.0) and detailed reasoning.
+"""
+
+# Prompt template versions; part of the Claude response cache key so
+# editing a prompt makes earlier cached responses unreachable
+PROMPT_VERSIONS = {
+    "vision": fingerprint(CLAUDE_VISION_PROMPT)[:16],
+    "text": fingerprint(CLAUDE_TEXT_PROMPT)[:16],
+}
+
+
+def _record_detection_metrics(
+    path: str, seconds: float, claude_calls: int, skipped: int
+) -> None:
+    try:
+        from services.metrics_service import (
+            observe_payment_detection_time,
+            record_payment_claude_calls,
+        )
+    except ImportError:
+        try:
+            from .metrics_service import (
+                observe_payment_detection_time,
+                record_payment_claude_calls,
+            )
+        except ImportError:
+            return
+    observe_payment_detection_time(path, seconds)
+    record_payment_claude_calls("called", claude_calls)
+    record_payment_claude_calls("skipped", skipped)
+
+
+def _record_token_metrics(kind: str, input_tokens: int, output_tokens: int) -> None:
+    try:
+        from services.metrics_service import record_claude_tokens
+    except ImportError:
+        try:
+            from .metrics_service import record_claude_tokens
+        except ImportError:
+            return
+    record_claude_tokens(kind, "input", input_tokens)
+    record_claude_tokens(kind, "output", output_tokens)
+
 
 @dataclass
 class MethodResult:
@@ -47,25 +218,79 @@ class MethodResult:
     processing_time: float
 
 
+@dataclass
+class ClaudeBatchRequest:
+    """A Claude request collected for submission through the batch API"""
+
+    custom_id: str
+    kind: str
+    digest: str
+    params: Dict[str, Any]
+
+
 class PaymentDetectionService:
     """
     Sophisticated payment detection service using 5-method consensus
     """
 
-    def __init__(self, claude_config: Dict[str, Any], enabled_methods: List[str]):
+    def __init__(
+        self,
+        claude_config: Dict[str, Any],
+        enabled_methods: List[str],
+        result_cache: Optional[Any] = None,
+        response_cache: Optional[Any] = None,
+        early_exit_threshold: Optional[float] = None,
+        local_method_timeout: float = 2.0,
+        claude_method_timeout: float = 30.0,
+        text_token_budget: Optional[int] = None,
+        image_preprocessor: Optional[Any] = None,
+        claude_client_service: Optional[Any] = None,
+        usage_service: Optional[Any] = None,
+    ):
         self.claude_config = claude_config
         self.enabled_methods = [
             PaymentDetectionMethod(method) for method in enabled_methods
         ]
         self.initialized = False
+        self._result_cache = result_cache
+        self._response_cache = response_cache
+        self.config_version = ""
+
+        # Skip Claude when the local methods already agree at this confidence
+        self.early_exit_threshold = early_exit_threshold
+        self.local_method_timeout = local_method_timeout
+        self.claude_method_timeout = claude_method_timeout
+        # Document text sent to Claude Text is compacted to this many tokens
+        self.text_token_budget = text_token_budget
+        # Rasterizes/downscales document images before Claude Vision
+        self.image_preprocessor = image_preprocessor
+        # Per-tenant Claude usage; over-budget tenants get local-only detection
+        self.usage_service = usage_service
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._stats = {
+            "detections": 0,
+            "early_exits": 0,
+            "claude_calls": 0,
+            "claude_calls_skipped": 0,
+            "method_timeouts": 0,
+            "method_failures": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "prompt_tokens_saved": 0,
+            "budget_downgrades": 0,
+        }
 
-        # Pattern compilations for efficiency
-        self.paid_patterns: List[Pattern[str]] = []
-        self.unpaid_patterns: List[Pattern[str]] = []
-        self.partial_patterns: List[Pattern[str]] = []
-        self.void_patterns: List[Pattern[str]] = []
+        # Single-pass scanner shared by the regex, keyword and Claude Text
+        # methods; each detection scans its document once
+        self.indicator_scanner: Optional[PaymentIndicatorScanner] = None
 
-        # Claude client (will be initialized if available)
+        # Batch API responses for content that is about to be reprocessed,
+        # used when there is no response cache to hold them
+        self._primed: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+        # Claude client (will be initialized if available); the shared
+        # concurrency-limited client service is used when one is given
+        self.claude_client_service = claude_client_service
         self.claude_client: Optional[Any] = None
         self._claude_circuit = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
 
@@ -78,9 +303,15 @@ class PaymentDetectionService:
             self._compile_patterns()
 
             # Initialize Claude AI client if available
-            if self.claude_config.get("enabled") and self.claude_config.get("api_key"):
+            if self.claude_client_service is not None:
+                if self.claude_client_service.available:
+                    self.claude_client = self.claude_client_service
+            elif self.claude_config.get("enabled") and self.claude_config.get(
+                "api_key"
+            ):
                 await self._initialize_claude_client()
 
+            self.config_version = self._compute_config_version()
             self.initialized = True
 
             logger.info(f"✅ Payment Detection Service initialized:")
@@ -97,63 +328,34 @@ class PaymentDetectionService:
             )
 
     def _compile_patterns(self):
-        """Compile regex patterns for payment detection"""
-        # Paid patterns
-        paid_keywords = PAYMENT_INDICATORS["PAID_KEYWORDS"]
-        self.paid_patterns = [
-            re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
-            for keyword in paid_keywords
-        ]
-
-        # Additional sophisticated paid patterns
-        self.paid_patterns.extend(
-            [
-                re.compile(
-                    r"\b(?:balance|amount)\s+(?:due|owed)?\s*:?\s*\$?0+\.?0*\b",
-                    re.IGNORECASE,
-                ),
-                re.compile(r"\bzero\s+balance\b", re.IGNORECASE),
-                re.compile(r"\bpaid\s+in\s+full\b", re.IGNORECASE),
-                re.compile(r"\bcheck\s+#?\d+\b", re.IGNORECASE),
-                re.compile(r"\bref\s*#?\s*\d+\b", re.IGNORECASE),
-            ]
-        )
+        """Compile all payment indicators into the single-pass scanner"""
+        self.indicator_scanner = PaymentIndicatorScanner()
 
-        # Unpaid patterns
-        unpaid_keywords = PAYMENT_INDICATORS["UNPAID_KEYWORDS"]
-        self.unpaid_patterns = [
-            re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
-            for keyword in unpaid_keywords
-        ]
-
-        # Additional sophisticated unpaid patterns
-        self.unpaid_patterns.extend(
-            [
-                re.compile(
-                    r"\b(?:balance|amount)\s+(?:due|owed)\s*:?\s*\$?[1-9]\d*(?:\.\d{2})?\b",
-                    re.IGNORECASE,
-                ),
-                re.compile(
-                    r"\btotal\s+due\s*:?\s*\$?[1-9]\d*(?:\.\d{2})?\b", re.IGNORECASE
-                ),
-                re.compile(r"\bdue\s+date\b", re.IGNORECASE),
-                re.compile(r"\bplease\s+remit\b", re.IGNORECASE),
-            ]
-        )
+    def _scan_indicators(self, document_text: str) -> IndicatorScan:
+        """Run the single-pass indicator scan over *document_text*."""
+        if self.indicator_scanner is None:
+            self._compile_patterns()
+        return self.indicator_scanner.scan(document_text)  # type: ignore[union-attr]
 
-        # Partial payment patterns
-        partial_keywords = PAYMENT_INDICATORS["PARTIAL_KEYWORDS"]
-        self.partial_patterns = [
-            re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
-            for keyword in partial_keywords
-        ]
+    async def _scan_for(
+        self, methods: List[PaymentDetectionMethod], document_text: str
+    ) -> Optional[IndicatorScan]:
+        """Scan *document_text* once, in a worker thread, for *methods*.
 
-        # Void patterns
-        void_keywords = PAYMENT_INDICATORS["VOID_KEYWORDS"]
-        self.void_patterns = [
-            re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
-            for keyword in void_keywords
-        ]
+        The scan is passed down to every method of this detection that
+        reads it.  Returns None when none does, or when the scan fails or
+        times out; the methods then scan for themselves.
+        """
+        if not any(m in _SCAN_METHODS for m in methods):
+            return None
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self._scan_indicators, document_text),
+                timeout=self.local_method_timeout,
+            )
+        except Exception as e:
+            logger.warning(f"Indicator scan failed: {e!r}")
+            return None
 
     async def _initialize_claude_client(self) -> None:
         """Initialize Claude AI client"""
@@ -182,6 +384,36 @@ class PaymentDetectionService:
             logger.error(f"Failed to initialize Claude client: {e}")
             self.claude_client = None
 
+    def _compute_config_version(self) -> str:
+        """Hash of everything that influences detection output.
+
+        Used as part of the memoization key so a change to patterns,
+        enabled methods, Claude model or thresholds invalidates cached results.
+        """
+        patterns = (
+            [self.indicator_scanner.pattern.pattern] if self.indicator_scanner else []
+        )
+        preprocessor = self.image_preprocessor
+        vision_image = (
+            [preprocessor.max_long_edge, preprocessor.max_bytes, preprocessor.pdf_pages]
+            if preprocessor is not None
+            else None
+        )
+        payload = json.dumps(
+            {
+                "methods": [m.value for m in self.enabled_methods],
+                "patterns": patterns,
+                "claude": bool(self.claude_client),
+                "model": self.claude_config.get("model"),
+                "threshold": CONFIDENCE_THRESHOLDS.get("PAYMENT_DETECTION_MIN"),
+                "early_exit": self.early_exit_threshold,
+                "text_token_budget": self.text_token_budget,
+                "vision_image": vision_image,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
     def get_enabled_methods(self) -> List[PaymentDetectionMethod]:
         """Get list of enabled detection methods"""
         return self.enabled_methods.copy()
@@ -191,6 +423,7 @@ class PaymentDetectionService:
         document_text: str,
         document_image: Optional[bytes] = None,
         amount_info: Optional[Dict[str, Any]] = None,
+        tenant_id: Optional[str] = None,
     ) -> PaymentConsensusResult:
         """
         Detect payment status using sophisticated 5-method consensus
@@ -199,6 +432,8 @@ class PaymentDetectionService:
             document_text: Extracted text from document
             document_image: Document image for vision analysis (optional)
             amount_info: Amount information from document (optional)
+            tenant_id: Tenant scope for memoized results and Claude usage
+                accounting (optional)
 
         Returns:
             PaymentConsensusResult with consensus decision and confidence
@@ -206,137 +441,566 @@ class PaymentDetectionService:
         if not self.initialized:
             raise PaymentDetectionError("Payment detection service not initialized")
 
+        token = _detection_tenant.set(tenant_id or _UNSCOPED_TENANT)
+        try:
+            return await self._detect(
+                document_text, document_image, amount_info, tenant_id
+            )
+        finally:
+            _detection_tenant.reset(token)
+
+    async def _detect(
+        self,
+        document_text: str,
+        document_image: Optional[bytes],
+        amount_info: Optional[Dict[str, Any]],
+        tenant_id: Optional[str],
+    ) -> PaymentConsensusResult:
+        exceeded = self._exceeded_budget()
+        if self._result_cache is None:
+            consensus, _, _ = await self._run_detection(
+                document_text, document_image, amount_info, exceeded
+            )
+            return consensus
+
+        extra = json.dumps(amount_info or {}, sort_keys=True, default=str)
+        if document_image:
+            extra += hashlib.sha256(document_image).hexdigest()
+        cache_key = self._result_cache.make_key(
+            "payment", document_text, None, tenant_id, self.config_version, extra
+        )
+        cached = await self._result_cache.get("payment", cache_key)
+        if cached is not None:
+            return PaymentConsensusResult.model_validate(cached)
+
+        consensus, claude_calls, failed = await self._run_detection(
+            document_text, document_image, amount_info, exceeded
+        )
+        # Degraded results (a method raised, or Claude skipped for budget)
+        # are not memoized so the next attempt gets the full consensus.
+        if not failed and not exceeded and consensus.methods_used:
+            await self._result_cache.put(
+                "payment",
+                cache_key,
+                tenant_id,
+                self.config_version,
+                consensus.model_dump(mode="json"),
+                claude_calls=claude_calls,
+            )
+        return consensus
+
+    async def _run_detection(
+        self,
+        document_text: str,
+        document_image: Optional[bytes],
+        amount_info: Optional[Dict[str, Any]],
+        exceeded_budget: Optional[str] = None,
+    ) -> Tuple[PaymentConsensusResult, int, int]:
+        """Run enabled methods; returns (consensus, claude_calls, failed_methods).
+
+        The local methods (regex, keywords, amount) run concurrently first,
+        in worker threads since they are CPU-bound; they finish in
+        milliseconds.  If they agree at or above ``early_exit_threshold`` the
+        Claude methods are skipped, otherwise the Claude methods run
+        concurrently with each other.  Each method is bounded by its timeout,
+        and a method that times out counts as failed.  With *exceeded_budget*
+        set the tenant is out of Claude budget and only the local methods
+        run.  ``claude_calls`` counts API requests actually sent, so answers
+        from the response cache or primed batch results cost nothing.
+        """
+        start_time = time.perf_counter()
         try:
             logger.debug("Starting sophisticated payment detection consensus...")
 
-            # Run all enabled detection methods
-            method_results = []
+            local_methods, claude_methods = self._split_methods(document_image)
+            downgraded = bool(exceeded_budget and claude_methods)
+            if downgraded:
+                claude_methods = []
+                self._stats["budget_downgrades"] += 1
+                if self.usage_service is not None:
+                    self.usage_service.record_downgrade(
+                        _detection_tenant.get(), exceeded_budget
+                    )
 
-            for method in self.enabled_methods:
+            scan = await self._scan_for(local_methods + claude_methods, document_text)
+            method_results, failed_methods = await self._run_methods(
+                local_methods, document_text, document_image, amount_info, scan
+            )
+
+            claude_calls = 0
+            skipped = 0
+            if claude_methods and self._local_consensus_reached(method_results):
+                skipped = len(claude_methods)
+                logger.debug(
+                    f"Local methods agree; skipping {skipped} Claude method(s)"
+                )
+            elif claude_methods:
+                sent = [0]
+                token = _claude_requests.set(sent)
                 try:
-                    start_time = time.perf_counter()
-
-                    if (
-                        method == PaymentDetectionMethod.CLAUDE_VISION
-                        and document_image
-                    ):
-                        result = await self._detect_claude_vision(
-                            document_image, document_text
-                        )
-                    elif method == PaymentDetectionMethod.CLAUDE_TEXT:
-                        result = await self._detect_claude_text(document_text)
-                    elif method == PaymentDetectionMethod.REGEX_PATTERNS:
-                        result = await self._detect_regex_patterns(document_text)
-                    elif method == PaymentDetectionMethod.KEYWORD_MATCHING:
-                        result = await self._detect_keywords(document_text)
-                    elif method == PaymentDetectionMethod.AMOUNT_ANALYSIS:
-                        result = await self._detect_amount_analysis(
-                            document_text, amount_info
-                        )
-                    else:
-                        continue  # Skip unavailable methods
-
-                    processing_time = time.perf_counter() - start_time
-                    result.processing_time = processing_time
-                    method_results.append(result)
-
-                    logger.debug(
-                        f"Method {method.value}: {result.payment_status.value} (confidence: {result.confidence:.2f})"
+                    claude_results, claude_failed = await self._run_methods(
+                        claude_methods, document_text, document_image, amount_info, scan
                     )
+                finally:
+                    _claude_requests.reset(token)
+                claude_calls = sent[0]
+                method_results.extend(claude_results)
+                failed_methods += claude_failed
 
-                except Exception as e:
-                    logger.warning(f"Method {method.value} failed: {e}")
-                    continue
+            # Keep the configured method order regardless of completion order
+            order = {m: i for i, m in enumerate(self.enabled_methods)}
+            method_results.sort(key=lambda r: order[r.method])
 
             # Calculate consensus
             consensus = self._calculate_consensus(method_results)
 
             logger.info(
-                f"Payment detection consensus: {consensus.payment_status.value} (confidence: {consensus.confidence:.2f})"
+                f"Payment detection consensus: {consensus.payment_status.value} "
+                f"(confidence: {consensus.confidence:.2f})"
             )
 
-            return consensus
+            elapsed = time.perf_counter() - start_time
+            if downgraded:
+                path = "budget_downgrade"
+            elif skipped:
+                path = "early_exit"
+            else:
+                path = "full" if claude_methods else "local"
+            self._latencies.append(elapsed)
+            self._stats["detections"] += 1
+            self._stats["early_exits"] += 1 if skipped else 0
+            self._stats["claude_calls"] += claude_calls
+            self._stats["claude_calls_skipped"] += skipped
+            self._stats["method_failures"] += failed_methods
+            _record_detection_metrics(path, elapsed, claude_calls, skipped)
+
+            return consensus, claude_calls, failed_methods
 
         except Exception as e:
             logger.error(f"Payment detection error: {e}")
             raise PaymentDetectionError(f"Failed to detect payment status: {e}")
 
-    @async_retry(
-        max_attempts=3,
-        backoff_seconds=(1.0, 2.0, 4.0),
-        retryable_exceptions=(CLAUDEAPIError,),
-    )
+    def _split_methods(
+        self, document_image: Optional[bytes]
+    ) -> Tuple[List[PaymentDetectionMethod], List[PaymentDetectionMethod]]:
+        """Enabled (local, Claude) methods; Claude Vision needs an image.
+
+        Without a Claude client the Claude methods are unavailable rather
+        than failed, so they are left out entirely.
+        """
+        local_methods = [m for m in self.enabled_methods if m not in _CLAUDE_METHODS]
+        if self.claude_client is None:
+            return local_methods, []
+        claude_methods: List[PaymentDetectionMethod] = [
+            m
+            for m in self.enabled_methods
+            if m == PaymentDetectionMethod.CLAUDE_TEXT
+            or (m == PaymentDetectionMethod.CLAUDE_VISION and document_image)
+        ]
+        return local_methods, claude_methods
+
+    # ------------------------------------------------------------------
+    # Batch mode
+    # ------------------------------------------------------------------
+
+    async def plan_claude_requests(
+        self,
+        document_text: str,
+        document_image: Optional[bytes] = None,
+        amount_info: Optional[Dict[str, Any]] = None,
+        tenant_id: Optional[str] = None,
+    ) -> List[ClaudeBatchRequest]:
+        """Claude requests a detection of this document would make.
+
+        Used to submit a reprocessing backlog through the batch API: the
+        local methods run first and nothing is planned when they reach
+        early-exit consensus, for content already answered, nor for a tenant
+        that is out of Claude budget. Request
+        content (compacted text, prepared image) is built exactly as in
+        ``detect_payment_status`` so the responses can be primed for it.
+        """
+        if not self.initialized:
+            raise PaymentDetectionError("Payment detection service not initialized")
+        local_methods, claude_methods = self._split_methods(document_image)
+        if self.claude_client is None or not claude_methods:
+            return []
+        token = _detection_tenant.set(tenant_id or _UNSCOPED_TENANT)
+        try:
+            if self._exceeded_budget():
+                return []
+        finally:
+            _detection_tenant.reset(token)
+        scan = await self._scan_for(local_methods + claude_methods, document_text)
+        local_results, _ = await self._run_methods(
+            local_methods, document_text, document_image, amount_info, scan
+        )
+        if self._local_consensus_reached(local_results):
+            return []
+
+        requests: List[ClaudeBatchRequest] = []
+        for method in claude_methods:
+            if method == PaymentDetectionMethod.CLAUDE_TEXT:
+                kind = "text"
+                content: Any = self._text_excerpt(document_text, scan).text
+                params = self._text_params(content)
+            else:
+                try:
+                    content, media_type = await self._vision_image(
+                        document_image  # type: ignore[arg-type]
+                    )
+                except PaymentDetectionError:
+                    continue
+                kind = "vision"
+                params = self._vision_params(content, media_type)
+            digest = content_hash(content)
+            if await self._stored_response(kind, digest) is not None:
+                continue
+            requests.append(
+                ClaudeBatchRequest(f"{kind}-{digest[:48]}", kind, digest, params)
+            )
+        return requests
+
+    async def prime_claude_response(
+        self, kind: str, digest: str, response_text: str
+    ) -> bool:
+        """Store a batch API response for content hash *digest*.
+
+        The next detection that would send that content to Claude uses it
+        instead. Responses that parse to UNKNOWN are dropped, as in the
+        interactive path. Returns True when the response was kept.
+        """
+        try:
+            payment_status, _, _ = self._parse_claude_response(response_text)
+        except Exception:
+            return False
+        if payment_status == PaymentStatus.UNKNOWN:
+            return False
+
+        cache = self._response_cache
+        if cache is not None and await cache.put(
+            kind,
+            cache.make_key(kind, self._claude_model, PROMPT_VERSIONS[kind], digest),
+            self._claude_model,
+            PROMPT_VERSIONS[kind],
+            digest,
+            response_text,
+            0.0,
+        ):
+            if cache.persistent:
+                return True
+        # A memory-only cache could evict it before the document comes up
+        self._primed[(kind, digest)] = response_text
+        self._primed.move_to_end((kind, digest))
+        while len(self._primed) > _MAX_PRIMED_RESPONSES:
+            self._primed.popitem(last=False)
+        return True
+
+    async def _stored_response(self, kind: str, digest: str) -> Optional[str]:
+        """A primed or cached response for this content, if any."""
+        primed = self._primed.get((kind, digest))
+        if primed is not None:
+            return primed
+        cache = self._response_cache
+        if cache is None:
+            return None
+        cached: Optional[str] = await cache.get(
+            kind,
+            cache.make_key(kind, self._claude_model, PROMPT_VERSIONS[kind], digest),
+        )
+        return cached
+
+    async def _run_methods(
+        self,
+        methods: List[PaymentDetectionMethod],
+        document_text: str,
+        document_image: Optional[bytes],
+        amount_info: Optional[Dict[str, Any]],
+        scan: Optional[IndicatorScan] = None,
+    ) -> Tuple[List[MethodResult], int]:
+        """Run *methods* concurrently; returns (results, failed_count)."""
+        outcomes = await asyncio.gather(
+            *(
+                self._run_method(m, document_text, document_image, amount_info, scan)
+                for m in methods
+            ),
+            return_exceptions=True,
+        )
+        results: List[MethodResult] = []
+        failed = 0
+        for method, outcome in zip(methods, outcomes):
+            if isinstance(outcome, BaseException):
+                if isinstance(outcome, asyncio.TimeoutError):
+                    self._stats["method_timeouts"] += 1
+                    logger.warning(f"Method {method.value} timed out")
+                else:
+                    logger.warning(f"Method {method.value} failed: {outcome}")
+                failed += 1
+                continue
+            results.append(outcome)
+            logger.debug(
+                f"Method {method.value}: {outcome.payment_status.value} "
+                f"(confidence: {outcome.confidence:.2f})"
+            )
+        return results, failed
+
+    async def _run_method(
+        self,
+        method: PaymentDetectionMethod,
+        document_text: str,
+        document_image: Optional[bytes],
+        amount_info: Optional[Dict[str, Any]],
+        scan: Optional[IndicatorScan] = None,
+    ) -> MethodResult:
+        """Run one detection method under its timeout and record its duration.
+
+        The local methods never await, so they run in worker threads for the
+        timeout to be able to interrupt the wait on them.  *scan* is this
+        detection's indicator scan, if already taken.
+        """
+        coro: Awaitable[MethodResult]
+        if method == PaymentDetectionMethod.CLAUDE_VISION:
+            coro = self._detect_claude_vision(
+                document_image, document_text  # type: ignore[arg-type]
+            )
+        elif method == PaymentDetectionMethod.CLAUDE_TEXT:
+            coro = self._detect_claude_text(document_text, scan)
+        elif method == PaymentDetectionMethod.REGEX_PATTERNS:
+            coro = asyncio.to_thread(self._detect_regex_patterns, document_text, scan)
+        elif method == PaymentDetectionMethod.KEYWORD_MATCHING:
+            coro = asyncio.to_thread(self._detect_keywords, document_text, scan)
+        else:
+            coro = asyncio.to_thread(
+                self._detect_amount_analysis, document_text, amount_info
+            )
+
+        timeout = (
+            self.claude_method_timeout
+            if method in _CLAUDE_METHODS
+            else self.local_method_timeout
+        )
+        start_time = time.perf_counter()
+        result = await asyncio.wait_for(coro, timeout=timeout)
+        result.processing_time = time.perf_counter() - start_time
+        return result
+
+    def _local_consensus_reached(self, local_results: List[MethodResult]) -> bool:
+        """True when at least two local methods agree on a definite status
+        with consensus confidence at or above ``early_exit_threshold``."""
+        if self.early_exit_threshold is None or len(local_results) < 2:
+            return False
+        statuses = {r.payment_status for r in local_results}
+        if len(statuses) != 1 or PaymentStatus.UNKNOWN in statuses:
+            return False
+        consensus = self._calculate_consensus(local_results)
+        return consensus.confidence >= self.early_exit_threshold
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Detection counters plus p50/p99 latency over the recent window."""
+        latencies = sorted(self._latencies)
+
+        def _pct(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+        return {
+            **self._stats,
+            "early_exit_threshold": self.early_exit_threshold,
+            "latency_ms_p50": _pct(0.50),
+            "latency_ms_p99": _pct(0.99),
+        }
+
     async def _detect_claude_vision(
         self, document_image: bytes, document_text: str
     ) -> MethodResult:
         """Detect payment status using Claude Vision"""
         if not self.claude_client:
             raise PaymentDetectionError("Claude client not available")
-        if self._claude_circuit.is_open:
-            raise CLAUDEAPIError("Claude API circuit breaker is open — failing fast")
+        image, media_type = await self._vision_image(document_image)
+        return await self._claude_method(
+            PaymentDetectionMethod.CLAUDE_VISION,
+            "vision",
+            image,
+            lambda: self._request_claude_vision(image, media_type),
+            details={
+                "media_type": media_type,
+                "image_bytes": len(image),
+                "original_bytes": len(document_image),
+            },
+        )
 
-        try:
-            # Convert image to base64
-            import base64
-
-            image_data = base64.b64encode(document_image).decode("utf-8")
-
-            # Create vision analysis prompt
-            prompt = """
-            Analyze this document image for payment status indicators. Look for:
-            1. Stamps or markings indicating "PAID"
-            2. Balance amounts (zero balance = paid)
-            3. Payment method references (check numbers, card transactions)
-            4. Due dates and payment terms
-            5. Any visual indicators of payment status
-
-            Respond with:
-            - PAID: if the document shows payment has been completed
-            - UNPAID: if the document shows an outstanding balance
-            - PARTIAL: if partial payment is indicated
-            - VOID: if the document is void/cancelled
-            - UNKNOWN: if payment status cannot be determined
-
-            Include your confidence (0.0-1.0) and reasoning.
-            """
+    async def _vision_image(self, document_image: bytes) -> Tuple[bytes, str]:
+        """Image bytes and media type to send to Claude Vision.
 
-            response = await self.claude_client.messages.create(
-                model=self.claude_config["model"],
-                max_tokens=1000,
-                temperature=self.claude_config["temperature"],
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/jpeg",
-                                    "data": image_data,
-                                },
-                            },
-                            {"type": "text", "text": prompt},
-                        ],
-                    }
-                ],
+        With a preprocessor, PDFs and TIFFs are rasterized/converted and large
+        scans downscaled; without one the bytes are sent as-is, labelled by
+        their signature.
+        """
+        if self.image_preprocessor is None:
+            return document_image, sniff_media_type(document_image) or "image/jpeg"
+        prepared = await self.image_preprocessor.prepare(document_image)
+        if prepared is None:
+            raise PaymentDetectionError("Document has no usable vision image")
+        return prepared.data, prepared.media_type
+
+    async def _detect_claude_text(
+        self, document_text: str, scan: Optional[IndicatorScan] = None
+    ) -> MethodResult:
+        """Detect payment status using Claude Text analysis"""
+        if not self.claude_client:
+            raise PaymentDetectionError("Claude client not available")
+        excerpt = self._text_excerpt(document_text, scan)
+        self._stats["prompt_tokens_saved"] += excerpt.original_tokens - excerpt.tokens
+        return await self._claude_method(
+            PaymentDetectionMethod.CLAUDE_TEXT,
+            "text",
+            excerpt.text,
+            lambda: self._request_claude_text(excerpt.text),
+            details={
+                "prompt_tokens_estimate": excerpt.tokens,
+                "document_tokens_estimate": excerpt.original_tokens,
+                "compacted": excerpt.compacted,
+            },
+        )
+
+    def _text_excerpt(
+        self, document_text: str, scan: Optional[IndicatorScan] = None
+    ) -> CompactedText:
+        return compact_document_text(
+            document_text,
+            scan if scan is not None else self._scan_indicators(document_text),
+            self.text_token_budget,
+        )
+
+    async def _claude_method(
+        self,
+        method: PaymentDetectionMethod,
+        kind: str,
+        content: Any,
+        request: Callable[[], Awaitable[str]],
+        details: Optional[Dict[str, Any]] = None,
+    ) -> MethodResult:
+        """Serve a Claude method from primed batch responses, the response
+        cache, or the API.
+
+        Only definite responses from successful calls are stored; API
+        errors and circuit-breaker failures propagate before the store, and
+        UNKNOWN responses are not cached.
+        """
+        digest = content_hash(content)
+        primed = self._primed.get((kind, digest))
+        if primed is not None:
+            return self._claude_result(method, primed, True, details)
+
+        cache = self._response_cache
+        key = ""
+        if cache is not None:
+            key = cache.make_key(
+                kind, self._claude_model, PROMPT_VERSIONS[kind], digest
+            )
+            cached_text = await cache.get(kind, key)
+            if cached_text is not None:
+                return self._claude_result(method, cached_text, True, details)
+
+        start_time = time.perf_counter()
+        response_text = await request()
+        latency = time.perf_counter() - start_time
+
+        result = self._claude_result(method, response_text, False, details)
+        if cache is not None and result.payment_status != PaymentStatus.UNKNOWN:
+            await cache.put(
+                kind,
+                key,
+                self._claude_model,
+                PROMPT_VERSIONS[kind],
+                digest,
+                response_text,
+                latency,
             )
+        return result
 
-            # Parse Claude response
-            response_text = response.content[0].text
+    def _claude_result(
+        self,
+        method: PaymentDetectionMethod,
+        response_text: str,
+        cached: bool,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> MethodResult:
+        try:
             payment_status, confidence, reasoning = self._parse_claude_response(
                 response_text
             )
+        except Exception as e:
+            raise CLAUDEAPIError(f"Unparseable {method.value} response: {e}")
+        return MethodResult(
+            method=method,
+            payment_status=payment_status,
+            confidence=confidence,
+            reasoning=reasoning,
+            details={
+                "claude_response": response_text,
+                "cached": cached,
+                **(details or {}),
+            },
+            processing_time=0.0,
+        )
+
+    def _record_token_usage(
+        self, kind: str, response: Any, latency_seconds: float = 0.0
+    ) -> None:
+        """Record input/output tokens reported in the API response usage,
+        and account the call to the current detection's tenant."""
+        usage = getattr(response, "usage", None)
+        input_tokens = int(getattr(usage, "input_tokens", 0) or 0)
+        output_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+        self._stats["input_tokens"] += input_tokens
+        self._stats["output_tokens"] += output_tokens
+        _record_token_metrics(kind, input_tokens, output_tokens)
+        if self.usage_service is not None:
+            self.usage_service.record(
+                _detection_tenant.get(), input_tokens, output_tokens, latency_seconds
+            )
 
+    def _exceeded_budget(self) -> Optional[str]:
+        """Budget the current detection's tenant has used up, if any."""
+        if self.usage_service is None:
+            return None
+        exceeded: Optional[str] = self.usage_service.exceeded_budget(
+            _detection_tenant.get()
+        )
+        return exceeded
+
+    @property
+    def _claude_model(self) -> str:
+        return str(self.claude_config.get("model", ""))
+
+    @async_retry(
+        max_attempts=3,
+        backoff_seconds=(1.0, 2.0, 4.0),
+        retryable_exceptions=(CLAUDEAPIError,),
+    )
+    async def _request_claude_vision(
+        self, document_image: bytes, media_type: str = "image/jpeg"
+    ) -> str:
+        """Call Claude Vision and return the raw response text"""
+        if self._claude_circuit.is_open:
+            raise CLAUDEAPIError("Claude API circuit breaker is open — failing fast")
+        if self.claude_client is None:
+            raise PaymentDetectionError("Claude client not available")
+
+        try:
+            start_time = time.perf_counter()
+            _count_claude_request()
+            response = await self.claude_client.messages.create(
+                **self._vision_params(document_image, media_type)
+            )
+
+            response_text: str = response.content[0].text
             self._claude_circuit.record_success()
-            return MethodResult(
-                method=PaymentDetectionMethod.CLAUDE_VISION,
-                payment_status=payment_status,
-                confidence=confidence,
-                reasoning=reasoning,
-                details={"claude_response": response_text},
-                processing_time=0.0,
+            self._record_token_usage(
+                "vision", response, time.perf_counter() - start_time
             )
+            return response_text
 
         except CLAUDEAPIError:
             raise
@@ -350,56 +1014,24 @@ class PaymentDetectionService:
         backoff_seconds=(1.0, 2.0, 4.0),
         retryable_exceptions=(CLAUDEAPIError,),
     )
-    async def _detect_claude_text(self, document_text: str) -> MethodResult:
-        """Detect payment status using Claude Text analysis"""
-        if not self.claude_client:
-            raise PaymentDetectionError("Claude client not available")
+    async def _request_claude_text(self, document_text: str) -> str:
+        """Call Claude Text and return the raw response text"""
         if self._claude_circuit.is_open:
             raise CLAUDEAPIError("Claude API circuit breaker is open — failing fast")
+        if self.claude_client is None:
+            raise PaymentDetectionError("Claude client not available")
 
         try:
-            prompt = f"""
-            Analyze this document text for payment status indicators:
-
-            {document_text}
-
-            Determine the payment status based on:
-            1. Explicit payment references (paid, check numbers, etc.)
-            2. Balance amounts (zero balance typically means paid)
-            3. Payment terms and due dates
-            4. Context clues about payment completion
-
-            Respond with:
-            - PAID: if payment has been completed
-            - UNPAID: if there's an outstanding balance
-            - PARTIAL: if partial payment is indicated
-            - VOID: if document is void/cancelled
-            - UNKNOWN: if status cannot be determined
-
-            Include confidence (0.0-1.0) and detailed reasoning.
-            """
-
+            start_time = time.perf_counter()
+            _count_claude_request()
             response = await self.claude_client.messages.create(
-                model=self.claude_config["model"],
-                max_tokens=1000,
-                temperature=self.claude_config["temperature"],
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = response.content[0].text
-            payment_status, confidence, reasoning = self._parse_claude_response(
-                response_text
+                **self._text_params(document_text)
             )
 
+            response_text: str = response.content[0].text
             self._claude_circuit.record_success()
-            return MethodResult(
-                method=PaymentDetectionMethod.CLAUDE_TEXT,
-                payment_status=payment_status,
-                confidence=confidence,
-                reasoning=reasoning,
-                details={"claude_response": response_text},
-                processing_time=0.0,
-            )
+            self._record_token_usage("text", response, time.perf_counter() - start_time)
+            return response_text
 
         except CLAUDEAPIError:
             raise
@@ -408,20 +1040,58 @@ class PaymentDetectionService:
             logger.error(f"Claude Text detection failed: {e}")
             raise CLAUDEAPIError(f"Claude Text analysis failed: {e}")
 
-    async def _detect_regex_patterns(self, document_text: str) -> MethodResult:
+    def _vision_params(self, image: bytes, media_type: str) -> Dict[str, Any]:
+        """``messages.create`` arguments for a Claude Vision request"""
+        import base64
+
+        image_data = base64.b64encode(image).decode("utf-8")
+        return {
+            "model": self.claude_config["model"],
+            "max_tokens": 1000,
+            "temperature": self.claude_config["temperature"],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": media_type,
+                                "data": image_data,
+                            },
+                        },
+                        {"type": "text", "text": CLAUDE_VISION_PROMPT},
+                    ],
+                }
+            ],
+        }
+
+    def _text_params(self, document_text: str) -> Dict[str, Any]:
+        """``messages.create`` arguments for a Claude Text request"""
+        return {
+            "model": self.claude_config["model"],
+            "max_tokens": 1000,
+            "temperature": self.claude_config["temperature"],
+            "messages": [
+                {
+                    "role": "user",
+                    "content": CLAUDE_TEXT_PROMPT.format(document_text=document_text),
+                }
+            ],
+        }
+
+    def _detect_regex_patterns(
+        self, document_text: str, scan: Optional[IndicatorScan] = None
+    ) -> MethodResult:
         """Detect payment status using regex patterns"""
-        paid_matches = sum(
-            1 for pattern in self.paid_patterns if pattern.search(document_text)
-        )
-        unpaid_matches = sum(
-            1 for pattern in self.unpaid_patterns if pattern.search(document_text)
-        )
-        partial_matches = sum(
-            1 for pattern in self.partial_patterns if pattern.search(document_text)
-        )
-        void_matches = sum(
-            1 for pattern in self.void_patterns if pattern.search(document_text)
-        )
+        if scan is None:
+            scan = self._scan_indicators(document_text)
+        counts = scan.counts(PATTERN_KIND)
+        paid_matches = counts["paid"]
+        unpaid_matches = counts["unpaid"]
+        partial_matches = counts["partial"]
+        void_matches = counts["void"]
 
         # Determine status based on pattern matches
         max_matches = max(paid_matches, unpaid_matches, partial_matches, void_matches)
@@ -457,35 +1127,22 @@ class PaymentDetectionService:
                 "unpaid_matches": unpaid_matches,
                 "partial_matches": partial_matches,
                 "void_matches": void_matches,
+                "positions": scan.position_summary(PATTERN_KIND),
             },
             processing_time=0.0,
         )
 
-    async def _detect_keywords(self, document_text: str) -> MethodResult:
+    def _detect_keywords(
+        self, document_text: str, scan: Optional[IndicatorScan] = None
+    ) -> MethodResult:
         """Detect payment status using keyword analysis"""
-        text_lower = document_text.lower()
-
-        # Count keyword categories
-        paid_score = sum(
-            1
-            for keyword in PAYMENT_INDICATORS["PAID_KEYWORDS"]
-            if keyword.lower() in text_lower
-        )
-        unpaid_score = sum(
-            1
-            for keyword in PAYMENT_INDICATORS["UNPAID_KEYWORDS"]
-            if keyword.lower() in text_lower
-        )
-        partial_score = sum(
-            1
-            for keyword in PAYMENT_INDICATORS["PARTIAL_KEYWORDS"]
-            if keyword.lower() in text_lower
-        )
-        void_score = sum(
-            1
-            for keyword in PAYMENT_INDICATORS["VOID_KEYWORDS"]
-            if keyword.lower() in text_lower
-        )
+        if scan is None:
+            scan = self._scan_indicators(document_text)
+        counts = scan.counts(KEYWORD_KIND)
+        paid_score = counts["paid"]
+        unpaid_score = counts["unpaid"]
+        partial_score = counts["partial"]
+        void_score = counts["void"]
 
         # Determine status based on keyword scores
         max_score = max(paid_score, unpaid_score, partial_score, void_score)
@@ -521,11 +1178,12 @@ class PaymentDetectionService:
                 "unpaid_score": unpaid_score,
                 "partial_score": partial_score,
                 "void_score": void_score,
+                "positions": scan.position_summary(KEYWORD_KIND),
             },
             processing_time=0.0,
         )
 
-    async def _detect_amount_analysis(
+    def _detect_amount_analysis(
         self, document_text: str, amount_info: Optional[Dict[str, Any]]
     ) -> MethodResult:
         """Detect payment status using amount analysis"""
@@ -0,0 +1,189 @@
+"""
+ASR Production Server - Payment Indicator Scanner
+Single-pass scanner shared by the regex and keyword payment detection
+methods. Every payment indicator (word-bounded patterns for the regex
+method, plain substrings for the keyword method) is compiled into one
+alternation with a named group per indicator, so one ``finditer`` over the
+document yields per-category counts and match positions for both methods.
+
+Each branch of the alternation starts with the indicator's literal first
+character and checks the remainder with lookaheads. That lets the regex
+engine skip straight to candidate characters, and because only one
+character is consumed per match, indicators that overlap or nest (``paid``
+inside ``unpaid``, ``due`` inside ``balance due``) are all still reported.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from shared.core.constants import PAYMENT_INDICATORS
+
+PAYMENT_CATEGORIES = ("paid", "unpaid", "partial", "void")
+
+PATTERN_KIND = "pattern"
+KEYWORD_KIND = "keyword"
+
+# Word-bounded patterns beyond the plain keywords, per category. Each entry
+# is (lead words, tail regex) and counts as one pattern however many lead
+# words it has; the lead words must be lowercase literals.
+EXTRA_PATTERNS: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {
+    "paid": [
+        (("balance", "amount"), r"\s+(?:due|owed)?\s*:?\s*\$?0+\.?0*\b"),
+        (("zero",), r"\s+balance\b"),
+        (("paid",), r"\s+in\s+full\b"),
+        (("check",), r"\s+#?\d+\b"),
+        (("ref",), r"\s*#?\s*\d+\b"),
+    ],
+    "unpaid": [
+        (
+            ("balance", "amount"),
+            r"\s+(?:due|owed)\s*:?\s*\$?[1-9]\d*(?:\.\d{2})?\b",
+        ),
+        (("total",), r"\s+due\s*:?\s*\$?[1-9]\d*(?:\.\d{2})?\b"),
+        (("due",), r"\s+date\b"),
+        (("please",), r"\s+remit\b"),
+    ],
+    "partial": [],
+    "void": [],
+}
+
+# Positions reported per category in method details
+MAX_REPORTED_POSITIONS = 10
+
+# Fixed-width "no word character before the consumed lead character"; this
+# is the leading \b of a pattern, checked after the lead has been consumed.
+_WORD_START = r"(?<!\w.)"
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """One payment indicator: a regex-method pattern or a keyword"""
+
+    category: str
+    kind: str
+    label: str
+
+
+class IndicatorScan:
+    """Indicator matches found in one document"""
+
+    def __init__(
+        self,
+        indicators: Sequence[Indicator],
+        hits: Dict[int, List[Tuple[int, int]]],
+    ):
+        self._indicators = indicators
+        self._hits = hits
+
+    def counts(self, kind: str) -> Dict[str, int]:
+        """Distinct indicators of *kind* matched, per category."""
+        counts = dict.fromkeys(PAYMENT_CATEGORIES, 0)
+        for index in self._hits:
+            indicator = self._indicators[index]
+            if indicator.kind == kind:
+                counts[indicator.category] += 1
+        return counts
+
+    def positions(self, kind: str, category: str) -> List[Tuple[int, int]]:
+        """Sorted ``(start, end)`` spans of every *kind* match in *category*."""
+        spans: List[Tuple[int, int]] = []
+        for index, hits in self._hits.items():
+            indicator = self._indicators[index]
+            if indicator.kind == kind and indicator.category == category:
+                spans.extend(hits)
+        return sorted(spans)
+
+    def matched(self, kind: str) -> List[Indicator]:
+        """Indicators of *kind* matched at least once."""
+        return [
+            self._indicators[i]
+            for i in sorted(self._hits)
+            if self._indicators[i].kind == kind
+        ]
+
+    def position_summary(self, kind: str) -> Dict[str, List[int]]:
+        """First match offsets per category, capped for method details."""
+        return {
+            category: [
+                start
+                for start, _ in self.positions(kind, category)[:MAX_REPORTED_POSITIONS]
+            ]
+            for category in PAYMENT_CATEGORIES
+        }
+
+
+class PaymentIndicatorScanner:
+    """Compiles all payment indicators into one scanning regex"""
+
+    def __init__(
+        self,
+        indicators: Optional[Dict[str, List[str]]] = None,
+        extra_patterns: Optional[Dict[str, List[Tuple[Tuple[str, ...], str]]]] = None,
+    ):
+        keywords = indicators or PAYMENT_INDICATORS
+        extras = EXTRA_PATTERNS if extra_patterns is None else extra_patterns
+
+        self.indicators: List[Indicator] = []
+        # lead character -> [(indicator index, remainder regex)]
+        alternatives: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+
+        def add(category, kind, label, leads, tail, bounded):
+            index = len(self.indicators)
+            self.indicators.append(Indicator(category, kind, label))
+            for lead in leads:
+                lead = lead.lower()
+                rest = re.escape(lead[1:]) + tail
+                alternatives[lead[0]].append(
+                    (index, (_WORD_START if bounded else "") + rest)
+                )
+
+        for category in PAYMENT_CATEGORIES:
+            words = keywords.get(f"{category.upper()}_KEYWORDS", [])
+            for word in words:
+                add(category, PATTERN_KIND, word, (word,), r"\b", True)
+            for leads, tail in extras.get(category, []):
+                label = f"{'|'.join(leads)}{tail}"
+                add(category, PATTERN_KIND, label, leads, tail, True)
+            for word in words:
+                add(category, KEYWORD_KIND, word, (word,), "", False)
+
+        branches = []
+        # lead character -> [(group number, indicator index)]
+        self._lead_groups: Dict[str, List[Tuple[int, int]]] = {}
+        group = 0
+        for lead, alts in alternatives.items():
+            any_alt = "|".join(rest for _, rest in alts)
+            groups = []
+            self._lead_groups[lead] = []
+            for index, rest in alts:
+                group += 1
+                groups.append(f"(?=(?P<i{index}_{group}>{rest})?)")
+                self._lead_groups[lead].append((group, index))
+            branches.append(f"{re.escape(lead)}(?=(?:{any_alt})){''.join(groups)}")
+
+        source = "|".join(branches) or r"(?!)"
+        # Text is lowercased before scanning so every branch starts with a
+        # caseless literal; the IGNORECASE variant covers the rare text whose
+        # lowercase form has a different length (offsets would drift).
+        self.pattern: Pattern[str] = re.compile(source)
+        self._caseless_pattern: Pattern[str] = re.compile(source, re.IGNORECASE)
+
+    def scan(self, text: str) -> IndicatorScan:
+        """Scan *text* once; offsets index into *text*."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            pattern, target = self.pattern, lowered
+        else:
+            pattern, target = self._caseless_pattern, text
+
+        hits: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        lead_groups = self._lead_groups
+        for match in pattern.finditer(target):
+            start = match.start()
+            for group, index in lead_groups[target[start].lower()]:
+                end = match.end(group)
+                if end >= 0:
+                    hits[index].append((start, end))
+        return IndicatorScan(self.indicators, dict(hits))
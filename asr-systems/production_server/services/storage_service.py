@@ -3,11 +3,12 @@ Production Storage Service
 Handles document storage with multi-backend support
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from shared.core.exceptions import StorageError
 
@@ -17,6 +18,14 @@ from shared.core.models import DocumentMetadata
 logger = logging.getLogger(__name__)
 
 
+def _write_file(path: Path, content: bytes) -> None:
+    """Write via a temporary file so readers never see a partial blob."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(content)
+    tmp.replace(path)
+
+
 @dataclass
 class StorageResult:
     """Storage operation result"""
@@ -569,6 +578,84 @@ class ProductionStorageService:
             logger.error(f"❌ S3 deletion failed: {e}")
             return False
 
+    async def put_blob(self, key: str, content: bytes) -> str:
+        """Store an opaque blob (archives, exports) under a relative key.
+
+        Returns the backend path. Raises StorageError on failure, so callers
+        never go on to delete data that was not written.
+        """
+        if not self.initialized:
+            raise StorageError("Storage service not initialized")
+        try:
+            if self.storage_backend == "local":
+                path = self._validate_path(key)
+                await asyncio.to_thread(_write_file, path, content)
+                return str(path)
+            elif self.storage_backend == "s3":
+                assert self.s3_client is not None  # nosec B101
+                s3_key = f"{self.s3_prefix}/{key}"
+                await asyncio.to_thread(
+                    self.s3_client.put_object,
+                    Bucket=self.s3_bucket,
+                    Key=s3_key,
+                    Body=content,
+                )
+                return f"s3://{self.s3_bucket}/{s3_key}"
+            raise StorageError(f"Unsupported storage backend: {self.storage_backend}")
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"Blob storage failed for {key}: {e}")
+
+    async def get_blob(self, key: str) -> Optional[bytes]:
+        """Read a blob stored with put_blob. Returns None if it is missing."""
+        if not self.initialized:
+            raise StorageError("Storage service not initialized")
+        try:
+            if self.storage_backend == "local":
+                path = self._validate_path(key)
+                if not path.exists():
+                    return None
+                return await asyncio.to_thread(path.read_bytes)
+            elif self.storage_backend == "s3":
+                assert self.s3_client is not None  # nosec B101
+                try:
+                    response = await asyncio.to_thread(
+                        self.s3_client.get_object,
+                        Bucket=self.s3_bucket,
+                        Key=f"{self.s3_prefix}/{key}",
+                    )
+                except self.s3_client.exceptions.NoSuchKey:
+                    return None
+                return await asyncio.to_thread(response["Body"].read)
+            raise StorageError(f"Unsupported storage backend: {self.storage_backend}")
+        except StorageError:
+            raise
+        except Exception as e:
+            raise StorageError(f"Blob retrieval failed for {key}: {e}")
+
+    async def delete_blob(self, key: str) -> bool:
+        """Delete a blob stored with put_blob."""
+        try:
+            if self.storage_backend == "local":
+                path = self._validate_path(key)
+                if not path.exists():
+                    return False
+                path.unlink()
+                return True
+            elif self.storage_backend == "s3":
+                assert self.s3_client is not None  # nosec B101
+                await asyncio.to_thread(
+                    self.s3_client.delete_object,
+                    Bucket=self.s3_bucket,
+                    Key=f"{self.s3_prefix}/{key}",
+                )
+                return True
+            return False
+        except Exception as e:
+            logger.error(f"❌ Blob deletion failed for {key}: {e}")
+            return False
+
     async def search_documents(
         self, query: str, limit: int = 20, tenant_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
@@ -639,13 +726,17 @@ class ProductionStorageService:
     async def _get_local_stats(self) -> Dict[str, Any]:
         """Get local storage statistics"""
         try:
-            total_size = 0
-            document_count = 0
 
-            for document_file in self.base_path.glob("documents/**/*"):
-                if document_file.is_file():
-                    total_size += document_file.stat().st_size
-                    document_count += 1
+            def _scan() -> Tuple[int, int]:
+                size = count = 0
+                for document_file in self.base_path.glob("documents/**/*"):
+                    if document_file.is_file():
+                        size += document_file.stat().st_size
+                        count += 1
+                return size, count
+
+            # The walk is proportional to the archive; keep it off the loop
+            total_size, document_count = await asyncio.to_thread(_scan)
 
             return {
                 "backend": "local",
@@ -665,13 +756,17 @@ class ProductionStorageService:
             assert self.s3_client is not None  # nosec B101
             prefix = f"{self.s3_prefix}/tenants/"
             paginator = self.s3_client.get_paginator("list_objects_v2")
-            total_size = 0
-            doc_count = 0
-            for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
-                for obj in page.get("Contents", []):
-                    if "/documents/" in obj["Key"]:
-                        total_size += obj["Size"]
-                        doc_count += 1
+
+            def _scan() -> Tuple[int, int]:
+                size = count = 0
+                for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
+                    for obj in page.get("Contents", []):
+                        if "/documents/" in obj["Key"]:
+                            size += obj["Size"]
+                            count += 1
+                return size, count
+
+            total_size, doc_count = await asyncio.to_thread(_scan)
 
             return {
                 "backend": "s3",
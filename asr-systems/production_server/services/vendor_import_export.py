@@ -1,13 +1,28 @@
 """
 ASR Production Server - Vendor Bulk Import/Export Service
 CSV and JSON import/export with merge/overwrite/append modes.
+Imports are validated in chunks and applied through VendorService.bulk_import
+in a single transaction; file imports are stream-parsed from a spooled upload
+in a worker thread so large files do not block the event loop.
 """
 
+import asyncio
 import csv
 import io
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +41,36 @@ VENDOR_EXPORT_FIELDS = [
     "tenant_id",
 ]
 
+# Columns an import row may set on a vendor (name is the match key)
+VENDOR_IMPORT_FIELDS = [
+    f for f in VENDOR_EXPORT_FIELDS if f not in ("name", "tenant_id")
+]
+
+IMPORT_FILE_FORMATS = ("csv", "ndjson", "json")
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_PAGE_SIZE = 500
+# Validation stops collecting messages past this many errors
+MAX_IMPORT_ERRORS = 1000
+
+
+def iter_chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most *size* items from *rows*."""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class VendorImportExportService:
     """Bulk import/export of vendors in CSV and JSON formats."""
 
-    def __init__(self, vendor_service: Any) -> None:
+    def __init__(
+        self, vendor_service: Any, chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> None:
         self.vendor_service = vendor_service
+        self.chunk_size = chunk_size
 
     # ------------------------------------------------------------------
     # Export
@@ -51,13 +90,57 @@ class VendorImportExportService:
         writer = csv.DictWriter(buf, fieldnames=VENDOR_EXPORT_FIELDS)
         writer.writeheader()
         for v in vendors:
-            row = self._export_row(v)
-            # Flatten list fields for CSV
-            row["aliases"] = "|".join(row.get("aliases") or [])
-            row["tags"] = "|".join(row.get("tags") or [])
-            writer.writerow(row)
+            writer.writerow(self._csv_row(self._export_row(v)))
         return buf.getvalue()
 
+    # ------------------------------------------------------------------
+    # Streaming export
+    # ------------------------------------------------------------------
+
+    async def stream_vendors_csv(
+        self, tenant_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield a CSV export one keyset page at a time."""
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=VENDOR_EXPORT_FIELDS)
+        writer.writeheader()
+        yield buf.getvalue()
+        async for page in self._export_pages(tenant_id):
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(self._csv_row(v) for v in page)
+            yield buf.getvalue()
+
+    async def stream_vendors_ndjson(
+        self, tenant_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield one JSON object per line, one keyset page per chunk."""
+        async for page in self._export_pages(tenant_id):
+            yield "".join(json.dumps(v) + "\n" for v in page)
+
+    async def stream_vendors_json(
+        self, tenant_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield the ``{"success", "format", "data": [...]}`` export envelope
+        incrementally, so JSON exports have the same bounded memory as NDJSON."""
+        yield '{"success": true, "format": "json", "data": ['
+        first = True
+        async for page in self._export_pages(tenant_id):
+            body = ", ".join(json.dumps(v) for v in page)
+            yield body if first else ", " + body
+            first = False
+        yield "]}"
+
+    async def _export_pages(
+        self, tenant_id: Optional[str]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        async for page in self.vendor_service.iter_vendor_pages(
+            tenant_id=tenant_id,
+            columns=VENDOR_EXPORT_FIELDS,
+            page_size=EXPORT_PAGE_SIZE,
+        ):
+            yield page
+
     # ------------------------------------------------------------------
     # Import
     # ------------------------------------------------------------------
@@ -96,24 +179,7 @@ class VendorImportExportService:
         gl_codes: Optional[set] = None,
     ) -> Dict[str, Any]:
         """Import vendors from CSV string."""
-        reader = csv.DictReader(io.StringIO(csv_text))
-        rows: List[Dict[str, Any]] = []
-        for row in reader:
-            # Unflatten list fields
-            if "aliases" in row and isinstance(row["aliases"], str):
-                row["aliases"] = [
-                    a.strip() for a in row["aliases"].split("|") if a.strip()
-                ]
-            if "tags" in row and isinstance(row["tags"], str):
-                row["tags"] = [t.strip() for t in row["tags"].split("|") if t.strip()]
-            if "payment_terms_days" in row and row["payment_terms_days"]:
-                try:
-                    row["payment_terms_days"] = int(row["payment_terms_days"])
-                except ValueError:
-                    row["payment_terms_days"] = None
-            if "active" in row:
-                row["active"] = str(row["active"]).lower() in ("true", "1", "yes")
-            rows.append(row)
+        rows = list(self._iter_csv_rows(io.StringIO(csv_text, newline="")))
 
         errors = self._validate_import_data(rows, gl_codes)
         if errors:
@@ -127,6 +193,47 @@ class VendorImportExportService:
 
         return await self._execute_import(rows, mode, tenant_id)
 
+    async def import_vendors_file(
+        self,
+        fileobj: IO[bytes],
+        file_format: str,
+        mode: str = "merge",
+        tenant_id: str = "default",
+        gl_codes: Optional[set] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Import vendors from a seekable binary file (CSV, NDJSON or JSON).
+
+        CSV and NDJSON are stream-parsed twice — once to validate in chunks
+        and once to apply — so memory stays bounded by the chunk size plus
+        the set of seen names.  A JSON array is loaded whole.  Reading and
+        parsing run in a worker thread.
+        """
+        if file_format not in IMPORT_FILE_FORMATS:
+            raise ValueError(f"Unsupported import format '{file_format}'")
+
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        try:
+            errors = await asyncio.to_thread(
+                self._validate_file, text, file_format, gl_codes
+            )
+            if errors:
+                return {
+                    "success": False,
+                    "created": 0,
+                    "updated": 0,
+                    "skipped": 0,
+                    "errors": errors,
+                }
+
+            rows = await asyncio.to_thread(self._rewind_file_rows, text, file_format)
+            return await self._execute_import(
+                rows, mode, tenant_id, progress, in_thread=True
+            )
+        finally:
+            # Leave the caller's file object open
+            text.detach()
+
     def validate_import_data(
         self,
         data: List[Dict[str, Any]],
@@ -147,14 +254,23 @@ class VendorImportExportService:
     # ------------------------------------------------------------------
 
     def _validate_import_data(
-        self, data: List[Dict[str, Any]], gl_codes: Optional[set] = None
+        self,
+        data: List[Dict[str, Any]],
+        gl_codes: Optional[set] = None,
+        names_seen: Optional[set] = None,
+        start: int = 0,
     ) -> List[str]:
-        """Return a list of validation error strings."""
+        """Return a list of validation error strings.
+
+        *names_seen* and *start* carry duplicate detection and row numbering
+        across chunks when validating a stream.
+        """
         errors: List[str] = []
-        names_seen: set = set()
+        if names_seen is None:
+            names_seen = set()
 
-        for idx, row in enumerate(data):
-            name = row.get("name", "").strip()
+        for idx, row in enumerate(data, start=start):
+            name = (row.get("name") or "").strip()
             if not name:
                 errors.append(f"Row {idx + 1}: missing required field 'name'")
                 continue
@@ -168,85 +284,146 @@ class VendorImportExportService:
 
         return errors
 
+    def _validate_stream(
+        self, rows: Iterable[Dict[str, Any]], gl_codes: Optional[set] = None
+    ) -> List[str]:
+        """Validate *rows* chunk by chunk without materialising them."""
+        errors: List[str] = []
+        names_seen: set = set()
+        start = 0
+        for chunk in iter_chunks(rows, self.chunk_size):
+            errors.extend(
+                self._validate_import_data(chunk, gl_codes, names_seen, start)
+            )
+            start += len(chunk)
+            if len(errors) >= MAX_IMPORT_ERRORS:
+                errors = errors[:MAX_IMPORT_ERRORS]
+                errors.append(f"Validation stopped after {MAX_IMPORT_ERRORS} errors")
+                break
+        return errors
+
+    def _validate_file(
+        self, text: IO[str], file_format: str, gl_codes: Optional[set] = None
+    ) -> List[str]:
+        """Validate an import file, reporting parse failures as errors."""
+        try:
+            return self._validate_stream(
+                self._iter_file_rows(text, file_format), gl_codes
+            )
+        except (UnicodeDecodeError, ValueError, csv.Error) as e:
+            return [f"Unable to parse {file_format} file: {e}"]
+
+    def _rewind_file_rows(
+        self, text: IO[str], file_format: str
+    ) -> Iterator[Dict[str, Any]]:
+        text.seek(0)
+        return self._iter_file_rows(text, file_format)
+
     async def _execute_import(
-        self, data: List[Dict[str, Any]], mode: str, tenant_id: str
+        self,
+        data: Iterable[Dict[str, Any]],
+        mode: str,
+        tenant_id: str,
+        progress: Optional[Callable[[int], None]] = None,
+        in_thread: bool = False,
     ) -> Dict[str, Any]:
-        """Run the actual import logic."""
-        created = 0
-        updated = 0
-        skipped = 0
-
-        if mode == "overwrite":
-            # Delete all tenant vendors first
-            existing = await self.vendor_service.list_vendors(tenant_id=tenant_id)
-            for v in existing:
-                await self.vendor_service.delete_vendor(v["id"], tenant_id=tenant_id)
-
-        # Build name→vendor lookup for merge/append
-        existing_vendors = await self.vendor_service.list_vendors(tenant_id=tenant_id)
-        name_map = {v["name"].lower(): v for v in existing_vendors}
-
-        for row in data:
-            name = row["name"].strip()
-            existing = name_map.get(name.lower())
-
-            if existing and mode == "append":
-                skipped += 1
-                continue
+        """Apply validated rows through VendorService.bulk_import in chunks.
 
-            if existing and mode in ("merge", "overwrite"):
-                # Update existing vendor
-                updates = {
-                    k: v
-                    for k, v in row.items()
-                    if k != "name" and k in VENDOR_EXPORT_FIELDS
-                }
-                await self.vendor_service.update_vendor(
-                    existing["id"], updates, tenant_id=tenant_id
-                )
-                updated += 1
-            else:
-                # Create new vendor
-                await self.vendor_service.create_vendor(
-                    name=name,
-                    tenant_id=tenant_id,
-                    display_name=row.get("display_name", name),
-                    notes=row.get("notes", ""),
-                    tags=row.get("tags", []),
-                )
-                # Apply additional fields via update
-                vendor_list = await self.vendor_service.list_vendors(
-                    tenant_id=tenant_id
-                )
-                new_vendor = next(
-                    (v for v in vendor_list if v["name"].lower() == name.lower()), None
-                )
-                if new_vendor:
-                    extra_updates = {}
-                    for f in (
-                        "default_gl_account",
-                        "aliases",
-                        "payment_terms",
-                        "payment_terms_days",
-                        "vendor_type",
-                    ):
-                        if f in row and row[f]:
-                            extra_updates[f] = row[f]
-                    if extra_updates:
-                        await self.vendor_service.update_vendor(
-                            new_vendor["id"], extra_updates, tenant_id=tenant_id
-                        )
-                created += 1
+        With *in_thread* each chunk is pulled from *data* in a worker
+        thread, for rows parsed lazily from a file.
+        """
+
+        def _report(processed: int) -> None:
+            logger.info(
+                "vendor_import progress tenant_id=%s mode=%s rows=%d",
+                tenant_id,
+                mode,
+                processed,
+            )
+            if progress is not None:
+                progress(processed)
+
+        async def _chunks() -> AsyncIterator[List[Dict[str, Any]]]:
+            batches = iter_chunks(data, self.chunk_size)
+            while True:
+                if in_thread:
+                    chunk = await asyncio.to_thread(next, batches, None)
+                else:
+                    chunk = next(batches, None)
+                if chunk is None:
+                    return
+                yield [self._import_values(row) for row in chunk]
+
+        counts = await self.vendor_service.bulk_import(
+            _chunks(), mode=mode, tenant_id=tenant_id, progress=_report
+        )
 
         return {
             "success": True,
-            "created": created,
-            "updated": updated,
-            "skipped": skipped,
+            "created": counts["created"],
+            "updated": counts["updated"],
+            "skipped": counts["skipped"],
             "errors": [],
         }
 
+    @staticmethod
+    def _import_values(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the importable vendor columns present in *row*."""
+        values = {k: row[k] for k in VENDOR_IMPORT_FIELDS if k in row}
+        values["name"] = row["name"].strip()
+        return values
+
+    def _iter_file_rows(
+        self, text: IO[str], file_format: str
+    ) -> Iterator[Dict[str, Any]]:
+        if file_format == "csv":
+            return self._iter_csv_rows(text)
+        if file_format == "ndjson":
+            return self._iter_ndjson_rows(text)
+        data = json.load(text)
+        if not isinstance(data, list):
+            raise ValueError("JSON import must be an array of vendor objects")
+        return iter(data)
+
+    @staticmethod
+    def _iter_csv_rows(text: IO[str]) -> Iterator[Dict[str, Any]]:
+        """Parse CSV rows lazily, unflattening pipe-delimited list fields."""
+        for row in csv.DictReader(text):
+            if "aliases" in row and isinstance(row["aliases"], str):
+                row["aliases"] = [
+                    a.strip() for a in row["aliases"].split("|") if a.strip()
+                ]
+            if "tags" in row and isinstance(row["tags"], str):
+                row["tags"] = [t.strip() for t in row["tags"].split("|") if t.strip()]
+            if "payment_terms_days" in row:
+                try:
+                    row["payment_terms_days"] = int(row["payment_terms_days"])
+                except (TypeError, ValueError):
+                    row["payment_terms_days"] = None
+            if "active" in row:
+                row["active"] = str(row["active"]).lower() in ("true", "1", "yes")
+            yield row
+
+    @staticmethod
+    def _iter_ndjson_rows(text: IO[str]) -> Iterator[Dict[str, Any]]:
+        for line in text:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError("Each NDJSON line must be a vendor object")
+                yield row
+
     @staticmethod
     def _export_row(vendor: Dict[str, Any]) -> Dict[str, Any]:
         """Extract exportable fields from a vendor dict."""
         return {k: vendor.get(k) for k in VENDOR_EXPORT_FIELDS}
+
+    @staticmethod
+    def _csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten list fields of an export row to pipe-delimited strings."""
+        return {
+            **row,
+            "aliases": "|".join(row.get("aliases") or []),
+            "tags": "|".join(row.get("tags") or []),
+        }
@@ -5,20 +5,87 @@ Follows the AuditTrailService pattern: get_async_session(), select(), session.ad
 """
 
 import logging
+import time
+import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Table,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
 
 try:
     from ..config.database import get_async_session
     from ..models.vendor import VendorRecord
+    from ..models.vendor_stats import VendorStatsDocumentRecord, VendorStatsRecord
 except (ImportError, SystemError):
     from config.database import get_async_session  # type: ignore[no-redef]
     from models.vendor import VendorRecord  # type: ignore[no-redef]
+    from models.vendor_stats import (  # type: ignore[no-redef]
+        VendorStatsDocumentRecord,
+        VendorStatsRecord,
+    )
 
 logger = logging.getLogger(__name__)
 
+# Rollup dimensions maintained by record_document_rollups()
+STATS_BY_MONTH = "month"
+STATS_BY_GL_ACCOUNT = "gl_account"
+STATS_BY_PAYMENT_STATUS = "payment_status"
+
+PAYMENT_STATUS_BUCKETS = ("paid", "unpaid", "partial", "void")
+
+# Vendor version of a tenant with no vendor rows
+EMPTY_VENDOR_VERSION = "0."
+
+
+def normalize_vendor_name(name: str) -> str:
+    """Key used by the match index: case-folded with whitespace collapsed."""
+    return " ".join(name.split()).casefold()
+
+
+def build_match_index(
+    vendors: Iterable[Dict[str, Any]],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Build ``{tenant_id: {normalized name/alias: vendor}}`` from vendor dicts.
+
+    Names take precedence over aliases; among equal keys the first vendor
+    seen wins, so callers should pass vendors in a stable order.
+    """
+    index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    aliases: List[tuple] = []
+    for vendor in vendors:
+        tenant_index = index.setdefault(vendor["tenant_id"], {})
+        tenant_index.setdefault(normalize_vendor_name(vendor["name"]), vendor)
+        for alias in vendor.get("aliases") or []:
+            if isinstance(alias, str) and alias.strip():
+                aliases.append((tenant_index, normalize_vendor_name(alias), vendor))
+    for tenant_index, key, vendor in aliases:
+        tenant_index.setdefault(key, vendor)
+    return index
+
 
 class VendorService:
     """Async vendor CRUD service backed by the database.
@@ -27,16 +94,44 @@ class VendorService:
     so that API endpoints require no changes.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, match_index_recheck_seconds: float = 5.0) -> None:
         self.initialized = False
+        # Per-tenant {normalized name/alias -> vendor dict} for match_vendor()
+        self._match_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # True once every tenant has been loaded; absent tenants then have
+        # no active vendors unless they were invalidated since.
+        self._match_index_complete = False
+        self._stale_tenants: set = set()
+        self._match_index_generation = 0
+        # Vendor version each index was built from (None: every tenant) and
+        # when it was last compared with the database, so writes made by
+        # other workers are picked up within match_index_recheck_seconds
+        self.match_index_recheck_seconds = match_index_recheck_seconds
+        self._index_versions: Dict[Optional[str], str] = {}
+        self._index_checked_at: Dict[Optional[str], float] = {}
+        self._change_listeners: List[Callable[[str], Awaitable[None]]] = []
+
+    async def initialize(self, warm_index: bool = True) -> None:
+        """Warm the vendor match index. Table creation is handled by init_database().
 
-    async def initialize(self) -> None:
-        """Mark service as ready. Table creation is handled by init_database()."""
+        With ``warm_index=False`` the index is left to a later
+        ``warm_match_index()`` call (startup defers it until the server is
+        ready); lookups before then load their tenant lazily.
+        """
+        if warm_index:
+            try:
+                await self.warm_match_index()
+            except Exception:
+                logger.exception("Vendor match index warm-up failed; will load lazily")
         self.initialized = True
-        logger.info("VendorService initialized (database-backed)")
+        logger.info(
+            "VendorService initialized (database-backed, %d tenants indexed)",
+            len(self._match_index),
+        )
 
     async def cleanup(self) -> None:
-        """No-op — database connections are managed by the engine."""
+        """Drop the match index — database connections are managed by the engine."""
+        self.invalidate_match_index()
         self.initialized = False
         logger.info("VendorService cleaned up")
 
@@ -60,6 +155,56 @@ class VendorService:
             logger.exception("Failed to list vendors")
             return []
 
+    async def iter_vendor_pages(
+        self,
+        tenant_id: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield vendors in pages ordered by ``(name, id)`` using keyset pagination.
+
+        Each page is fetched in its own short-lived session with a
+        ``WHERE (name, id) > (last_name, last_id)`` predicate served by the
+        ``(tenant_id, name)`` index, so memory and per-page cost stay flat
+        however many vendors the tenant has.  When *columns* is given only
+        those columns are selected and each vendor is a plain dict of them.
+        """
+        wanted = list(columns) if columns else None
+        selected = (
+            [getattr(VendorRecord, c) for c in dict.fromkeys(["id", "name", *wanted])]
+            if wanted
+            else [VendorRecord]
+        )
+        last: Optional[tuple] = None
+        while True:
+            stmt = select(*selected)
+            if tenant_id:
+                stmt = stmt.where(VendorRecord.tenant_id == tenant_id)
+            if last is not None:
+                stmt = stmt.where(
+                    or_(
+                        VendorRecord.name > last[0],
+                        and_(VendorRecord.name == last[0], VendorRecord.id > last[1]),
+                    )
+                )
+            stmt = stmt.order_by(VendorRecord.name, VendorRecord.id).limit(page_size)
+            async with get_async_session() as session:
+                result = await session.execute(stmt)
+                if wanted:
+                    rows = [dict(r._mapping) for r in result.all()]
+                    page = [{c: r[c] for c in wanted} for r in rows]
+                    tail = rows[-1] if rows else None
+                    last = (tail["name"], tail["id"]) if tail else last
+                else:
+                    records = result.scalars().all()
+                    page = [self._row_to_dict(r) for r in records]
+                    last = (records[-1].name, records[-1].id) if records else last
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+
     async def get_vendor(
         self, vendor_id: str, tenant_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
@@ -103,6 +248,7 @@ class VendorService:
                 session.add(row)
                 await session.commit()
                 await session.refresh(row)
+                await self._vendors_changed(tenant_id)
                 logger.info(
                     "vendor_crud action=create vendor_id=%s name=%s tenant_id=%s",
                     row.id,
@@ -155,6 +301,7 @@ class VendorService:
 
                 await session.commit()
                 await session.refresh(row)
+                await self._vendors_changed(row.tenant_id)
                 logger.info(
                     "vendor_crud action=update vendor_id=%s tenant_id=%s fields=%s",
                     vendor_id,
@@ -185,7 +332,18 @@ class VendorService:
                     return False
                 tenant_id = row.tenant_id
                 await session.delete(row)
+                await session.execute(
+                    delete(VendorStatsRecord).where(
+                        VendorStatsRecord.vendor_id == vendor_id
+                    )
+                )
+                await session.execute(
+                    delete(VendorStatsDocumentRecord).where(
+                        VendorStatsDocumentRecord.vendor_id == vendor_id
+                    )
+                )
                 await session.commit()
+                await self._vendors_changed(tenant_id)
                 logger.info(
                     "vendor_crud action=delete vendor_id=%s tenant_id=%s",
                     vendor_id,
@@ -199,34 +357,429 @@ class VendorService:
     async def get_vendor_stats(
         self, vendor_id: str, tenant_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Return stats for a vendor, or ``None`` if not found."""
+        """Return stats for a vendor, or ``None`` if not found.
+
+        Reads the rollup buckets maintained by record_document_rollups(),
+        so the cost is a primary-key lookup plus one indexed range scan.
+        """
         vendor = await self.get_vendor(vendor_id, tenant_id=tenant_id)
         if vendor is None:
             return None
 
+        buckets: Dict[str, List[VendorStatsRecord]] = {}
+        try:
+            async with get_async_session() as session:
+                result = await session.execute(
+                    select(VendorStatsRecord)
+                    .where(VendorStatsRecord.vendor_id == vendor_id)
+                    .order_by(VendorStatsRecord.dimension, VendorStatsRecord.bucket)
+                )
+                for row in result.scalars().all():
+                    buckets.setdefault(row.dimension, []).append(row)
+        except Exception:
+            logger.exception("Failed to load stats for vendor %s", vendor_id)
+
+        months = buckets.get(STATS_BY_MONTH, [])
+        gl_accounts = sorted(
+            buckets.get(STATS_BY_GL_ACCOUNT, []),
+            key=lambda r: (-r.document_count, r.bucket),
+        )
+        status_distribution = {status: 0 for status in PAYMENT_STATUS_BUCKETS}
+        for row in buckets.get(STATS_BY_PAYMENT_STATUS, []):
+            status_distribution[row.bucket] = row.document_count
+
         return {
             "documents": {
                 "total": vendor["document_count"],
-                "by_month": [],
-                "by_gl_account": [],
+                "by_month": [
+                    {
+                        "month": r.bucket,
+                        "count": r.document_count,
+                        "amount": r.total_amount,
+                    }
+                    for r in months
+                ],
+                "by_gl_account": [
+                    {
+                        "code": r.bucket,
+                        "name": r.label or r.bucket,
+                        "count": r.document_count,
+                        "amount": r.total_amount,
+                        "accuracy": 0.0,
+                    }
+                    for r in gl_accounts
+                ],
             },
             "payments": {
                 "accuracy": 0.0,
                 "detection_methods": [],
-                "status_distribution": {
-                    "paid": 0,
-                    "unpaid": 0,
-                    "partial": 0,
-                    "void": 0,
-                },
+                "status_distribution": status_distribution,
             },
             "trends": {
-                "document_volume": [],
-                "amount_processed": [],
+                "document_volume": [
+                    {"date": r.bucket, "count": r.document_count} for r in months
+                ],
+                "amount_processed": [
+                    {"date": r.bucket, "amount": r.total_amount} for r in months
+                ],
                 "accuracy_over_time": [],
             },
         }
 
+    async def record_document_rollups(self, documents: Sequence[Dict[str, Any]]) -> int:
+        """Fold processed documents into the per-vendor rollups.
+
+        Each document dict carries ``vendor_id``, ``tenant_id`` and optionally
+        ``document_id``, ``amount``, ``document_date``, ``gl_account_code``,
+        ``gl_account_name`` and ``payment_status``.  Documents are
+        pre-aggregated in memory, then written in one transaction as a single
+        batched upsert into ``vendor_stats`` plus a single batched increment
+        of the vendor totals.
+
+        A document with a ``document_id`` is counted once: what it
+        contributed last time is subtracted first, so reprocessing moves it
+        between buckets instead of counting it again.
+
+        Returns the number of bucket rows touched.
+        """
+        if not documents:
+            return 0
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        keyed: Dict[str, Dict[str, Any]] = {}
+        contributions: List[Tuple[Dict[str, Any], int]] = []
+        for doc in documents:
+            contribution = self._contribution(doc, now)
+            if doc.get("document_id"):
+                keyed[doc["document_id"]] = contribution
+            else:
+                contributions.append((contribution, 1))
+        contributions.extend((c, 1) for c in keyed.values())
+
+        async with get_async_session() as session:
+            previous = await self._pop_contributions(session, list(keyed))
+            touched = await self._apply_contributions(
+                session, [(c, -1) for c in previous] + contributions, now
+            )
+            session.add_all(
+                VendorStatsDocumentRecord(document_id=document_id, **contribution)
+                for document_id, contribution in keyed.items()
+            )
+            await session.commit()
+        return touched
+
+    async def forget_document_rollups(
+        self, document_id: str, tenant_id: Optional[str] = None
+    ) -> bool:
+        """Take a deleted document back out of its vendor's rollups.
+
+        Returns ``True`` if the document had been rolled up.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        async with get_async_session() as session:
+            previous = await self._pop_contributions(session, [document_id], tenant_id)
+            if not previous:
+                return False
+            await self._apply_contributions(session, [(c, -1) for c in previous], now)
+            await session.commit()
+        return True
+
+    @staticmethod
+    def _contribution(doc: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """What one document adds to its vendor's rollups, normalized."""
+        when = doc.get("document_date") or now
+        if isinstance(when, datetime) and when.tzinfo is not None:
+            when = when.astimezone(timezone.utc).replace(tzinfo=None)
+        status = doc.get("payment_status")
+        return {
+            "vendor_id": doc["vendor_id"],
+            "tenant_id": doc["tenant_id"],
+            "amount": float(doc.get("amount") or 0.0),
+            "document_date": when,
+            "gl_account_code": (
+                str(doc["gl_account_code"]) if doc.get("gl_account_code") else None
+            ),
+            "gl_account_name": doc.get("gl_account_name"),
+            "payment_status": str(getattr(status, "value", status)) if status else None,
+        }
+
+    @staticmethod
+    async def _pop_contributions(
+        session: Any, document_ids: List[str], tenant_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Remove and return the recorded contributions of *document_ids*."""
+        if not document_ids:
+            return []
+        # Core rows, not ORM instances: the replacements reuse these keys
+        table = cast(Table, VendorStatsDocumentRecord.__table__)
+        where: List[ColumnElement[bool]] = [table.c.document_id.in_(document_ids)]
+        if tenant_id is not None:
+            where.append(table.c.tenant_id == tenant_id)
+        result = await session.execute(select(table).where(*where))
+        previous = [dict(row._mapping) for row in result]
+        if previous:
+            await session.execute(delete(table).where(*where))
+        for contribution in previous:
+            del contribution["document_id"]
+        return previous
+
+    async def _apply_contributions(
+        self,
+        session: Any,
+        contributions: List[Tuple[Dict[str, Any], int]],
+        now: datetime,
+    ) -> int:
+        """Add (sign 1) or subtract (sign -1) contributions; returns buckets touched."""
+        buckets: Dict[tuple, Dict[str, Any]] = {}
+        totals: Dict[str, Dict[str, Any]] = {}
+
+        for doc, sign in contributions:
+            vendor_id = doc["vendor_id"]
+            when = doc["document_date"]
+            keys = [(STATS_BY_MONTH, when.strftime("%Y-%m"), None)]
+            if doc["gl_account_code"]:
+                keys.append(
+                    (
+                        STATS_BY_GL_ACCOUNT,
+                        doc["gl_account_code"],
+                        doc["gl_account_name"],
+                    )
+                )
+            if doc["payment_status"]:
+                keys.append((STATS_BY_PAYMENT_STATUS, doc["payment_status"], None))
+
+            for dimension, bucket, label in keys:
+                entry = buckets.setdefault(
+                    (vendor_id, dimension, bucket),
+                    {
+                        "vendor_id": vendor_id,
+                        "dimension": dimension,
+                        "bucket": bucket,
+                        "tenant_id": doc["tenant_id"],
+                        "label": None,
+                        "document_count": 0,
+                        "total_amount": 0.0,
+                        "last_document_at": None,
+                        "updated_at": now,
+                    },
+                )
+                entry["document_count"] += sign
+                entry["total_amount"] += sign * doc["amount"]
+                if sign > 0:
+                    latest = entry["last_document_at"]
+                    entry["last_document_at"] = max(latest, when) if latest else when
+                    entry["label"] = label or entry["label"]
+
+            total = totals.setdefault(
+                vendor_id, {"b_id": vendor_id, "b_count": 0, "b_amount": 0.0}
+            )
+            total["b_count"] += sign
+            total["b_amount"] += sign * doc["amount"]
+
+        if not buckets:
+            return 0
+        await self._upsert_stats(session, list(buckets.values()))
+        if any(sign < 0 for _, sign in contributions):
+            # Buckets emptied by subtraction would show up as zero rows
+            await session.execute(
+                delete(VendorStatsRecord).where(
+                    VendorStatsRecord.vendor_id.in_(list(totals)),
+                    VendorStatsRecord.document_count <= 0,
+                )
+            )
+        vendors = cast(Table, VendorRecord.__table__)
+        await session.execute(
+            update(vendors)
+            .where(vendors.c.id == bindparam("b_id"))
+            .values(
+                document_count=vendors.c.document_count + bindparam("b_count"),
+                total_amount_processed=vendors.c.total_amount_processed
+                + bindparam("b_amount"),
+                # Rollups are not edits; keep updated_at unchanged
+                updated_at=vendors.c.updated_at,
+            ),
+            list(totals.values()),
+        )
+        return len(buckets)
+
+    @staticmethod
+    async def _upsert_stats(session: Any, rows: List[Dict[str, Any]]) -> None:
+        """Increment rollup buckets with INSERT .. ON CONFLICT DO UPDATE."""
+        dialect = session.bind.dialect.name if session.bind is not None else ""
+        dialect_insert: Optional[Callable[[Table], Any]] = None
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            dialect_insert = pg_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            dialect_insert = sqlite_insert
+
+        table = cast(Table, VendorStatsRecord.__table__)
+        if dialect_insert is not None:
+            stmt = dialect_insert(table)
+            incoming = stmt.excluded
+            # SQLite's scalar max() returns NULL if any argument is NULL, and
+            # subtractions carry no last_document_at
+            newest = (
+                func.max(
+                    func.coalesce(table.c.last_document_at, incoming.last_document_at),
+                    func.coalesce(incoming.last_document_at, table.c.last_document_at),
+                )
+                if dialect == "sqlite"
+                else func.greatest(table.c.last_document_at, incoming.last_document_at)
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.vendor_id, table.c.dimension, table.c.bucket],
+                set_={
+                    "document_count": table.c.document_count + incoming.document_count,
+                    "total_amount": table.c.total_amount + incoming.total_amount,
+                    "last_document_at": newest,
+                    "label": func.coalesce(incoming.label, table.c.label),
+                    "updated_at": incoming.updated_at,
+                },
+            )
+            await session.execute(stmt, rows)
+            return
+
+        # Portable fallback: read the touched buckets, then insert or update
+        for row in rows:
+            existing = await session.get(
+                VendorStatsRecord, (row["vendor_id"], row["dimension"], row["bucket"])
+            )
+            if existing is None:
+                session.add(VendorStatsRecord(**row))
+                continue
+            existing.document_count += row["document_count"]
+            existing.total_amount += row["total_amount"]
+            if row["last_document_at"] is not None and (
+                existing.last_document_at is None
+                or row["last_document_at"] > existing.last_document_at
+            ):
+                existing.last_document_at = row["last_document_at"]
+            existing.label = row["label"] or existing.label
+            existing.updated_at = row["updated_at"]
+
+    # ------------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------------
+
+    async def bulk_import(
+        self,
+        chunks: AsyncIterable[List[Dict[str, Any]]],
+        mode: str,
+        tenant_id: str,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[str, int]:
+        """Apply pre-validated import rows in a single transaction.
+
+        Existing vendors are resolved once with a single keyed query on
+        ``(tenant_id, lower(name))``; each chunk is then written with one
+        batched INSERT and one batched UPDATE.  Rows are dicts of vendor
+        columns and must include ``name``.  *progress* is called with the
+        running row count after every chunk.  Overwrite mode also drops the
+        tenant's vendor statistics and their per-document ledger.
+
+        Returns ``{"created": n, "updated": n, "skipped": n}``.  Nothing is
+        written if any chunk fails.
+        """
+        created = updated = skipped = processed = 0
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        try:
+            async with get_async_session() as session:
+                existing: Dict[str, str] = {}
+                if mode == "overwrite":
+                    await session.execute(
+                        delete(VendorRecord).where(VendorRecord.tenant_id == tenant_id)
+                    )
+                    await session.execute(
+                        delete(VendorStatsRecord).where(
+                            VendorStatsRecord.tenant_id == tenant_id
+                        )
+                    )
+                    await session.execute(
+                        delete(VendorStatsDocumentRecord).where(
+                            VendorStatsDocumentRecord.tenant_id == tenant_id
+                        )
+                    )
+                else:
+                    result = await session.execute(
+                        select(VendorRecord.id, VendorRecord.name).where(
+                            VendorRecord.tenant_id == tenant_id
+                        )
+                    )
+                    existing = {name.lower(): vid for vid, name in result.all()}
+
+                async for chunk in chunks:
+                    inserts: List[Dict[str, Any]] = []
+                    updates: List[Dict[str, Any]] = []
+                    for row in chunk:
+                        name = row["name"].strip()
+                        vendor_id = existing.get(name.lower())
+                        if vendor_id is None:
+                            values = self._new_vendor_values(row, name, tenant_id, now)
+                            existing[name.lower()] = values["id"]
+                            inserts.append(values)
+                        elif mode == "append":
+                            skipped += 1
+                        else:
+                            values = {k: v for k, v in row.items() if k != "name"}
+                            updates.append(
+                                {**values, "id": vendor_id, "updated_at": now}
+                            )
+                    if inserts:
+                        await session.execute(insert(VendorRecord), inserts)
+                    if updates:
+                        await session.execute(update(VendorRecord), updates)
+                    created += len(inserts)
+                    updated += len(updates)
+                    processed += len(chunk)
+                    if progress is not None:
+                        progress(processed)
+
+                await session.commit()
+        except Exception:
+            logger.exception("Bulk vendor import failed for tenant %s", tenant_id)
+            raise
+        finally:
+            await self._vendors_changed(tenant_id)
+
+        logger.info(
+            "vendor_crud action=bulk_import tenant_id=%s mode=%s created=%d "
+            "updated=%d skipped=%d",
+            tenant_id,
+            mode,
+            created,
+            updated,
+            skipped,
+        )
+        return {"created": created, "updated": updated, "skipped": skipped}
+
+    @staticmethod
+    def _new_vendor_values(
+        row: Dict[str, Any], name: str, tenant_id: str, now: datetime
+    ) -> Dict[str, Any]:
+        """Column values for a vendor inserted by bulk_import()."""
+        return {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "display_name": row.get("display_name") or name,
+            "contact_info": row.get("contact_info") or {},
+            "default_gl_account": row.get("default_gl_account") or None,
+            "aliases": row.get("aliases") or [],
+            "payment_terms": row.get("payment_terms") or None,
+            "payment_terms_days": row.get("payment_terms_days") or None,
+            "vendor_type": row.get("vendor_type") or "supplier",
+            "document_count": 0,
+            "total_amount_processed": 0.0,
+            "tenant_id": tenant_id,
+            "notes": row.get("notes") or "",
+            "tags": row.get("tags") or [],
+            "active": row.get("active", True) is not False,
+            "created_at": now,
+            "updated_at": now,
+        }
+
     # ------------------------------------------------------------------
     # Vendor matching (for GL classification integration)
     # ------------------------------------------------------------------
@@ -234,33 +787,195 @@ class VendorService:
     async def match_vendor(
         self, name: str, tenant_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Find a vendor by case-insensitive name or alias match.
+        """Find an active vendor by case-insensitive name or alias match.
 
-        Returns the first matching vendor dict, or ``None``.
+        Served from the in-memory match index, so the lookup is a single
+        dict probe per tenant.  Name matches win over alias matches.
+        Returns a copy of the vendor dict, or ``None``.
         """
         if not name:
             return None
-        name_lower = name.lower()
+        key = normalize_vendor_name(name)
         try:
-            async with get_async_session() as session:
-                stmt = select(VendorRecord).where(VendorRecord.active.is_(True))
-                if tenant_id:
-                    stmt = stmt.where(VendorRecord.tenant_id == tenant_id)
-                result = await session.execute(stmt)
-                for row in result.scalars().all():
-                    # Exact name match (case-insensitive)
-                    if row.name.lower() == name_lower:
-                        return self._row_to_dict(row)
-                    # Alias match (case-insensitive)
-                    aliases = row.aliases or []
-                    for alias in aliases:
-                        if isinstance(alias, str) and alias.lower() == name_lower:
-                            return self._row_to_dict(row)
-                return None
+            if tenant_id:
+                tenant_index = await self._tenant_match_index(tenant_id)
+                vendor = tenant_index.get(key)
+            else:
+                if (
+                    not self._match_index_complete
+                    or self._stale_tenants
+                    or await self._index_outdated(None)
+                ):
+                    await self.warm_match_index()
+                vendor = next(
+                    (
+                        idx[key]
+                        for idx in list(self._match_index.values())
+                        if key in idx
+                    ),
+                    None,
+                )
+            return dict(vendor) if vendor is not None else None
         except Exception:
             logger.exception("Failed to match vendor '%s'", name)
             return None
 
+    async def warm_match_index(self) -> int:
+        """(Re)build the match index for every tenant with one query.
+
+        Returns the number of active vendors indexed.
+        """
+        generation = self._match_index_generation
+        # Versions are read first, so a write racing the load only causes
+        # an extra reload later
+        versions = await self._load_vendor_versions()
+        vendors = await self._load_active_vendors()
+        if generation != self._match_index_generation:
+            # A write landed while loading; leave it to the next lookup.
+            return len(vendors)
+        self._match_index = build_match_index(vendors)
+        self._match_index_complete = True
+        self._stale_tenants.clear()
+        now = time.monotonic()
+        self._index_versions = dict(versions)
+        self._index_checked_at = {key: now for key in versions}
+        return len(vendors)
+
+    def invalidate_match_index(self, tenant_id: Optional[str] = None) -> None:
+        """Drop the cached match index for *tenant_id* (or every tenant).
+
+        Called after vendor writes; the next lookup reloads the tenant.
+        """
+        self._match_index_generation += 1
+        if tenant_id is None:
+            self._match_index = {}
+            self._match_index_complete = False
+            self._stale_tenants.clear()
+            self._index_versions.clear()
+            self._index_checked_at.clear()
+            return
+        self._match_index.pop(tenant_id, None)
+        self._stale_tenants.add(tenant_id)
+
+    async def get_vendor_version(self, tenant_id: Optional[str]) -> str:
+        """Revision of *tenant_id*'s vendors (every tenant when ``None``).
+
+        Read from the database so it survives restarts and agrees across
+        workers: creates, edits and imports move the latest ``updated_at``,
+        deletes lower the row count.
+        """
+        async with get_async_session() as session:
+            stmt = select(
+                func.count(VendorRecord.id), func.max(VendorRecord.updated_at)
+            )
+            if tenant_id:
+                stmt = stmt.where(VendorRecord.tenant_id == tenant_id)
+            count, latest = (await session.execute(stmt)).one()
+        return self._vendor_version(count, latest)
+
+    def add_change_listener(self, listener: Callable[[str], Awaitable[None]]) -> None:
+        """Call ``await listener(tenant_id)`` after each vendor write."""
+        self._change_listeners.append(listener)
+
+    async def _vendors_changed(self, tenant_id: str) -> None:
+        self.invalidate_match_index(tenant_id)
+        for listener in self._change_listeners:
+            try:
+                await listener(tenant_id)
+            except Exception:
+                logger.warning("Vendor change listener failed", exc_info=True)
+
+    def get_match_index_statistics(self) -> Dict[str, Any]:
+        """Return size information about the vendor match index."""
+        return {
+            "tenants": len(self._match_index),
+            "keys": sum(len(idx) for idx in self._match_index.values()),
+            "complete": self._match_index_complete,
+            "stale_tenants": len(self._stale_tenants),
+        }
+
+    async def _tenant_match_index(self, tenant_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return the index for one tenant, loading it on first use or after a write."""
+        tenant_index = self._match_index.get(tenant_id)
+        cached = tenant_index is not None or (
+            self._match_index_complete and tenant_id not in self._stale_tenants
+        )
+        if cached and not await self._index_outdated(tenant_id):
+            return tenant_index or {}
+
+        generation = self._match_index_generation
+        version = await self.get_vendor_version(tenant_id)
+        vendors = await self._load_active_vendors(tenant_id)
+        tenant_index = build_match_index(vendors).get(tenant_id, {})
+        if generation == self._match_index_generation:
+            self._match_index[tenant_id] = tenant_index
+            self._stale_tenants.discard(tenant_id)
+            self._index_versions[tenant_id] = version
+            self._index_checked_at[tenant_id] = time.monotonic()
+        return tenant_index
+
+    async def _index_outdated(self, tenant_id: Optional[str]) -> bool:
+        """Whether another worker changed the vendors behind a cached index.
+
+        The persisted version is compared at most once per
+        ``match_index_recheck_seconds``; if it cannot be read the cached
+        index keeps serving.
+        """
+        now = time.monotonic()
+        checked_at = self._index_checked_at.get(tenant_id)
+        if (
+            checked_at is not None
+            and now - checked_at < self.match_index_recheck_seconds
+        ):
+            return False
+        try:
+            version = await self.get_vendor_version(tenant_id)
+        except Exception:
+            logger.warning("Vendor version check failed", exc_info=True)
+            return False
+        expected = self._index_versions.get(tenant_id)
+        if expected is None and tenant_id is not None and self._match_index_complete:
+            # Tenants absent from a full warm-up had no vendor rows
+            expected = EMPTY_VENDOR_VERSION
+        if version != expected:
+            return True
+        self._index_checked_at[tenant_id] = now
+        return False
+
+    async def _load_vendor_versions(self) -> Dict[Optional[str], str]:
+        """Vendor version of every tenant with vendor rows, plus ``None`` for all."""
+        async with get_async_session() as session:
+            count = func.count(VendorRecord.id)
+            latest = func.max(VendorRecord.updated_at)
+            result = await session.execute(
+                select(VendorRecord.tenant_id, count, latest).group_by(
+                    VendorRecord.tenant_id
+                )
+            )
+            rows = result.all()
+            total, overall = (await session.execute(select(count, latest))).one()
+        versions: Dict[Optional[str], str] = {
+            tenant_id: self._vendor_version(n, updated)
+            for tenant_id, n, updated in rows
+        }
+        versions[None] = self._vendor_version(total, overall)
+        return versions
+
+    @staticmethod
+    def _vendor_version(count: int, latest: Optional[datetime]) -> str:
+        return f"{count}.{latest.isoformat() if latest else ''}"
+
+    async def _load_active_vendors(
+        self, tenant_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        async with get_async_session() as session:
+            stmt = select(VendorRecord).where(VendorRecord.active.is_(True))
+            if tenant_id:
+                stmt = stmt.where(VendorRecord.tenant_id == tenant_id)
+            stmt = stmt.order_by(VendorRecord.created_at, VendorRecord.id)
+            result = await session.execute(stmt)
+            return [self._row_to_dict(r) for r in result.scalars().all()]
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -279,7 +994,11 @@ class VendorService:
             "vendor_type": row.vendor_type,
             "document_count": row.document_count,
             "total_amount_processed": row.total_amount_processed,
-            "average_amount": 0.0,
+            "average_amount": (
+                row.total_amount_processed / row.document_count
+                if row.document_count
+                else 0.0
+            ),
             "last_document_date": None,
             "common_gl_accounts": [],
             "payment_accuracy": 0.0,
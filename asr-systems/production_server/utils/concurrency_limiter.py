@@ -0,0 +1,221 @@
+"""
+ASR Production Server - Adaptive Concurrency Limiter
+AIMD (additive increase, multiplicative decrease) limit on concurrent calls
+to a rate-limited upstream, with a priority queue for waiters.
+
+The limit grows by about one slot per window of successful calls and is
+halved when the upstream pushes back (429/529) or a call exceeds the
+latency target; a Retry-After pause holds back new calls entirely. Waiters
+are granted strictly by priority, then arrival order, so interactive work
+overtakes queued background reprocessing.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Priority of upstream calls made by the current task; asyncio tasks
+# inherit it from the task that created them
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def background_priority() -> Iterator[None]:
+    """Run the enclosed calls (and tasks they spawn) at BACKGROUND priority."""
+    token = request_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class LimiterSlot:
+    """One granted call; the caller reports upstream pushback on it."""
+
+    def __init__(self, priority: int, wait_seconds: float = 0.0) -> None:
+        self.priority = priority
+        self.wait_seconds = wait_seconds
+        self.overloaded = False
+        self.retry_after: Optional[float] = None
+
+    def mark_overloaded(self, retry_after: Optional[float] = None) -> None:
+        self.overloaded = True
+        self.retry_after = retry_after
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit with prioritised waiters.
+
+    Args:
+        initial_limit: Starting number of concurrent calls.
+        min_limit / max_limit: Bounds for the adaptive limit.
+        latency_target: Calls slower than this (seconds) count as congestion;
+            None adapts on pushback only.
+        backoff_ratio: Multiplier applied to the limit on congestion.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_target: Optional[float] = None,
+        backoff_ratio: float = 0.5,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._resume_handle: Optional[asyncio.TimerHandle] = None
+        # Completions since the last decrease; one burst of 429s from calls
+        # already in flight only halves the limit once
+        self._since_decrease = self.limit
+        self._stats: Dict[str, Any] = {
+            "granted": 0,
+            "queued": 0,
+            "overloads": 0,
+            "slow_calls": 0,
+            "decreases": 0,
+            "wait_seconds": 0.0,
+        }
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Optional[int] = None):
+        """Hold one concurrency slot for the duration of the block.
+
+        Yields a LimiterSlot; call ``mark_overloaded`` on it when the
+        upstream rejects the call for capacity reasons.
+        """
+        if priority is None:
+            priority = request_priority.get()
+        slot = LimiterSlot(priority, await self._acquire(priority))
+        start_time = time.monotonic()
+        try:
+            yield slot
+        finally:
+            self._release(slot, time.monotonic() - start_time)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        paused = max(0.0, self._paused_until - time.monotonic())
+        return {
+            **self._stats,
+            "wait_seconds": round(self._stats["wait_seconds"], 3),
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "paused_seconds": round(paused, 3),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _acquire(self, priority: int) -> float:
+        """Wait for a slot; returns the seconds spent queued."""
+        if not self._waiters and self._can_grant():
+            self._in_flight += 1
+            self._stats["granted"] += 1
+            return 0.0
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._stats["queued"] += 1
+        self._schedule_resume()
+        start_time = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot on
+                self._in_flight -= 1
+                self._grant()
+            raise
+        waited = time.monotonic() - start_time
+        self._stats["wait_seconds"] += waited
+        return waited
+
+    def _can_grant(self) -> bool:
+        return self._in_flight < self.limit and time.monotonic() >= self._paused_until
+
+    def _grant(self) -> None:
+        while self._waiters and self._can_grant():
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._in_flight += 1
+            self._stats["granted"] += 1
+            future.set_result(None)
+        self._schedule_resume()
+
+    def _schedule_resume(self) -> None:
+        """Wake waiters when a Retry-After pause ends."""
+        delay = self._paused_until - time.monotonic()
+        if delay <= 0 or not self._waiters or self._resume_handle is not None:
+            return
+
+        def resume() -> None:
+            self._resume_handle = None
+            self._grant()
+
+        self._resume_handle = asyncio.get_running_loop().call_later(delay, resume)
+
+    def _release(self, slot: LimiterSlot, latency: float) -> None:
+        self._in_flight -= 1
+        self._since_decrease += 1
+        if slot.overloaded:
+            self._stats["overloads"] += 1
+            if slot.retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + slot.retry_after
+                )
+            self._decrease("overload")
+        elif self.latency_target is not None and latency > self.latency_target:
+            self._stats["slow_calls"] += 1
+            self._decrease("latency")
+        else:
+            # +1 per `limit` successful completions
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+        self._grant()
+
+    def _decrease(self, reason: str) -> None:
+        if self._since_decrease < self.limit:
+            return
+        self._since_decrease = 0
+        previous = self.limit
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self._stats["decreases"] += 1
+        logger.warning(
+            "concurrency_limit_decreased reason=%s limit=%d->%d",
+            reason,
+            previous,
+            self.limit,
+        )
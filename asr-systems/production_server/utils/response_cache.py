@@ -0,0 +1,165 @@
+"""
+ASR Production Server - Single-Flight Response Cache
+In-memory TTL cache for expensive, read-only endpoint results.
+
+Concurrent requests for the same key share one computation instead of each
+recomputing it. Entries are fresh for ``ttl_seconds``; for a further
+``stale_seconds`` the stale value is still returned immediately while one
+background refresh replaces it. Errors are never cached: they reach every
+caller waiting on that computation, and a failed background refresh keeps
+serving the stale value until it ages out.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lookup outcomes, also the metric label values
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+COALESCED = "coalesced"
+
+
+def _record_lookup(cache: str, outcome: str) -> None:
+    try:
+        from services.metrics_service import record_response_cache_lookup
+    except ImportError:
+        try:
+            from ..services.metrics_service import record_response_cache_lookup
+        except ImportError:
+            return
+    record_response_cache_lookup(cache, outcome)
+
+
+class SingleFlightCache:
+    """Per-key TTL cache with request coalescing and stale-while-revalidate."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float = 30.0,
+        stale_seconds: float = 300.0,
+        max_entries: int = 1000,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = max(0.0, stale_seconds)
+        self.max_entries = max(1, max_entries)
+        self.enabled = enabled
+        self._clock = clock
+
+        # key -> (value, fresh until)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._counts: Dict[str, int] = {HIT: 0, STALE: 0, MISS: 0, COALESCED: 0}
+        self._refresh_failures: int = 0
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for ``key``, computing it at most once."""
+        if not self.enabled:
+            return await compute()
+
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if now < fresh_until:
+                self._entries.move_to_end(key)
+                self._count(HIT)
+                return value
+            if now < fresh_until + self.stale_seconds:
+                self._entries.move_to_end(key)
+                self._count(STALE)
+                if key not in self._inflight:
+                    refresh = self._start(key, compute)
+                    self._background.add(refresh)
+                    refresh.add_done_callback(self._background_done)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count(COALESCED)
+        else:
+            self._count(MISS)
+            task = self._start(key, compute)
+        # A cancelled caller must not cancel the computation others await
+        return await asyncio.shield(task)
+
+    def _start(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._compute(key, compute))
+        self._inflight[key] = task
+        return task
+
+    async def _compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        try:
+            value = await compute()
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._refresh_failures += 1
+            logger.warning("%s cache refresh failed: %s", self.name, error)
+
+    def _count(self, outcome: str) -> None:
+        self._counts[outcome] += 1
+        _record_lookup(self.name, outcome)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Drop entries whose key matches ``predicate``, or all of them."""
+        keys = [k for k in self._entries if predicate is None or predicate(k)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    async def cleanup(self) -> None:
+        """Cancel background refreshes and drop all entries."""
+        tasks = list(self._background) + list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._background.clear()
+        self._inflight.clear()
+        self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = sum(self._counts.values())
+        served = self._counts[HIT] + self._counts[STALE] + self._counts[COALESCED]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self._counts[HIT],
+            "stale_hits": self._counts[STALE],
+            "misses": self._counts[MISS],
+            "coalesced": self._counts[COALESCED],
+            "in_flight": len(self._inflight),
+            "refresh_failures": self._refresh_failures,
+            "hit_rate": served / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,169 @@
+"""
+ASR Production Server - Startup Plan
+Dependency-aware service initialization.
+
+Steps declare the steps they need (``after``); each starts as soon as
+those have finished, so independent services initialize concurrently and
+readiness waits only on the longest dependency chain. Steps may only
+depend on steps added before them, which rules out cycles. Warmups that
+the server can serve without (index builds, cache housekeeping, job
+resumption) are registered with ``defer`` and run in the background once
+the server is ready. Every step is timed for ``get_timings``.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+StepFunc = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _Step:
+    name: str
+    func: StepFunc
+    after: Tuple[str, ...] = ()
+    started_at: Optional[float] = None  # seconds since the plan started
+    duration: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def finished_at(self) -> float:
+        return (self.started_at or 0.0) + (self.duration or 0.0)
+
+
+class StartupPlan:
+    """Runs startup steps in dependency order, concurrently where possible."""
+
+    def __init__(
+        self,
+        concurrent: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.concurrent = concurrent
+        self._clock = clock
+        self._steps: Dict[str, _Step] = {}
+        self._deferred: Dict[str, _Step] = {}
+        self._deferred_tasks: List[asyncio.Task] = []
+        self._started: Optional[float] = None
+        self.total_seconds: Optional[float] = None
+
+    def add(self, name: str, func: StepFunc, after: Sequence[str] = ()) -> None:
+        """Add a step that must finish before the server is ready."""
+        missing = [dep for dep in after if dep not in self._steps]
+        if missing:
+            raise ValueError(f"Startup step {name!r} depends on unknown {missing}")
+        if name in self._steps:
+            raise ValueError(f"Duplicate startup step {name!r}")
+        self._steps[name] = _Step(name, func, tuple(after))
+
+    def step_names(self) -> List[str]:
+        return list(self._steps)
+
+    def defer(self, name: str, func: StepFunc) -> None:
+        """Add a warmup to run in the background after the server is ready."""
+        self._deferred[name] = _Step(name, func)
+
+    async def run(self) -> None:
+        """Run every step; the first failure cancels the rest and is raised."""
+        self._started = self._clock()
+        if not self.concurrent:
+            for step in self._steps.values():
+                await self._run_step(step)
+        else:
+            tasks: Dict[str, asyncio.Task] = {}
+
+            async def run_after(step: _Step) -> None:
+                if step.after:
+                    await asyncio.gather(*(tasks[dep] for dep in step.after))
+                await self._run_step(step)
+
+            for step in self._steps.values():
+                tasks[step.name] = asyncio.ensure_future(run_after(step))
+            try:
+                await asyncio.gather(*tasks.values())
+            except BaseException:
+                for task in tasks.values():
+                    task.cancel()
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+                raise
+        self.total_seconds = self._clock() - self._started
+
+    async def _run_step(self, step: _Step) -> None:
+        assert self._started is not None  # nosec B101
+        start = self._clock()
+        step.started_at = start - self._started
+        try:
+            await step.func()
+        except Exception as e:
+            step.error = str(e)
+            raise
+        finally:
+            step.duration = self._clock() - start
+
+    def start_deferred(self) -> None:
+        """Start the deferred warmups as background tasks."""
+        if self._started is None:
+            self._started = self._clock()
+        for step in self._deferred.values():
+            self._deferred_tasks.append(asyncio.ensure_future(self._run_deferred(step)))
+
+    async def _run_deferred(self, step: _Step) -> None:
+        try:
+            await self._run_step(step)
+            logger.info(
+                "Deferred warmup %s finished in %.2fs", step.name, step.duration
+            )
+        except Exception as e:
+            logger.warning("Deferred warmup %s failed: %s", step.name, e)
+
+    async def wait_deferred(self) -> None:
+        """Wait for the deferred warmups (benchmarks and tests)."""
+        if self._deferred_tasks:
+            await asyncio.gather(*self._deferred_tasks, return_exceptions=True)
+
+    async def cleanup(self) -> None:
+        """Cancel deferred warmups that are still running."""
+        for task in self._deferred_tasks:
+            task.cancel()
+        await self.wait_deferred()
+        self._deferred_tasks = []
+
+    def critical_path(self) -> List[str]:
+        """The chain of steps that determined when startup finished."""
+        timed = [s for s in self._steps.values() if s.duration is not None]
+        if not timed:
+            return []
+        step: Optional[_Step] = max(timed, key=lambda s: s.finished_at)
+        path: List[str] = []
+        while step is not None:
+            path.append(step.name)
+            deps = [self._steps[d] for d in step.after]
+            step = max(deps, key=lambda s: s.finished_at) if deps else None
+        return path[::-1]
+
+    def get_timings(self) -> Dict[str, Any]:
+        def describe(step: _Step) -> Dict[str, Any]:
+            return {
+                "name": step.name,
+                "after": list(step.after),
+                "start_ms": _ms(step.started_at),
+                "duration_ms": _ms(step.duration),
+                "error": step.error,
+            }
+
+        return {
+            "concurrent": self.concurrent,
+            "total_ms": _ms(self.total_seconds),
+            "steps": [describe(s) for s in self._steps.values()],
+            "critical_path": self.critical_path(),
+            "deferred": [describe(s) for s in self._deferred.values()],
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
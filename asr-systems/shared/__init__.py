@@ -3,7 +3,8 @@ ASR Systems - Shared Components
 Common components for both Production Server and Document Scanner
 """
 
-from .api import *
+import importlib
+
 from .core import *
 from .utils import *
 
@@ -20,3 +21,14 @@ __all__ = [
     "validation",
     "file_utils",
 ]
+
+
+def __getattr__(name: str):
+    # API schemas and clients load on first use, not with ``shared.core``
+    if not name.startswith("_"):
+        api = importlib.import_module(".api", __name__)
+        if name == "api":
+            return api
+        if hasattr(api, name):
+            return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,9 +3,21 @@ ASR Systems - API Components
 Shared API schemas and client for inter-system communication
 """
 
-from .client import *
 from .schemas import *
 
+# The clients import httpx, which the server does not otherwise need at
+# startup; they load on first attribute access.
+_CLIENTS = ("APIClient", "ProductionServerClient", "DocumentScannerClient")
+
+
+def __getattr__(name: str):
+    if name in _CLIENTS:
+        from . import client
+
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Request schemas
     "DocumentUploadSchema",
@@ -119,6 +119,19 @@ class BatchProcessingRequestSchema(BaseModel):
     )
 
 
+class BatchReprocessRequestSchema(BaseModel):
+    """Schema for batch-mode (Message Batches) reprocessing of a backlog"""
+
+    document_ids: List[str] = Field(
+        ..., min_length=1, max_length=100000, description="Document IDs to reprocess"
+    )
+
+    @field_validator("document_ids")
+    @classmethod
+    def validate_document_ids(cls, v: List[str]) -> List[str]:
+        return [validate_document_id(document_id) for document_id in v]
+
+
 class ScannerRegistrationSchema(BaseModel):
     """Schema for scanner registration requests"""
 
@@ -355,6 +368,9 @@ class AuditLogListResponseSchema(BaseModel):
         ..., description="List of audit log entries"
     )
     total_count: int = Field(..., description="Total number of entries returned")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page; absent on the last page"
+    )
 
 
 # Settings Schema
@@ -404,6 +420,17 @@ class GLAccountUpdateRequestSchema(BaseModel):
     active: Optional[bool] = Field(None, description="Whether account is active")
 
 
+class GLClassificationOverrideRequestSchema(BaseModel):
+    """Schema for manually correcting a document's GL classification."""
+
+    gl_account_code: str = Field(
+        ..., min_length=1, max_length=10, description="Correct GL account code"
+    )
+    previous_gl_account_code: Optional[str] = Field(
+        None, max_length=10, description="GL code the pipeline assigned"
+    )
+
+
 # Vendor Schemas
 
 
@@ -606,6 +633,7 @@ __all__ = [
     "DocumentUploadSchema",
     "ClassificationRequestSchema",
     "BatchProcessingRequestSchema",
+    "BatchReprocessRequestSchema",
     "ScannerRegistrationSchema",
     "ScannerHeartbeatSchema",
     "RoutingOverrideSchema",
@@ -0,0 +1,212 @@
+"""
+Local fake of the Claude Messages API for concurrency and rate-limit tests.
+Serves POST /v1/messages on an ephemeral port with configurable latency,
+a provider-side concurrency cap answered with 429 + Retry-After, and a
+number of forced 429/529 responses. Records peak concurrency and the order
+in which requests were accepted.
+
+Also fakes the Message Batches API: batches end ``batch_latency`` seconds
+after submission and their results stream as JSONL, answered by
+``batch_responder`` (or ``response_text``), with custom ids listed in
+``batch_errors`` reported as errored.
+
+Point ``ClaudeClientService(base_url=server.url)`` (or
+``CLAUDE_BASE_URL``) at it.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from aiohttp import web
+
+
+class FakeClaudeServer:
+    def __init__(
+        self,
+        latency: float = 0.05,
+        max_concurrency: Optional[int] = None,
+        retry_after: float = 0.1,
+        response_text: str = "PAID (confidence: 0.92) - stamp reads PAID",
+    ) -> None:
+        self.latency = latency
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+        self.response_text = response_text
+        # Next N requests are answered with this status before anything else
+        self.forced_status = 529
+        self.forced_failures = 0
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self.requests = 0
+        self.rejected = 0
+        # Marker text from each accepted request's prompt, in arrival order
+        self.accepted: List[str] = []
+        # Message Batches
+        self.batch_latency = 0.05
+        self.batch_responder: Optional[Callable[[Dict[str, Any]], str]] = None
+        self.batch_errors: Set[str] = set()
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.batch_status_checks = 0
+        self.batch_result_downloads = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self) -> "FakeClaudeServer":
+        app = web.Application()
+        app.router.add_post("/v1/messages", self._messages)
+        app.router.add_post("/v1/messages/batches", self._create_batch)
+        app.router.add_get("/v1/messages/batches/{batch_id}", self._get_batch)
+        app.router.add_get(
+            "/v1/messages/batches/{batch_id}/results", self._batch_results
+        )
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def fail_next(self, count: int, status: int = 529) -> None:
+        self.forced_failures = count
+        self.forced_status = status
+
+    async def _messages(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+
+        if self.forced_failures > 0:
+            self.forced_failures -= 1
+            return self._error(self.forced_status)
+        if self.max_concurrency is not None and self.in_flight >= self.max_concurrency:
+            return self._error(429)
+
+        self.in_flight += 1
+        self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+        self.accepted.append(_prompt_text(body))
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return web.json_response(
+            _message(
+                f"msg_{self.requests:06d}",
+                self.response_text,
+                body.get("model", "fake"),
+            )
+        )
+
+    async def _create_batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        batch_id = f"msgbatch_{len(self.batches) + 1:06d}"
+        self.batches[batch_id] = {
+            "requests": body["requests"],
+            "created_at": datetime.now(timezone.utc),
+            "ends_at": time.monotonic() + self.batch_latency,
+        }
+        return web.json_response(self._batch_json(batch_id))
+
+    async def _get_batch(self, request: web.Request) -> web.Response:
+        batch_id = request.match_info["batch_id"]
+        if batch_id not in self.batches:
+            return self._not_found()
+        self.batch_status_checks += 1
+        return web.json_response(self._batch_json(batch_id))
+
+    async def _batch_results(self, request: web.Request) -> web.Response:
+        batch = self.batches.get(request.match_info["batch_id"])
+        if batch is None:
+            return self._not_found()
+        self.batch_result_downloads += 1
+        lines = []
+        for entry in batch["requests"]:
+            custom_id = entry["custom_id"]
+            if custom_id in self.batch_errors:
+                result: Dict[str, Any] = {
+                    "type": "errored",
+                    "error": {
+                        "type": "error",
+                        "error": {"type": "api_error", "message": "failed"},
+                    },
+                }
+            else:
+                text = (
+                    self.batch_responder(entry["params"])
+                    if self.batch_responder
+                    else self.response_text
+                )
+                result = {"type": "succeeded", "message": _message(custom_id, text)}
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+        return web.Response(
+            body="\n".join(lines).encode("utf-8"),
+            content_type="application/binary",
+        )
+
+    def _batch_json(self, batch_id: str) -> Dict[str, Any]:
+        batch = self.batches[batch_id]
+        ended = time.monotonic() >= batch["ends_at"]
+        total = len(batch["requests"])
+        errored = len({r["custom_id"] for r in batch["requests"]} & self.batch_errors)
+        created_at = batch["created_at"]
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": created_at.isoformat(),
+            "expires_at": (created_at + timedelta(hours=24)).isoformat(),
+            "ended_at": datetime.now(timezone.utc).isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None
+            ),
+        }
+
+    def _not_found(self) -> web.Response:
+        return web.json_response(
+            {"type": "error", "error": {"type": "not_found_error", "message": "?"}},
+            status=404,
+        )
+
+    def _error(self, status: int) -> web.Response:
+        self.rejected += 1
+        error_type = "rate_limit_error" if status == 429 else "overloaded_error"
+        return web.json_response(
+            {"type": "error", "error": {"type": error_type, "message": "slow down"}},
+            status=status,
+            headers={"retry-after": str(self.retry_after)},
+        )
+
+
+def _message(message_id: str, text: str, model: str = "fake") -> Dict[str, Any]:
+    return {
+        "id": message_id,
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 100, "output_tokens": 20},
+    }
+
+
+def _prompt_text(body: dict) -> str:
+    content = body["messages"][0]["content"]
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content)
@@ -148,6 +148,37 @@ class TestAuditLogEndpoints:
         data = response.json()
         assert data["data"]["total_count"] == 0
 
+    def test_audit_logs_invalid_cursor_returns_400(self, client):
+        response = client.get(
+            "/api/v1/audit-logs?tenant_id=default&cursor=not-a-cursor",
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 400
+
+    def test_audit_logs_export_streams_ndjson(self, client):
+        response = client.get("/api/v1/audit-logs/export", headers=AUTH_HEADERS)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    def test_audit_logs_aggregate_returns_buckets(self, client):
+        response = client.get(
+            "/api/v1/audit-logs/aggregate?bucket=day"
+            "&event_type=billing_routing&group_by=destination",
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["bucket"] == "day"
+        assert data["group_by"] == ["destination"]
+        assert isinstance(data["rows"], list)
+
+    def test_audit_logs_aggregate_invalid_field_returns_400(self, client):
+        response = client.get(
+            "/api/v1/audit-logs/aggregate?group_by=bad;field",
+            headers=AUTH_HEADERS,
+        )
+        assert response.status_code == 400
+
 
 class TestReprocessEndpoints:
     def test_reprocess_document_returns_200(self, client):
@@ -0,0 +1,240 @@
+"""
+Tests for time-bucketed audit trail aggregation.
+Covers grouping by bucket, event type and event_data fields, the closed
+bucket cache and open bucket recounts, use of the tenant/timestamp index,
+and validation of buckets, fields and ranges.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import AuditTrailEntry
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from config.database import close_database, get_async_session, init_database
+from services.audit_aggregation_service import (
+    AuditAggregationService,
+    floor_bucket,
+    next_bucket,
+)
+from services.audit_trail_service import AuditTrailService
+
+
+@pytest.fixture
+async def audit():
+    await init_database("sqlite:///")
+    service = AuditTrailService()
+    await service.initialize()
+    yield service
+    await service.cleanup()
+    await close_database()
+
+
+def _hours_ago(hours: float) -> datetime:
+    return datetime.utcnow() - timedelta(hours=hours)
+
+
+async def _record(
+    audit, when, event_type="billing_routing", tenant_id="tenant-a", **data
+):
+    await audit.record(
+        AuditTrailEntry(
+            document_id="doc-1",
+            event_type=event_type,
+            event_data=data,
+            system_component="test",
+            tenant_id=tenant_id,
+            timestamp=when,
+        )
+    )
+
+
+def _counts(result):
+    return {
+        (r["bucket"], r["event_type"], tuple(r["fields"].values())): r["count"]
+        for r in result["rows"]
+    }
+
+
+class TestAggregation:
+    @pytest.mark.asyncio
+    async def test_counts_per_hour_and_destination(self, audit):
+        two_hours = floor_bucket(_hours_ago(2), "hour") + timedelta(minutes=5)
+        for destination in ("open_payable", "open_payable", "closed_payable"):
+            await _record(audit, two_hours, destination=destination)
+        next_hour = two_hours + timedelta(hours=1)
+        await _record(audit, next_hour, destination="open_payable")
+        await _record(audit, two_hours, event_type="gl_classification_override")
+        await _record(
+            audit, two_hours, tenant_id="tenant-b", destination="open_payable"
+        )
+
+        service = AuditAggregationService(audit)
+        result = await service.aggregate(
+            "tenant-a",
+            bucket="hour",
+            since=_hours_ago(6),
+            event_types=["billing_routing"],
+            group_by=["destination"],
+        )
+        first = floor_bucket(two_hours, "hour").isoformat()
+        second = (floor_bucket(two_hours, "hour") + timedelta(hours=1)).isoformat()
+        assert _counts(result) == {
+            (first, "billing_routing", ("closed_payable",)): 1,
+            (first, "billing_routing", ("open_payable",)): 2,
+            (second, "billing_routing", ("open_payable",)): 1,
+        }
+        assert [r["bucket"] for r in result["rows"]] == [first, first, second]
+
+    @pytest.mark.asyncio
+    async def test_nested_fields_and_missing_values(self, audit):
+        yesterday = _hours_ago(24)
+        await _record(
+            audit,
+            yesterday,
+            event_type="billing_routing",
+            document_context={"vendor_name": "Acme"},
+        )
+        await _record(audit, yesterday, event_type="billing_routing")
+        service = AuditAggregationService(audit)
+        result = await service.aggregate(
+            "tenant-a", bucket="day", group_by=["document_context.vendor_name"]
+        )
+        values = sorted(
+            (r["fields"]["document_context.vendor_name"] or "", r["count"])
+            for r in result["rows"]
+        )
+        assert values == [("", 1), ("Acme", 1)]
+
+    @pytest.mark.asyncio
+    async def test_manual_overrides_per_day(self, audit):
+        for days in (1, 1, 3):
+            await _record(
+                audit, _hours_ago(24 * days), event_type="gl_classification_override"
+            )
+        service = AuditAggregationService(audit)
+        result = await service.aggregate(
+            "tenant-a", bucket="day", event_types=["gl_classification_override"]
+        )
+        assert sorted(r["count"] for r in result["rows"]) == [1, 2]
+        assert result["group_by"] == []
+
+
+class TestClosedBucketCache:
+    @pytest.mark.asyncio
+    async def test_closed_buckets_served_from_cache(self, audit):
+        await _record(audit, _hours_ago(3), destination="open_payable")
+        service = AuditAggregationService(audit, closed_grace_seconds=0)
+        since = _hours_ago(5)
+
+        first = await service.aggregate(
+            "tenant-a", since=since, group_by=["destination"]
+        )
+        assert first["cached_buckets"] == 0
+        # Late event inside a closed bucket is not seen once the bucket is cached
+        await _record(audit, _hours_ago(3), destination="open_payable")
+        second = await service.aggregate(
+            "tenant-a", since=since, group_by=["destination"]
+        )
+        assert second["cached_buckets"] == first["queried_buckets"] - 1
+        assert second["queried_buckets"] == 1
+        assert _counts(second) == _counts(first)
+        assert service.get_statistics()["bucket_cache_hits"] > 0
+
+    @pytest.mark.asyncio
+    async def test_open_bucket_is_always_recounted(self, audit):
+        service = AuditAggregationService(audit)
+        await _record(audit, datetime.utcnow(), destination="open_payable")
+        first = await service.aggregate("tenant-a", since=_hours_ago(2))
+        await _record(audit, datetime.utcnow(), destination="open_payable")
+        second = await service.aggregate("tenant-a", since=_hours_ago(2))
+        assert sum(r["count"] for r in first["rows"]) == 1
+        assert sum(r["count"] for r in second["rows"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_keyed_by_tenant_and_grouping(self, audit):
+        await _record(audit, _hours_ago(3), destination="open_payable")
+        service = AuditAggregationService(audit)
+        since = _hours_ago(5)
+        await service.aggregate("tenant-a", since=since)
+        other = await service.aggregate("tenant-b", since=since)
+        assert other["cached_buckets"] == 0 and other["rows"] == []
+        grouped = await service.aggregate(
+            "tenant-a", since=since, group_by=["destination"]
+        )
+        assert grouped["cached_buckets"] == 0
+        assert service.invalidate("tenant-a") > 0
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, audit):
+        service = AuditAggregationService(audit, cache_max_buckets=3)
+        await service.aggregate("tenant-a", since=_hours_ago(12))
+        assert service.get_statistics()["cached_buckets"] == 3
+
+    @pytest.mark.asyncio
+    async def test_buffered_writes_are_flushed_before_counting(self):
+        await init_database("sqlite:///")
+        audit = AuditTrailService(buffered=True, flush_interval_seconds=3600)
+        await audit.initialize()
+        try:
+            await _record(audit, datetime.utcnow())
+            result = await AuditAggregationService(audit).aggregate(
+                "tenant-a", since=_hours_ago(1)
+            )
+            assert sum(r["count"] for r in result["rows"]) == 1
+        finally:
+            await audit.cleanup()
+            await close_database()
+
+
+class TestQueryPlan:
+    @pytest.mark.asyncio
+    async def test_uses_tenant_timestamp_index(self, audit):
+        service = AuditAggregationService(audit)
+        stmt = service.build_statement(
+            "sqlite",
+            "tenant-a",
+            "hour",
+            ["billing_routing"],
+            ["destination"],
+            _hours_ago(24),
+            datetime.utcnow(),
+        )
+        compiled = stmt.compile(
+            dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        async with get_async_session() as session:
+            result = await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+            plan = " ".join(str(row[-1]) for row in result.all())
+        assert "ix_audit_trail_tenant_timestamp" in plan
+
+
+class TestValidation:
+    @pytest.mark.asyncio
+    async def test_rejects_bad_requests(self, audit):
+        service = AuditAggregationService(audit, max_buckets=48)
+        with pytest.raises(ValueError):
+            await service.aggregate("tenant-a", bucket="week")
+        with pytest.raises(ValueError):
+            await service.aggregate("tenant-a", group_by=["destination'); --"])
+        with pytest.raises(ValueError):
+            await service.aggregate("tenant-a", group_by=["a", "b", "c", "d"])
+        with pytest.raises(ValueError):
+            await service.aggregate("tenant-a", since=_hours_ago(100))
+        with pytest.raises(ValueError):
+            await service.aggregate(
+                "tenant-a", since=_hours_ago(1), until=_hours_ago(2)
+            )
+
+    def test_month_buckets(self):
+        start = floor_bucket(datetime(2024, 1, 31, 18, 30), "month")
+        assert start == datetime(2024, 1, 1)
+        assert next_bucket(start, "month") == datetime(2024, 2, 1)
+        assert next_bucket(datetime(2024, 12, 1), "month") == datetime(2025, 1, 1)
@@ -0,0 +1,264 @@
+"""
+Tests for cold archival of aged audit trail events.
+Covers per-tenant monthly files and the manifest, read fallback from the
+audit trail queries, Bloom-filtered document lookups, storage failures
+leaving events in the hot table, expiry of archive files, and cursor
+paging and export across both tiers.
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.exceptions import StorageError
+from shared.core.models import AuditTrailEntry
+from sqlalchemy import func, select
+
+from config.database import close_database, get_async_session, init_database
+from models.audit_trail import AuditTrailRecord
+from services.audit_archive_service import (
+    AuditArchiveService,
+    _bloom_contains,
+    _bloom_encode,
+)
+from services.audit_trail_service import AuditTrailService
+from services.storage_service import ProductionStorageService
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    service = ProductionStorageService(
+        {"backend": "local", "local_path": str(tmp_path / "storage")}
+    )
+    await service.initialize()
+    return service
+
+
+@pytest.fixture
+async def audit():
+    await init_database("sqlite:///")
+    service = AuditTrailService(retention_days=2555)
+    await service.initialize()
+    yield service
+    await service.cleanup()
+    await close_database()
+
+
+async def _archive(audit, storage, **kwargs) -> AuditArchiveService:
+    kwargs.setdefault("archive_after_days", 90)
+    kwargs.setdefault("interval_seconds", 0)
+    kwargs.setdefault("compression", "gz")
+    service = AuditArchiveService(audit, storage, **kwargs)
+    await service.initialize()
+    return service
+
+
+def _days_ago(days: float) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+async def _record(audit, document_id, days_ago, tenant_id="tenant-a", **kwargs):
+    await audit.record(
+        AuditTrailEntry(
+            document_id=document_id,
+            event_type=kwargs.get("event_type", "billing_routing"),
+            event_data={"days_ago": days_ago},
+            system_component="test",
+            tenant_id=tenant_id,
+            timestamp=_days_ago(days_ago),
+        )
+    )
+
+
+async def _hot_count() -> int:
+    async with get_async_session() as session:
+        result = await session.execute(select(func.count(AuditTrailRecord.id)))
+        return result.scalar_one()
+
+
+class TestArchiving:
+    @pytest.mark.asyncio
+    async def test_aged_events_move_to_monthly_files(self, audit, storage, tmp_path):
+        await _record(audit, "doc-old-1", 400)
+        await _record(audit, "doc-old-2", 440)
+        await _record(audit, "doc-other", 400, tenant_id="tenant-b")
+        await _record(audit, "doc-new", 1)
+        archive = await _archive(audit, storage)
+
+        run = await archive.archive_expired()
+        assert (run["rows"], run["segments"]) == (3, 3)
+        assert await _hot_count() == 1
+
+        manifest = await archive.get_manifest("tenant-a")
+        assert len(manifest) == 2
+        assert manifest[0]["month"] < manifest[1]["month"]
+        assert all(m["rows"] == 1 for m in manifest)
+
+        files = sorted((tmp_path / "storage" / "audit-archive").rglob("*.jsonl.gz"))
+        assert len(files) == 3
+        assert {f.parts[-3] for f in files} == {"tenant-a", "tenant-b"}
+        line = gzip.decompress(files[0].read_bytes()).decode().strip()
+        assert json.loads(line)["event_type"] == "billing_routing"
+
+    @pytest.mark.asyncio
+    async def test_large_month_split_across_files(self, audit, storage):
+        for n in range(5):
+            await _record(audit, f"doc-{n}", 400 + n / 1000)
+        archive = await _archive(audit, storage, rows_per_file=2)
+        run = await archive.archive_expired()
+        assert (run["rows"], run["segments"]) == (5, 3)
+        assert await _hot_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_keeps_events_hot(self, audit, storage):
+        await _record(audit, "doc-old", 400)
+        archive = await _archive(audit, storage)
+
+        async def broken_put(key, content):
+            raise StorageError("bucket unavailable")
+
+        storage.put_blob = broken_put
+        with pytest.raises(StorageError):
+            await archive.archive_expired()
+        assert await _hot_count() == 1
+        assert await archive.get_manifest("tenant-a") == []
+
+    @pytest.mark.asyncio
+    async def test_files_past_retention_are_removed(self, audit, storage, tmp_path):
+        audit.retention_days = 300
+        await _record(audit, "doc-ancient", 500)
+        await _record(audit, "doc-old", 200)
+        archive = await _archive(audit, storage)
+        run = await archive.archive_expired()
+        assert run["segments_expired"] == 1
+        manifest = await archive.get_manifest("tenant-a")
+        assert len(manifest) == 1
+        files = list((tmp_path / "storage" / "audit-archive").rglob("*.jsonl.gz"))
+        assert len(files) == 1
+
+    def test_unknown_compression_rejected(self, storage):
+        with pytest.raises(ValueError):
+            AuditArchiveService(AuditTrailService(), storage, compression="lz4")
+
+
+class TestQueryFallback:
+    @pytest.mark.asyncio
+    async def test_query_by_document_spans_hot_and_archive(self, audit, storage):
+        await _record(audit, "doc-1", 400, event_type="document_uploaded")
+        await _record(audit, "doc-1", 1, event_type="document_deleted")
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+
+        rows = await audit.query_by_document("doc-1")
+        assert [r["event_type"] for r in rows] == [
+            "document_uploaded",
+            "document_deleted",
+        ]
+        assert await audit.query_by_document("doc-1", tenant_id="tenant-b") == []
+
+    @pytest.mark.asyncio
+    async def test_document_lookup_opens_only_matching_files(self, audit, storage):
+        await _record(audit, "doc-a", 400)
+        await _record(audit, "doc-b", 460)
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+
+        rows = await audit.query_by_document("doc-a")
+        assert len(rows) == 1
+        assert archive.get_statistics()["segments_read"] == 1
+
+    @pytest.mark.asyncio
+    async def test_query_by_tenant_fills_page_from_archive(self, audit, storage):
+        for n in range(4):
+            await _record(audit, f"doc-old-{n}", 400 + n)
+        await _record(audit, "doc-new-1", 1)
+        await _record(audit, "doc-new-2", 2)
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+
+        rows = await audit.query_by_tenant("tenant-a", limit=10)
+        assert [r["document_id"] for r in rows] == [
+            "doc-new-1",
+            "doc-new-2",
+            "doc-old-0",
+            "doc-old-1",
+            "doc-old-2",
+            "doc-old-3",
+        ]
+        rows = await audit.query_by_tenant("tenant-a", limit=3)
+        assert [r["document_id"] for r in rows][-1] == "doc-old-0"
+
+        since = _days_ago(401.5)
+        rows = await audit.query_by_tenant("tenant-a", since=since, limit=10)
+        assert {r["document_id"] for r in rows} == {
+            "doc-new-1",
+            "doc-new-2",
+            "doc-old-0",
+            "doc-old-1",
+        }
+
+    @pytest.mark.asyncio
+    async def test_full_hot_page_skips_archive(self, audit, storage):
+        await _record(audit, "doc-old", 400)
+        await _record(audit, "doc-new", 1)
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+        rows = await audit.query_by_tenant("tenant-a", limit=1)
+        assert [r["document_id"] for r in rows] == ["doc-new"]
+        assert archive.get_statistics()["segments_read"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_from_hot_into_archive(self, audit, storage):
+        for n in range(5):
+            await _record(audit, f"doc-old-{n}", 400 + n)
+        for n in range(2):
+            await _record(audit, f"doc-new-{n}", 1 + n)
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await audit.query_page("tenant-a", limit=2, cursor=cursor)
+            seen.extend(e["document_id"] for e in page)
+            if cursor is None:
+                break
+        assert seen == ["doc-new-0", "doc-new-1"] + [f"doc-old-{n}" for n in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_export_includes_archived_events_first(self, audit, storage):
+        await _record(audit, "doc-old", 400)
+        await _record(audit, "doc-new", 1)
+        await _record(audit, "doc-other", 400, tenant_id="tenant-b")
+        archive = await _archive(audit, storage)
+        await archive.archive_expired()
+
+        body = "".join([c async for c in audit.stream_ndjson("tenant-a")])
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [r["document_id"] for r in rows] == ["doc-old", "doc-new"]
+        # Export reads bypass the segment cache
+        assert archive.get_statistics()["cached_segments"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_detaches_archive(self, audit, storage):
+        archive = await _archive(audit, storage)
+        assert audit.archive is archive
+        await archive.cleanup()
+        assert audit.archive is None
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        ids = [f"doc-{n}" for n in range(2000)]
+        encoded = _bloom_encode(ids)
+        assert all(_bloom_contains(encoded, i) for i in ids)
+        false_positives = sum(
+            _bloom_contains(encoded, f"other-{n}") for n in range(2000)
+        )
+        assert false_positives < 100
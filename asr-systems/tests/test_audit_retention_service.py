@@ -0,0 +1,211 @@
+"""
+Tests for the chunked, resumable audit trail retention purge.
+Covers bounded batches, progress reporting, resuming an interrupted or
+failed purge with its original cutoff, the background scheduler, and
+partition bound parsing for the PostgreSQL partition drop.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import AuditTrailEntry
+from sqlalchemy import func, select
+
+from config.database import close_database, get_async_session, init_database
+from models.audit_retention_run import AuditRetentionRunRecord
+from models.audit_trail import AuditTrailRecord
+from services.audit_retention_service import (
+    COMPLETED,
+    FAILED,
+    RUNNING,
+    AuditRetentionService,
+    _partition_upper_bound,
+)
+from services.audit_trail_service import AuditTrailService
+
+
+@pytest.fixture
+async def audit():
+    await init_database("sqlite:///")
+    service = AuditTrailService(retention_days=30)
+    await service.initialize()
+    yield service
+    await service.cleanup()
+    await close_database()
+
+
+async def _seed(audit, expired: int, fresh: int = 0) -> None:
+    old = datetime.utcnow() - timedelta(days=60)
+    for n in range(expired):
+        await audit.record(_entry(f"old-{n}", old + timedelta(seconds=n)))
+    for n in range(fresh):
+        await audit.record(_entry(f"new-{n}", datetime.utcnow()))
+
+
+def _entry(document_id: str, timestamp: datetime) -> AuditTrailEntry:
+    return AuditTrailEntry(
+        document_id=document_id,
+        event_type="billing_routing",
+        event_data={},
+        system_component="test",
+        tenant_id="tenant-a",
+        timestamp=timestamp,
+    )
+
+
+async def _remaining() -> int:
+    async with get_async_session() as session:
+        result = await session.execute(select(func.count(AuditTrailRecord.id)))
+        return result.scalar_one()
+
+
+async def _run_record(run_id: str) -> AuditRetentionRunRecord:
+    async with get_async_session() as session:
+        return await session.get(AuditRetentionRunRecord, run_id)
+
+
+def _retention(audit, **kwargs) -> AuditRetentionService:
+    kwargs.setdefault("enabled", False)
+    kwargs.setdefault("pause_seconds", 0)
+    return AuditRetentionService(audit, retention_days=30, **kwargs)
+
+
+class _StopAfter:
+    """Audit service stand-in that stops the purge after a few batches."""
+
+    def __init__(self, audit, batches: int, fail: bool = False) -> None:
+        self.audit = audit
+        self.batches = batches
+        self.fail = fail
+        self.retention: AuditRetentionService = None  # type: ignore[assignment]
+
+    async def delete_expired_batch(self, cutoff, limit):
+        if self.fail and self.batches == 0:
+            raise RuntimeError("lock timeout")
+        result = await self.audit.delete_expired_batch(cutoff, limit)
+        self.batches -= 1
+        if self.batches == 0 and not self.fail:
+            self.retention._stop.set()
+        return result
+
+
+class TestChunkedPurge:
+    @pytest.mark.asyncio
+    async def test_purge_deletes_in_bounded_batches(self, audit):
+        await _seed(audit, expired=25, fresh=5)
+        retention = _retention(audit, batch_size=10)
+        summary = await retention.run_purge()
+
+        assert summary["status"] == COMPLETED
+        assert (summary["deleted"], summary["batches"]) == (25, 3)
+        assert summary["rows_per_second"] > 0
+        assert summary["watermark"] is not None
+        assert await _remaining() == 5
+
+        record = await _run_record(summary["run_id"])
+        assert (record.status, record.deleted) == (COMPLETED, 25)
+        assert record.finished_at is not None
+        assert retention.get_progress()["last_run"]["run_id"] == summary["run_id"]
+
+    @pytest.mark.asyncio
+    async def test_purge_expired_is_chunked(self, audit):
+        await _seed(audit, expired=7, fresh=1)
+        assert await audit.purge_expired(batch_size=3) == 7
+        assert await _remaining() == 1
+
+    @pytest.mark.asyncio
+    async def test_interrupted_purge_resumes_with_same_cutoff(self, audit):
+        await _seed(audit, expired=20)
+        stopper = _StopAfter(audit, batches=2)
+        first = _retention(stopper, batch_size=5, save_every=1)
+        stopper.retention = first
+        partial = await first.run_purge()
+        assert partial["status"] == RUNNING
+        assert partial["deleted"] == 10
+        assert (await _run_record(partial["run_id"])).status == RUNNING
+
+        resumed = await _retention(audit, batch_size=5).run_purge()
+        assert resumed["run_id"] == partial["run_id"]
+        assert resumed["cutoff"] == partial["cutoff"]
+        assert (resumed["status"], resumed["deleted"]) == (COMPLETED, 20)
+        assert await _remaining() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_purge_is_recorded_and_resumed(self, audit):
+        await _seed(audit, expired=12)
+        failing = _StopAfter(audit, batches=1, fail=True)
+        first = _retention(failing, batch_size=5)
+        failing.retention = first
+        failed = await first.run_purge()
+        assert failed["status"] == FAILED
+        assert "lock timeout" in failed["error"]
+
+        resumed = await _retention(audit, batch_size=5).run_purge()
+        assert resumed["run_id"] == failed["run_id"]
+        assert (resumed["status"], resumed["deleted"]) == (COMPLETED, 12)
+
+    @pytest.mark.asyncio
+    async def test_next_purge_starts_fresh_after_completion(self, audit):
+        retention = _retention(audit)
+        first = await retention.run_purge()
+        second = await retention.run_purge()
+        assert first["run_id"] != second["run_id"]
+        assert retention.get_statistics()["runs"] == 2
+
+    @pytest.mark.asyncio
+    async def test_partition_drop_is_skipped_off_postgresql(self, audit):
+        await _seed(audit, expired=3)
+        summary = await _retention(audit, drop_partitions=True).run_purge()
+        assert summary["partitions_dropped"] == []
+        assert summary["deleted"] == 3
+
+
+class TestScheduler:
+    @pytest.mark.asyncio
+    async def test_scheduler_runs_purge_in_background(self, audit):
+        await _seed(audit, expired=4)
+        retention = _retention(
+            audit, enabled=True, initial_delay_seconds=0, interval_seconds=3600
+        )
+        await retention.initialize()
+        try:
+            for _ in range(50):
+                if retention.get_progress()["last_run"]:
+                    break
+                await asyncio.sleep(0.02)
+            assert retention.get_progress()["last_run"]["deleted"] == 4
+        finally:
+            await asyncio.wait_for(retention.cleanup(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_before_first_run(self, audit):
+        retention = _retention(audit, enabled=True, initial_delay_seconds=3600)
+        await retention.initialize()
+        await asyncio.wait_for(retention.cleanup(), timeout=1)
+        assert retention.get_statistics()["runs"] == 0
+
+
+class TestPartitionBounds:
+    def test_range_upper_bound(self):
+        bound = "FOR VALUES FROM ('2019-01-01 00:00:00') TO ('2019-02-01 00:00:00')"
+        assert _partition_upper_bound(bound) == datetime(2019, 2, 1)
+
+    def test_timezone_bound_normalized_to_utc(self):
+        bound = (
+            "FOR VALUES FROM ('2019-01-01 00:00:00+02') "
+            "TO ('2019-02-01 02:00:00+02')"
+        )
+        assert _partition_upper_bound(bound) == datetime(2019, 2, 1)
+
+    def test_default_and_maxvalue_partitions_never_dropped(self):
+        assert _partition_upper_bound("DEFAULT") is None
+        unbounded = "FOR VALUES FROM (MINVALUE) TO (MAXVALUE)"
+        assert _partition_upper_bound(unbounded) is None
+        assert _partition_upper_bound(None) is None
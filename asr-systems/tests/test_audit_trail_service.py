@@ -3,12 +3,16 @@ Unit Tests for Audit Trail Service
 Uses in-memory SQLite via aiosqlite — no disk I/O.
 """
 
+import asyncio
+import json
 from datetime import datetime, timedelta
 
 import pytest
 from shared.core.models import AuditTrailEntry
+from sqlalchemy import func, select
 
-from config.database import close_database, init_database
+import services.audit_trail_service as audit_module
+from config.database import close_database, get_async_session, init_database
 from models.audit_trail import AuditTrailRecord  # noqa: F401 — registers table
 from services.audit_trail_service import AuditTrailService
 
@@ -102,3 +106,274 @@ class TestAuditTrail:
         remaining = await service.query_by_tenant("tenant-a")
         assert len(remaining) == 1
         assert remaining[0]["document_id"] == "doc-new"
+
+
+# ---------------------------------------------------------------------------
+# Buffered writer
+# ---------------------------------------------------------------------------
+
+
+async def _buffered(**kwargs):
+    kwargs.setdefault("flush_interval_seconds", 3600)
+    svc = AuditTrailService(enabled=True, retention_days=30, buffered=True, **kwargs)
+    await svc.initialize()
+    return svc
+
+
+async def _stored_documents():
+    async with get_async_session() as session:
+        result = await session.execute(
+            select(AuditTrailRecord.document_id).order_by(AuditTrailRecord.timestamp)
+        )
+        return list(result.scalars().all())
+
+
+async def _stored_count():
+    async with get_async_session() as session:
+        result = await session.execute(select(func.count(AuditTrailRecord.id)))
+        return result.scalar_one()
+
+
+class TestBufferedWriter:
+    @pytest.mark.asyncio
+    async def test_record_returns_before_database_write(self, db):
+        svc = await _buffered()
+        try:
+            await svc.record(_entry())
+            assert await _stored_count() == 0
+            assert svc.get_statistics()["buffered_events"] == 1
+            # Reads flush first, so callers see their own writes
+            rows = await svc.query_by_document("doc-001")
+            assert len(rows) == 1
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_in_one_transaction(self, db):
+        svc = await _buffered(flush_batch_size=3)
+        try:
+            for n in range(3):
+                await svc.record(_entry(document_id=f"doc-{n}"))
+            await asyncio.sleep(0.05)
+            assert await _stored_count() == 3
+            stats = svc.get_statistics()
+            assert (stats["flushes"], stats["records_written"]) == (1, 3)
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_interval_flushes_partial_batch(self, db):
+        svc = await _buffered(flush_interval_seconds=0.02)
+        try:
+            await svc.record(_entry())
+            await asyncio.sleep(0.1)
+            assert await _stored_count() == 1
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_flushes_pending_entries(self, db):
+        svc = await _buffered()
+        for n in range(5):
+            await svc.record(_entry(document_id=f"doc-{n}"))
+        await svc.cleanup()
+        assert await _stored_count() == 5
+        assert svc.get_statistics()["buffered"] is False
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_policy(self, db):
+        svc = await _buffered(max_buffered_events=2, overflow_policy="drop_newest")
+        try:
+            for n in range(3):
+                await svc.record(_entry(document_id=f"doc-{n}"))
+            assert svc.get_statistics()["dropped"] == 1
+            await svc.flush()
+            assert await _stored_documents() == ["doc-0", "doc-1"]
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self, db):
+        svc = await _buffered(max_buffered_events=2, overflow_policy="drop_oldest")
+        try:
+            for n in range(3):
+                await svc.record(_entry(document_id=f"doc-{n}"))
+            await svc.flush()
+            assert await _stored_documents() == ["doc-1", "doc-2"]
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_waits_for_writer(self, db):
+        svc = await _buffered(max_buffered_events=2, overflow_policy="block")
+        try:
+            for n in range(5):
+                await svc.record(_entry(document_id=f"doc-{n}"))
+            # Blocked producers woke the writer instead of dropping entries
+            assert svc.get_statistics()["dropped"] == 0
+            assert await _stored_count() >= 2
+            await svc.flush()
+            assert await _stored_count() == 5
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_sync_policy_writes_overflow_inline(self, db):
+        svc = await _buffered(max_buffered_events=1, overflow_policy="sync")
+        try:
+            await svc.record(_entry(document_id="queued"))
+            await svc.record(_entry(document_id="inline"))
+            assert await _stored_documents() == ["inline"]
+            assert svc.get_statistics()["overflow_writes"] == 1
+        finally:
+            await svc.cleanup()
+
+    def test_unknown_overflow_policy_rejected(self):
+        with pytest.raises(ValueError):
+            AuditTrailService(overflow_policy="spill")
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_requeued_not_lost(self, db, monkeypatch):
+        svc = await _buffered()
+        try:
+            await svc.record(_entry(document_id="doc-0"))
+            await svc.record(_entry(document_id="doc-1"))
+
+            def broken_session():
+                raise RuntimeError("database unavailable")
+
+            monkeypatch.setattr(audit_module, "get_async_session", broken_session)
+            assert await svc.flush() == 0
+            stats = svc.get_statistics()
+            assert (stats["buffered_events"], stats["retries"]) == (2, 2)
+            assert (stats["failed"], stats["dropped"]) == (0, 0)
+
+            monkeypatch.undo()
+            assert await svc.flush() == 2
+            assert await _stored_documents() == ["doc-0", "doc-1"]
+        finally:
+            monkeypatch.undo()
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_writer_retries_failed_batch(self, db, monkeypatch):
+        svc = await _buffered(flush_interval_seconds=0.01)
+        insert = svc._insert
+        failures = [RuntimeError("database unavailable")] * 2
+
+        async def flaky_insert(rows):
+            if failures:
+                raise failures.pop()
+            return await insert(rows)
+
+        monkeypatch.setattr(svc, "_insert", flaky_insert)
+        try:
+            await svc.record(_entry())
+            await asyncio.sleep(0.3)
+            assert await _stored_count() == 1
+            assert svc.get_statistics()["retries"] == 2
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "policy, stored, dropped",
+        [
+            ("drop_newest", ["doc-0", "doc-1"], 1),
+            ("drop_oldest", ["doc-1", "late"], 1),
+            ("block", ["doc-0", "doc-1", "late"], 0),
+        ],
+    )
+    async def test_requeue_respects_overflow_policy(
+        self, db, monkeypatch, policy, stored, dropped
+    ):
+        svc = await _buffered(max_buffered_events=2, overflow_policy=policy)
+        try:
+            for n in range(2):
+                await svc.record(_entry(document_id=f"doc-{n}"))
+
+            async def failing_insert(rows):
+                # Recorded while the batch is out of the buffer
+                await svc.record(_entry(document_id="late"))
+                raise RuntimeError("database unavailable")
+
+            monkeypatch.setattr(svc, "_insert", failing_insert)
+            await svc.flush()
+            monkeypatch.undo()
+            assert svc.get_statistics()["dropped"] == dropped
+            await svc.flush()
+            assert await _stored_documents() == stored
+        finally:
+            await svc.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_unwritten_entries_dropped_at_shutdown(self, db, monkeypatch):
+        svc = await _buffered(flush_interval_seconds=0.01)
+
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(audit_module, "get_async_session", broken_session)
+        for n in range(3):
+            await svc.record(_entry(document_id=f"doc-{n}"))
+        await svc.cleanup()
+        stats = svc.get_statistics()
+        assert (stats["dropped"], stats["buffered_events"]) == (3, 0)
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination and export
+# ---------------------------------------------------------------------------
+
+
+class TestPagination:
+    @pytest.mark.asyncio
+    async def test_cursor_pages_through_history(self, service):
+        base = datetime.utcnow() - timedelta(hours=1)
+        for n in range(7):
+            await service.record(
+                _entry(document_id=f"doc-{n}", timestamp=base + timedelta(minutes=n))
+            )
+        # Two entries sharing a timestamp are split by id, never skipped
+        await service.record(_entry(document_id="doc-tie", timestamp=base))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await service.query_page("tenant-a", limit=3, cursor=cursor)
+            seen.extend(e["document_id"] for e in page)
+            if cursor is None:
+                break
+        assert len(seen) == 8 and len(set(seen)) == 8
+        assert seen[:2] == ["doc-6", "doc-5"]
+        assert set(seen[-2:]) == {"doc-0", "doc-tie"}
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, service):
+        await service.record(_entry())
+        page, cursor = await service.query_page("tenant-a", limit=5)
+        assert len(page) == 1 and cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, service):
+        with pytest.raises(ValueError):
+            await service.query_page("tenant-a", cursor="bm9wZQ")
+
+    @pytest.mark.asyncio
+    async def test_ndjson_export_streams_oldest_first(self, service):
+        base = datetime.utcnow() - timedelta(days=1)
+        for n in range(5):
+            await service.record(
+                _entry(document_id=f"doc-{n}", timestamp=base + timedelta(minutes=n))
+            )
+        await service.record(_entry(document_id="other", tenant_id="tenant-b"))
+
+        chunks = [c async for c in service.iter_tenant_events("tenant-a", chunk_size=2)]
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+        lines = "".join([c async for c in service.stream_ndjson("tenant-a")])
+        rows = [json.loads(line) for line in lines.splitlines()]
+        assert [r["document_id"] for r in rows] == [f"doc-{n}" for n in range(5)]
+
+        until = base + timedelta(minutes=2)
+        chunks = [c async for c in service.iter_tenant_events("tenant-a", until=until)]
+        assert [e["document_id"] for c in chunks for e in c] == ["doc-0", "doc-1"]
@@ -0,0 +1,277 @@
+"""
+Tests for the classification memoization cache.
+Covers the LRU and database tiers, ruleset-version invalidation for GL
+classification, and saved-Claude-call accounting for payment detection.
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import PaymentDetectionMethod, PaymentStatus
+
+from config.database import close_database, init_database
+from services.classification_cache_service import (
+    ClassificationCacheService,
+    normalize_text,
+)
+from services.gl_account_service import GLAccountService
+from services.payment_detection_service import (
+    MethodResult,
+    PaymentDetectionService,
+    _count_claude_request,
+)
+from services.vendor_service import VendorService
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def db():
+    await init_database("sqlite:///")
+    yield
+    await close_database()
+
+
+@pytest.fixture
+async def cache(db):
+    service = ClassificationCacheService(max_entries=100, ttl_seconds=3600)
+    await service.initialize()
+    return service
+
+
+# ---------------------------------------------------------------------------
+# Cache primitives
+# ---------------------------------------------------------------------------
+
+
+class TestCacheTiers:
+    def test_normalize_collapses_whitespace_and_case(self):
+        assert normalize_text("  Office\n\tRENT  ") == "office rent"
+
+    def test_key_ignores_whitespace_but_not_tenant(self):
+        k1 = ClassificationCacheService.make_key("gl", "Office  rent", None, "t1", "v1")
+        k2 = ClassificationCacheService.make_key("gl", "office rent", None, "t1", "v1")
+        k3 = ClassificationCacheService.make_key("gl", "office rent", None, "t2", "v1")
+        k4 = ClassificationCacheService.make_key("gl", "office rent", None, "t1", "v2")
+        assert k1 == k2
+        assert k1 != k3
+        assert k1 != k4
+
+    @pytest.mark.asyncio
+    async def test_memory_then_db_hit(self, cache):
+        await cache.put("gl", "k", "t1", "v1", {"x": 1})
+        assert await cache.get("gl", "k") == {"x": 1}
+
+        fresh = ClassificationCacheService()
+        assert await fresh.get("gl", "k") == {"x": 1}
+        assert fresh.get_statistics()["db_hits"] == 1
+        assert await fresh.get("gl", "k") == {"x": 1}
+        assert fresh.get_statistics()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_counted(self, cache):
+        assert await cache.get("gl", "absent") is None
+        stats = cache.get_statistics()
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest(self):
+        lru = ClassificationCacheService(max_entries=2, persistent=False)
+        await lru.put("gl", "a", None, "v", {"n": "a"})
+        await lru.put("gl", "b", None, "v", {"n": "b"})
+        await lru.get("gl", "a")  # touch a so b becomes the oldest
+        await lru.put("gl", "c", None, "v", {"n": "c"})
+        assert await lru.get("gl", "b") is None
+        assert await lru.get("gl", "a") == {"n": "a"}
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        short = ClassificationCacheService(ttl_seconds=60, persistent=False)
+        await short.put("gl", "k", None, "v", {"x": 1})
+        short._entries["k"].stored_at = time.time() - 120
+        assert await short.get("gl", "k") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_scoped_to_tenant(self, cache):
+        await cache.put("gl", "a", "t1", "v", {"n": "a"})
+        await cache.put("gl", "b", "t2", "v", {"n": "b"})
+        removed = await cache.invalidate(kind="gl", tenant_id="t1")
+        assert removed == 1
+        assert await cache.get("gl", "a") is None
+        assert await cache.get("gl", "b") == {"n": "b"}
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_never_hits(self):
+        off = ClassificationCacheService(enabled=False, persistent=False)
+        await off.put("gl", "k", None, "v", {"x": 1})
+        assert await off.get("gl", "k") is None
+
+
+# ---------------------------------------------------------------------------
+# GL classification memoization
+# ---------------------------------------------------------------------------
+
+
+class TestGLMemoization:
+    @pytest.mark.asyncio
+    async def test_repeat_classification_served_from_cache(self, cache):
+        gl = GLAccountService(result_cache=cache)
+        await gl.initialize()
+
+        first = await gl.classify_document_text("office rent monthly payment")
+        second = await gl.classify_document_text("Office rent  monthly payment")
+        assert second.gl_account_code == first.gl_account_code
+        assert second.confidence == first.confidence
+        assert cache.get_statistics()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_gl_change_invalidates_results(self, cache):
+        gl = GLAccountService(result_cache=cache)
+        await gl.initialize()
+        before = await gl.get_ruleset_version()
+
+        await gl.classify_document_text("zzcustom widget")
+        await gl.create_gl_account(
+            code="ZC01",
+            name="Widgets",
+            category="EXPENSES",
+            keywords=["zzcustom widget"],
+        )
+        assert await gl.get_ruleset_version() != before
+
+        result = await gl.classify_document_text("zzcustom widget")
+        assert result.gl_account_code == "ZC01"
+        assert cache.get_statistics()["memory_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_overlay_change_keeps_other_tenants_version(self, cache):
+        gl = GLAccountService(result_cache=cache)
+        await gl.initialize()
+        other = await gl.get_ruleset_version("tenant-b")
+        await gl.create_gl_account(
+            code="ZC02", name="Overlay", category="EXPENSES", tenant_id="tenant-a"
+        )
+        assert await gl.get_ruleset_version("tenant-b") == other
+        assert await gl.get_ruleset_version("tenant-a") != other
+
+    @pytest.mark.asyncio
+    async def test_vendor_change_invalidates_results(self, cache):
+        vendors = VendorService()
+        await vendors.initialize()
+        gl = GLAccountService(vendor_service=vendors, result_cache=cache)
+        await gl.initialize()
+        vendor = await vendors.create_vendor(name="Acme Supply", tenant_id="t1")
+        await vendors.update_vendor(vendor["id"], {"default_gl_account": "1000"})
+        before = await gl.get_ruleset_version("t1")
+
+        first = await gl.classify_document_text("invoice", "Acme Supply", "t1")
+        await vendors.update_vendor(vendor["id"], {"default_gl_account": "1100"})
+        second = await gl.classify_document_text("invoice", "Acme Supply", "t1")
+
+        assert (first.gl_account_code, second.gl_account_code) == ("1000", "1100")
+        assert await gl.get_ruleset_version("t1") != before
+        assert cache.get_statistics()["memory_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_vendor_version_is_shared_across_workers(self, db):
+        worker_a, worker_b = VendorService(), VendorService()
+        vendor = await worker_a.create_vendor(name="Acme Supply", tenant_id="t1")
+        # A restarted or second worker reads the same version, not a fresh one
+        before = await worker_b.get_vendor_version("t1")
+        assert before == await worker_a.get_vendor_version("t1")
+
+        await worker_a.update_vendor(vendor["id"], {"default_gl_account": "1100"})
+        edited = await worker_b.get_vendor_version("t1")
+        assert edited != before
+        await worker_a.delete_vendor(vendor["id"])
+        assert await worker_b.get_vendor_version("t1") not in (before, edited)
+        assert await worker_b.get_vendor_version("t2") == "0."
+
+
+# ---------------------------------------------------------------------------
+# Payment detection memoization
+# ---------------------------------------------------------------------------
+
+
+def _claude_result(status=PaymentStatus.PAID):
+    return MethodResult(
+        method=PaymentDetectionMethod.CLAUDE_TEXT,
+        payment_status=status,
+        confidence=0.9,
+        reasoning="stub",
+        details={},
+        processing_time=0.0,
+    )
+
+
+class TestPaymentMemoization:
+    @pytest.fixture
+    async def pds(self, cache):
+        service = PaymentDetectionService(
+            claude_config={"enabled": False, "api_key": None},
+            enabled_methods=["claude_text", "regex_patterns"],
+            result_cache=cache,
+        )
+        await service.initialize()
+        service.claude_client = MagicMock()
+
+        async def _detect(*args, **kwargs):
+            _count_claude_request()
+            return _claude_result()
+
+        service._detect_claude_text = AsyncMock(side_effect=_detect)
+        return service
+
+    @pytest.mark.asyncio
+    async def test_cached_result_skips_claude(self, pds, cache):
+        text = "PAID IN FULL check #1234"
+        first = await pds.detect_payment_status(text, tenant_id="t1")
+        second = await pds.detect_payment_status(text, tenant_id="t1")
+
+        assert pds._detect_claude_text.await_count == 1
+        assert second.payment_status == first.payment_status
+        assert second.methods_used == first.methods_used
+        assert cache.get_statistics()["claude_calls_saved"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_method_not_cached(self, pds, cache):
+        pds._detect_claude_text = AsyncMock(side_effect=RuntimeError("boom"))
+        await pds.detect_payment_status("balance due $50", tenant_id="t1")
+        await pds.detect_payment_status("balance due $50", tenant_id="t1")
+        assert pds._detect_claude_text.await_count == 2
+        assert cache.get_statistics()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_result_cached_without_claude_client(self, pds, cache):
+        pds.claude_client = None
+        await pds.detect_payment_status("PAID IN FULL", tenant_id="t1")
+        await pds.detect_payment_status("PAID IN FULL", tenant_id="t1")
+        pds._detect_claude_text.assert_not_awaited()
+        assert cache.get_statistics()["stores"] == 1
+        assert cache.get_statistics()["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_amount_info_is_part_of_key(self, pds):
+        await pds.detect_payment_status("invoice", amount_info={"total": 1})
+        await pds.detect_payment_status("invoice", amount_info={"total": 2})
+        assert pds._detect_claude_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_config_version_tracks_methods(self, cache):
+        a = PaymentDetectionService({"enabled": False}, ["regex_patterns"])
+        b = PaymentDetectionService(
+            {"enabled": False}, ["regex_patterns", "keyword_matching"]
+        )
+        await a.initialize()
+        await b.initialize()
+        assert a.config_version and a.config_version != b.config_version
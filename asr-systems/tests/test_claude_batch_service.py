@@ -0,0 +1,467 @@
+"""
+Tests for batch-mode Claude reprocessing.
+Covers request planning and priming in the payment detection service, and
+jobs run against the fake Message Batches API: submission, batch splitting,
+errored results, progress saved in the database, and resuming after a
+failure or a restart.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_claude_server import FakeClaudeServer
+from shared.core.models import (
+    BillingDestination,
+    DocumentMetadata,
+    PaymentStatus,
+    ProcessingStatus,
+    UploadResult,
+)
+from utils.concurrency_limiter import BACKGROUND, request_priority
+
+from config.database import close_database, init_database
+from services.billing_router_service import BillingRouterService
+from services.claude_batch_service import (
+    COMPLETED,
+    FAILED,
+    PROCESSING,
+    ClaudeBatchService,
+)
+from services.claude_client_service import ClaudeClientService
+from services.claude_usage_service import ClaudeUsageService
+from services.document_processor_service import DocumentProcessorService
+from services.gl_account_service import GLClassificationResult
+from services.payment_detection_service import PaymentDetectionService
+from services.storage_service import StorageResult
+
+TENANT = "tenant-a"
+PAID_RESPONSE = "PAID (confidence: 0.92) - stamp reads PAID"
+_CLEAR_PAID = "PAID IN FULL check #1234 balance due: $0.00"
+
+
+def _ambiguous(n):
+    return f"Invoice {1000 + n} for services rendered in period {n}"
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def db():
+    await init_database("sqlite:///")
+    yield
+    await close_database()
+
+
+@pytest.fixture
+async def server():
+    fake = await FakeClaudeServer().start()
+    fake.batch_latency = 0.05
+    yield fake
+    await fake.stop()
+
+
+class _Storage:
+    """Stored documents keyed by id, scoped to one tenant."""
+
+    def __init__(self, texts):
+        self.documents = {
+            document_id: SimpleNamespace(
+                content=text.encode("utf-8"),
+                metadata=DocumentMetadata(
+                    filename=f"{document_id}.txt",
+                    file_size=len(text),
+                    mime_type="text/plain",
+                    tenant_id=TENANT,
+                ),
+            )
+            for document_id, text in texts.items()
+        }
+
+    async def store_document(self, document_id, file_content, metadata):
+        return StorageResult(success=True, storage_path=f"/tmp/{document_id}")
+
+    async def retrieve_document(self, document_id, tenant_id=None):
+        if tenant_id != TENANT:
+            return None
+        return self.documents.get(document_id)
+
+
+class _Harness:
+    """Wires a batch service to the fake API; reprocessing runs detection.
+
+    With ``full_pipeline`` reprocessing goes through the real
+    ``DocumentProcessorService`` and billing router instead.
+    """
+
+    def __init__(
+        self, server, texts, fail_on=None, full_pipeline=False, **batch_kwargs
+    ):
+        self.server = server
+        self.storage = _Storage(texts)
+        self.fail_on = fail_on
+        self.full_pipeline = full_pipeline
+        self.detections = {}
+        self.priorities = []
+        self.batch_kwargs = {"poll_interval_seconds": 0.02, **batch_kwargs}
+
+    async def start(self):
+        self.client = ClaudeClientService("test-key", base_url=self.server.url)
+        await self.client.initialize()
+        self.pds = PaymentDetectionService(
+            {"enabled": True, "model": "m", "temperature": 0},
+            ["claude_text", "regex_patterns", "keyword_matching"],
+            early_exit_threshold=0.8,
+            claude_client_service=self.client,
+        )
+        await self.pds.initialize()
+        if self.full_pipeline:
+            router = BillingRouterService(
+                [destination.value for destination in BillingDestination],
+                confidence_threshold=0.5,
+            )
+            await router.initialize()
+            self.processor = DocumentProcessorService(
+                _gl_service(), self.pds, router, self.storage
+            )
+            self.processor.reprocess_document = self._record(
+                self.processor.reprocess_document
+            )
+        else:
+            self.processor = DocumentProcessorService(
+                MagicMock(), self.pds, MagicMock(), self.storage
+            )
+            self.processor.reprocess_document = self._reprocess
+        self.service = ClaudeBatchService(
+            self.pds, self.processor, self.storage, self.client, **self.batch_kwargs
+        )
+        await self.service.initialize()
+        return self
+
+    async def stop(self):
+        await self.service.cleanup()
+        await self.client.cleanup()
+
+    def _record(self, reprocess_document):
+        async def reprocess(document_id, tenant_id=None):
+            self.priorities.append(request_priority.get())
+            result = await reprocess_document(document_id, tenant_id=tenant_id)
+            self.detections[document_id] = result
+            return result
+
+        return reprocess
+
+    async def _reprocess(self, document_id, tenant_id=None):
+        """Step 4 of the pipeline on the stored document."""
+        if document_id == self.fail_on:
+            raise RuntimeError("worker crashed")
+        self.priorities.append(request_priority.get())
+        document = await self.storage.retrieve_document(document_id, tenant_id)
+        if document is None:
+            return UploadResult(  # type: ignore[call-arg]
+                success=False,
+                document_id=document_id,
+                processing_status=ProcessingStatus.ERROR.value,
+            )
+        text, image = await self.processor.prepare_detection_inputs(
+            document.content, document.metadata.filename
+        )
+        self.detections[document_id] = await self.pds.detect_payment_status(text, image)
+        return UploadResult(  # type: ignore[call-arg]
+            success=True,
+            document_id=document_id,
+            processing_status=ProcessingStatus.COMPLETED.value,
+        )
+
+
+def _gl_service():
+    gl = MagicMock()
+    gl.classify_document_text = AsyncMock(
+        return_value=GLClassificationResult(
+            gl_account_code="6000",
+            gl_account_name="Professional Services",
+            category="EXPENSES",
+            confidence=0.8,
+            reasoning="services keyword",
+            keywords_matched=["services"],
+            classification_method="keyword_matching",
+        )
+    )
+    return gl
+
+
+async def _harness(server, texts, **kwargs):
+    return await _Harness(server, texts, **kwargs).start()
+
+
+async def _run(service, document_ids):
+    job_id = await service.start_job(document_ids, TENANT)
+    await _finish(service, job_id)
+    return await service.get_job(job_id)
+
+
+async def _finish(service, job_id):
+    task = service._tasks.get(job_id)
+    if task is not None:
+        await asyncio.wait_for(task, timeout=10)
+
+
+# ---------------------------------------------------------------------------
+# Planning and priming
+# ---------------------------------------------------------------------------
+
+
+class TestPlanningAndPriming:
+    @pytest.mark.asyncio
+    async def test_plan_matches_interactive_request(self, server):
+        h = await _harness(server, {})
+        try:
+            requests = await h.pds.plan_claude_requests(_ambiguous(1))
+            assert [r.kind for r in requests] == ["text"]
+            excerpt = h.pds._text_excerpt(_ambiguous(1)).text
+            assert requests[0].params == h.pds._text_params(excerpt)
+            assert len(requests[0].custom_id) <= 64
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_local_consensus_plans_nothing(self, server):
+        h = await _harness(server, {})
+        try:
+            assert await h.pds.plan_claude_requests(_CLEAR_PAID) == []
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_primed_response_replaces_api_call(self, server):
+        h = await _harness(server, {})
+        try:
+            (request,) = await h.pds.plan_claude_requests(_ambiguous(1))
+            assert await h.pds.prime_claude_response(
+                request.kind, request.digest, PAID_RESPONSE
+            )
+            result = await h.pds._detect_claude_text(_ambiguous(1))
+            assert result.payment_status == PaymentStatus.PAID
+            assert result.details["cached"] is True
+            assert server.requests == 0
+            # Already answered: not planned again
+            assert await h.pds.plan_claude_requests(_ambiguous(1)) == []
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_unknown_response_not_primed(self, server):
+        h = await _harness(server, {})
+        try:
+            (request,) = await h.pds.plan_claude_requests(_ambiguous(1))
+            assert not await h.pds.prime_claude_response(
+                request.kind, request.digest, "I cannot tell from this document."
+            )
+            assert await h.pds._stored_response(request.kind, request.digest) is None
+        finally:
+            await h.stop()
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+
+class TestBatchJobs:
+    @pytest.mark.asyncio
+    async def test_job_reprocesses_backlog_without_interactive_calls(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(4)}
+        texts["doc-dup"] = _ambiguous(0)  # identical content, one request
+        texts["doc-clear"] = _CLEAR_PAID  # settled locally, not submitted
+        h = await _harness(server, texts)
+        try:
+            job = await _run(h.service, list(texts))
+            assert job["status"] == COMPLETED
+            assert len(server.batches) == 1
+            (batch,) = server.batches.values()
+            assert len(batch["requests"]) == 4
+            assert job["results"]["succeeded"] == 4
+            assert job["results"]["primed"] == 4
+            assert (job["reprocessed"], job["failed"]) == (6, 0)
+
+            # Every document went through normal consensus with no live calls;
+            # Claude Text answered from the primed batch responses
+            assert server.requests == 0
+            for document_id, result in h.detections.items():
+                if document_id == "doc-clear":
+                    continue
+                claude = result.method_results["claude_text"]
+                assert claude["status"] == PaymentStatus.PAID.value, document_id
+                assert claude["details"]["cached"] is True
+            assert set(h.priorities) == {BACKGROUND}
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_job_reprocesses_through_document_processor(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(3)}
+        h = await _harness(server, texts, full_pipeline=True)
+        try:
+            job = await _run(h.service, list(texts))
+            assert job["status"] == COMPLETED
+            assert (job["reprocessed"], job["failed"]) == (3, 0)
+            assert server.requests == 0
+            for document_id, result in h.detections.items():
+                assert result.success is True, result.error_message
+                payment = result.classification_result["payment_detection"]
+                claude = payment["method_results"]["claude_text"]
+                assert claude["status"] == PaymentStatus.PAID.value, document_id
+                assert claude["details"]["cached"] is True
+                assert result.classification_result["billing_routing"]["reasoning"]
+            assert set(h.priorities) == {BACKGROUND}
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_requests_split_across_batches(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(5)}
+        h = await _harness(server, texts, max_requests_per_batch=2)
+        try:
+            job = await _run(h.service, list(texts))
+            assert job["status"] == COMPLETED
+            assert [len(b["requests"]) for b in job["batches"]] == [2, 2, 1]
+            assert job["results"]["primed"] == 5
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_errored_results_fall_back_to_normal_path(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(3)}
+        h = await _harness(server, texts)
+        try:
+            (errored,) = await h.pds.plan_claude_requests(texts["doc-1"])
+            server.batch_errors = {errored.custom_id}
+            h.processor.reprocess_document = _succeed
+            job = await _run(h.service, list(texts))
+            assert job["results"]["succeeded"] == 2
+            assert job["results"]["errored"] == 1
+            assert job["results"]["primed"] == 2
+            assert await h.pds._stored_response("text", errored.digest) is None
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_missing_documents_counted_as_failed(self, db, server):
+        h = await _harness(server, {"doc-0": _ambiguous(0)})
+        try:
+            job = await _run(h.service, ["doc-0", "doc-gone"])
+            assert job["status"] == COMPLETED
+            assert (job["reprocessed"], job["failed"]) == (2, 1)
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_batch_usage_accounted_to_tenant(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(3)}
+        h = await _harness(server, texts)
+        h.pds.usage_service = ClaudeUsageService(persistent=False)
+        try:
+            await _run(h.service, list(texts))
+            usage = h.pds.usage_service.usage(TENANT)
+            assert (usage.calls, usage.batch_calls) == (0, 3)
+            assert usage.input_tokens == 300
+            # Half the interactive price
+            assert usage.cost_usd == pytest.approx(
+                h.pds.usage_service.estimate_cost(300, 60) / 2
+            )
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_job_is_tenant_scoped(self, db, server):
+        h = await _harness(server, {"doc-0": _ambiguous(0)})
+        try:
+            job = await _run(h.service, ["doc-0"])
+            assert await h.service.get_job(job["id"], "tenant-b") is None
+            assert await h.service.get_job(job["id"], TENANT) is not None
+            summary = h.service.job_summary(job)
+            assert summary["batches"][0]["requests"] == 1
+        finally:
+            await h.stop()
+
+
+class TestResume:
+    @pytest.mark.asyncio
+    async def test_failed_job_resumes_from_saved_progress(self, db, server):
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(4)}
+        h = await _harness(server, texts, fail_on="doc-2", save_every=1)
+        try:
+            job = await _run(h.service, list(texts))
+            assert job["status"] == FAILED
+            assert "worker crashed" in job["error"]
+            assert job["reprocessed"] == 2
+        finally:
+            await h.stop()
+
+        # A fresh process: primed responses are gone, the job row remains
+        h = await _harness(server, texts)
+        try:
+            assert await h.service.resume_job(job["id"], TENANT)
+            await _finish(h.service, job["id"])
+            job = await h.service.get_job(job["id"])
+            assert job["status"] == COMPLETED
+            assert job["reprocessed"] == 4
+            # No resubmission; results were downloaded again and re-primed
+            assert len(server.batches) == 1
+            assert server.batch_result_downloads == 2
+            assert set(h.detections) == {"doc-2", "doc-3"}
+            assert server.requests == 0
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_restart_while_polling_resumes_unfinished_job(self, db, server):
+        server.batch_latency = 0.5
+        texts = {f"doc-{n}": _ambiguous(n) for n in range(3)}
+        h = await _harness(server, texts)
+        try:
+            job_id = await h.service.start_job(list(texts), TENANT)
+            while server.batch_status_checks == 0:
+                await asyncio.sleep(0.01)
+        finally:
+            await h.stop()  # shutdown cancels the running job
+        assert (await h.service.get_job(job_id))["status"] == PROCESSING
+
+        h = await _harness(server, texts)
+        try:
+            assert await h.service.resume_unfinished_jobs() == 1
+            await _finish(h.service, job_id)
+            job = await h.service.get_job(job_id)
+            assert job["status"] == COMPLETED
+            assert len(server.batches) == 1
+            assert server.requests == 0
+        finally:
+            await h.stop()
+
+    @pytest.mark.asyncio
+    async def test_completed_job_not_resumed(self, db, server):
+        h = await _harness(server, {"doc-0": _ambiguous(0)})
+        try:
+            job = await _run(h.service, ["doc-0"])
+            assert not await h.service.resume_job(job["id"], TENANT)
+        finally:
+            await h.stop()
+
+
+async def _succeed(document_id, tenant_id=None):
+    return UploadResult(  # type: ignore[call-arg]
+        success=True,
+        document_id=document_id,
+        processing_status=ProcessingStatus.COMPLETED.value,
+    )
@@ -0,0 +1,328 @@
+"""
+Tests for the shared Claude client and its adaptive concurrency limiter.
+Covers AIMD limit changes, Retry-After pauses, priority ordering, slot
+accounting on cancellation, end-to-end behaviour against a local fake
+Claude server that injects latency and 429/529 responses, and payment
+detection routed through the shared client.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_claude_server import FakeClaudeServer
+from shared.core.exceptions import CLAUDEAPIError
+from shared.core.models import PaymentStatus
+from utils.concurrency_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    AdaptiveConcurrencyLimiter,
+    background_priority,
+    request_priority,
+)
+
+from services.claude_client_service import ClaudeClientService
+from services.payment_detection_service import PaymentDetectionService
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+
+async def _hold(limiter, release, order, label, priority=None):
+    async with limiter.slot(priority):
+        order.append(label)
+        await release.wait()
+
+
+class TestAdaptiveConcurrencyLimiter:
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2)
+        release, order = asyncio.Event(), []
+        tasks = [
+            asyncio.create_task(_hold(limiter, release, order, n)) for n in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        assert (limiter.in_flight, limiter.queued) == (2, 3)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2, 3, 4]
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_queued_background(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        release, order = asyncio.Event(), []
+        tasks = [asyncio.create_task(_hold(limiter, release, order, "running"))]
+        await asyncio.sleep(0)
+        for n in range(3):
+            tasks.append(
+                asyncio.create_task(
+                    _hold(limiter, release, order, f"background-{n}", BACKGROUND)
+                )
+            )
+        await asyncio.sleep(0)
+        tasks.append(
+            asyncio.create_task(
+                _hold(limiter, release, order, "interactive", INTERACTIVE)
+            )
+        )
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order[:2] == ["running", "interactive"]
+
+    @pytest.mark.asyncio
+    async def test_priority_follows_context(self):
+        seen = []
+        limiter = AdaptiveConcurrencyLimiter()
+
+        async def call():
+            async with limiter.slot() as slot:
+                seen.append(slot.priority)
+
+        await call()
+        with background_priority():
+            # Tasks created here inherit the background priority
+            await asyncio.gather(call(), call())
+        await call()
+        assert seen == [INTERACTIVE, BACKGROUND, BACKGROUND, INTERACTIVE]
+        assert request_priority.get() == INTERACTIVE
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_and_multiplicative_decrease(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8)
+        for _ in range(40):
+            async with limiter.slot():
+                pass
+        assert limiter.limit == 8
+
+        async with limiter.slot() as slot:
+            slot.mark_overloaded()
+        assert limiter.limit == 4
+        # Pushback from calls already in flight does not cut it again
+        async with limiter.slot() as slot:
+            slot.mark_overloaded()
+        assert limiter.limit == 4
+        assert limiter.get_statistics()["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_calls_shrink_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_target=0.01)
+        async with limiter.slot():
+            await asyncio.sleep(0.03)
+        assert limiter.limit == 2
+        assert limiter.get_statistics()["slow_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_never_below_floor(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+        for _ in range(10):
+            async with limiter.slot() as slot:
+                slot.mark_overloaded()
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_new_calls(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+        async with limiter.slot() as slot:
+            slot.mark_overloaded(retry_after=0.2)
+        start = time.monotonic()
+        async with limiter.slot():
+            pass
+        assert time.monotonic() - start >= 0.19
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        release, order = asyncio.Event(), []
+        holder = asyncio.create_task(_hold(limiter, release, order, "a"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(limiter, release, order, "b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        async with limiter.slot():
+            assert limiter.in_flight == 1
+
+
+# ---------------------------------------------------------------------------
+# Client service against the fake server
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def server():
+    fake = await FakeClaudeServer().start()
+    yield fake
+    await fake.stop()
+
+
+async def _service(server, **kwargs):
+    service = ClaudeClientService("test-key", base_url=server.url, **kwargs)
+    await service.initialize()
+    return service
+
+
+async def _ask(service, text="Invoice 42"):
+    response = await service.messages.create(
+        model="fake",
+        max_tokens=100,
+        messages=[{"role": "user", "content": text}],
+    )
+    return response.content[0].text
+
+
+class TestClaudeClientService:
+    @pytest.mark.asyncio
+    async def test_requests_go_through_shared_client(self, server):
+        service = await _service(server)
+        try:
+            assert "PAID" in await _ask(service)
+            stats = service.get_statistics()
+            assert (stats["requests"], stats["success"]) == (1, 1)
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_pushback_raised_as_claude_api_error(self, server):
+        server.fail_next(1, status=429)
+        service = await _service(server)
+        try:
+            with pytest.raises(CLAUDEAPIError) as excinfo:
+                await _ask(service)
+            assert excinfo.value.api_status == 429
+            assert service.limiter.get_statistics()["overloads"] == 1
+            assert "PAID" in await _ask(service)  # after the Retry-After pause
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_burst_adapts_to_provider_capacity(self, server):
+        server.max_concurrency = 3
+        server.retry_after = 0.05
+        service = await _service(server, initial_concurrency=12, max_concurrency=12)
+
+        async def ask_until_served(n):
+            while True:
+                try:
+                    return await _ask(service, f"doc {n}")
+                except CLAUDEAPIError:
+                    continue
+
+        try:
+            answers = await asyncio.gather(*(ask_until_served(n) for n in range(40)))
+            assert len(answers) == 40
+            assert server.peak_concurrency <= 3
+            assert service.limiter.limit < 12
+            # Far fewer rejections than one per request in the burst
+            assert server.rejected < 40
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_interactive_served_before_background_backlog(self, server):
+        server.latency = 0.02
+        service = await _service(server, initial_concurrency=1, max_concurrency=1)
+        try:
+            with background_priority():
+                backlog = [
+                    asyncio.create_task(_ask(service, f"background {n}"))
+                    for n in range(6)
+                ]
+            await asyncio.sleep(0.01)
+            await _ask(service, "interactive upload")
+            await asyncio.gather(*backlog)
+            assert server.accepted.index("interactive upload") <= 2
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_sdk_client_built_on_first_request(self, server):
+        service = await _service(server)
+        try:
+            assert service.available and service.client is None
+            assert "PAID" in await _ask(service)
+            assert service.get_statistics()["connected"] is True
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_eager_import_connects_at_initialize(self, server):
+        service = await _service(server, lazy_import=False)
+        try:
+            assert service.client is not None
+            assert await service.connect() is service.client
+        finally:
+            await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_without_api_key(self):
+        service = ClaudeClientService(None)
+        await service.initialize()
+        assert not service.available
+        with pytest.raises(CLAUDEAPIError):
+            await _ask(service)
+
+
+class _PushbackError(Exception):
+    status_code = 429
+
+
+def _sdk_client(**create_kwargs):
+    """Stand-in for the pooled SDK client behind the service."""
+    client = MagicMock()
+    client.messages.create = AsyncMock(**create_kwargs)
+    client.close = AsyncMock()
+    return client
+
+
+class TestPaymentDetectionIntegration:
+    @pytest.mark.asyncio
+    async def test_payment_service_uses_shared_client(self):
+        service = ClaudeClientService("test-key")
+        service.client = _sdk_client(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text="PAID (confidence: 0.9)")]
+            )
+        )
+        pds = PaymentDetectionService(
+            {"enabled": True, "api_key": "unused", "model": "m", "temperature": 0},
+            ["claude_text"],
+            claude_client_service=service,
+        )
+        await pds.initialize()
+        assert pds.claude_client is service
+        result = await pds._detect_claude_text("Invoice 42 PAID")
+        assert result.payment_status == PaymentStatus.PAID
+        assert service.get_statistics()["success"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_do_not_open_circuit_breaker(self):
+        service = ClaudeClientService("test-key")
+        service.client = _sdk_client(side_effect=_PushbackError("rate limited"))
+        pds = PaymentDetectionService(
+            {"enabled": True, "model": "m", "temperature": 0},
+            ["claude_text"],
+            claude_client_service=service,
+        )
+        await pds.initialize()
+        for _ in range(6):
+            with pytest.raises(CLAUDEAPIError):
+                await pds._request_claude_text.__wrapped__(pds, "Invoice 42")
+        assert not pds._claude_circuit.is_open
+        assert service.get_statistics()["overloaded"] == 6
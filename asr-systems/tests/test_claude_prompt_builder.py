@@ -0,0 +1,109 @@
+"""
+Tests for relevance-windowed prompt compaction.
+Covers the token budget, window selection around payment indicators and
+amounts, document-order assembly, and token accounting in Claude Text.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from services.claude_prompt_builder import (
+    OMISSION_MARKER,
+    compact_document_text,
+    estimate_tokens,
+)
+from services.payment_detection_service import PaymentDetectionService
+from services.payment_indicator_scanner import PaymentIndicatorScanner
+
+FILLER = "Item {n:04d}  Widget assembly, bracket kit, hardware  qty 3"
+
+
+def _statement(decisive_line, at, lines=800):
+    body = [FILLER.format(n=n) for n in range(lines)]
+    body.insert(at, decisive_line)
+    return "ACME SUPPLY CO - STATEMENT\n" + "\n".join(body) + "\nEnd of statement"
+
+
+def _compact(text, budget):
+    return compact_document_text(text, PaymentIndicatorScanner().scan(text), budget)
+
+
+class TestCompaction:
+    def test_short_text_unchanged(self):
+        text = "Invoice 12 balance due: $40.00"
+        result = _compact(text, 2000)
+        assert result.text == text
+        assert not result.compacted
+
+    def test_no_budget_sends_everything(self):
+        text = _statement("PAID IN FULL", 400)
+        assert _compact(text, None).text == text
+
+    @pytest.mark.parametrize("position", [5, 400, 795])
+    def test_decisive_line_kept_under_budget(self, position):
+        text = _statement("BALANCE DUE: $1,250.00  please remit", position)
+        result = _compact(text, 300)
+        assert result.compacted
+        assert result.tokens <= 300 < result.original_tokens
+        assert "BALANCE DUE: $1,250.00  please remit" in result.text
+
+    def test_context_and_document_order(self):
+        text = _statement("Payment received - check #4411  PAID IN FULL", 400)
+        result = _compact(text, 300)
+        lines = result.text.splitlines()
+        index = lines.index("Payment received - check #4411  PAID IN FULL")
+        # One neighbouring line either side of the match
+        assert lines[index - 1] == FILLER.format(n=399)
+        assert lines[index + 1] == FILLER.format(n=400)
+        assert result.text.startswith("ACME SUPPLY CO - STATEMENT")
+        assert OMISSION_MARKER.strip() in lines
+        assert result.windows >= 3  # head, match, tail
+
+    def test_long_lines_are_chunked(self):
+        text = ("lorem ipsum " * 5000) + "VOID credit memo issued" + (" dolor" * 5000)
+        result = _compact(text, 200)
+        assert "VOID credit memo issued" in result.text
+        assert result.tokens <= 200
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestClaudeTextIntegration:
+    @pytest.mark.asyncio
+    async def test_compacted_prompt_and_token_usage(self):
+        client = MagicMock()
+        client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text="UNPAID (confidence: 0.9)")],
+                usage=SimpleNamespace(input_tokens=412, output_tokens=37),
+            )
+        )
+        pds = PaymentDetectionService(
+            {"enabled": False, "model": "m", "temperature": 0.0},
+            ["claude_text"],
+            text_token_budget=300,
+        )
+        await pds.initialize()
+        pds.claude_client = client
+
+        text = _statement("BALANCE DUE: $1,250.00", 600)
+        result = await pds._detect_claude_text(text)
+
+        prompt = client.messages.create.await_args.kwargs["messages"][0]["content"]
+        assert "BALANCE DUE: $1,250.00" in prompt
+        assert len(prompt) < len(text) / 4
+        assert result.details["compacted"] is True
+        assert result.details["prompt_tokens_estimate"] <= 300
+        stats = pds.get_statistics()
+        assert (stats["input_tokens"], stats["output_tokens"]) == (412, 37)
+        assert stats["prompt_tokens_saved"] > 0
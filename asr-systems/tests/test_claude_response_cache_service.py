@@ -0,0 +1,203 @@
+"""
+Tests for the Claude response cache.
+Covers memory and database tiers, TTL and size limits, statistics, and the
+payment detection integration: identical content skips the API, while
+failures and UNKNOWN responses are never cached.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.exceptions import CLAUDEAPIError
+from shared.core.models import PaymentStatus
+
+from config.database import close_database, init_database
+from services.claude_response_cache_service import (
+    ClaudeResponseCacheService,
+    content_hash,
+)
+from services.payment_detection_service import (
+    PROMPT_VERSIONS,
+    PaymentDetectionService,
+)
+
+PAID_RESPONSE = "PAID (confidence: 0.92) - stamp reads PAID with check #1001"
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def db():
+    await init_database("sqlite:///")
+    yield
+    await close_database()
+
+
+@pytest.fixture
+async def cache(db):
+    service = ClaudeResponseCacheService()
+    await service.initialize()
+    yield service
+    await service.cleanup()
+
+
+async def _put(cache, key="k1", text=PAID_RESPONSE, latency=2.5):
+    return await cache.put("text", key, "model-a", "v1", "digest", text, latency)
+
+
+def _client(text=PAID_RESPONSE):
+    client = MagicMock()
+    client.messages.create = AsyncMock(
+        return_value=SimpleNamespace(content=[SimpleNamespace(text=text)])
+    )
+    return client
+
+
+async def _pds(cache, client):
+    service = PaymentDetectionService(
+        {"enabled": False, "model": "model-a", "temperature": 0.0},
+        ["claude_text", "claude_vision"],
+        response_cache=cache,
+    )
+    await service.initialize()
+    service.claude_client = client
+    return service
+
+
+# ---------------------------------------------------------------------------
+# Cache service
+# ---------------------------------------------------------------------------
+
+
+class TestCacheService:
+    @pytest.mark.asyncio
+    async def test_key_covers_model_prompt_and_content(self):
+        key = ClaudeResponseCacheService.make_key
+        base = key("text", "model-a", "v1", content_hash("doc"))
+        assert base == key("text", "model-a", "v1", content_hash("doc"))
+        assert base != key("text", "model-b", "v1", content_hash("doc"))
+        assert base != key("text", "model-a", "v2", content_hash("doc"))
+        assert base != key("text", "model-a", "v1", content_hash("doc "))
+        assert base != key("vision", "model-a", "v1", content_hash("doc"))
+        assert content_hash("doc") == content_hash(b"doc")
+
+    @pytest.mark.asyncio
+    async def test_memory_then_database_tier(self, cache):
+        assert await cache.get("text", "k1") is None
+        assert await _put(cache)
+        assert await cache.get("text", "k1") == PAID_RESPONSE
+
+        # A second worker shares the database tier
+        other = ClaudeResponseCacheService()
+        assert await other.get("text", "k1") == PAID_RESPONSE
+        assert await other.get("text", "k1") == PAID_RESPONSE
+        stats = other.get_statistics()
+        assert (stats["db_hits"], stats["memory_hits"]) == (1, 1)
+        assert stats["seconds_saved"] == pytest.approx(5.0)
+        assert stats["hit_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss_and_purge(self, cache):
+        await _put(cache)
+        cache.ttl_seconds = 0
+        assert await cache.get("text", "k1") is None
+        assert await cache.purge_expired() == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_and_empty_responses_rejected(self, cache):
+        cache.max_response_bytes = 10
+        assert not await _put(cache, text="x" * 11)
+        assert not await _put(cache, text="")
+        assert await cache.get("text", "k1") is None
+        assert cache.get_statistics()["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_row_limit_evicts_oldest(self, cache):
+        cache.max_rows = 2
+        for key in ("a", "b", "c"):
+            await _put(cache, key=key)
+        assert await cache.enforce_row_limit() == 1
+        cache._entries.clear()
+        assert await cache.get("text", "a") is None
+        assert await cache.get("text", "c") == PAID_RESPONSE
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_is_inert(self, db):
+        cache = ClaudeResponseCacheService(enabled=False)
+        assert not await _put(cache)
+        assert await cache.get("text", "k1") is None
+
+
+# ---------------------------------------------------------------------------
+# Payment detection integration
+# ---------------------------------------------------------------------------
+
+
+class TestPaymentDetectionIntegration:
+    @pytest.mark.asyncio
+    async def test_identical_text_served_from_cache(self, cache):
+        client = _client()
+        pds = await _pds(cache, client)
+
+        first = await pds._detect_claude_text("Invoice 42 PAID")
+        second = await pds._detect_claude_text("Invoice 42 PAID")
+        assert client.messages.create.await_count == 1
+        assert first.payment_status == second.payment_status == PaymentStatus.PAID
+        assert (first.details["cached"], second.details["cached"]) == (False, True)
+
+        await pds._detect_claude_text("Invoice 43 PAID")
+        assert client.messages.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vision_keyed_by_image_bytes(self, cache):
+        client = _client()
+        pds = await _pds(cache, client)
+        await pds._detect_claude_vision(b"image-1", "text a")
+        await pds._detect_claude_vision(b"image-1", "text b")
+        await pds._detect_claude_vision(b"image-2", "text a")
+        assert client.messages.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_responses_not_cached(self, cache):
+        client = _client("I cannot tell from this document.")
+        pds = await _pds(cache, client)
+        result = await pds._detect_claude_text("blurry")
+        assert result.payment_status == PaymentStatus.UNKNOWN
+        await pds._detect_claude_text("blurry")
+        assert client.messages.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self, cache):
+        pds = await _pds(cache, _client())
+        pds._request_claude_text = AsyncMock(
+            side_effect=CLAUDEAPIError("circuit breaker is open")
+        )
+        with pytest.raises(CLAUDEAPIError):
+            await pds._detect_claude_text("Invoice 42 PAID")
+        assert cache.get_statistics()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prompt_version_in_stored_row(self, cache):
+        pds = await _pds(cache, _client())
+        await pds._detect_claude_text("Invoice 42 PAID")
+        key = cache.make_key(
+            "text", "model-a", PROMPT_VERSIONS["text"], content_hash("Invoice 42 PAID")
+        )
+        assert await cache.get("text", key) == PAID_RESPONSE
+
+    @pytest.mark.asyncio
+    async def test_cached_results_do_not_count_as_claude_calls(self, cache):
+        pds = await _pds(cache, _client())
+        pds.enabled_methods = pds.enabled_methods[:1]  # claude_text only
+        await pds.detect_payment_status("Invoice 42 PAID")
+        await pds.detect_payment_status("Invoice 42 PAID")
+        assert pds.get_statistics()["claude_calls"] == 1
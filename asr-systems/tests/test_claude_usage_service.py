@@ -0,0 +1,215 @@
+"""
+Tests for per-tenant Claude usage accounting and budgets.
+Covers spend estimates, budget resolution, database flushes shared by
+several workers, the daily reset, and payment detection downgrading to
+local-only methods once a tenant is over budget.
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import PaymentDetectionMethod
+
+import services.claude_usage_service as usage_module
+from config.database import close_database, init_database
+from services.claude_usage_service import ClaudeUsageService
+from services.payment_detection_service import PaymentDetectionService
+
+_AMBIGUOUS = "Invoice 1234 for services"
+
+
+@pytest.fixture
+async def db():
+    await init_database("sqlite:///")
+    yield
+    await close_database()
+
+
+async def _usage(**kwargs):
+    kwargs.setdefault("persistent", False)
+    service = ClaudeUsageService(**kwargs)
+    await service.initialize()
+    return service
+
+
+def _client(input_tokens=1000, output_tokens=100):
+    client = MagicMock()
+    client.messages.create = AsyncMock(
+        return_value=SimpleNamespace(
+            content=[SimpleNamespace(text="PAID (confidence: 0.9)")],
+            usage=SimpleNamespace(
+                input_tokens=input_tokens, output_tokens=output_tokens
+            ),
+        )
+    )
+    return client
+
+
+async def _pds(usage, client):
+    service = PaymentDetectionService(
+        {"enabled": False, "model": "m", "temperature": 0},
+        ["claude_text", "regex_patterns", "keyword_matching"],
+        usage_service=usage,
+    )
+    await service.initialize()
+    service.claude_client = client
+    return service
+
+
+class TestUsageAccounting:
+    @pytest.mark.asyncio
+    async def test_spend_estimate(self):
+        usage = await _usage(input_cost_per_mtok=3.0, output_cost_per_mtok=15.0)
+        usage.record("acme", 1_000_000, 100_000, latency_seconds=2.5)
+        usage.record("acme", 1_000_000, 100_000, batch=True)
+        report = usage.get_tenant_report("acme")["usage"]
+        assert (report["calls"], report["batch_calls"]) == (1, 1)
+        assert report["tokens"] == 2_200_000
+        # 4.50 interactive + half price in a batch
+        assert report["cost_usd"] == pytest.approx(4.5 + 2.25)
+        assert report["latency_seconds"] == 2.5
+        assert usage.usage("other").calls == 0
+
+    @pytest.mark.asyncio
+    async def test_budgets_default_and_override(self):
+        usage = await _usage(
+            default_budgets={"calls": 2, "tokens": 0},
+            tenant_budgets={"vip": {"calls": 0, "spend_usd": 100}},
+        )
+        assert usage.budgets_for("acme") == {"calls": 2.0}
+        assert usage.budgets_for("vip") == {"calls": 0.0, "spend_usd": 100.0}
+        for _ in range(2):
+            usage.record("acme", 10, 10)
+            usage.record("vip", 10, 10)
+        assert usage.exceeded_budget("acme") == "calls"
+        assert usage.exceeded_budget("vip") is None
+        assert usage.get_tenant_report("acme")["remaining"] == {"calls": 0.0}
+
+    def test_unknown_budget_rejected(self):
+        with pytest.raises(ValueError):
+            ClaudeUsageService(default_budgets={"dollars": 5})
+
+    @pytest.mark.asyncio
+    async def test_daily_reset(self, monkeypatch):
+        usage = await _usage(default_budgets={"calls": 1})
+        usage.record("acme", 10, 10)
+        assert usage.exceeded_budget("acme") == "calls"
+        monkeypatch.setattr(usage_module, "_today", lambda: "2999-01-01")
+        assert usage.exceeded_budget("acme") is None
+        assert usage.usage("acme").calls == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_records_nothing(self):
+        usage = await _usage(enabled=False, default_budgets={"calls": 1})
+        usage.record("acme", 10, 10)
+        assert usage.usage("acme").calls == 0
+        assert usage.exceeded_budget("acme") is None
+
+
+class TestPersistence:
+    @pytest.mark.asyncio
+    async def test_workers_share_totals_through_database(self, db):
+        worker_a = await _usage(persistent=True, default_budgets={"calls": 3})
+        worker_b = await _usage(persistent=True, default_budgets={"calls": 3})
+        try:
+            worker_a.record("acme", 100, 10)
+            worker_b.record("acme", 100, 10)
+            worker_b.record("acme", 100, 10)
+            assert await worker_a.flush() == 1
+            assert await worker_b.flush() == 1
+            # Worker B's refresh sees A's call as well
+            assert worker_b.usage("acme").calls == 3
+            assert worker_b.exceeded_budget("acme") == "calls"
+        finally:
+            await worker_a.cleanup()
+            await worker_b.cleanup()
+
+        # A restarted worker starts from the persisted totals
+        restarted = await _usage(persistent=True)
+        try:
+            usage = restarted.usage("acme")
+            assert (usage.calls, usage.input_tokens) == (3, 300)
+        finally:
+            await restarted.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_flushes_pending_usage(self, db):
+        usage = await _usage(persistent=True, flush_interval_seconds=3600)
+        usage.record("acme", 5, 5)
+        await usage.cleanup()
+        reloaded = await _usage(persistent=True)
+        try:
+            assert reloaded.usage("acme").calls == 1
+        finally:
+            await reloaded.cleanup()
+
+
+class TestBudgetDowngrade:
+    @pytest.mark.asyncio
+    async def test_claude_calls_accounted_to_tenant(self):
+        usage = await _usage()
+        pds = await _pds(usage, _client(input_tokens=800, output_tokens=50))
+        await pds.detect_payment_status(_AMBIGUOUS, tenant_id="acme")
+        acme = usage.usage("acme")
+        assert (acme.calls, acme.input_tokens, acme.output_tokens) == (1, 800, 50)
+        assert acme.latency_seconds >= 0
+        assert usage.usage("default").calls == 0
+
+    @pytest.mark.asyncio
+    async def test_over_budget_tenant_gets_local_only_detection(self):
+        usage = await _usage(default_budgets={"calls": 1})
+        client = _client()
+        pds = await _pds(usage, client)
+
+        await pds.detect_payment_status(_AMBIGUOUS, tenant_id="acme")
+        result = await pds.detect_payment_status(_AMBIGUOUS, tenant_id="acme")
+        assert client.messages.create.await_count == 1
+        assert PaymentDetectionMethod.CLAUDE_TEXT not in result.methods_used
+        assert result.methods_used  # local methods still decide
+        assert pds.get_statistics()["budget_downgrades"] == 1
+        assert usage.usage("acme").downgrades == 1
+
+        # Other tenants keep their own budget
+        await pds.detect_payment_status(_AMBIGUOUS, tenant_id="globex")
+        assert client.messages.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_downgrade_without_usage_service(self):
+        client = _client()
+        pds = await _pds(None, client)
+        consensus, claude_calls, _ = await pds._run_detection(
+            _AMBIGUOUS, None, None, exceeded_budget="calls"
+        )
+        assert claude_calls == 0
+        client.messages.create.assert_not_awaited()
+        assert PaymentDetectionMethod.CLAUDE_TEXT not in consensus.methods_used
+        assert pds.get_statistics()["budget_downgrades"] == 1
+
+    @pytest.mark.asyncio
+    async def test_spend_budget(self):
+        usage = await _usage(
+            default_budgets={"spend_usd": 0.01},
+            input_cost_per_mtok=3.0,
+            output_cost_per_mtok=15.0,
+        )
+        client = _client(input_tokens=3000, output_tokens=100)  # $0.0105
+        pds = await _pds(usage, client)
+        await pds.detect_payment_status(_AMBIGUOUS, tenant_id="acme")
+        assert usage.exceeded_budget("acme") == "spend_usd"
+        await pds.detect_payment_status(_AMBIGUOUS, tenant_id="acme")
+        assert client.messages.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_over_budget_tenant_plans_no_batch_requests(self):
+        usage = await _usage(default_budgets={"calls": 1})
+        usage.record("acme", 10, 10)
+        pds = await _pds(usage, _client())
+        assert await pds.plan_claude_requests(_AMBIGUOUS, tenant_id="acme") == []
+        assert await pds.plan_claude_requests(_AMBIGUOUS, tenant_id="globex")
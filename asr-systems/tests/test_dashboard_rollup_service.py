@@ -0,0 +1,435 @@
+"""
+Tests for materialized dashboard rollups.
+Covers batched rollup upserts, per-tenant KPI, trend, distribution and
+aging reads, the recent documents list, the one-time metadata backfill,
+and the document pipeline hook that feeds the rollups.
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import (
+    BillingDestination,
+    DocumentMetadata,
+    PaymentConsensusResult,
+    PaymentDetectionMethod,
+    PaymentStatus,
+)
+
+from config.database import close_database, init_database
+from services.dashboard_rollup_service import DashboardRollupService
+from services.document_processor_service import DocumentProcessorService
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _payment_result(status, confidence):
+    return PaymentConsensusResult(
+        payment_status=status,
+        confidence=confidence,
+        methods_used=[PaymentDetectionMethod.REGEX_PATTERNS],
+        method_results={},
+        quality_score=0.8,
+        consensus_reached=True,
+    )
+
+
+@pytest.fixture
+async def svc():
+    await init_database("sqlite:///")
+    service = DashboardRollupService(recent_limit=3)
+    await service.initialize()
+    yield service
+    await service.cleanup()
+    await close_database()
+
+
+_counter = 0
+
+
+def _doc(tenant_id="t1", days_ago=0, **kwargs):
+    global _counter
+    _counter += 1
+    doc = {
+        "document_id": f"doc-{_counter}",
+        "tenant_id": tenant_id,
+        "processed_at": datetime.utcnow() - timedelta(days=days_ago),
+        "filename": f"invoice-{_counter}.pdf",
+        "vendor_name": "Acme Lumber",
+        "amount": 100.0,
+        "gl_account_code": "5000",
+        "gl_account_name": "Materials",
+        "gl_confidence": 0.9,
+        "payment_status": PaymentStatus.PAID,
+        "payment_confidence": 0.8,
+        "billing_destination": BillingDestination.CLOSED_PAYABLE,
+        "routing_confidence": 0.95,
+        "manual_review": False,
+        "processing_ms": 200.0,
+    }
+    doc.update(kwargs)
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+
+class TestRollupReads:
+    @pytest.mark.asyncio
+    async def test_kpis_from_rollups(self, svc):
+        await svc.record_documents(
+            [
+                _doc(),
+                _doc(
+                    amount=50.0,
+                    gl_account_code="6000",
+                    payment_status=PaymentStatus.UNPAID,
+                    billing_destination=BillingDestination.OPEN_PAYABLE,
+                    manual_review=True,
+                ),
+            ]
+        )
+        await svc.record_documents([_doc(amount=25.0)])
+
+        kpis = await svc.get_kpis("t1")
+        assert kpis["totalDocuments"] == 3
+        assert kpis["documentsThisMonth"] == 3
+        assert kpis["totalAmountProcessed"] == 175.0
+        assert kpis["glAccountsUsed"] == 2
+        assert kpis["classificationAccuracy"] == 90.0
+        assert kpis["averageProcessingTime"] == 200.0
+        assert kpis["manualReviewRate"] == 33.3
+        assert (kpis["openPayable"], kpis["closedPayable"]) == (1, 2)
+        assert len(kpis["recentDocuments"]) == 3
+        assert kpis["recentDocuments"][0]["status"] == "paid"
+
+    @pytest.mark.asyncio
+    async def test_reads_are_scoped_to_tenant(self, svc):
+        await svc.record_documents([_doc("t1"), _doc("t1"), _doc("t2")])
+        assert (await svc.get_kpis("t1"))["totalDocuments"] == 2
+        assert (await svc.get_kpis("t2"))["totalDocuments"] == 1
+        empty = await svc.get_kpis("t3")
+        assert empty["totalDocuments"] == 0
+        assert empty["recentDocuments"] == []
+
+    @pytest.mark.asyncio
+    async def test_trends_by_day(self, svc):
+        await svc.record_documents(
+            [_doc(days_ago=2), _doc(days_ago=2, manual_review=True), _doc()]
+        )
+        trends = await svc.get_trends("t1", "7d")
+        assert len(trends["documents"]) == 7
+        by_date = {d["date"]: d for d in trends["documents"]}
+        two_days = (datetime.utcnow() - timedelta(days=2)).strftime("%Y-%m-%d")
+        assert by_date[two_days]["total"] == 2
+        assert by_date[two_days]["manualReview"] == 1
+        assert sum(d["total"] for d in trends["documents"]) == 3
+        assert {a["accuracy"] for a in trends["accuracy"]} == {90.0}
+
+    @pytest.mark.asyncio
+    async def test_distributions(self, svc):
+        await svc.record_documents(
+            [
+                _doc(),
+                _doc(payment_status="unpaid", vendor_name="Beta Supply"),
+                _doc(vendor_name="  acme   LUMBER "),
+            ]
+        )
+        payments = await svc.get_payment_status_distribution("t1")
+        assert {p["status"]: p["count"] for p in payments["distribution"]} == {
+            "paid": 2,
+            "unpaid": 1,
+        }
+        vendors = (await svc.get_vendor_metrics("t1"))["topVendors"]
+        assert [(v["name"], v["count"]) for v in vendors] == [
+            ("Acme Lumber", 2),
+            ("Beta Supply", 1),
+        ]
+        gl = (await svc.get_gl_account_usage("t1"))["accounts"]
+        assert gl == [
+            {
+                "code": "5000",
+                "name": "Materials",
+                "count": 3,
+                "amount": 300.0,
+                "averageConfidence": 90.0,
+            }
+        ]
+        routing = (await svc.get_billing_destination_metrics("t1"))["routing"]
+        assert routing["automaticRouting"] == 3
+
+    @pytest.mark.asyncio
+    async def test_aging_uses_invoice_dates_of_unpaid_documents(self, svc):
+        now = datetime.utcnow()
+        await svc.record_documents(
+            [
+                _doc(payment_status="unpaid", invoice_date=now - timedelta(days=5)),
+                _doc(payment_status="partial", invoice_date=now - timedelta(days=45)),
+                _doc(payment_status="unpaid", invoice_date=now - timedelta(days=200)),
+                _doc(payment_status="paid", invoice_date=now - timedelta(days=200)),
+            ]
+        )
+        aging = await svc.get_aging("t1")
+        assert {b["range"]: b["count"] for b in aging["buckets"]} == {
+            "0-30": 1,
+            "31-60": 1,
+            "61-90": 0,
+            "90+": 1,
+        }
+        assert aging["summary"]["totalOutstanding"] == 300.0
+
+    @pytest.mark.asyncio
+    async def test_executive_summary(self, svc):
+        await svc.record_documents([_doc(), _doc(days_ago=40)])
+        summary = await svc.get_executive_summary("t1")
+        assert summary["totalDocumentsProcessed"] == 2
+        assert summary["totalValueProcessed"] == 200.0
+        assert summary["topGLAccounts"][0]["code"] == "5000"
+        assert summary["topVendors"][0]["name"] == "Acme Lumber"
+
+
+class TestRecentDocuments:
+    @pytest.mark.asyncio
+    async def test_recent_list_is_trimmed_per_tenant(self, svc):
+        for n in range(5):
+            await svc.record_documents([_doc(days_ago=5 - n)])
+        await svc.record_documents([_doc("t2")])
+        recent = (await svc.get_kpis("t1"))["recentDocuments"]
+        assert len(recent) == 3
+        assert recent[0]["processedAt"] > recent[-1]["processedAt"]
+        assert len((await svc.get_kpis("t2"))["recentDocuments"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_deleted_document_leaves_recent_list(self, svc):
+        doc = _doc()
+        await svc.record_documents([doc])
+        assert await svc.forget_document(doc["document_id"], "t1") is True
+        kpis = await svc.get_kpis("t1")
+        assert kpis["recentDocuments"] == []
+        assert kpis["totalDocuments"] == 0
+
+
+class TestDocumentReplacement:
+    @pytest.mark.asyncio
+    async def test_reprocessed_document_is_counted_once(self, svc):
+        doc = _doc(payment_status=PaymentStatus.UNPAID)
+        await svc.record_documents([_doc(gl_account_code="6000"), doc])
+        await svc.record_documents(
+            [
+                {
+                    **doc,
+                    "amount": 40.0,
+                    "gl_account_code": "7000",
+                    "payment_status": PaymentStatus.PAID,
+                }
+            ]
+        )
+
+        kpis = await svc.get_kpis("t1")
+        assert kpis["totalDocuments"] == 2
+        assert kpis["totalAmountProcessed"] == 140.0
+        accounts = (await svc.get_gl_account_usage("t1"))["accounts"]
+        assert sorted(a["code"] for a in accounts) == ["6000", "7000"]
+        statuses = (await svc.get_payment_status_distribution("t1"))["distribution"]
+        assert [(s["status"], s["count"]) for s in statuses] == [("paid", 2)]
+        assert (await svc.get_aging("t1"))["summary"]["documentCount"] == 0
+
+    @pytest.mark.asyncio
+    async def test_forget_reverses_every_dimension(self, svc):
+        kept, deleted = _doc(), _doc(gl_account_code="6000", vendor_name="Beta")
+        await svc.record_documents([kept, deleted])
+        await svc.forget_document(deleted["document_id"], "t1")
+
+        kpis = await svc.get_kpis("t1")
+        assert (kpis["totalDocuments"], kpis["glAccountsUsed"]) == (1, 1)
+        vendors = (await svc.get_vendor_metrics("t1"))["topVendors"]
+        assert [v["name"] for v in vendors] == ["Acme Lumber"]
+        assert kpis["closedPayable"] == 1
+
+    @pytest.mark.asyncio
+    async def test_forget_is_scoped_to_tenant(self, svc):
+        doc = _doc("t1")
+        await svc.record_documents([doc])
+        assert await svc.forget_document(doc["document_id"], "t2") is False
+        assert await svc.forget_document("unknown", "t1") is False
+        assert (await svc.get_kpis("t1"))["totalDocuments"] == 1
+
+
+class TestBackfill:
+    @pytest.mark.asyncio
+    async def test_backfill_from_metadata_files(self, tmp_path):
+        metadata = tmp_path / "metadata"
+        for tenant, count in (("t1", 2), ("t2", 1)):
+            (metadata / tenant).mkdir(parents=True)
+            for n in range(count):
+                (metadata / tenant / f"{tenant}-{n}.json").write_text(
+                    json.dumps(
+                        {
+                            "document_id": f"{tenant}-{n}",
+                            "filename": f"{n}.pdf",
+                            "tenant_id": tenant,
+                            "stored_at": datetime.utcnow().isoformat(),
+                        }
+                    )
+                )
+        (metadata / "t1" / "broken.json").write_text("{not json")
+
+        await init_database("sqlite:///")
+        try:
+            service = DashboardRollupService(metadata_path=metadata)
+            await service.initialize()
+            await service._backfill_task
+            assert service.get_statistics()["backfilled_documents"] == 3
+            kpis = await service.get_kpis("t1")
+            assert kpis["totalDocuments"] == 2
+            assert kpis["recentDocuments"][0]["status"] == "unknown"
+
+            # Rollups already exist, so a restart does not count them twice
+            again = DashboardRollupService(metadata_path=metadata)
+            await again.initialize()
+            await again._backfill_task
+            assert again.get_statistics()["backfilled_documents"] == 0
+            await service.cleanup()
+            await again.cleanup()
+        finally:
+            await close_database()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline hook
+# ---------------------------------------------------------------------------
+
+
+class TestPipelineHook:
+    @pytest.mark.asyncio
+    async def test_processed_document_is_rolled_up(self, svc):
+        processor = DocumentProcessorService(
+            gl_account_service=MagicMock(),
+            payment_detection_service=MagicMock(),
+            billing_router_service=MagicMock(),
+            storage_service=MagicMock(),
+            dashboard_rollup_service=svc,
+        )
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+            vendor_name="Acme Lumber",
+            amount=42.5,
+        )
+        gl = SimpleNamespace(
+            gl_account_code="5000", gl_account_name="Materials", confidence=0.7
+        )
+        payment = _payment_result(PaymentStatus.UNPAID, 0.6)
+        routing = SimpleNamespace(
+            destination=BillingDestination.OPEN_PAYABLE,
+            confidence=0.9,
+            manual_override=False,
+        )
+
+        await processor._record_dashboard_rollup(
+            "doc-x", metadata, gl, payment, routing, 120.0
+        )
+
+        kpis = await svc.get_kpis("t1")
+        assert kpis["totalDocuments"] == 1
+        assert kpis["openPayable"] == 1
+        assert kpis["paymentAccuracy"] == 60.0
+        assert kpis["recentDocuments"][0]["id"] == "doc-x"
+        aging = await svc.get_aging("t1")
+        assert aging["summary"]["documentCount"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_document_feeds_rollups(self, svc):
+        from services.billing_router_service import BillingRouterService
+        from services.gl_account_service import GLClassificationResult
+        from services.storage_service import StorageResult
+
+        gl = MagicMock()
+        gl.classify_document_text = AsyncMock(
+            return_value=GLClassificationResult(
+                gl_account_code="5000",
+                gl_account_name="Materials",
+                category="EXPENSES",
+                confidence=0.7,
+                reasoning="matched vendor",
+                keywords_matched=["lumber"],
+                classification_method="vendor_mapping",
+            )
+        )
+        payment = MagicMock()
+        payment.detect_payment_status = AsyncMock(
+            return_value=_payment_result(PaymentStatus.UNPAID, 0.8)
+        )
+        storage = MagicMock()
+        storage.store_document = AsyncMock(
+            return_value=StorageResult(success=True, storage_path="/tmp/inv.pdf")
+        )
+        router = BillingRouterService(
+            [destination.value for destination in BillingDestination],
+            confidence_threshold=0.5,
+        )
+        await router.initialize()
+        processor = DocumentProcessorService(
+            gl_account_service=gl,
+            payment_detection_service=payment,
+            billing_router_service=router,
+            storage_service=storage,
+            dashboard_rollup_service=svc,
+        )
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+            vendor_name="Acme Lumber",
+            amount=42.5,
+        )
+
+        result = await processor.process_document(
+            b"%PDF-1.4", metadata, document_id="doc-p"
+        )
+
+        assert result.success is True, result.error_message
+        kpis = await svc.get_kpis("t1")
+        assert kpis["totalDocuments"] == 1
+        assert kpis["openPayable"] == 1
+        assert kpis["paymentAccuracy"] == 80.0
+        assert kpis["recentDocuments"][0]["id"] == "doc-p"
+        vendors = (await svc.get_vendor_metrics("t1"))["topVendors"]
+        assert vendors[0]["name"] == "Acme Lumber"
+
+    @pytest.mark.asyncio
+    async def test_rollup_failure_does_not_break_pipeline(self):
+        broken = MagicMock()
+        broken.record_documents.side_effect = RuntimeError("db down")
+        processor = DocumentProcessorService(
+            gl_account_service=MagicMock(),
+            payment_detection_service=MagicMock(),
+            billing_router_service=MagicMock(),
+            storage_service=MagicMock(),
+            dashboard_rollup_service=broken,
+        )
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+        )
+        await processor._record_dashboard_rollup(
+            "doc-y", metadata, MagicMock(), MagicMock(), MagicMock(), 1.0
+        )
@@ -117,3 +117,28 @@ class TestMetricsAging:
     def test_aging_returns_200(self, client: TestClient) -> None:
         response = client.get("/metrics/aging")
         assert response.status_code == 200
+
+    def test_aging_has_buckets(self, client: TestClient) -> None:
+        data = client.get("/metrics/aging").json()
+        ranges = [b["range"] for b in data["buckets"]]
+        assert ranges == ["0-30", "31-60", "61-90", "90+"]
+        assert "totalOutstanding" in data["summary"]
+
+
+class TestMetricsTenantScope:
+    def test_unknown_tenant_sees_no_documents(self, client: TestClient) -> None:
+        data = client.get(
+            "/metrics/kpis", headers={"X-Tenant-ID": "tenant-with-no-documents"}
+        ).json()
+        assert data["totalDocuments"] == 0
+        assert data["recentDocuments"] == []
+
+
+class TestMetricsCache:
+    def test_repeated_requests_served_from_cache(self, client: TestClient) -> None:
+        headers = {"X-Tenant-ID": "cache-tenant"}
+        client.get("/metrics/kpis", headers=headers)
+        before = client.get("/api/status").json()["data"]["services"]
+        client.get("/metrics/kpis", headers=headers)
+        after = client.get("/api/status").json()["data"]["services"]
+        assert after["dashboard_cache"]["hits"] == before["dashboard_cache"]["hits"] + 1
@@ -162,12 +162,47 @@ class TestAlembicMigrationChain:
         cfg.set_main_option("script_location", str(self._alembic_root / "alembic"))
         script = ScriptDirectory.from_config(cfg)
         revisions = list(script.walk_revisions())
-        assert len(revisions) == 5  # 0001, 0002, 0003, 0004, 0005
+        assert len(revisions) == 15  # 0001 … 0015
 
         # Verify linear chain: each revision (except first) has exactly one down_revision
         heads = script.get_heads()
         assert len(heads) == 1, f"Expected 1 head, got {len(heads)}: {heads}"
 
+    def test_head_revision_read_without_alembic(self):
+        """init_database's head lookup should agree with Alembic's."""
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        from config.database import alembic_head_revision
+
+        cfg = Config(str(self._alembic_root / "alembic.ini"))
+        cfg.set_main_option("script_location", str(self._alembic_root / "alembic"))
+        head = ScriptDirectory.from_config(cfg).get_current_head()
+        assert alembic_head_revision() == head
+
+    @pytest.mark.asyncio
+    async def test_create_all_skipped_when_schema_is_current(self, tmp_path):
+        """A database migrated to head should not be re-inspected at startup."""
+        from alembic import command
+
+        from config.database import close_database, get_schema_status, init_database
+
+        db_path = tmp_path / "test.db"
+        command.upgrade(self._get_alembic_config(f"sqlite:///{db_path}"), "head")
+        try:
+            await init_database(f"sqlite:///{db_path}")
+            assert get_schema_status()["create_all"] == "skipped"
+
+            command.downgrade(self._get_alembic_config(f"sqlite:///{db_path}"), "-1")
+            await init_database(f"sqlite:///{db_path}")
+            assert get_schema_status()["create_all"] == "ran"
+
+            await init_database(f"sqlite:///{tmp_path / 'fresh.db'}")
+            status = get_schema_status()
+            assert status == {"alembic_revision": None, "create_all": "ran"}
+        finally:
+            await close_database()
+
     def test_seed_migration_populates_vendors(self, tmp_path):
         """Migration 0003 should seed 24 vendors into the table."""
         from alembic import command
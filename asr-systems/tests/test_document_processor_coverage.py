@@ -60,6 +60,8 @@ def _make_metadata(**overrides):
         "file_size": 1024,
         "tenant_id": "default",
         "scanner_metadata": None,
+        "vendor_name": None,
+        "amount": None,
     }
     defaults.update(overrides)
     for k, v in defaults.items():
@@ -86,7 +88,7 @@ async def test_process_document_success():
     )
     payment.detect_payment_status.return_value = MagicMock(
         payment_status="unpaid",
-        consensus_confidence=0.85,
+        confidence=0.85,
         methods_used=["regex"],
         quality_score=0.9,
         method_results={},
@@ -218,6 +220,19 @@ async def test_reprocess_not_found():
     assert "not found" in result.error_message.lower()
 
 
+@pytest.mark.asyncio
+async def test_reprocess_keeps_document_id():
+    """Reprocessing re-stores under the same ID so rollups are replaced."""
+    svc, _, _, _, storage = _make_service()
+    storage.retrieve_document.return_value = MagicMock(
+        content=b"text", metadata=_make_metadata()
+    )
+    svc.process_document = AsyncMock()
+
+    await svc.reprocess_document("doc-1", tenant_id="default")
+    assert svc.process_document.await_args.kwargs["document_id"] == "doc-1"
+
+
 @pytest.mark.asyncio
 async def test_process_document_with_request_id():
     """request_id is logged (no crash when provided)."""
@@ -237,7 +252,7 @@ async def test_process_document_with_request_id():
     )
     payment.detect_payment_status.return_value = MagicMock(
         payment_status="paid",
-        consensus_confidence=0.9,
+        confidence=0.9,
         methods_used=["regex"],
         quality_score=0.8,
         method_results={},
@@ -16,7 +16,15 @@ from production_server.services.document_processor_service import (
     DocumentProcessorService,
 )
 from shared.core.exceptions import DocumentError
-from shared.core.models import DocumentMetadata, ProcessingStatus, UploadResult
+from shared.core.models import (
+    BillingDestination,
+    DocumentMetadata,
+    PaymentConsensusResult,
+    PaymentDetectionMethod,
+    PaymentStatus,
+    ProcessingStatus,
+    UploadResult,
+)
 
 
 def _make_mock_gl_service():
@@ -40,7 +48,7 @@ def _make_mock_payment_service():
     svc.initialized = True
     result = MagicMock()
     result.payment_status = "unpaid"
-    result.consensus_confidence = 0.85
+    result.confidence = 0.85
     result.methods_used = ["regex_patterns", "keyword_matching"]
     result.quality_score = 0.8
     result.method_results = {}
@@ -115,6 +123,8 @@ class TestProcessDocument:
         metadata.file_size = 1024
         metadata.tenant_id = "test-tenant"
         metadata.scanner_metadata = None
+        metadata.vendor_name = None
+        metadata.amount = None
 
         result = await processor_service.process_document(
             file_content=b"%PDF-1.4 fake content",
@@ -129,6 +139,24 @@ class TestProcessDocument:
         assert "payment_detection" in result.classification_result
         assert "billing_routing" in result.classification_result
 
+    @pytest.mark.asyncio
+    async def test_classification_uses_document_tenant(self, processor_service):
+        metadata = MagicMock(spec=DocumentMetadata)
+        metadata.filename = "invoice.pdf"
+        metadata.file_size = 1024
+        metadata.tenant_id = "tenant-a"
+        metadata.scanner_metadata = None
+        metadata.vendor_name = None
+        metadata.amount = None
+
+        await processor_service.process_document(
+            file_content=b"%PDF-1.4 fake content", metadata=metadata
+        )
+
+        # Tenant overlays only apply when the tenant reaches the classifier
+        gl = processor_service.gl_account_service
+        assert gl.classify_document_text.await_args.kwargs["tenant_id"] == "tenant-a"
+
     @pytest.mark.asyncio
     async def test_storage_failure_returns_error(self):
         from services.storage_service import StorageResult
@@ -150,6 +178,8 @@ class TestProcessDocument:
         metadata.file_size = 512
         metadata.tenant_id = "test-tenant"
         metadata.scanner_metadata = None
+        metadata.vendor_name = None
+        metadata.amount = None
 
         result = await svc.process_document(file_content=b"content", metadata=metadata)
 
@@ -163,6 +193,8 @@ class TestProcessDocument:
         metadata.file_size = 100
         metadata.tenant_id = "test-tenant"
         metadata.scanner_metadata = None
+        metadata.vendor_name = None
+        metadata.amount = None
 
         result = await processor_service.process_document(
             file_content=b"content", metadata=metadata
@@ -171,6 +203,76 @@ class TestProcessDocument:
         assert result.processing_time_ms >= 0
 
 
+class TestRealResultModels:
+    """Runs the pipeline on the real result models and billing router."""
+
+    @staticmethod
+    async def _service(payment_result):
+        from services.billing_router_service import BillingRouterService
+        from services.gl_account_service import GLClassificationResult
+
+        gl = _make_mock_gl_service()
+        gl.classify_document_text = AsyncMock(
+            return_value=GLClassificationResult(
+                gl_account_code="5000",
+                gl_account_name="Materials",
+                category="EXPENSES",
+                confidence=0.92,
+                reasoning="matched vendor",
+                keywords_matched=["materials"],
+                classification_method="vendor_mapping",
+            )
+        )
+        payment = _make_mock_payment_service()
+        payment.detect_payment_status = AsyncMock(return_value=payment_result)
+        router = BillingRouterService(
+            [destination.value for destination in BillingDestination],
+            confidence_threshold=0.5,
+        )
+        await router.initialize()
+        svc = DocumentProcessorService(
+            gl_account_service=gl,
+            payment_detection_service=payment,
+            billing_router_service=router,
+            storage_service=_make_mock_storage_service(),
+        )
+        await svc.initialize()
+        return svc
+
+    @pytest.mark.asyncio
+    async def test_vision_result_reaches_classification_result(self):
+        payment_result = PaymentConsensusResult(
+            payment_status=PaymentStatus.PAID,
+            confidence=0.88,
+            methods_used=[PaymentDetectionMethod.CLAUDE_VISION],
+            method_results={"claude_vision": {"status": "paid", "confidence": 0.88}},
+            quality_score=0.9,
+            consensus_reached=True,
+        )
+        svc = await self._service(payment_result)
+        metadata = DocumentMetadata(
+            filename="invoice.pdf",
+            file_size=21,
+            mime_type="application/pdf",
+            tenant_id="test-tenant",
+            vendor_name="Acme Supply",
+        )
+
+        result = await svc.process_document(
+            file_content=b"%PDF-1.4 fake content", metadata=metadata
+        )
+
+        assert result.success is True, result.error_message
+        payment = result.classification_result["payment_detection"]
+        assert payment["status"] == PaymentStatus.PAID
+        assert payment["confidence"] == 0.88
+        assert "claude_vision" in payment["method_results"]
+        image = svc.payment_detection_service.detect_payment_status.await_args
+        assert image.kwargs["document_image"] == b"%PDF-1.4 fake content"
+        routing = result.classification_result["billing_routing"]
+        assert routing["destination"] == BillingDestination.CLOSED_PAYABLE
+
+
 class TestTextExtraction:
     @pytest.mark.asyncio
     async def test_pdf_extraction(self, processor_service):
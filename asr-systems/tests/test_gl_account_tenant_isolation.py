@@ -3,7 +3,8 @@ P82: GL account tenant scoping tests.
 Verifies that CRUD operations enforce tenant ownership:
 - Global ("default") accounts are read-only for non-default tenants
 - Tenants can only modify/delete their own custom accounts
-- Classification remains globally shared (intentional)
+- Custom accounts live in per-tenant overlays on top of the shared base
+  index, so they are only visible to (and classified for) their owner
 """
 
 import os
@@ -165,6 +166,69 @@ class TestGLAccountTenantOwnership:
         assert code_b not in codes
 
 
+# ---------------------------------------------------------------------------
+# In-memory tenant overlays
+# ---------------------------------------------------------------------------
+
+
+class TestGLAccountTenantOverlays:
+    @pytest.mark.asyncio
+    async def test_overlay_account_visible_only_to_owner(self, svc):
+        code = _unique_code()
+        await svc.create_gl_account(
+            code=code, name="Overlay", category="EXPENSES", tenant_id="tenant-a"
+        )
+        assert svc.get_account_by_code(code, tenant_id="tenant-a") is not None
+        assert svc.get_account_by_code(code, tenant_id="tenant-b") is None
+        assert svc.get_account_by_code(code) is None
+        assert code not in svc.gl_accounts
+        assert len(svc.get_all_accounts("tenant-a")) == len(svc.gl_accounts) + 1
+        assert len(svc.get_all_accounts("tenant-b")) == len(svc.gl_accounts)
+
+    @pytest.mark.asyncio
+    async def test_overlay_keywords_classify_for_owner_only(self, svc):
+        code = _unique_code()
+        await svc.create_gl_account(
+            code=code,
+            name="Drone Surveys",
+            category="EXPENSES",
+            keywords=["zzdrone survey"],
+            tenant_id="tenant-a",
+        )
+        text = "zzdrone survey"
+        own = await svc.classify_document_text(text, tenant_id="tenant-a")
+        other = await svc.classify_document_text(text, tenant_id="tenant-b")
+        assert own.gl_account_code == code
+        assert other.gl_account_code != code
+
+    @pytest.mark.asyncio
+    async def test_base_index_shared_and_not_rebuilt_by_overlay(self, svc):
+        base = svc._base_index
+        await svc.create_gl_account(
+            code=_unique_code(), name="A", category="EXPENSES", tenant_id="tenant-a"
+        )
+        assert svc._base_index is base
+        assert svc.get_overlay_statistics()["tenant_overlays"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deleting_last_overlay_account_drops_overlay(self, svc):
+        code = _unique_code()
+        await svc.create_gl_account(
+            code=code, name="A", category="EXPENSES", tenant_id="tenant-a"
+        )
+        await svc.delete_gl_account(code, tenant_id="tenant-a")
+        assert "tenant-a" not in svc._overlays
+        assert svc.get_account_codes("tenant-a") == set(svc.gl_accounts)
+
+    @pytest.mark.asyncio
+    async def test_rebuild_does_not_duplicate_keyword_entries(self, svc):
+        await svc.create_gl_account(
+            code=_unique_code(), name="G", category="EXPENSES", tenant_id="default"
+        )
+        for codes in svc.keyword_index.values():
+            assert len(codes) == len(set(codes))
+
+
 # ---------------------------------------------------------------------------
 # API-level tenant isolation
 # ---------------------------------------------------------------------------
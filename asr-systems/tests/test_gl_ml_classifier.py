@@ -0,0 +1,334 @@
+"""
+Tests for the local hashed-feature GL classifier.
+Covers feature hashing, Naive Bayes fit/predict, persistence, training-sample
+extraction from audit events (with manual overrides), and serving through
+GLAccountService as the ``local_model`` classification method.
+"""
+
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.constants import GL_ACCOUNTS
+
+from services.gl_ml_classifier import (
+    FEEDBACK_EVENT,
+    OVERRIDE_EVENT,
+    HashedNaiveBayesClassifier,
+    encode_features,
+    load_training_events,
+    samples_from_events,
+    token_hashes,
+    train_and_evaluate,
+)
+
+_NOISE = "invoice total amount date net terms thank you for your business".split()
+
+
+def _synthetic_events(per_code: int = 6, seed: int = 7):
+    """Feedback events whose text mixes an account's keywords with noise."""
+    rng = random.Random(seed)
+    events = []
+    for code, data in GL_ACCOUNTS.items():
+        for i in range(per_code):
+            words = list(data["keywords"]) * 2 + rng.sample(_NOISE, 4)
+            rng.shuffle(words)
+            events.append(
+                {
+                    "document_id": f"doc-{code}-{i}",
+                    "event_type": FEEDBACK_EVENT,
+                    "timestamp": f"2026-01-01T00:00:{i:02d}",
+                    "event_data": {
+                        "gl_account_code": str(code),
+                        "confidence": 0.8,
+                        "method": "keyword_matching",
+                        "features": encode_features(token_hashes(" ".join(words))),
+                    },
+                }
+            )
+    return events
+
+
+@pytest.fixture(scope="module")
+def trained():
+    return train_and_evaluate(_synthetic_events(), n_features=2**12)
+
+
+# ---------------------------------------------------------------------------
+# Features
+# ---------------------------------------------------------------------------
+
+
+class TestFeatureHashing:
+    def test_hashes_are_stable_and_include_bigrams(self):
+        a = token_hashes("Office Rent")
+        b = token_hashes("office   rent")
+        assert a == b
+        assert len(a) == 3  # office, rent, "office rent"
+
+    def test_encode_roundtrip(self):
+        hashes = token_hashes("diesel fuel diesel")
+        events = [
+            {
+                "document_id": "d1",
+                "event_type": FEEDBACK_EVENT,
+                "event_data": {
+                    "gl_account_code": "6900",
+                    "confidence": 0.9,
+                    "features": encode_features(hashes),
+                },
+            }
+        ]
+        [(_, decoded, label, _)] = samples_from_events(events)
+        assert decoded == hashes
+        assert label == "6900"
+
+
+# ---------------------------------------------------------------------------
+# Training samples
+# ---------------------------------------------------------------------------
+
+
+class TestSamplesFromEvents:
+    def _feedback(
+        self, doc, code, confidence=0.9, method="keyword_matching", tenant="t1"
+    ):
+        return {
+            "document_id": doc,
+            "tenant_id": tenant,
+            "event_type": FEEDBACK_EVENT,
+            "timestamp": "2026-01-01T00:00:00",
+            "event_data": {
+                "gl_account_code": code,
+                "confidence": confidence,
+                "method": method,
+                "features": encode_features(token_hashes("some text")),
+            },
+        }
+
+    def test_override_replaces_label(self):
+        events = [
+            self._feedback("d1", "7700", confidence=0.3, method="default"),
+            {
+                "document_id": "d1",
+                "tenant_id": "t1",
+                "event_type": OVERRIDE_EVENT,
+                "timestamp": "2026-01-02T00:00:00",
+                "event_data": {"gl_account_code": "6900"},
+            },
+        ]
+        [(_, _, label, weight)] = samples_from_events(events)
+        assert label == "6900"
+        assert weight > 1.0
+
+    def test_override_only_relabels_own_tenant(self):
+        events = [
+            self._feedback("d1", "7700", tenant="t1"),
+            self._feedback("d1", "6000", tenant="t2"),
+            {
+                "document_id": "d1",
+                "tenant_id": "t2",
+                "event_type": OVERRIDE_EVENT,
+                "timestamp": "2026-01-02T00:00:00",
+                "event_data": {"gl_account_code": "6900"},
+            },
+        ]
+        labels = sorted(label for _, _, label, _ in samples_from_events(events))
+        assert labels == ["6900", "7700"]
+
+    def test_weak_and_default_labels_skipped(self):
+        events = [
+            self._feedback("d1", "7700", confidence=0.3, method="default"),
+            self._feedback("d2", "6900", confidence=0.4),
+            self._feedback("d3", "6000", confidence=0.9, method="local_model"),
+        ]
+        assert samples_from_events(events) == []
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+
+class TestModel:
+    def test_holdout_report(self, trained):
+        model, report = trained
+        assert report["classes"] == len(GL_ACCOUNTS)
+        assert report["holdout_samples"] > 0
+        assert report["holdout"]["accuracy"] >= 0.8
+        assert report["holdout"]["latency_ms_p50"] < 1.0
+
+    def test_predict_text(self, trained):
+        model, _ = trained
+        code, prob = model.predict("diesel fuel and propane")
+        assert code == "6900"
+        assert 0.0 < prob <= 1.0
+
+    def test_sub_millisecond_inference(self, trained):
+        model, _ = trained
+        text = "monthly office rent for suite 200 " * 10
+        start = time.perf_counter()
+        for _ in range(200):
+            model.predict(text)
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+    def test_save_load_roundtrip(self, trained, tmp_path):
+        model, _ = trained
+        path = model.save(str(tmp_path / "gl.npz"))
+        loaded = HashedNaiveBayesClassifier.load(str(path))
+        assert loaded.version == model.version
+        assert loaded.classes == model.classes
+        text = "electricity utility bill kwh"
+        assert loaded.predict(text) == model.predict(text)
+
+    def test_untrained_model_raises(self):
+        with pytest.raises(RuntimeError):
+            HashedNaiveBayesClassifier().predict("anything")
+
+
+# ---------------------------------------------------------------------------
+# Audit trail + serving
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_load_training_events_from_audit_trail():
+    from shared.core.models import AuditTrailEntry
+
+    from config.database import close_database, init_database
+    from services.audit_trail_service import AuditTrailService
+
+    await init_database("sqlite:///")
+    try:
+        audit = AuditTrailService()
+        await audit.initialize()
+        doc = f"doc-{uuid.uuid4().hex[:8]}"
+        await audit.record(
+            AuditTrailEntry(
+                document_id=doc,
+                event_type=FEEDBACK_EVENT,
+                event_data={
+                    "gl_account_code": "6900",
+                    "confidence": 0.8,
+                    "method": "keyword_matching",
+                    "features": encode_features(token_hashes("diesel fuel")),
+                },
+                system_component="test",
+                tenant_id="t1",
+            )
+        )
+        await audit.record(
+            AuditTrailEntry(
+                document_id=doc,
+                event_type="billing_routing",
+                event_data={},
+                system_component="test",
+                tenant_id="t1",
+            )
+        )
+        await audit.record(
+            AuditTrailEntry(
+                document_id=doc,
+                event_type=OVERRIDE_EVENT,
+                event_data={"gl_account_code": "6000"},
+                system_component="test",
+                tenant_id="t2",
+            )
+        )
+        events = await load_training_events(tenant_id="t1")
+        assert [e["event_type"] for e in events] == [FEEDBACK_EVENT]
+        assert events[0]["document_id"] == doc
+        assert events[0]["tenant_id"] == "t1"
+
+        with pytest.raises(ValueError):
+            await load_training_events()
+        pooled = await load_training_events(all_tenants=True)
+        assert {e["tenant_id"] for e in pooled} == {"t1", "t2"}
+    finally:
+        await close_database()
+
+
+@pytest.mark.asyncio
+async def test_gl_service_serves_local_model(trained):
+    from services.gl_account_service import GLAccountService
+
+    model, _ = trained
+    svc = GLAccountService(local_model=model, local_model_min_confidence=0.0)
+    await svc.initialize()
+
+    # Token the rule-based methods do not know but the model learned for 1100
+    result = await svc._classify_uncached("reserve savings")
+    assert result.gl_account_code == "1100"
+
+    direct = svc._classify_by_local_model("reserve savings")
+    assert direct.classification_method == "local_model"
+    assert direct.confidence <= 0.85
+
+
+@pytest.mark.asyncio
+async def test_model_version_changes_ruleset_version(trained):
+    from services.gl_account_service import GLAccountService
+
+    model, _ = trained
+    plain = GLAccountService()
+    with_model = GLAccountService(local_model=model)
+    await plain.initialize()
+    await with_model.initialize()
+    assert await plain.get_ruleset_version() != await with_model.get_ruleset_version()
+
+
+def test_gl_override_endpoint_records_feedback():
+    from unittest.mock import AsyncMock, patch
+
+    from fastapi.testclient import TestClient
+    from tests.auth_helpers import AUTH_HEADERS, CSRF_COOKIES, WRITE_HEADERS
+
+    import api.main as api_mod
+    from api.main import app
+
+    async def _retrieve(document_id, tenant_id=None):
+        # Only the caller's own document exists
+        return object() if document_id == "doc-override-1" else None
+
+    storage = AsyncMock()
+    storage.retrieve_document = AsyncMock(side_effect=_retrieve)
+    with (
+        TestClient(app, raise_server_exceptions=False) as client,
+        patch.object(api_mod, "storage_service", storage),
+    ):
+        accounts = client.get("/api/v1/gl-accounts", headers=AUTH_HEADERS).json()[
+            "data"
+        ]["accounts"]
+        code = accounts[0]["code"]
+        ok = client.post(
+            "/api/v1/documents/doc-override-1/gl-override",
+            json={"gl_account_code": code, "previous_gl_account_code": "7700"},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        assert ok.status_code == 200
+        assert ok.json()["data"]["gl_account_code"] == code
+
+        unknown = client.post(
+            "/api/v1/documents/doc-override-1/gl-override",
+            json={"gl_account_code": "ZZZZ"},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        assert unknown.status_code == 422
+
+        missing = client.post(
+            "/api/v1/documents/doc-other-tenant/gl-override",
+            json={"gl_account_code": code},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        assert missing.status_code == 404
+        assert storage.retrieve_document.await_args.kwargs["tenant_id"]
@@ -93,3 +93,26 @@ class TestShutdownFlag:
             assert response.status_code == 200
         finally:
             main_module._shutting_down = original
+
+
+class TestHealthSnapshots:
+    """Readiness is served from the background health monitor."""
+
+    def test_components_report_check_timing(self, client: TestClient):
+        data = client.get("/health/ready").json()
+        database = data["components"]["database"]
+        assert database["stale"] is False
+        assert database["check_duration_ms"] >= 0
+        assert "age_seconds" in database
+        assert data["metrics"]["stale_components"] == []
+
+    def test_probe_does_not_hit_database(self, client: TestClient, monkeypatch):
+        import production_server.api.main as main_module
+
+        async def fail():
+            raise AssertionError("probe queried the database")
+
+        monkeypatch.setattr(main_module, "check_database_connectivity", fail)
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["components"]["database"]["status"] == "connected"
@@ -0,0 +1,154 @@
+"""
+Tests for the background health monitor.
+Covers snapshot reads, per-check intervals and timeouts, failure capture,
+staleness detection and the inline fallback when the monitor is disabled.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from services.health_monitor_service import HealthMonitorService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 500.0
+
+    def __call__(self):
+        return self.now
+
+
+def _counting_check(result=None):
+    calls = {"n": 0}
+
+    async def check():
+        calls["n"] += 1
+        return dict(result or {"status": "healthy"}, run=calls["n"])
+
+    return check, calls
+
+
+@pytest.fixture
+async def monitor():
+    m = HealthMonitorService(interval_seconds=60, timeout_seconds=0.5)
+    yield m
+    await m.cleanup()
+
+
+class TestSnapshots:
+    @pytest.mark.asyncio
+    async def test_initialize_runs_first_round(self, monitor):
+        check, calls = _counting_check({"status": "connected"})
+        monitor.register("database", check)
+        await monitor.initialize()
+
+        snap = monitor.snapshot()
+        assert snap["database"]["status"] == "connected"
+        assert snap["database"]["stale"] is False
+        assert snap["database"]["check_duration_ms"] >= 0
+        assert "checked_at" in snap["database"]
+
+    @pytest.mark.asyncio
+    async def test_probes_do_not_run_checks(self, monitor):
+        check, calls = _counting_check()
+        monitor.register("storage", check)
+        await monitor.initialize()
+        for _ in range(50):
+            await monitor.get_snapshot()
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_checks_refresh_on_their_own_interval(self, monitor):
+        fast, fast_calls = _counting_check()
+        slow, slow_calls = _counting_check()
+        monitor.register("fast", fast, interval_seconds=0.01)
+        monitor.register("slow", slow, interval_seconds=60)
+        await monitor.initialize()
+        await asyncio.sleep(0.1)
+        assert fast_calls["n"] > 2
+        assert slow_calls["n"] == 1
+        assert monitor.snapshot()["fast"]["run"] > 1
+
+
+class TestFailures:
+    @pytest.mark.asyncio
+    async def test_exception_and_timeout_are_recorded(self, monitor):
+        async def broken():
+            raise RuntimeError("db down")
+
+        async def hangs():
+            await asyncio.sleep(10)
+
+        monitor.register("database", broken)
+        monitor.register("storage", hangs, timeout_seconds=0.05)
+        await monitor.initialize()
+
+        snap = monitor.snapshot()
+        assert snap["database"]["status"] == "error"
+        assert snap["database"]["error"] == "db down"
+        assert snap["storage"]["status"] == "degraded"
+        assert "timed out" in snap["storage"]["reason"]
+        checks = monitor.get_statistics()["checks"]
+        assert checks["database"]["failures"] == 1
+        assert checks["storage"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_first_check_reads_pending(self):
+        monitor = HealthMonitorService(startup_timeout_seconds=0.05)
+        gate = asyncio.Event()
+
+        async def slow():
+            await gate.wait()
+            return {"status": "healthy"}
+
+        monitor.register("storage", slow, timeout_seconds=5)
+        await monitor.initialize()
+        assert monitor.snapshot()["storage"] == {"status": "pending", "stale": True}
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert monitor.snapshot()["storage"]["status"] == "healthy"
+        await monitor.cleanup()
+
+
+class TestStaleness:
+    @pytest.mark.asyncio
+    async def test_result_goes_stale_when_loop_stops_refreshing(self):
+        clock = FakeClock()
+        monitor = HealthMonitorService(
+            interval_seconds=10, timeout_seconds=1, clock=clock
+        )
+        check, _ = _counting_check()
+        monitor.register("database", check)
+        await monitor.initialize()
+        assert monitor.snapshot()["database"]["stale"] is False
+
+        # Default stale_after is three intervals plus the timeout
+        clock.now += 31.5
+        snap = monitor.snapshot()["database"]
+        assert snap["stale"] is True
+        assert snap["age_seconds"] == 31.5
+        assert monitor.get_statistics()["stale_components"] == ["database"]
+        await monitor.cleanup()
+
+
+class TestDisabled:
+    @pytest.mark.asyncio
+    async def test_disabled_monitor_checks_on_every_probe(self):
+        monitor = HealthMonitorService(enabled=False)
+        check, calls = _counting_check()
+        monitor.register("database", check)
+        await monitor.initialize()
+        assert calls["n"] == 0
+
+        await monitor.get_snapshot()
+        snap = await monitor.get_snapshot()
+        assert calls["n"] == 2
+        assert snap["database"]["stale"] is False
+        await monitor.cleanup()
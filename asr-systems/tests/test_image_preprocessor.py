@@ -0,0 +1,235 @@
+"""
+Tests for Claude Vision image preprocessing.
+Covers format sniffing, PDF rasterization, TIFF conversion, downscaling,
+the byte budget, pass-through of small images, the content-hash cache, the
+process pool, and the media type sent by the vision method.
+"""
+
+import io
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from services.document_processor_service import DocumentProcessorService
+from services.image_preprocessor import (
+    _HAS_PDF2IMAGE,
+    _HAS_PDFIUM,
+    DEFAULT_MAX_LONG_EDGE,
+    ImagePreprocessorService,
+    prepare_image,
+    sniff_media_type,
+)
+from services.payment_detection_service import PaymentDetectionService
+
+needs_pdf_renderer = pytest.mark.skipif(
+    not (_HAS_PDFIUM or _HAS_PDF2IMAGE), reason="no PDF rasterizer installed"
+)
+
+
+def _encode(image, fmt, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def _scan(size=(2550, 3300)):
+    """A noisy 300 DPI letter page, which compresses poorly."""
+    return Image.effect_noise(size, 40).convert("RGB")
+
+
+def _open(data):
+    return Image.open(io.BytesIO(data))
+
+
+# ---------------------------------------------------------------------------
+# prepare_image
+# ---------------------------------------------------------------------------
+
+
+class TestPrepareImage:
+    @pytest.mark.parametrize(
+        "fmt, media_type",
+        [
+            ("PDF", "application/pdf"),
+            ("JPEG", "image/jpeg"),
+            ("PNG", "image/png"),
+            ("GIF", "image/gif"),
+            ("TIFF", "image/tiff"),
+            ("BMP", "image/bmp"),
+            ("WEBP", "image/webp"),
+        ],
+    )
+    def test_sniff_media_type(self, fmt, media_type):
+        assert sniff_media_type(_encode(Image.new("RGB", (8, 8)), fmt)) == media_type
+
+    def test_unrecognised_content(self):
+        assert sniff_media_type(b"plain text invoice") is None
+        assert prepare_image(b"plain text invoice") is None
+
+    def test_large_tiff_converted_downscaled_and_budgeted(self):
+        original = _encode(_scan(), "TIFF")
+        prepared = prepare_image(original, max_bytes=300_000)
+        assert prepared.media_type == "image/jpeg"
+        assert prepared.source_type == "image/tiff"
+        assert max(prepared.width, prepared.height) <= DEFAULT_MAX_LONG_EDGE
+        assert len(prepared.data) <= 300_000
+        assert len(prepared.data) < len(original) / 20
+        assert _open(prepared.data).size == (prepared.width, prepared.height)
+
+    def test_small_png_passes_through(self):
+        original = _encode(Image.new("RGB", (800, 600), "white"), "PNG")
+        prepared = prepare_image(original)
+        assert prepared.data == original
+        assert prepared.media_type == "image/png"
+        assert not prepared.converted
+
+    def test_transparent_png_flattened_on_white(self):
+        image = Image.new("RGBA", (2000, 2000), (0, 0, 0, 0))
+        prepared = prepare_image(_encode(image, "PNG"))
+        assert prepared.media_type == "image/jpeg"
+        pixel = _open(prepared.data).convert("RGB").getpixel((10, 10))
+        assert pixel == (255, 255, 255)
+
+    def test_sixteen_bit_greyscale_tiff(self):
+        image = Image.new("I;16", (3000, 2000), 30000)
+        prepared = prepare_image(_encode(image, "TIFF"))
+        assert prepared.media_type == "image/jpeg"
+        assert max(prepared.width, prepared.height) <= DEFAULT_MAX_LONG_EDGE
+
+    @needs_pdf_renderer
+    def test_pdf_pages_rasterized_and_stacked(self):
+        pages = [Image.new("RGB", (850, 1100), "white") for _ in range(3)]
+        pdf = _encode(pages[0], "PDF", save_all=True, append_images=pages[1:])
+
+        first = prepare_image(pdf)
+        assert first.media_type == "image/jpeg"
+        assert (first.source_type, first.pages) == ("application/pdf", 1)
+
+        stacked = prepare_image(pdf, pdf_pages=2)
+        assert stacked.pages == 2
+        # Two pages stacked are roughly twice as tall as they are wide
+        assert stacked.height / stacked.width == pytest.approx(
+            2 * first.height / first.width, rel=0.05
+        )
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def preprocessor():
+    service = ImagePreprocessorService(max_workers=0)
+    await service.initialize()
+    yield service
+    await service.cleanup()
+
+
+class TestImagePreprocessorService:
+    @pytest.mark.asyncio
+    async def test_cached_by_content_hash(self, preprocessor):
+        original = _encode(_scan((2000, 2000)), "TIFF")
+        first = await preprocessor.prepare(original)
+        second = await preprocessor.prepare(original)
+        assert first is second
+        stats = preprocessor.get_statistics()
+        assert (stats["prepared"], stats["cache_hits"]) == (1, 1)
+        assert 0 < stats["byte_ratio"] < 0.2
+
+    @pytest.mark.asyncio
+    async def test_failures_return_none(self, preprocessor):
+        # A PNG signature followed by garbage cannot be decoded
+        assert await preprocessor.prepare(b"\x89PNG\r\n\x1a\n" + b"\0" * 64) is None
+        assert await preprocessor.prepare(b"not an image") is None
+        stats = preprocessor.get_statistics()
+        assert (stats["failures"], stats["unsupported"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_cache_bounded_by_bytes(self):
+        service = ImagePreprocessorService(max_workers=0, cache_bytes=10_000)
+        await service.initialize()
+        for shade in range(5):
+            image = Image.new("RGB", (64, 64), (shade, shade, shade))
+            await service.prepare(_encode(image, "PNG"))
+        assert service.get_statistics()["cached_bytes"] <= 10_000
+        await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_disabled_service_prepares_nothing(self):
+        service = ImagePreprocessorService(enabled=False)
+        await service.initialize()
+        assert await service.prepare(_encode(_scan((100, 100)), "PNG")) is None
+        await service.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        service = ImagePreprocessorService(max_workers=1)
+        await service.initialize()
+        try:
+            prepared = await service.prepare(_encode(_scan((3136, 1000)), "TIFF"))
+            assert prepared.media_type == "image/jpeg"
+            assert (prepared.width, prepared.height) == (DEFAULT_MAX_LONG_EDGE, 500)
+        finally:
+            await service.cleanup()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline integration
+# ---------------------------------------------------------------------------
+
+
+def _client():
+    client = MagicMock()
+    client.messages.create = AsyncMock(
+        return_value=SimpleNamespace(
+            content=[SimpleNamespace(text="PAID (confidence: 0.9)")]
+        )
+    )
+    return client
+
+
+def _sent_image(client):
+    content = client.messages.create.await_args.kwargs["messages"][0]["content"]
+    return content[0]["source"]
+
+
+class TestVisionIntegration:
+    @pytest.mark.asyncio
+    async def test_tiff_sent_as_downscaled_jpeg(self, preprocessor):
+        pds = PaymentDetectionService(
+            {"enabled": False, "model": "m", "temperature": 0.0},
+            ["claude_vision"],
+            image_preprocessor=preprocessor,
+        )
+        await pds.initialize()
+        pds.claude_client = client = _client()
+
+        original = _encode(_scan(), "TIFF")
+        result = await pds._detect_claude_vision(original, "")
+        assert _sent_image(client)["media_type"] == "image/jpeg"
+        assert result.details["image_bytes"] < len(original) / 20
+        assert result.details["original_bytes"] == len(original)
+
+    @pytest.mark.asyncio
+    async def test_media_type_from_signature_without_preprocessor(self):
+        pds = PaymentDetectionService(
+            {"enabled": False, "model": "m", "temperature": 0.0}, ["claude_vision"]
+        )
+        await pds.initialize()
+        pds.claude_client = client = _client()
+        await pds._detect_claude_vision(_encode(Image.new("RGB", (8, 8)), "PNG"), "")
+        assert _sent_image(client)["media_type"] == "image/png"
+
+    def test_processor_passes_pdfs_and_images_to_vision(self):
+        source = DocumentProcessorService._vision_source
+        assert source(b"%PDF-1.4", "statement.PDF") == b"%PDF-1.4"
+        assert source(b"II*\x00", "scan.tif") == b"II*\x00"
+        assert source(b"Invoice 12", "invoice.txt") is None
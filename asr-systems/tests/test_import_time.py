@@ -0,0 +1,50 @@
+"""
+Tests for import-time laziness of the server.
+Importing the API app must not pull in optional SDKs and backends (anthropic,
+boto3, httpx, numpy, PDF rasterizers); they load on first use. Each check
+runs in a fresh interpreter so modules imported by other tests don't count.
+"""
+
+import json
+import subprocess  # nosec B404
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+LAZY_MODULES = (
+    "anthropic",
+    "boto3",
+    "botocore",
+    "httpx",
+    "numpy",
+    "pypdfium2",
+    "pdf2image",
+)
+
+
+def _imported_after(statement: str) -> list:
+    code = (
+        "import json, sys\n"
+        f"sys.path[:0] = [{str(ROOT)!r}, {str(ROOT / 'shared')!r}, "
+        f"{str(ROOT / 'production_server')!r}]\n"
+        f"{statement}\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    proc = subprocess.run(  # nosec B603
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_api_import_leaves_optional_sdks_unloaded():
+    assert _imported_after("import production_server.api.main") == []
+
+
+def test_shared_api_clients_load_on_first_access():
+    assert _imported_after("import shared.api.schemas") == []
+    assert _imported_after("from shared.api import APIClient") == ["httpx"]
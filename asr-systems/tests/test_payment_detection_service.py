@@ -1,13 +1,24 @@
 """
 Unit Tests for Payment Detection Service
-Tests the 3 deterministic methods (regex, keywords, amount) + consensus.
-Claude API methods are excluded — no network calls.
+Tests the 3 deterministic methods (regex, keywords, amount) + consensus,
+plus concurrent execution, timeouts and early exit with Claude methods stubbed
+out — no network calls.
 """
 
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from shared.core.models import PaymentDetectionMethod, PaymentStatus
 
-from services.payment_detection_service import MethodResult, PaymentDetectionService
+from services.payment_detection_service import (
+    MethodResult,
+    PaymentDetectionService,
+    _count_claude_request,
+)
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -56,19 +67,19 @@ class TestInit:
 class TestRegex:
     @pytest.mark.asyncio
     async def test_detect_paid(self, pds):
-        result = await pds._detect_regex_patterns("PAID IN FULL check #12345")
+        result = pds._detect_regex_patterns("PAID IN FULL check #12345")
         assert result.payment_status == PaymentStatus.PAID
         assert result.confidence >= 0.6
 
     @pytest.mark.asyncio
     async def test_detect_unpaid(self, pds):
-        result = await pds._detect_regex_patterns("Balance due: $1,250.00 please remit")
+        result = pds._detect_regex_patterns("Balance due: $1,250.00 please remit")
         assert result.payment_status == PaymentStatus.UNPAID
         assert result.confidence >= 0.5
 
     @pytest.mark.asyncio
     async def test_detect_void(self, pds):
-        result = await pds._detect_regex_patterns("VOID VOID VOID cancelled invoice")
+        result = pds._detect_regex_patterns("VOID VOID VOID cancelled invoice")
         assert result.payment_status == PaymentStatus.VOID
         assert result.confidence >= 0.7
 
@@ -81,21 +92,19 @@ class TestRegex:
 class TestKeywords:
     @pytest.mark.asyncio
     async def test_detect_paid(self, pds):
-        result = await pds._detect_keywords("payment received settled cleared check")
+        result = pds._detect_keywords("payment received settled cleared check")
         assert result.payment_status == PaymentStatus.PAID
         assert result.confidence >= 0.5
 
     @pytest.mark.asyncio
     async def test_detect_unpaid(self, pds):
-        result = await pds._detect_keywords("outstanding balance due overdue past due")
+        result = pds._detect_keywords("outstanding balance due overdue past due")
         assert result.payment_status == PaymentStatus.UNPAID
         assert result.confidence >= 0.4
 
     @pytest.mark.asyncio
     async def test_detect_unknown(self, pds):
-        result = await pds._detect_keywords(
-            "some random text with no payment indicators"
-        )
+        result = pds._detect_keywords("some random text with no payment indicators")
         assert result.payment_status == PaymentStatus.UNKNOWN
         assert result.confidence <= 0.3
 
@@ -108,20 +117,20 @@ class TestKeywords:
 class TestAmountAnalysis:
     @pytest.mark.asyncio
     async def test_zero_balance_is_paid(self, pds):
-        result = await pds._detect_amount_analysis("Balance due: $0.00", None)
+        result = pds._detect_amount_analysis("Balance due: $0.00", None)
         assert result.payment_status == PaymentStatus.PAID
         assert result.confidence >= 0.7
 
     @pytest.mark.asyncio
     async def test_nonzero_amount_is_unpaid(self, pds):
-        result = await pds._detect_amount_analysis("Total due: $4,500.00", None)
+        result = pds._detect_amount_analysis("Total due: $4,500.00", None)
         assert result.payment_status == PaymentStatus.UNPAID
         assert result.confidence >= 0.5
 
     @pytest.mark.asyncio
     async def test_amount_info_unpaid(self, pds):
         """amount_info with nonzero amount_due should return UNPAID."""
-        result = await pds._detect_amount_analysis(
+        result = pds._detect_amount_analysis(
             "invoice text",
             {"amount_due": 500.00},
         )
@@ -188,3 +197,166 @@ class TestConsensus:
         ]
         consensus = pds._calculate_consensus(results)
         assert consensus.payment_status == PaymentStatus.PAID
+
+
+# ---------------------------------------------------------------------------
+# Concurrent execution and early exit
+# ---------------------------------------------------------------------------
+
+_CLEAR_PAID = "PAID IN FULL check #1234 balance due: $0.00"
+_AMBIGUOUS = "Invoice 1234 for services"
+
+
+def _slow_claude(method, delay=0.2, status=PaymentStatus.PAID):
+    async def _detect(*args, **kwargs):
+        _count_claude_request()
+        await asyncio.sleep(delay)
+        return MethodResult(
+            method=method,
+            payment_status=status,
+            confidence=0.9,
+            reasoning="stub",
+            details={},
+            processing_time=0.0,
+        )
+
+    return AsyncMock(side_effect=_detect)
+
+
+async def _claude_pds(**kwargs):
+    service = PaymentDetectionService(
+        claude_config={"enabled": False, "api_key": None},
+        enabled_methods=[
+            "claude_vision",
+            "claude_text",
+            "regex_patterns",
+            "keyword_matching",
+            "amount_analysis",
+        ],
+        **kwargs,
+    )
+    await service.initialize()
+    service.claude_client = MagicMock()
+    service._detect_claude_vision = _slow_claude(PaymentDetectionMethod.CLAUDE_VISION)
+    service._detect_claude_text = _slow_claude(PaymentDetectionMethod.CLAUDE_TEXT)
+    return service
+
+
+class TestConcurrentDetection:
+    @pytest.mark.asyncio
+    async def test_claude_methods_run_concurrently(self):
+        service = await _claude_pds()
+        start = time.perf_counter()
+        result = await service.detect_payment_status(_AMBIGUOUS, document_image=b"img")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35  # two 0.2 s calls overlapped
+        # Results keep the configured method order
+        assert result.methods_used == [
+            PaymentDetectionMethod.CLAUDE_VISION,
+            PaymentDetectionMethod.CLAUDE_TEXT,
+            PaymentDetectionMethod.REGEX_PATTERNS,
+            PaymentDetectionMethod.KEYWORD_MATCHING,
+            PaymentDetectionMethod.AMOUNT_ANALYSIS,
+        ]
+        assert service.get_statistics()["claude_calls"] == 2
+
+    @pytest.mark.asyncio
+    async def test_early_exit_skips_claude(self):
+        service = await _claude_pds(early_exit_threshold=0.8)
+        result = await service.detect_payment_status(_CLEAR_PAID, document_image=b"img")
+
+        assert result.payment_status == PaymentStatus.PAID
+        service._detect_claude_text.assert_not_awaited()
+        service._detect_claude_vision.assert_not_awaited()
+        stats = service.get_statistics()
+        assert stats["early_exits"] == 1
+        assert stats["claude_calls_skipped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_text_still_asks_claude(self):
+        service = await _claude_pds(early_exit_threshold=0.8)
+        await service.detect_payment_status(_AMBIGUOUS)
+        service._detect_claude_text.assert_awaited_once()
+        # No image, so vision is never attempted
+        service._detect_claude_vision.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_disabled_by_default(self):
+        service = await _claude_pds()
+        await service.detect_payment_status(_CLEAR_PAID)
+        service._detect_claude_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_method_timeout_counts_as_failure(self):
+        service = await _claude_pds(claude_method_timeout=0.05)
+        service._detect_claude_text = _slow_claude(
+            PaymentDetectionMethod.CLAUDE_TEXT, delay=5
+        )
+        start = time.perf_counter()
+        consensus, _, failed = await service._run_detection(_AMBIGUOUS, None, None)
+
+        assert time.perf_counter() - start < 1.0
+        assert failed == 1
+        assert PaymentDetectionMethod.CLAUDE_TEXT not in consensus.methods_used
+        stats = service.get_statistics()
+        assert stats["method_timeouts"] == 1
+        assert stats["latency_ms_p50"] > 0
+
+    @pytest.mark.asyncio
+    async def test_claude_calls_count_only_sent_requests(self):
+        service = PaymentDetectionService(
+            {"enabled": False, "model": "model-a", "temperature": 0.0},
+            ["claude_vision", "claude_text", "regex_patterns"],
+            # No usable image, so vision fails before sending anything
+            image_preprocessor=SimpleNamespace(
+                max_long_edge=1568,
+                max_bytes=1024,
+                pdf_pages=1,
+                prepare=AsyncMock(return_value=None),
+            ),
+        )
+        await service.initialize()
+        service.claude_client = MagicMock()
+        service.claude_client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(
+                content=[SimpleNamespace(text="PAID (confidence: 0.9) - stamped")]
+            )
+        )
+        _, claude_calls, failed = await service._run_detection(_AMBIGUOUS, b"img", None)
+        assert (claude_calls, failed) == (1, 1)
+        assert service.get_statistics()["claude_calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_local_methods_run_off_the_event_loop(self, pds):
+        threads = []
+        detect_keywords = pds._detect_keywords
+
+        def _record_thread(text, scan=None):
+            threads.append(threading.get_ident())
+            return detect_keywords(text, scan)
+
+        pds._detect_keywords = _record_thread
+        await pds.detect_payment_status(_CLEAR_PAID)
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_stuck_local_method_times_out(self, pds):
+        pds.local_method_timeout = 0.05
+
+        def _stuck(text, scan=None):
+            time.sleep(0.5)
+            raise AssertionError("result should have been abandoned")
+
+        pds._detect_keywords = _stuck
+        start = time.perf_counter()
+        consensus, _, failed = await pds._run_detection(_CLEAR_PAID, None, None)
+        assert time.perf_counter() - start < 0.4
+        assert failed == 1
+        assert PaymentDetectionMethod.KEYWORD_MATCHING not in consensus.methods_used
+
+    @pytest.mark.asyncio
+    async def test_early_exit_changes_config_version(self):
+        plain = await _claude_pds()
+        early = await _claude_pds(early_exit_threshold=0.8)
+        assert plain.config_version != early.config_version
@@ -0,0 +1,137 @@
+"""
+Tests for the single-pass payment indicator scanner.
+Checks that one scan reproduces the per-pattern regex counts and the
+substring keyword counts the detection methods used before, reports
+overlapping matches with their positions, and is shared by both methods.
+"""
+
+import asyncio
+import re
+from unittest.mock import patch
+
+import pytest
+from shared.core.constants import PAYMENT_INDICATORS
+from shared.core.models import PaymentStatus
+
+from services.payment_detection_service import PaymentDetectionService
+from services.payment_indicator_scanner import (
+    EXTRA_PATTERNS,
+    KEYWORD_KIND,
+    PATTERN_KIND,
+    PAYMENT_CATEGORIES,
+    PaymentIndicatorScanner,
+)
+
+SAMPLES = [
+    "PAID IN FULL check #12345 balance due: $0.00",
+    "Balance due: $1,250.00 please remit by due date",
+    "Amount owed: 40.00 - total due $40.00",
+    "VOID VOID cancelled invoice, credit memo issued",
+    "Partial payment received; balance remaining on account",
+    "unpaid overdue reopened; attach receipt to each check",
+    "Zero balance. Ref # 881 settled via ACH / wire transfer",
+    "Nothing relevant here at all",
+    "",
+]
+
+
+def _legacy_counts(text):
+    """The previous per-pattern implementation, kept as the reference."""
+    pattern_counts, keyword_counts = {}, {}
+    lowered = text.lower()
+    for category in PAYMENT_CATEGORIES:
+        keywords = PAYMENT_INDICATORS[f"{category.upper()}_KEYWORDS"]
+        sources = [rf"\b{re.escape(k)}\b" for k in keywords] + [
+            rf"\b(?:{'|'.join(leads)}){tail}"
+            for leads, tail in EXTRA_PATTERNS[category]
+        ]
+        pattern_counts[category] = sum(
+            1 for s in sources if re.search(s, text, re.IGNORECASE)
+        )
+        keyword_counts[category] = sum(1 for k in keywords if k.lower() in lowered)
+    return pattern_counts, keyword_counts
+
+
+@pytest.fixture(scope="module")
+def scanner():
+    return PaymentIndicatorScanner()
+
+
+class TestScanner:
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_per_pattern_reference(self, scanner, text):
+        scan = scanner.scan(text)
+        pattern_counts, keyword_counts = _legacy_counts(text)
+        assert scan.counts(PATTERN_KIND) == pattern_counts
+        assert scan.counts(KEYWORD_KIND) == keyword_counts
+
+    def test_nested_and_overlapping_matches(self, scanner):
+        text = "unpaid balance due: $5.00"
+        scan = scanner.scan(text)
+        # "paid" is a keyword substring of "unpaid" but not a bounded pattern
+        assert (2, 6) in scan.positions(KEYWORD_KIND, "paid")
+        assert scan.counts(PATTERN_KIND)["paid"] == 0
+        unpaid = scan.positions(PATTERN_KIND, "unpaid")
+        # unpaid, balance due, due, balance due: $5.00
+        assert (0, 6) in unpaid
+        assert (7, 18) in unpaid
+        assert (15, 18) in unpaid
+        assert (7, 25) in unpaid
+
+    def test_positions_index_original_text(self, scanner):
+        text = "Ref: VOID\nItem VOID"
+        spans = scanner.scan(text).positions(PATTERN_KIND, "void")
+        assert [text[s:e] for s, e in spans] == ["VOID", "VOID"]
+
+    def test_length_changing_lowercase_keeps_offsets(self, scanner):
+        # "İ".lower() is two characters; offsets must still index the input
+        text = "İİ Paid in full"
+        spans = scanner.scan(text).positions(PATTERN_KIND, "paid")
+        assert {text[s:e] for s, e in spans} == {"Paid", "Paid in full"}
+
+    def test_position_summary_is_capped(self, scanner):
+        summary = scanner.scan("void " * 50).position_summary(PATTERN_KIND)
+        assert len(summary["void"]) == 10
+        assert summary["paid"] == []
+
+
+class TestServiceIntegration:
+    @pytest.mark.asyncio
+    async def test_regex_and_keywords_share_one_scan(self):
+        service = PaymentDetectionService(
+            {"enabled": False}, ["regex_patterns", "keyword_matching"]
+        )
+        await service.initialize()
+        text = "PAID IN FULL check #12345"
+        with patch.object(
+            service.indicator_scanner,
+            "scan",
+            wraps=service.indicator_scanner.scan,
+        ) as scan:
+            result = await service.detect_payment_status(text)
+        assert scan.call_count == 1
+        regex = result.method_results["regex_patterns"]["details"]
+        assert regex["paid_matches"] == 5
+        assert regex["positions"]["paid"][0] == 0
+        keywords = result.method_results["keyword_matching"]["details"]
+        assert keywords["paid_score"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_detections_keep_their_own_scan(self):
+        service = PaymentDetectionService(
+            {"enabled": False}, ["regex_patterns", "keyword_matching"]
+        )
+        await service.initialize()
+        paid = "PAID IN FULL check #12345 payment received"
+        unpaid = "Balance due: $1,250.00 outstanding, please remit"
+        with patch.object(
+            service.indicator_scanner,
+            "scan",
+            wraps=service.indicator_scanner.scan,
+        ) as scan:
+            results = await asyncio.gather(
+                *(service.detect_payment_status(text) for text in [paid, unpaid] * 4)
+            )
+        assert scan.call_count == 8
+        statuses = [r.payment_status for r in results]
+        assert statuses == [PaymentStatus.PAID, PaymentStatus.UNPAID] * 4
@@ -0,0 +1,210 @@
+"""
+Tests for the single-flight response cache.
+Covers request coalescing, TTL expiry, stale-while-revalidate refreshes,
+error propagation, the LRU bound and cancellation safety.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+
+from production_server.utils.response_cache import SingleFlightCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counter:
+    """Compute function that counts calls and can be held open or failed."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = None
+        self.error = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+async def cache(clock):
+    c = SingleFlightCache("test", ttl_seconds=30, stale_seconds=300, clock=clock)
+    yield c
+    await c.cleanup()
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_compute_once(self, cache):
+        compute = Counter()
+        compute.gate = asyncio.Event()
+        waiters = [
+            asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        compute.gate.set()
+        results = await asyncio.gather(*waiters)
+
+        assert compute.calls == 1
+        assert results == [{"calls": 1}] * 5
+        stats = cache.get_statistics()
+        assert (stats["misses"], stats["coalesced"]) == (1, 4)
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_a_hit_until_ttl(self, cache, clock):
+        compute = Counter()
+        await cache.get_or_compute("k", compute)
+        clock.now += 29
+        assert await cache.get_or_compute("k", compute) == {"calls": 1}
+        assert cache.get_statistics()["hits"] == 1
+
+        # Past TTL + stale window the entry is recomputed inline
+        clock.now += 400
+        assert await cache.get_or_compute("k", compute) == {"calls": 2}
+        assert cache.get_statistics()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self, cache):
+        compute = Counter()
+        await cache.get_or_compute(("t1", "kpis"), compute)
+        await cache.get_or_compute(("t2", "kpis"), compute)
+        assert compute.calls == 2
+
+
+class TestStaleWhileRevalidate:
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self, cache, clock):
+        compute = Counter()
+        await cache.get_or_compute("k", compute)
+        clock.now += 60
+
+        compute.gate = asyncio.Event()
+        assert await cache.get_or_compute("k", compute) == {"calls": 1}
+        assert await cache.get_or_compute("k", compute) == {"calls": 1}
+        await asyncio.sleep(0)
+        assert compute.calls == 2  # one background refresh for both lookups
+
+        compute.gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await cache.get_or_compute("k", compute) == {"calls": 2}
+        assert cache.get_statistics()["stale_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self, cache, clock):
+        compute = Counter()
+        await cache.get_or_compute("k", compute)
+        clock.now += 60
+
+        compute.error = RuntimeError("db down")
+        assert await cache.get_or_compute("k", compute) == {"calls": 1}
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert cache.get_statistics()["refresh_failures"] == 1
+        assert await cache.get_or_compute("k", compute) == {"calls": 1}
+
+
+class TestErrors:
+    @pytest.mark.asyncio
+    async def test_errors_reach_all_waiters_and_are_not_cached(self, cache):
+        compute = Counter()
+        compute.gate = asyncio.Event()
+        compute.error = ValueError("boom")
+        waiters = [
+            asyncio.ensure_future(cache.get_or_compute("k", compute)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        compute.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert compute.calls == 1
+
+        compute.gate = None
+        compute.error = None
+        assert await cache.get_or_compute("k", compute) == {"calls": 2}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_computation(self, cache):
+        compute = Counter()
+        compute.gate = asyncio.Event()
+        first = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        second = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        compute.gate.set()
+
+        assert await second == {"calls": 1}
+        assert first.cancelled()
+        assert compute.calls == 1
+
+
+class TestBoundsAndLifecycle:
+    @pytest.mark.asyncio
+    async def test_lru_bound(self, clock):
+        cache = SingleFlightCache("test", max_entries=2, clock=clock)
+        compute = Counter()
+        await cache.get_or_compute("a", compute)
+        await cache.get_or_compute("b", compute)
+        await cache.get_or_compute("a", compute)  # a is now most recent
+        await cache.get_or_compute("c", compute)
+        assert cache.get_statistics()["entries"] == 2
+
+        await cache.get_or_compute("a", compute)
+        assert compute.calls == 3
+        await cache.get_or_compute("b", compute)
+        assert compute.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_predicate(self, cache):
+        compute = Counter()
+        for key in (("t1", "kpis"), ("t1", "aging"), ("t2", "kpis")):
+            await cache.get_or_compute(key, compute)
+        assert cache.invalidate(lambda key: key[0] == "t1") == 2
+        assert cache.get_statistics()["entries"] == 1
+        assert cache.invalidate() == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self):
+        cache = SingleFlightCache("test", enabled=False)
+        compute = Counter()
+        await cache.get_or_compute("k", compute)
+        await cache.get_or_compute("k", compute)
+        assert compute.calls == 2
+        assert cache.get_statistics()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_background_refresh(self, cache, clock):
+        compute = Counter()
+        await cache.get_or_compute("k", compute)
+        clock.now += 60
+        compute.gate = asyncio.Event()
+        await cache.get_or_compute("k", compute)
+        await asyncio.sleep(0)
+        assert cache.get_statistics()["in_flight"] == 1
+
+        await cache.cleanup()
+        stats = cache.get_statistics()
+        assert (stats["in_flight"], stats["entries"]) == (0, 0)
+        assert stats["refresh_failures"] == 0
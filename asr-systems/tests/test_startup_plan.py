@@ -0,0 +1,128 @@
+"""
+Tests for the dependency-aware startup plan.
+Covers dependency ordering, concurrent independent steps, failure handling,
+sequential mode, deferred warmups and the critical path breakdown.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+
+from production_server.utils.startup import StartupPlan
+
+
+def _step(log, name, delay=0.0, error=None):
+    async def run():
+        log.append(f"{name}:start")
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        log.append(f"{name}:end")
+
+    return run
+
+
+class TestOrdering:
+    @pytest.mark.asyncio
+    async def test_steps_wait_for_dependencies(self):
+        log = []
+        plan = StartupPlan()
+        plan.add("database", _step(log, "database", 0.02))
+        plan.add("vendors", _step(log, "vendors"), after=["database"])
+        plan.add("gl", _step(log, "gl"), after=["vendors"])
+        await plan.run()
+        assert log.index("database:end") < log.index("vendors:start")
+        assert log.index("vendors:end") < log.index("gl:start")
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        plan = StartupPlan()
+        for name in ("a", "b", "c", "d"):
+            plan.add(name, _step([], name, 0.05))
+        await plan.run()
+        assert plan.total_seconds < 0.15
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_runs_in_insertion_order(self):
+        log = []
+        plan = StartupPlan(concurrent=False)
+        plan.add("a", _step(log, "a", 0.01))
+        plan.add("b", _step(log, "b"))
+        await plan.run()
+        assert log == ["a:start", "a:end", "b:start", "b:end"]
+
+    def test_unknown_or_duplicate_step_rejected(self):
+        plan = StartupPlan()
+        with pytest.raises(ValueError, match="unknown"):
+            plan.add("gl", _step([], "gl"), after=["vendors"])
+        plan.add("vendors", _step([], "vendors"))
+        with pytest.raises(ValueError, match="Duplicate"):
+            plan.add("vendors", _step([], "vendors"))
+
+
+class TestFailures:
+    @pytest.mark.asyncio
+    async def test_failure_is_raised_and_dependents_never_start(self):
+        log = []
+        plan = StartupPlan()
+        plan.add("database", _step(log, "database", error=RuntimeError("down")))
+        plan.add("slow", _step(log, "slow", 5.0))
+        plan.add("vendors", _step(log, "vendors"), after=["database"])
+        with pytest.raises(RuntimeError, match="down"):
+            await plan.run()
+        assert "vendors:start" not in log
+        assert "slow:end" not in log
+        steps = {s["name"]: s for s in plan.get_timings()["steps"]}
+        assert steps["database"]["error"] == "down"
+
+
+class TestDeferred:
+    @pytest.mark.asyncio
+    async def test_deferred_warmups_run_after_start_and_failures_are_logged(self):
+        log = []
+        plan = StartupPlan()
+        plan.add("vendors", _step(log, "vendors"))
+        plan.defer("index", _step(log, "index"))
+        plan.defer("purge", _step(log, "purge", error=RuntimeError("locked")))
+        await plan.run()
+        assert "index:start" not in log
+
+        plan.start_deferred()
+        await plan.wait_deferred()
+        assert "index:end" in log
+        deferred = {s["name"]: s for s in plan.get_timings()["deferred"]}
+        assert deferred["index"]["duration_ms"] is not None
+        assert deferred["purge"]["error"] == "locked"
+
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_running_warmups(self):
+        log = []
+        plan = StartupPlan()
+        plan.defer("index", _step(log, "index", 5.0))
+        await plan.run()
+        plan.start_deferred()
+        await asyncio.sleep(0)
+        await plan.cleanup()
+        assert log == ["index:start"]
+
+
+class TestTimings:
+    @pytest.mark.asyncio
+    async def test_critical_path_follows_the_latest_dependency(self):
+        plan = StartupPlan()
+        plan.add("database", _step([], "database", 0.01))
+        plan.add("claude", _step([], "claude", 0.08))
+        plan.add("gl", _step([], "gl"), after=["database"])
+        plan.add("payment", _step([], "payment"), after=["claude", "gl"])
+        await plan.run()
+
+        assert plan.critical_path() == ["claude", "payment"]
+        timings = plan.get_timings()
+        assert timings["concurrent"] is True
+        assert timings["total_ms"] >= 80
+        assert [s["name"] for s in timings["steps"]] == plan.step_names()
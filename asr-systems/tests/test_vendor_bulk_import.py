@@ -0,0 +1,264 @@
+"""
+Tests for the bulk vendor import path.
+Covers single-transaction upserts through VendorService.bulk_import, a
+constant statement count per chunk, chunked stream validation, and CSV /
+NDJSON / JSON file imports including the upload endpoint.
+"""
+
+import io
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, func, select
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+import config.database as database
+from config.database import close_database, get_async_session, init_database
+from models.vendor_stats import VendorStatsDocumentRecord
+from services.vendor_import_export import VendorImportExportService
+from services.vendor_service import VendorService
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def svc():
+    await init_database("sqlite:///")
+    service = VendorService()
+    await service.initialize()
+    yield service
+    await close_database()
+
+
+@pytest.fixture
+def importer(svc):
+    return VendorImportExportService(svc, chunk_size=10)
+
+
+def _rows(n, prefix="Vendor"):
+    return [{"name": f"{prefix} {i:04d}", "notes": f"row {i}"} for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# VendorService.bulk_import
+# ---------------------------------------------------------------------------
+
+
+class TestBulkImport:
+    @pytest.mark.asyncio
+    async def test_merge_creates_and_updates(self, svc, importer):
+        existing = await svc.create_vendor(name="Acme", tenant_id="t1")
+        result = await importer.import_vendors_json(
+            [
+                {"name": "ACME", "default_gl_account": "5000", "aliases": ["acm"]},
+                {"name": "Beta", "payment_terms_days": 30, "active": True},
+            ],
+            mode="merge",
+            tenant_id="t1",
+        )
+        assert (result["created"], result["updated"]) == (1, 1)
+
+        acme = await svc.get_vendor(existing["id"])
+        assert acme["name"] == "Acme"
+        assert acme["default_gl_account"] == "5000"
+        assert (await svc.match_vendor("acm", "t1"))["id"] == existing["id"]
+        beta = await svc.match_vendor("beta", "t1")
+        assert beta["payment_terms_days"] == 30
+        assert beta["display_name"] == "Beta"
+
+    @pytest.mark.asyncio
+    async def test_append_skips_and_overwrite_is_tenant_scoped(self, svc, importer):
+        await svc.create_vendor(name="Acme", tenant_id="t1")
+        await svc.create_vendor(name="Other", tenant_id="t2")
+
+        appended = await importer.import_vendors_json(
+            [{"name": "acme"}, {"name": "New"}], mode="append", tenant_id="t1"
+        )
+        assert (appended["created"], appended["skipped"]) == (1, 1)
+
+        await importer.import_vendors_json(
+            [{"name": "Only"}], mode="overwrite", tenant_id="t1"
+        )
+        assert [v["name"] for v in await svc.list_vendors("t1")] == ["Only"]
+        assert [v["name"] for v in await svc.list_vendors("t2")] == ["Other"]
+
+    @pytest.mark.asyncio
+    async def test_overwrite_drops_document_ledger(self, svc, importer):
+        for tenant_id in ("t1", "t2"):
+            vendor = await svc.create_vendor(name="Acme", tenant_id=tenant_id)
+            await svc.record_document_rollups(
+                [
+                    {
+                        "document_id": f"doc-{tenant_id}",
+                        "vendor_id": vendor["id"],
+                        "tenant_id": tenant_id,
+                        "amount": 10.0,
+                        "document_date": datetime(2026, 5, 1),
+                        "payment_status": "paid",
+                    }
+                ]
+            )
+
+        await importer.import_vendors_json(
+            [{"name": "Only"}], mode="overwrite", tenant_id="t1"
+        )
+
+        async with get_async_session() as session:
+            result = await session.execute(
+                select(VendorStatsDocumentRecord.tenant_id, func.count()).group_by(
+                    VendorStatsDocumentRecord.tenant_id
+                )
+            )
+            assert dict(result.all()) == {"t2": 1}
+
+    @pytest.mark.asyncio
+    async def test_statements_per_chunk_are_constant(self, svc, importer):
+        await importer.import_vendors_json(_rows(25), mode="merge", tenant_id="t1")
+
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0].upper())
+
+        sync_engine = database._engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _count)
+        try:
+            rows = _rows(25) + _rows(25, prefix="Fresh")
+            result = await importer.import_vendors_json(
+                rows, mode="merge", tenant_id="t1"
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _count)
+
+        assert (result["created"], result["updated"]) == (25, 25)
+        # 1 keyed lookup + at most one INSERT and one UPDATE per 10-row chunk
+        assert statements.count("SELECT") == 1
+        assert statements.count("INSERT") + statements.count("UPDATE") <= 2 * 5
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back_whole_import(self, svc, importer):
+        calls = []
+
+        def _progress(processed):
+            calls.append(processed)
+            if processed >= 20:
+                raise RuntimeError("client went away")
+
+        with pytest.raises(RuntimeError):
+            await importer._execute_import(_rows(30), "merge", "t1", _progress)
+        assert calls == [10, 20]
+        assert await svc.list_vendors("t1") == []
+
+
+# ---------------------------------------------------------------------------
+# File imports
+# ---------------------------------------------------------------------------
+
+
+class TestFileImport:
+    @pytest.mark.asyncio
+    async def test_csv_stream(self, svc, importer):
+        lines = ["name,aliases,tags,payment_terms_days,active"]
+        lines += [f"Vendor {i},v{i}|vv{i},a|b,,true" for i in range(35)]
+        data = io.BytesIO(("﻿" + "\n".join(lines) + "\n").encode("utf-8"))
+        progress = []
+
+        result = await importer.import_vendors_file(
+            data, "csv", tenant_id="t1", progress=progress.append
+        )
+        assert result["created"] == 35
+        assert progress == [10, 20, 30, 35]
+        assert not data.closed
+        vendor = await svc.match_vendor("vv7", "t1")
+        assert vendor["tags"] == ["a", "b"]
+        assert vendor["payment_terms_days"] is None
+
+    @pytest.mark.asyncio
+    async def test_file_is_parsed_off_the_event_loop(self, svc, importer):
+        parse_threads = set()
+        parse = importer._iter_csv_rows
+
+        def _rows(text):
+            for row in parse(text):
+                parse_threads.add(threading.get_ident())
+                yield row
+
+        data = io.BytesIO(
+            ("name\n" + "\n".join(f"Vendor {i}" for i in range(25))).encode()
+        )
+        with patch.object(importer, "_iter_csv_rows", _rows):
+            result = await importer.import_vendors_file(data, "csv", tenant_id="t1")
+
+        assert result["created"] == 25
+        assert parse_threads
+        assert threading.get_ident() not in parse_threads
+
+    @pytest.mark.asyncio
+    async def test_ndjson_and_json(self, svc, importer):
+        ndjson = "\n".join(json.dumps(r) for r in _rows(12)) + "\n\n"
+        result = await importer.import_vendors_file(
+            io.BytesIO(ndjson.encode()), "ndjson", tenant_id="t1"
+        )
+        assert result["created"] == 12
+
+        array = json.dumps(_rows(12) + [{"name": "Extra"}])
+        result = await importer.import_vendors_file(
+            io.BytesIO(array.encode()), "json", tenant_id="t1"
+        )
+        assert (result["created"], result["updated"]) == (1, 12)
+
+    @pytest.mark.asyncio
+    async def test_validation_spans_chunks(self, svc, importer):
+        rows = _rows(15) + [{"name": "vendor 0003"}]
+        ndjson = "\n".join(json.dumps(r) for r in rows)
+        result = await importer.import_vendors_file(
+            io.BytesIO(ndjson.encode()), "ndjson", tenant_id="t1"
+        )
+        assert result["success"] is False
+        assert result["errors"] == ["Row 16: duplicate name 'vendor 0003'"]
+        assert await svc.list_vendors("t1") == []
+
+    @pytest.mark.asyncio
+    async def test_unparseable_file_reports_error(self, importer):
+        result = await importer.import_vendors_file(
+            io.BytesIO(b'{"name": "ok"}\n{broken'), "ndjson", tenant_id="t1"
+        )
+        assert result["success"] is False
+        assert "Unable to parse ndjson" in result["errors"][0]
+
+
+def test_import_file_endpoint():
+    from fastapi.testclient import TestClient
+    from tests.auth_helpers import CSRF_COOKIES, WRITE_HEADERS
+
+    from api.main import app
+
+    csv_text = "name,notes\nUpload Vendor A,first\nUpload Vendor B,second\n"
+    with TestClient(app, raise_server_exceptions=False) as client:
+        ok = client.post(
+            "/vendors/import/file?mode=merge",
+            files={"file": ("vendors.csv", csv_text, "text/csv")},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        assert ok.status_code == 200
+        body = ok.json()
+        assert body["success"] is True
+        assert body["created"] + body["updated"] == 2
+
+        bad = client.post(
+            "/vendors/import/file",
+            files={"file": ("vendors.xlsx", b"x", "application/octet-stream")},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        assert bad.status_code == 422
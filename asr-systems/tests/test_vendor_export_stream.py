@@ -0,0 +1,157 @@
+"""
+Tests for streaming vendor export.
+Covers keyset pagination in VendorService.iter_vendor_pages and the CSV,
+NDJSON and JSON streams served by /vendors/export.
+"""
+
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from config.database import close_database, init_database
+from services import vendor_import_export
+from services.vendor_import_export import VendorImportExportService
+from services.vendor_service import VendorService
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def svc():
+    await init_database("sqlite:///")
+    service = VendorService()
+    await service.initialize()
+    yield service
+    await close_database()
+
+
+@pytest.fixture
+def exporter(svc, monkeypatch):
+    monkeypatch.setattr(vendor_import_export, "EXPORT_PAGE_SIZE", 3)
+    return VendorImportExportService(svc)
+
+
+async def _seed(svc, names, tenant_id="t1"):
+    for name in names:
+        await svc.create_vendor(name=name, tenant_id=tenant_id)
+
+
+async def _collect(stream):
+    return "".join([chunk async for chunk in stream])
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------------------------
+
+
+class TestIterVendorPages:
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_vendor_once(self, svc):
+        # Duplicate names exercise the (name, id) tie-breaker
+        await _seed(
+            svc, ["Delta", "Alpha", "Bravo", "Alpha", "Echo", "Charlie", "Alpha"]
+        )
+        await _seed(svc, ["Other"], tenant_id="t2")
+
+        pages = [p async for p in svc.iter_vendor_pages("t1", page_size=2)]
+        assert [len(p) for p in pages] == [2, 2, 2, 1]
+        vendors = [v for page in pages for v in page]
+        assert len({v["id"] for v in vendors}) == 7
+        keys = [(v["name"], v["id"]) for v in vendors]
+        assert keys == sorted(keys)
+        assert "Other" not in {v["name"] for v in vendors}
+
+    @pytest.mark.asyncio
+    async def test_column_projection(self, svc):
+        await _seed(svc, ["Alpha"])
+        [[vendor]] = [
+            p async for p in svc.iter_vendor_pages("t1", columns=["name", "tags"])
+        ]
+        assert vendor == {"name": "Alpha", "tags": []}
+
+    @pytest.mark.asyncio
+    async def test_pages_are_fetched_lazily(self, svc):
+        await _seed(svc, ["A1", "A2"])
+        pages = svc.iter_vendor_pages("t1", page_size=2)
+        first = await pages.__anext__()
+        await _seed(svc, ["Z9"])
+        rest = [p async for p in pages]
+        assert [v["name"] for v in first] == ["A1", "A2"]
+        assert [v["name"] for page in rest for v in page] == ["Z9"]
+
+
+# ---------------------------------------------------------------------------
+# Export streams
+# ---------------------------------------------------------------------------
+
+
+class TestExportStreams:
+    @pytest.mark.asyncio
+    async def test_csv_stream_matches_buffered_export(self, svc, exporter):
+        await _seed(svc, [f"Vendor {i}" for i in range(8)])
+        vendor = await svc.match_vendor("vendor 3", "t1")
+        await svc.update_vendor(vendor["id"], {"aliases": ["v3", "vee3"]})
+
+        chunks = [c async for c in exporter.stream_vendors_csv("t1")]
+        assert len(chunks) == 1 + 3  # header + ceil(8 / 3) pages
+        streamed = list(csv.DictReader(io.StringIO("".join(chunks))))
+        buffered = list(
+            csv.DictReader(io.StringIO(await exporter.export_vendors_csv("t1")))
+        )
+        assert streamed == buffered
+        assert streamed[3]["aliases"] == "v3|vee3"
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stream(self, svc, exporter):
+        await _seed(svc, [f"Vendor {i}" for i in range(5)])
+        lines = (await _collect(exporter.stream_vendors_ndjson("t1"))).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert [r["name"] for r in rows] == [f"Vendor {i}" for i in range(5)]
+        assert set(rows[0]) == set(vendor_import_export.VENDOR_EXPORT_FIELDS)
+
+    @pytest.mark.asyncio
+    async def test_json_envelope(self, svc, exporter):
+        assert json.loads(await _collect(exporter.stream_vendors_json("t1"))) == {
+            "success": True,
+            "format": "json",
+            "data": [],
+        }
+        await _seed(svc, [f"Vendor {i}" for i in range(7)])
+        body = json.loads(await _collect(exporter.stream_vendors_json("t1")))
+        assert len(body["data"]) == 7
+
+
+def test_export_endpoint_streams_csv_and_ndjson():
+    from fastapi.testclient import TestClient
+    from tests.auth_helpers import AUTH_HEADERS, CSRF_COOKIES, WRITE_HEADERS
+
+    from api.main import app
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.post(
+            "/vendors",
+            json={"name": "Streamed Export Vendor", "tenant_id": "default"},
+            headers=WRITE_HEADERS,
+            cookies=CSRF_COOKIES,
+        )
+        resp = client.get("/vendors/export?format=csv", headers=AUTH_HEADERS)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        names = [r["name"] for r in csv.DictReader(io.StringIO(resp.text))]
+        assert "Streamed Export Vendor" in names
+
+        resp = client.get("/vendors/export?format=ndjson", headers=AUTH_HEADERS)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        names = [json.loads(line)["name"] for line in resp.text.splitlines()]
+        assert "Streamed Export Vendor" in names
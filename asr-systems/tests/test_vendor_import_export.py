@@ -78,10 +78,37 @@ def _make_svc(vendors=None):
                 return True
         return False
 
+    async def _bulk_import(chunks, mode, tenant_id, progress=None):
+        counts = {"created": 0, "updated": 0, "skipped": 0}
+        if mode == "overwrite":
+            _vendors[:] = [v for v in _vendors if v["tenant_id"] != tenant_id]
+        async for chunk in chunks:
+            for row in chunk:
+                existing = next(
+                    (
+                        v
+                        for v in _vendors
+                        if v["tenant_id"] == tenant_id
+                        and v["name"].lower() == row["name"].lower()
+                    ),
+                    None,
+                )
+                if existing is None:
+                    await _create_vendor(row["name"], tenant_id)
+                    _vendors[-1].update(row)
+                    counts["created"] += 1
+                elif mode == "append":
+                    counts["skipped"] += 1
+                else:
+                    existing.update(row)
+                    counts["updated"] += 1
+        return counts
+
     vs.list_vendors = AsyncMock(side_effect=_list_vendors)
     vs.create_vendor = AsyncMock(side_effect=_create_vendor)
     vs.update_vendor = AsyncMock(side_effect=_update_vendor)
     vs.delete_vendor = AsyncMock(side_effect=_delete_vendor)
+    vs.bulk_import = AsyncMock(side_effect=_bulk_import)
 
     return VendorImportExportService(vs), vs, _vendors
 
@@ -270,6 +297,7 @@ async def test_import_rejects_invalid_data():
     assert len(result["errors"]) > 0
     # Vendor service should not have been called for create/update
     vs.create_vendor.assert_not_called()
+    vs.bulk_import.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
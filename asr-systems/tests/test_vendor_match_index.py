@@ -0,0 +1,199 @@
+"""
+Tests for the in-memory vendor match index behind VendorService.match_vendor.
+Covers normalization, name-over-alias precedence, startup warm-up, tenant
+scoping, invalidation on create/update/delete and import, and picking up
+writes made by other workers.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from config.database import close_database, init_database
+from services.vendor_import_export import VendorImportExportService
+from services.vendor_service import (
+    VendorService,
+    build_match_index,
+    normalize_vendor_name,
+)
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def db():
+    await init_database("sqlite:///")
+    yield
+    await close_database()
+
+
+@pytest.fixture
+async def svc(db):
+    service = VendorService()
+    await service.initialize()
+    return service
+
+
+# ---------------------------------------------------------------------------
+# Index construction
+# ---------------------------------------------------------------------------
+
+
+class TestBuildMatchIndex:
+    def test_normalize_collapses_whitespace_and_case(self):
+        assert normalize_vendor_name("  ACME\t Lumber ") == "acme lumber"
+
+    def test_name_wins_over_alias(self):
+        index = build_match_index(
+            [
+                {
+                    "id": "1",
+                    "tenant_id": "t1",
+                    "name": "Acme",
+                    "aliases": ["Home Depot"],
+                },
+                {"id": "2", "tenant_id": "t1", "name": "Home Depot", "aliases": []},
+            ]
+        )
+        assert index["t1"]["home depot"]["id"] == "2"
+        assert index["t1"]["acme"]["id"] == "1"
+
+    def test_tenants_are_separate(self):
+        index = build_match_index(
+            [
+                {"id": "1", "tenant_id": "t1", "name": "Acme", "aliases": []},
+                {"id": "2", "tenant_id": "t2", "name": "Acme", "aliases": [None, ""]},
+            ]
+        )
+        assert index["t1"]["acme"]["id"] == "1"
+        assert index["t2"]["acme"]["id"] == "2"
+        assert len(index["t2"]) == 1
+
+
+# ---------------------------------------------------------------------------
+# Service behaviour
+# ---------------------------------------------------------------------------
+
+
+class TestMatchVendor:
+    @pytest.mark.asyncio
+    async def test_warmed_at_startup(self, db):
+        seed = VendorService()
+        await seed.create_vendor(name="Acme Lumber", tenant_id="t1")
+
+        svc = VendorService()
+        await svc.initialize()
+        stats = svc.get_match_index_statistics()
+        assert stats["complete"] is True
+        assert stats["tenants"] == 1
+
+        with patch.object(svc, "_load_active_vendors") as load:
+            match = await svc.match_vendor("acme  LUMBER", "t1")
+            miss = await svc.match_vendor("Acme Lumber", "unknown-tenant")
+        assert match["name"] == "Acme Lumber"
+        assert miss is None
+        load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_alias_match_and_tenant_scope(self, svc):
+        v = await svc.create_vendor(name="Home Depot", tenant_id="t1")
+        await svc.update_vendor(v["id"], {"aliases": ["THD", "HD Supply"]})
+
+        assert (await svc.match_vendor("hd supply", "t1"))["id"] == v["id"]
+        assert await svc.match_vendor("thd", "t2") is None
+        assert (await svc.match_vendor("THD"))["id"] == v["id"]
+
+    @pytest.mark.asyncio
+    async def test_create_update_delete_invalidate(self, svc):
+        assert await svc.match_vendor("Acme", "t1") is None
+
+        v = await svc.create_vendor(name="Acme", tenant_id="t1")
+        assert (await svc.match_vendor("acme", "t1"))["id"] == v["id"]
+
+        await svc.update_vendor(v["id"], {"name": "Acme Supply"}, tenant_id="t1")
+        assert await svc.match_vendor("acme", "t1") is None
+        assert (await svc.match_vendor("acme supply", "t1"))["id"] == v["id"]
+
+        await svc.update_vendor(v["id"], {"active": False}, tenant_id="t1")
+        assert await svc.match_vendor("acme supply", "t1") is None
+
+        await svc.update_vendor(v["id"], {"active": True}, tenant_id="t1")
+        await svc.delete_vendor(v["id"], tenant_id="t1")
+        assert await svc.match_vendor("acme supply", "t1") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_only_reloads_that_tenant(self, svc):
+        await svc.create_vendor(name="Acme", tenant_id="t1")
+        await svc.create_vendor(name="Beta", tenant_id="t2")
+        await svc.match_vendor("acme", "t1")
+        await svc.match_vendor("beta", "t2")
+
+        svc.invalidate_match_index("t1")
+        with patch.object(
+            svc, "_load_active_vendors", wraps=svc._load_active_vendors
+        ) as load:
+            assert await svc.match_vendor("beta", "t2") is not None
+            assert await svc.match_vendor("acme", "t1") is not None
+        load.assert_called_once_with("t1")
+
+    @pytest.mark.asyncio
+    async def test_returned_dict_is_a_copy(self, svc):
+        await svc.create_vendor(name="Acme", tenant_id="t1")
+        first = await svc.match_vendor("acme", "t1")
+        first["default_gl_account"] = "9999"
+        second = await svc.match_vendor("acme", "t1")
+        assert second["default_gl_account"] is None
+
+    @pytest.mark.asyncio
+    async def test_import_invalidates_index(self, svc):
+        assert await svc.match_vendor("Imported Co", "t1") is None
+        importer = VendorImportExportService(svc)
+        with patch.object(
+            svc, "invalidate_match_index", wraps=svc.invalidate_match_index
+        ) as invalidate:
+            result = await importer.import_vendors_json(
+                [{"name": "Imported Co"}], mode="merge", tenant_id="t1"
+            )
+        assert result["created"] == 1
+        assert invalidate.call_args_list[-1].args == ("t1",)
+        assert await svc.match_vendor("imported co", "t1") is not None
+
+
+class TestOtherWorkers:
+    @pytest.mark.asyncio
+    async def test_writes_on_another_worker_are_picked_up(self, db):
+        writer = VendorService()
+        reader = VendorService(match_index_recheck_seconds=0)
+        await reader.initialize()
+        assert await reader.match_vendor("Acme", "t1") is None
+        assert await reader.match_vendor("Acme") is None
+
+        v = await writer.create_vendor(name="Acme", tenant_id="t1")
+        assert (await reader.match_vendor("acme", "t1"))["id"] == v["id"]
+        assert (await reader.match_vendor("acme"))["id"] == v["id"]
+
+        await writer.update_vendor(v["id"], {"name": "Acme Supply"})
+        assert await reader.match_vendor("acme", "t1") is None
+        assert (await reader.match_vendor("acme supply", "t1"))["id"] == v["id"]
+
+        await writer.delete_vendor(v["id"])
+        assert await reader.match_vendor("acme supply", "t1") is None
+        assert await reader.match_vendor("acme supply") is None
+
+    @pytest.mark.asyncio
+    async def test_version_rechecked_at_most_once_per_interval(self, svc):
+        await svc.create_vendor(name="Acme", tenant_id="t1")
+        await svc.match_vendor("acme", "t1")
+        with patch.object(
+            svc, "get_vendor_version", wraps=svc.get_vendor_version
+        ) as version:
+            for _ in range(3):
+                assert await svc.match_vendor("acme", "t1") is not None
+        version.assert_not_called()
@@ -0,0 +1,319 @@
+"""
+Tests for incrementally maintained vendor statistics.
+Covers batched rollup upserts, the stats read path, cleanup on vendor
+delete, and the document pipeline hook that feeds the rollups.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "shared"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "production_server"))
+
+from shared.core.models import (
+    BillingDestination,
+    DocumentMetadata,
+    PaymentConsensusResult,
+    PaymentDetectionMethod,
+    PaymentStatus,
+)
+
+from config.database import close_database, get_async_session, init_database
+from models.vendor_stats import VendorStatsDocumentRecord, VendorStatsRecord
+from services.document_processor_service import DocumentProcessorService
+from services.vendor_service import VendorService
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+async def svc():
+    await init_database("sqlite:///")
+    service = VendorService()
+    await service.initialize()
+    yield service
+    await close_database()
+
+
+@pytest.fixture
+async def vendor(svc):
+    return await svc.create_vendor(name="Acme Lumber", tenant_id="t1")
+
+
+def _doc(vendor, amount, month, gl="5000", status=PaymentStatus.PAID, doc_id=None):
+    return {
+        "document_id": doc_id,
+        "vendor_id": vendor["id"],
+        "tenant_id": "t1",
+        "amount": amount,
+        "document_date": datetime(2026, month, 15),
+        "gl_account_code": gl,
+        "gl_account_name": f"Account {gl}",
+        "payment_status": status,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+
+class TestVendorRollups:
+    @pytest.mark.asyncio
+    async def test_rollups_feed_stats(self, svc, vendor):
+        touched = await svc.record_document_rollups(
+            [
+                _doc(vendor, 100.0, 1),
+                _doc(vendor, 50.0, 1, gl="6000", status=PaymentStatus.UNPAID),
+                _doc(vendor, 25.0, 2),
+            ]
+        )
+        # months 01, 02 + GL 5000, 6000 + status paid, unpaid
+        assert touched == 6
+
+        stats = await svc.get_vendor_stats(vendor["id"], tenant_id="t1")
+        docs = stats["documents"]
+        assert docs["total"] == 3
+        assert docs["by_month"] == [
+            {"month": "2026-01", "count": 2, "amount": 150.0},
+            {"month": "2026-02", "count": 1, "amount": 25.0},
+        ]
+        assert [(g["code"], g["count"]) for g in docs["by_gl_account"]] == [
+            ("5000", 2),
+            ("6000", 1),
+        ]
+        assert docs["by_gl_account"][0]["name"] == "Account 5000"
+        assert stats["payments"]["status_distribution"] == {
+            "paid": 2,
+            "unpaid": 1,
+            "partial": 0,
+            "void": 0,
+        }
+        assert stats["trends"]["amount_processed"][0] == {
+            "date": "2026-01",
+            "amount": 150.0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_batches_accumulate(self, svc, vendor):
+        await svc.record_document_rollups([_doc(vendor, 10.0, 3)])
+        await svc.record_document_rollups([_doc(vendor, 5.0, 3)])
+        await svc.record_document_rollups([_doc(vendor, 1.0, 1)])
+
+        refreshed = await svc.get_vendor(vendor["id"])
+        assert refreshed["document_count"] == 3
+        assert refreshed["total_amount_processed"] == pytest.approx(16.0)
+        assert refreshed["average_amount"] == pytest.approx(16.0 / 3)
+        # Rollups are not vendor edits
+        assert refreshed["updated_at"] == vendor["updated_at"]
+
+        async with get_async_session() as session:
+            row = await session.get(
+                VendorStatsRecord, (vendor["id"], "gl_account", "5000")
+            )
+        assert row.document_count == 3
+        assert row.last_document_at == datetime(2026, 3, 15)
+
+    @pytest.mark.asyncio
+    async def test_reprocessed_document_replaces_its_contribution(self, svc, vendor):
+        await svc.record_document_rollups([_doc(vendor, 10.0, 1, doc_id="d1")])
+        await svc.record_document_rollups(
+            [_doc(vendor, 30.0, 2, gl="6000", doc_id="d1")]
+        )
+        await svc.record_document_rollups([_doc(vendor, 5.0, 2, doc_id="d2")])
+
+        refreshed = await svc.get_vendor(vendor["id"])
+        assert refreshed["document_count"] == 2
+        assert refreshed["total_amount_processed"] == pytest.approx(35.0)
+        stats = await svc.get_vendor_stats(vendor["id"])
+        # The emptied January and GL 5000 buckets are dropped
+        assert stats["documents"]["by_month"] == [
+            {"month": "2026-02", "count": 2, "amount": 35.0}
+        ]
+        assert [
+            (g["code"], g["count"]) for g in stats["documents"]["by_gl_account"]
+        ] == [
+            ("5000", 1),
+            ("6000", 1),
+        ]
+        assert stats["payments"]["status_distribution"]["paid"] == 2
+
+    @pytest.mark.asyncio
+    async def test_forget_document_takes_it_back_out(self, svc, vendor):
+        await svc.record_document_rollups(
+            [_doc(vendor, 10.0, 1, doc_id="d1"), _doc(vendor, 4.0, 1, doc_id="d2")]
+        )
+        assert not await svc.forget_document_rollups("d1", tenant_id="t2")
+        assert await svc.forget_document_rollups("d1", tenant_id="t1")
+        assert not await svc.forget_document_rollups("d1", tenant_id="t1")
+
+        refreshed = await svc.get_vendor(vendor["id"])
+        assert refreshed["document_count"] == 1
+        assert refreshed["total_amount_processed"] == pytest.approx(4.0)
+        stats = await svc.get_vendor_stats(vendor["id"])
+        assert stats["documents"]["by_month"] == [
+            {"month": "2026-01", "count": 1, "amount": 4.0}
+        ]
+
+        await svc.forget_document_rollups("d2")
+        stats = await svc.get_vendor_stats(vendor["id"])
+        assert stats["documents"]["by_month"] == []
+        assert stats["documents"]["by_gl_account"] == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_status_and_missing_amount(self, svc, vendor):
+        doc = _doc(vendor, None, 4, status=PaymentStatus.UNKNOWN)
+        await svc.record_document_rollups([doc])
+        stats = await svc.get_vendor_stats(vendor["id"])
+        assert stats["payments"]["status_distribution"]["unknown"] == 1
+        assert stats["documents"]["by_month"][0]["amount"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_delete_vendor_drops_rollups(self, svc, vendor):
+        await svc.record_document_rollups([_doc(vendor, 10.0, 1, doc_id="doc-1")])
+        assert await svc.delete_vendor(vendor["id"], tenant_id="t1")
+        async with get_async_session() as session:
+            rows = await session.execute(
+                select(VendorStatsRecord).where(
+                    VendorStatsRecord.vendor_id == vendor["id"]
+                )
+            )
+            assert rows.scalars().all() == []
+            assert await session.get(VendorStatsDocumentRecord, "doc-1") is None
+
+    @pytest.mark.asyncio
+    async def test_empty_vendor_stats(self, svc, vendor):
+        stats = await svc.get_vendor_stats(vendor["id"])
+        assert stats["documents"]["by_month"] == []
+        assert stats["payments"]["status_distribution"]["paid"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Pipeline hook
+# ---------------------------------------------------------------------------
+
+
+class TestPipelineHook:
+    def _processor(self, vendor_service):
+        return DocumentProcessorService(
+            gl_account_service=MagicMock(),
+            payment_detection_service=MagicMock(),
+            billing_router_service=MagicMock(),
+            storage_service=MagicMock(),
+            vendor_service=vendor_service,
+        )
+
+    @pytest.mark.asyncio
+    async def test_document_rolled_up_for_matched_vendor(self, svc, vendor):
+        processor = self._processor(svc)
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+            vendor_name="ACME lumber",
+            amount=42.5,
+            invoice_date=datetime(2026, 5, 1),
+        )
+        gl = SimpleNamespace(gl_account_code="5000", gl_account_name="Materials")
+        payment = SimpleNamespace(payment_status=PaymentStatus.PARTIAL)
+
+        await processor._record_vendor_rollup("doc-1", metadata, gl, payment)
+        # Reprocessing keeps the document ID, so it is not counted twice
+        await processor._record_vendor_rollup("doc-1", metadata, gl, payment)
+
+        stats = await svc.get_vendor_stats(vendor["id"])
+        assert stats["documents"]["total"] == 1
+        assert stats["documents"]["by_month"][0]["month"] == "2026-05"
+        assert stats["payments"]["status_distribution"]["partial"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_document_updates_vendor_stats(self, svc, vendor):
+        from services.billing_router_service import BillingRouterService
+        from services.gl_account_service import GLClassificationResult
+        from services.storage_service import StorageResult
+
+        gl = MagicMock()
+        gl.classify_document_text = AsyncMock(
+            return_value=GLClassificationResult(
+                gl_account_code="5000",
+                gl_account_name="Materials",
+                category="EXPENSES",
+                confidence=0.9,
+                reasoning="matched vendor",
+                keywords_matched=["lumber"],
+                classification_method="vendor_mapping",
+            )
+        )
+        payment = MagicMock()
+        payment.detect_payment_status = AsyncMock(
+            return_value=PaymentConsensusResult(
+                payment_status=PaymentStatus.UNPAID,
+                confidence=0.8,
+                methods_used=[PaymentDetectionMethod.REGEX_PATTERNS],
+                method_results={},
+                quality_score=0.8,
+                consensus_reached=True,
+            )
+        )
+        storage = MagicMock()
+        storage.store_document = AsyncMock(
+            return_value=StorageResult(success=True, storage_path="/tmp/inv.pdf")
+        )
+        router = BillingRouterService(
+            [destination.value for destination in BillingDestination],
+            confidence_threshold=0.5,
+        )
+        await router.initialize()
+        processor = DocumentProcessorService(
+            gl_account_service=gl,
+            payment_detection_service=payment,
+            billing_router_service=router,
+            storage_service=storage,
+            vendor_service=svc,
+        )
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+            vendor_name="ACME lumber",
+            amount=42.5,
+            invoice_date=datetime(2026, 5, 1),
+        )
+
+        result = await processor.process_document(
+            b"%PDF-1.4", metadata, document_id="doc-1"
+        )
+
+        assert result.success is True, result.error_message
+        async with get_async_session() as session:
+            row = await session.get(
+                VendorStatsRecord, (vendor["id"], "payment_status", "unpaid")
+            )
+        assert row.document_count == 1
+        assert row.total_amount == 42.5
+
+    @pytest.mark.asyncio
+    async def test_unmatched_vendor_is_skipped(self, svc):
+        processor = self._processor(svc)
+        svc.record_document_rollups = MagicMock()
+        metadata = DocumentMetadata(
+            filename="inv.pdf",
+            file_size=10,
+            mime_type="application/pdf",
+            tenant_id="t1",
+            vendor_name="Nobody Inc",
+        )
+        await processor._record_vendor_rollup(
+            "doc-1", metadata, MagicMock(), MagicMock()
+        )
+        svc.record_document_rollups.assert_not_called()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+ASR Local GL Classifier Training
+Trains the hashed-feature Naive Bayes GL model offline from audit-trail
+feedback and writes the model plus an accuracy/latency evaluation report.
+
+Usage:
+    python train_gl_classifier.py [--database-url URL]
+                                  [--tenant-id T | --all-tenants]
+                                  [--since 2026-01-01] [--output PATH]
+
+Trains on one tenant's feedback (DEFAULT_TENANT_ID unless --tenant-id is
+given); --all-tenants pools every tenant's labels into one model.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add shared modules to path
+root = Path(__file__).parent
+sys.path.insert(0, str(root))
+sys.path.insert(0, str(root / "shared"))
+sys.path.insert(0, str(root / "production_server"))
+
+from config.database import close_database, init_database
+from services.gl_ml_classifier import load_training_events, train_and_evaluate
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def train(args: argparse.Namespace) -> dict:
+    await init_database(args.database_url)
+    try:
+        since = datetime.fromisoformat(args.since) if args.since else None
+        events = await load_training_events(
+            tenant_id=args.tenant_id, since=since, all_tenants=args.all_tenants
+        )
+    finally:
+        await close_database()
+
+    logger.info(f"📚 Loaded {len(events)} feedback events from audit_trail")
+    model, report = train_and_evaluate(
+        events,
+        n_features=args.features,
+        holdout_fraction=args.holdout,
+        min_confidence=args.min_confidence,
+    )
+
+    output = model.save(args.output)
+    report_path = output.with_suffix(".report.json")
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    holdout = report["holdout"]
+    logger.info(f"✅ Model {model.version} written to {output}")
+    logger.info(f"   • Classes: {report['classes']}")
+    logger.info(
+        f"   • Samples: {report['train_samples']} train / "
+        f"{report['holdout_samples']} holdout ({report['overrides']} overrides)"
+    )
+    if holdout.get("samples"):
+        logger.info(f"   • Holdout accuracy: {holdout['accuracy']:.2%}")
+        logger.info(
+            f"   • Coverage at p>={holdout['min_confidence']}: {holdout['coverage']:.2%}"
+        )
+        logger.info(
+            f"   • Inference latency p50/p95: "
+            f"{holdout['latency_ms_p50']:.3f}/{holdout['latency_ms_p95']:.3f} ms"
+        )
+    logger.info(f"   • Report: {report_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("DATABASE_URL", "sqlite:///./data/production_server.db"),
+    )
+    tenants = parser.add_mutually_exclusive_group()
+    tenants.add_argument(
+        "--tenant-id", default=os.environ.get("DEFAULT_TENANT_ID", "default")
+    )
+    tenants.add_argument("--all-tenants", action="store_true")
+    parser.add_argument("--since", default=None, help="ISO date of oldest event")
+    parser.add_argument("--output", default="data/models/gl_classifier.npz")
+    parser.add_argument("--features", type=int, default=2**14)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--min-confidence", type=float, default=0.55)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(train(args))
+    except ValueError as e:
+        logger.error(f"❌ Training failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()